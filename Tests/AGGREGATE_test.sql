@@ -0,0 +1,61 @@
+-- python3 dini_db.py -r -f AGGREGATE_test.sql
+-- python3 dini_db.py --columnar -r -f AGGREGATE_test.sql
+
+-- Aggregates of the records that satisfy a condition
+-- An aggregate of no records is 0 for COUNT and SUM and empty for AVG, MIN and MAX,
+-- whether it is computed on records, vectorized, or grouped
+
+CREATE DATABASE db_aggregate;
+USE db_aggregate;
+
+CREATE TABLE Part (Partkey int, Size int, Name varchar(10));
+
+INSERT INTO Part VALUES (1, 7, 'bolt');
+INSERT INTO Part VALUES (2, 21, 'nut');
+INSERT INTO Part VALUES (3, 14, 'gear');
+
+-- The condition rules out every record
+SELECT COUNT(*) FROM Part WHERE Partkey > 100;
+SELECT SUM(Size) FROM Part WHERE Partkey > 100;
+SELECT AVG(Size) FROM Part WHERE Partkey > 100;
+SELECT MIN(Size) FROM Part WHERE Partkey > 100;
+SELECT MAX(Name) FROM Part WHERE Partkey > 100;
+SELECT AVG(Size), MIN(Size) FROM Part WHERE Partkey > 100;
+SELECT COUNT(*), MAX(Size), SUM(Size) FROM Part WHERE Partkey > 100;
+
+-- The condition keeps some of the records
+SELECT AVG(Size) FROM Part WHERE Partkey > 1;
+SELECT MAX(Size) FROM Part WHERE Partkey < 3;
+SELECT MIN(Name) FROM Part WHERE Size > 10;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_aggregate created.
+-- Using database db_aggregate.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- COUNT(*)
+-- 0
+-- SUM(Size)
+-- 0
+-- AVG(Size)
+--
+-- MIN(Size)
+--
+-- MAX(Name)
+--
+-- AVG(Size)|MIN(Size)
+-- |
+-- COUNT(*)|MAX(Size)|SUM(Size)
+-- 0||0
+-- AVG(Size)
+-- 17.5
+-- MAX(Size)
+-- 21
+-- MIN(Name)
+-- gear
+-- All done.
@@ -0,0 +1,92 @@
+-- python3 dini_db.py -r -f ALTER_test.sql
+
+-- Fields added to and dropped from a table without rewriting its records
+-- The rows written before a change are read with the table's current fields: an added field holds
+-- its default, or no value without one, and a dropped field is left out
+
+CREATE DATABASE db_alter;
+USE db_alter;
+
+CREATE TABLE Tool (id int, name varchar(10), weight float);
+
+INSERT INTO Tool VALUES (1, 'hammer', 1.5);
+INSERT INTO Tool VALUES (2, 'saw', 0.75);
+
+-- The old rows hold the default of an added field
+ALTER TABLE Tool ADD stock int DEFAULT 3;
+ALTER TABLE Tool ADD brand varchar(10);
+SELECT * FROM Tool;
+INSERT INTO Tool VALUES (3, 'drill', 2.0, 8, 'acme');
+SELECT * FROM Tool WHERE stock > 2;
+SELECT SUM(stock) FROM Tool;
+
+-- The old rows can be updated and deleted by their added fields
+UPDATE Tool SET stock = 0 WHERE id = 2;
+UPDATE Tool SET brand = 'zed' WHERE stock = 3;
+SELECT * FROM Tool;
+DELETE FROM Tool WHERE brand = 'zed';
+
+-- A dropped field is no longer read, and a field added with its name does not hold its old values
+ALTER TABLE Tool DROP COLUMN weight;
+SELECT * FROM Tool;
+ALTER TABLE Tool DROP name;
+ALTER TABLE Tool ADD name varchar(10) DEFAULT 'none';
+INSERT INTO Tool VALUES (4, 9, 'bolt', 'wrench');
+SELECT * FROM Tool;
+
+-- Rewriting the table keeps its records as they are read
+VACUUM Tool;
+SELECT * FROM Tool;
+ALTER TABLE Tool DROP COLUMN missing;
+ALTER TABLE Tool ADD id int;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_alter created.
+-- Using database db_alter.
+-- Table Tool created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Table Tool modified.
+-- Table Tool modified.
+-- id int|name varchar(10)|weight float|stock int|brand varchar(10)
+-- 1|hammer|1.5|3|
+-- 2|saw|0.75|3|
+-- 1 new record inserted.
+-- id int|name varchar(10)|weight float|stock int|brand varchar(10)
+-- 1|hammer|1.5|3|
+-- 2|saw|0.75|3|
+-- 3|drill|2.0|8|acme
+-- SUM(stock)
+-- 14
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar(10)|weight float|stock int|brand varchar(10)
+-- 3|drill|2.0|8|acme
+-- 2|saw|0.75|0|
+-- 1|hammer|1.5|3|zed
+-- Error: no transaction active!
+-- 1 record deleted.
+-- Table Tool modified.
+-- id int|name varchar(10)|stock int|brand varchar(10)
+-- 3|drill|8|acme
+-- 2|saw|0|
+-- Table Tool modified.
+-- Table Tool modified.
+-- 1 new record inserted.
+-- id int|stock int|brand varchar(10)|name varchar(10)
+-- 3|8|acme|none
+-- 2|0||none
+-- 4|9|bolt|wrench
+-- Table Tool vacuumed, 3 slots reclaimed.
+-- id int|stock int|brand varchar(10)|name varchar(10)
+-- 3|8|acme|none
+-- 2|0||none
+-- 4|9|bolt|wrench
+-- !Failed because Tool has no field missing.
+-- !Failed because the field id has already been declared
+-- All done.
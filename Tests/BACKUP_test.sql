@@ -0,0 +1,78 @@
+-- python3 dini_db.py -r -f BACKUP_test.sql
+
+-- BACKUP DATABASE copies every file of a database to a new generation in a directory
+-- RESTORE DATABASE creates a database that does not exist from the last generation of it in a directory
+-- Files that have not changed since the previous generation are linked to it instead of copied, unless they
+-- changed shortly before it was made, as every file of this script did
+
+CREATE DATABASE db_backup;
+USE db_backup;
+
+CREATE TABLE Part (id int, name varchar(10), price float);
+CREATE TABLE Supply (pid int, qty int);
+
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (2, 'nut', 1.5);
+INSERT INTO Supply VALUES (1, 10);
+
+BACKUP DATABASE db_backup TO 'backups';
+
+-- The changes made after the first backup are held by the second
+INSERT INTO Part VALUES (3, 'gear', 9.0);
+begin transaction;
+UPDATE Part SET price = 2.5 WHERE id = 2;
+DELETE FROM Supply WHERE pid = 1;
+commit;
+BACKUP DATABASE db_backup TO 'backups';
+
+-- The database is restored from the last generation once it has been dropped
+DROP DATABASE db_backup;
+RESTORE DATABASE db_backup FROM 'backups';
+USE db_backup;
+SELECT * FROM Part;
+SELECT * FROM Supply;
+INSERT INTO Supply VALUES (3, 5);
+SELECT * FROM Supply;
+
+-- A database that exists, a database that was not backed up and invalid statements
+RESTORE DATABASE db_backup FROM 'backups';
+RESTORE DATABASE db_other FROM 'backups';
+BACKUP DATABASE db_other TO 'backups';
+RESTORE DATABASE db_backup;
+BACKUP db_backup;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_backup created.
+-- Using database db_backup.
+-- Table Part created.
+-- Table Supply created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Database db_backup backed up to backups/db_backup_0001 (3 files copied, 0 unchanged files linked, 152 bytes copied).
+-- 1 new record inserted.
+-- Transaction starts.
+-- 1 record modified.
+-- 1 record deleted.
+-- Transaction committed.
+-- Database db_backup backed up to backups/db_backup_0002 (6 files copied, 0 unchanged files linked, 212 bytes copied).
+-- Database db_backup deleted.
+-- Database db_backup restored from backups/db_backup_0002 (6 files, 212 bytes).
+-- Using database db_backup.
+-- id int|name varchar(10)|price float
+-- 1|bolt|3.5
+-- 2|nut|2.5
+-- 3|gear|9.0
+-- pid int|qty int
+-- 1 new record inserted.
+-- pid int|qty int
+-- 3|5
+-- !Failed to restore db_backup because the database already exists.
+-- !Failed to restore db_other because it has not been backed up to backups.
+-- !Failed to back up db_other because the database does not exist.
+-- !Failed because the restore is invalid, expected RESTORE DATABASE name FROM 'directory'.
+-- !Failed because the backup is invalid, expected BACKUP DATABASE name TO 'directory'.
+-- All done.
@@ -0,0 +1,113 @@
+-- python3 dini_db.py -r -f BLOOM_test.sql
+
+-- A Bloom filter on the fields of a table holds the values of each block of the table's rows, so a comparison
+-- of a field with a literal skips the blocks whose filter does not hold the literal
+-- The filters are maintained as records are inserted and updated, and rebuilt when the table is rewritten
+-- A join looks up the keys of one table in a filter built from the keys of the other table
+-- EXPLAIN ANALYZE reports the blocks that were read, its times vary from run to run
+
+CREATE DATABASE db_bloom;
+USE db_bloom;
+
+CREATE TABLE Part (id int, name varchar(10));
+CREATE TABLE Supply (pid int, qty int);
+
+INSERT INTO Part VALUES (1, 'bolt');
+INSERT INTO Part VALUES (2, 'nut');
+INSERT INTO Part VALUES (3, 'gear');
+INSERT INTO Part VALUES (4, 'washer');
+INSERT INTO Supply VALUES (2, 10);
+INSERT INTO Supply VALUES (4, 5);
+INSERT INTO Supply VALUES (9, 1);
+
+CREATE BLOOM FILTER ON Part (name, id);
+SHOW BLOOM FILTERS;
+
+-- Values the filters hold and a value they do not
+SELECT * FROM Part WHERE name = 'gear';
+SELECT * FROM Part WHERE id = 4;
+SELECT * FROM Part WHERE name = 'pin';
+EXPLAIN ANALYZE SELECT * FROM Part WHERE name = 'pin';
+
+-- Inserted and updated values are added to the filters
+INSERT INTO Part VALUES (5, 'pin');
+UPDATE Part SET name = 'spring' WHERE id = 1;
+SELECT * FROM Part WHERE name = 'pin';
+SELECT * FROM Part WHERE name = 'spring';
+
+-- VACUUM rebuilds the filters from the remaining rows
+DELETE FROM Part WHERE id > 3;
+VACUUM Part;
+SHOW BLOOM FILTERS;
+SELECT * FROM Part WHERE name = 'pin';
+SELECT * FROM Part WHERE name = 'nut';
+
+-- A join drops the rows whose key is not in the other table's filter
+SELECT Part.name, Supply.qty FROM Supply INNER JOIN Part ON Supply.pid = Part.id;
+
+-- Dropping a field drops its filter, and the filters of a table are dropped together
+ALTER TABLE Part DROP COLUMN name;
+SHOW BLOOM FILTERS;
+DROP BLOOM FILTER ON Part;
+SHOW BLOOM FILTERS;
+
+-- A table without a filter and a field that does not exist
+DROP BLOOM FILTER ON Part;
+CREATE BLOOM FILTER ON Part (weight);
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_bloom created.
+-- Using database db_bloom.
+-- Table Part created.
+-- Table Supply created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Bloom filter created on Part(name, id), 10264 bytes.
+-- table|fields|blocks|rows|bytes|current
+-- part|name,id|1|4|10264|True
+-- id int|name varchar
+-- 3|gear
+-- id int|name varchar
+-- 4|washer
+-- id int|name varchar
+-- PROFILE: EXPLAIN ANALYZE SELECT * FROM Part WHERE name = 'pin'
+-- Total: 0.551 ms, 0 rows scanned, 0 rows decoded, 0 rows returned, 20 bytes read, 0 bytes peak memory
+--   split_arguments                       0.023 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--   execute                               0.463 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     scan part                           0.189 ms  rows in: 0        rows out: 0         bytes read: 20         bytes written: 0  pushed down: name == 'pin'  bloom blocks: 0 of 1
+--     filter                              0.001 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     format                              0.001 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     output                              0.006 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+-- 1 new record inserted.
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar
+-- 5|pin
+-- id int|name varchar
+-- 1|spring
+-- Error: no transaction active!
+-- 2 records deleted.
+-- Table Part vacuumed, 3 slots reclaimed.
+-- table|fields|blocks|rows|bytes|current
+-- part|name,id|1|3|10264|True
+-- id int|name varchar
+-- id int|name varchar
+-- 2|nut
+-- name varchar|qty int
+-- nut|10
+-- Table Part modified.
+-- table|fields|blocks|rows|bytes|current
+-- part|id|1|3|5139|True
+-- Bloom filter on Part dropped.
+-- table|fields|blocks|rows|bytes|current
+-- !Failed because Part has no Bloom filter.
+-- !Failed because Part has no field weight.
+-- All done.
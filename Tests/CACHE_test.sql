@@ -0,0 +1,91 @@
+-- python3 dini_db.py -r --result-cache-mb 0.0005 -f CACHE_test.sql
+
+-- The output of a SELECT statement is cached, keyed by the statement and the versions of the tables it reads
+-- Writing to a table changes its version, so the statements reading it are executed again
+-- The cache holds up to 524 bytes of output here, and evicts the least recently used output to stay within it
+
+CREATE DATABASE db_cache;
+USE db_cache;
+
+CREATE TABLE Part (id int, name varchar(10));
+INSERT INTO Part VALUES (1, 'bolt');
+
+-- The first statement misses, the statements repeating it hit, whatever the case of their keywords
+SELECT * FROM Part;
+SELECT * FROM Part;
+select * from Part;
+SHOW CACHE;
+
+-- An insert, an ALTER and dropping the table each change the output
+INSERT INTO Part VALUES (2, 'nut');
+SELECT * FROM Part;
+ALTER TABLE Part ADD qty int;
+SELECT * FROM Part;
+DROP TABLE Part;
+CREATE TABLE Part (id int, name varchar(10));
+SELECT * FROM Part;
+SHOW CACHE;
+
+-- Outputs that do not fit evict the least recently used output
+INSERT INTO Part VALUES (1, 'bolt');
+INSERT INTO Part VALUES (2, 'nut');
+SELECT * FROM Part WHERE id = 1;
+SELECT * FROM Part WHERE id = 2;
+SELECT name FROM Part;
+SELECT id FROM Part;
+SELECT * FROM Part;
+SHOW CACHE;
+SELECT * FROM Part WHERE id = 1;
+SHOW CACHE;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_cache created.
+-- Using database db_cache.
+-- Table Part created.
+-- 1 new record inserted.
+-- id int|name varchar
+-- 1|bolt
+-- id int|name varchar
+-- 1|bolt
+-- id int|name varchar
+-- 1|bolt
+-- entries|bytes used|capacity|hits|misses|evictions
+-- 1|136|524|2|1|0
+-- 1 new record inserted.
+-- id int|name varchar
+-- 1|bolt
+-- 2|nut
+-- Table Part modified.
+-- id int|name varchar|qty int
+-- 1|bolt|0
+-- 2|nut|0
+-- Table Part deleted.
+-- Table Part created.
+-- id int|name varchar
+-- entries|bytes used|capacity|hits|misses|evictions
+-- 1|129|524|2|4|0
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- id int|name varchar
+-- 1|bolt
+-- id int|name varchar
+-- 2|nut
+-- name varchar
+-- bolt
+-- nut
+-- id int
+-- 1
+-- 2
+-- id int|name varchar
+-- 1|bolt
+-- 2|nut
+-- entries|bytes used|capacity|hits|misses|evictions
+-- 3|397|524|2|9|3
+-- id int|name varchar
+-- 1|bolt
+-- entries|bytes used|capacity|hits|misses|evictions
+-- 3|412|524|2|10|4
+-- All done.
@@ -0,0 +1,120 @@
+-- python3 dini_db.py -r -f COMPRESS_test.sql
+
+-- Compressing a table encodes its records into a segment one column at a time, which the table is then read from
+-- A table is only compressed when the segment is smaller than the text of its rows, so a small table is not
+-- The records of a compressed table are selected, updated and deleted as they were before it was compressed
+
+CREATE DATABASE db_compress;
+USE db_compress;
+
+CREATE TABLE Part (id int, kind varchar(10), qty int);
+CREATE TABLE Tiny (id int, kind varchar(10));
+
+INSERT INTO Part VALUES (1, 'nut', 1);
+INSERT INTO Part VALUES (2, 'bolt', 2);
+INSERT INTO Part VALUES (3, 'nut', 0);
+INSERT INTO Part VALUES (4, 'bolt', 1);
+INSERT INTO Part VALUES (5, 'nut', 2);
+INSERT INTO Part VALUES (6, 'bolt', 0);
+INSERT INTO Part VALUES (7, 'nut', 1);
+INSERT INTO Part VALUES (8, 'bolt', 2);
+INSERT INTO Part VALUES (9, 'nut', 0);
+INSERT INTO Part VALUES (10, 'bolt', 1);
+INSERT INTO Part VALUES (11, 'nut', 2);
+INSERT INTO Part VALUES (12, 'bolt', 0);
+INSERT INTO Part VALUES (13, 'nut', 1);
+INSERT INTO Part VALUES (14, 'bolt', 2);
+INSERT INTO Part VALUES (15, 'nut', 0);
+INSERT INTO Part VALUES (16, 'bolt', 1);
+INSERT INTO Tiny VALUES (1, 'nut');
+
+-- The small table keeps its rows as text
+COMPRESS TABLE Tiny;
+SELECT * FROM Tiny;
+
+-- The records read from the segment are the records the table held
+COMPRESS TABLE Part;
+SELECT * FROM Part WHERE id < 5;
+SELECT kind, COUNT(*), SUM(qty) FROM Part GROUP BY kind ORDER BY kind;
+
+-- Updated records of the segment are relocated to the table file, and deleted records are skipped
+UPDATE Part SET kind = 'washer' WHERE id = 2;
+DELETE FROM Part WHERE qty = 0;
+INSERT INTO Part VALUES (17, 'pin', 5);
+SELECT * FROM Part;
+
+-- VACUUM encodes the records again along with the records that were appended to the table file
+VACUUM Part;
+SELECT * FROM Part WHERE kind != 'nut';
+SELECT COUNT(*) FROM Part;
+
+COMPRESS TABLE Missing;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_compress created.
+-- Using database db_compress.
+-- Table Part created.
+-- Table Tiny created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Table Tiny not compressed, 6 bytes would be 13 bytes.
+-- id int|kind varchar
+-- 1|nut
+-- Table Part compressed, 143 bytes to 91 bytes.
+-- id int|kind varchar(10)|qty int
+-- 1|nut|1
+-- 2|bolt|2
+-- 3|nut|0
+-- 4|bolt|1
+-- kind varchar(10)|COUNT(*)|SUM(qty)
+-- bolt|8|9
+-- nut|8|7
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 5 records deleted.
+-- 1 new record inserted.
+-- id int|kind varchar(10)|qty int
+-- 1|nut|1
+-- 4|bolt|1
+-- 5|nut|2
+-- 7|nut|1
+-- 8|bolt|2
+-- 10|bolt|1
+-- 11|nut|2
+-- 13|nut|1
+-- 14|bolt|2
+-- 16|bolt|1
+-- 2|washer|2
+-- 17|pin|5
+-- Table Part vacuumed, 6 slots reclaimed.
+-- id int|kind varchar(10)|qty int
+-- 4|bolt|1
+-- 8|bolt|2
+-- 10|bolt|1
+-- 14|bolt|2
+-- 16|bolt|1
+-- 2|washer|2
+-- 17|pin|5
+-- COUNT(*)
+-- 12
+-- !Failed to compress Missing because it does not exist.
+-- All done.
@@ -0,0 +1,101 @@
+-- python3 dini_db.py -r -f GROUPBY_test.sql
+-- python3 dini_db.py -r --aggregate-memory-mb 0.0001 -f GROUPBY_test.sql
+
+-- Grouping, distinct selections and aggregates of each group
+-- Groups are printed in the order their first record was read in memory, but in the order of their
+-- partitions once they spill to disk, so every grouping is sorted to give the same output either way
+
+CREATE DATABASE db_groupby;
+USE db_groupby;
+
+CREATE TABLE Part (Partkey int, Grp varchar(10), Size int, Price float);
+
+INSERT INTO Part VALUES (1, 'bolt', 7, 3.5);
+INSERT INTO Part VALUES (2, 'nut', 21, 1.5);
+INSERT INTO Part VALUES (3, 'bolt', 14, 2.0);
+INSERT INTO Part VALUES (4, 'gear', 7, 9.0);
+INSERT INTO Part VALUES (5, 'nut', 21, 0.5);
+INSERT INTO Part VALUES (6, 'bolt', 7, 4.5);
+
+-- Every aggregate of each group
+SELECT Grp, COUNT(*), SUM(Size), AVG(Price), MIN(Partkey), MAX(Partkey) FROM Part GROUP BY Grp ORDER BY Grp;
+
+-- A group of more than one field
+SELECT Grp, Size, COUNT(*) FROM Part GROUP BY Grp, Size ORDER BY Grp, Size;
+
+-- A parenthesized condition is applied before the records are grouped
+SELECT Grp, COUNT(*) FROM Part WHERE (Partkey > 2 or Partkey < 2) GROUP BY Grp ORDER BY Grp;
+SELECT Grp, SUM(Size) FROM Part WHERE (Size > 10) and (Price < 2) GROUP BY Grp;
+
+-- Groups sorted by an aggregate, by an alias and by a grouped field
+SELECT Grp, COUNT(*) FROM Part GROUP BY Grp ORDER BY COUNT(*) DESC;
+SELECT Grp, SUM(Price) AS total FROM Part GROUP BY Grp ORDER BY total;
+SELECT Grp, MAX(Price) FROM Part GROUP BY Grp ORDER BY Grp DESC LIMIT 2;
+
+-- Distinct selections
+SELECT DISTINCT Grp FROM Part ORDER BY Grp;
+SELECT DISTINCT Grp, Size FROM Part ORDER BY Size, Grp;
+SELECT COUNT(DISTINCT Size) FROM Part;
+SELECT Grp, COUNT(DISTINCT Size) FROM Part GROUP BY Grp ORDER BY Grp;
+
+-- Invalid groupings
+SELECT Size, COUNT(*) FROM Part GROUP BY Grp;
+SELECT Grp, COUNT(*) FROM Part GROUP BY Weight;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_groupby created.
+-- Using database db_groupby.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Grp varchar(10)|COUNT(*)|SUM(Size)|AVG(Price)|MIN(Partkey)|MAX(Partkey)
+-- bolt|3|28|3.3333333333333335|1|6
+-- gear|1|7|9.0|4|4
+-- nut|2|42|1.0|2|5
+-- Grp varchar(10)|Size int|COUNT(*)
+-- bolt|7|2
+-- bolt|14|1
+-- gear|7|1
+-- nut|21|2
+-- Grp varchar(10)|COUNT(*)
+-- bolt|3
+-- gear|1
+-- nut|1
+-- Grp varchar(10)|SUM(Size)
+-- nut|42
+-- Grp varchar(10)|COUNT(*)
+-- bolt|3
+-- nut|2
+-- gear|1
+-- Grp varchar(10)|total
+-- nut|2.0
+-- gear|9.0
+-- bolt|10.0
+-- Grp varchar(10)|MAX(Price)
+-- nut|1.5
+-- gear|9.0
+-- Grp varchar(10)
+-- bolt
+-- gear
+-- nut
+-- Grp varchar(10)|Size int
+-- bolt|7
+-- gear|7
+-- bolt|14
+-- nut|21
+-- COUNT(DISTINCT Size)
+-- 3
+-- Grp varchar(10)|COUNT(DISTINCT Size)
+-- bolt|2
+-- gear|1
+-- nut|1
+-- !Failed because each field selected with an aggregate must be listed in GROUP BY.
+-- !Failed because the field Weight does not exist.
+-- All done.
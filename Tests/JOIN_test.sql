@@ -0,0 +1,70 @@
+-- python3 dini_db.py -r -f JOIN_test.sql
+
+-- Joins of more than two tables
+-- Tables may be listed with commas or joined with JOIN ... ON, with or without an identifier
+
+CREATE DATABASE db_join;
+USE db_join;
+
+CREATE TABLE Employee (id int, name varchar(10), rid int);
+CREATE TABLE Sales (eid int, amount int);
+CREATE TABLE Region (id int, label varchar(10));
+
+INSERT INTO Employee VALUES (1, 'Joe', 10);
+INSERT INTO Employee VALUES (2, 'Jack', 20);
+INSERT INTO Employee VALUES (3, 'Gill', 30);
+INSERT INTO Sales VALUES (1, 100);
+INSERT INTO Sales VALUES (1, 150);
+INSERT INTO Sales VALUES (2, 200);
+INSERT INTO Region VALUES (10, 'north');
+INSERT INTO Region VALUES (20, 'south');
+
+-- Three tables listed with commas, each with an identifier
+SELECT E.name, S.amount, R.label FROM Employee E, Sales S, Region R WHERE E.id = S.eid and E.rid = R.id ORDER BY amount;
+
+-- Three tables listed with commas, none with an identifier
+SELECT * FROM Employee, Sales, Region WHERE Employee.id = Sales.eid and Employee.rid = Region.id and Sales.amount > 120;
+
+-- Tables with and without identifiers
+SELECT Employee.name, R.label FROM Employee, Sales S, Region R WHERE Employee.id = S.eid and Employee.rid = R.id and S.amount < 120;
+
+-- Two tables listed with commas, without identifiers
+SELECT Employee.name, Sales.amount FROM Employee, Sales WHERE Employee.id = Sales.eid and Sales.amount > 120;
+
+-- A chain of joins
+SELECT E.name, S.amount, R.label FROM Employee E LEFT OUTER JOIN Sales S ON E.id = S.eid INNER JOIN Region R ON E.rid = R.id ORDER BY name;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_join created.
+-- Using database db_join.
+-- Table Employee created.
+-- Table Sales created.
+-- Table Region created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- name varchar(10)|amount int|label varchar
+-- Joe|100|north
+-- Joe|150|north
+-- Jack|200|south
+-- id int|name varchar(10)|rid int|eid int|amount int|id int|label varchar
+-- 1|Joe|10|1|150|10|north
+-- 2|Jack|20|2|200|20|south
+-- name varchar(10)|label varchar
+-- Joe|north
+-- name varchar(10)|amount int
+-- Joe|150
+-- Jack|200
+-- name varchar(10)|amount int|label varchar
+-- Jack|200|south
+-- Joe|100|north
+-- Joe|150|north
+-- All done.
@@ -0,0 +1,89 @@
+-- python3 dini_db.py -r -f LIMIT_test.sql
+
+-- Limiting the records selected with LIMIT and OFFSET
+-- The OFFSET may come before or after the LIMIT, and both must be whole numbers
+
+CREATE DATABASE db_limit;
+USE db_limit;
+
+CREATE TABLE Part (Partkey int, Name varchar(10), Price float);
+
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (2, 'nut', 1.5);
+INSERT INTO Part VALUES (3, 'gear', 9.0);
+INSERT INTO Part VALUES (4, 'washer', 0.5);
+INSERT INTO Part VALUES (5, 'spring', 4.0);
+
+-- The first records of the table
+SELECT * FROM Part LIMIT 2;
+SELECT Name FROM Part LIMIT 0;
+SELECT Name FROM Part LIMIT 10;
+
+-- Records skipped with OFFSET, with or without a LIMIT
+SELECT * FROM Part LIMIT 2 OFFSET 1;
+SELECT * FROM Part OFFSET 1 LIMIT 2;
+SELECT Name FROM Part OFFSET 3;
+SELECT Name FROM Part OFFSET 5;
+
+-- The top records of a sort, along with a condition
+SELECT Name, Price FROM Part ORDER BY Price DESC LIMIT 3;
+SELECT Name, Price FROM Part ORDER BY Price LIMIT 2 OFFSET 1;
+SELECT Partkey FROM Part WHERE Price > 1 ORDER BY Partkey DESC LIMIT 2;
+
+-- Values that are not whole numbers
+SELECT * FROM Part LIMIT -1;
+SELECT * FROM Part OFFSET -2;
+SELECT * FROM Part LIMIT 1.5;
+SELECT * FROM Part LIMIT two;
+SELECT * FROM Part LIMIT 1 2;
+SELECT * FROM Part LIMIT;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_limit created.
+-- Using database db_limit.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Partkey int|Name varchar(10)|Price float
+-- 1|bolt|3.5
+-- 2|nut|1.5
+-- Name varchar(10)
+-- Name varchar(10)
+-- bolt
+-- nut
+-- gear
+-- washer
+-- spring
+-- Partkey int|Name varchar(10)|Price float
+-- 2|nut|1.5
+-- 3|gear|9.0
+-- Partkey int|Name varchar(10)|Price float
+-- 2|nut|1.5
+-- 3|gear|9.0
+-- Name varchar(10)
+-- washer
+-- spring
+-- Name varchar(10)
+-- Name varchar(10)|Price float
+-- gear|9.0
+-- spring|4.0
+-- bolt|3.5
+-- Name varchar(10)|Price float
+-- nut|1.5
+-- bolt|3.5
+-- Partkey int
+-- 5
+-- 3
+-- !Failed because LIMIT and OFFSET must be whole numbers.
+-- !Failed because LIMIT and OFFSET must be whole numbers.
+-- !Failed because LIMIT and OFFSET must be whole numbers.
+-- !Failed because LIMIT and OFFSET must be whole numbers.
+-- !Failed because LIMIT and OFFSET must be whole numbers.
+-- !Failed because LIMIT and OFFSET must be whole numbers.
+-- All done.
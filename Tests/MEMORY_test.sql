@@ -0,0 +1,106 @@
+-- python3 dini_db.py -r --memory-limit 0.001 -f MEMORY_test.sql
+
+-- The operators of every session reserve the memory they hold from a limit of 1048 bytes here, and each
+-- reservation may grow up to the session's work_mem
+-- An operator whose reservation can not grow spills its records to disk, and its output is the same as in memory
+-- SHOW MEMORY reports the settings, the memory reserved and the most memory reserved at once
+
+CREATE DATABASE db_memory;
+USE db_memory;
+
+CREATE TABLE Part (id int, grp varchar(10), price float);
+CREATE TABLE Supply (pid int, qty int);
+
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (2, 'nut', 1.5);
+INSERT INTO Part VALUES (3, 'gear', 9.0);
+INSERT INTO Part VALUES (4, 'bolt', 0.5);
+INSERT INTO Part VALUES (5, 'nut', 2.0);
+INSERT INTO Part VALUES (6, 'gear', 4.5);
+INSERT INTO Supply VALUES (2, 10);
+INSERT INTO Supply VALUES (4, 5);
+INSERT INTO Supply VALUES (6, 1);
+INSERT INTO Supply VALUES (9, 7);
+
+SHOW MEMORY;
+SET work_mem = 1KB;
+SHOW MEMORY;
+
+-- An aggregation, a sort and joins that spill
+SELECT grp, COUNT(*), SUM(price) FROM Part GROUP BY grp ORDER BY grp;
+SELECT id, price FROM Part WHERE id < 5 ORDER BY price DESC;
+SELECT COUNT(*) FROM Part INNER JOIN Supply ON Part.id = Supply.pid;
+SELECT Part.grp, Supply.qty FROM Part INNER JOIN Supply ON Part.id = Supply.pid ORDER BY Supply.qty;
+
+-- The workspace of a transaction holds its reservation until the transaction ends
+begin transaction;
+UPDATE Part SET price = 1.0 WHERE grp = 'nut';
+SHOW MEMORY;
+commit;
+SELECT * FROM Part WHERE grp = 'nut';
+SHOW MEMORY;
+
+-- Resetting work_mem, an invalid amount of memory and a setting that does not exist
+SET work_mem = DEFAULT;
+SET work_mem = 512kB;
+SET work_mem = lots;
+SET nothing = 1;
+SHOW MEMORY;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_memory created.
+-- Using database db_memory.
+-- Table Part created.
+-- Table Supply created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- memory limit|work_mem|reserved|peak reserved
+-- 1048|67108864|0|0
+-- work_mem set to 1024 bytes.
+-- memory limit|work_mem|reserved|peak reserved
+-- 1048|1024|0|0
+-- grp varchar(10)|COUNT(*)|SUM(price)
+-- bolt|2|4.0
+-- gear|2|13.5
+-- nut|2|3.5
+-- id int|price float
+-- 3|9.0
+-- 1|3.5
+-- 2|1.5
+-- 4|0.5
+-- COUNT(*)
+-- 3
+-- grp varchar(10)|qty int
+-- gear|1
+-- bolt|5
+-- nut|10
+-- Transaction starts.
+-- 2 records modified.
+-- memory limit|work_mem|reserved|peak reserved
+-- 1048|1024|792|1024
+-- operator|reserved
+-- workspace Part|792
+-- Transaction committed.
+-- id int|grp varchar(10)|price float
+-- 2|nut|1.0
+-- 5|nut|1.0
+-- memory limit|work_mem|reserved|peak reserved
+-- 1048|1024|0|1024
+-- work_mem reset to the default.
+-- work_mem set to 524288 bytes.
+-- !Failed because "lots" is not a valid amount of memory, expected a size such as 16MB.
+-- !Failed because nothing is not a setting.
+-- memory limit|work_mem|reserved|peak reserved
+-- 1048|524288|0|1024
+-- All done.
@@ -0,0 +1,137 @@
+-- python3 dini_db.py -r -f ORDER_test.sql
+-- python3 dini_db.py -r --sort-memory-mb 0.0005 -f ORDER_test.sql
+-- python3 dini_db.py -r --memory-limit 0.0005 -f ORDER_test.sql
+
+-- Sorting the records selected with ORDER BY
+-- The sort is stable, so records that tie on every field they are sorted by keep the order they were read in
+-- With a small sort memory or memory limit the sort spills sorted runs to disk and merges them, which
+-- gives the same output
+
+CREATE DATABASE db_order;
+USE db_order;
+
+CREATE TABLE Part (Partkey int, Name varchar(10), Size int, Price float);
+
+INSERT INTO Part VALUES (1, 'bolt', 7, 3.5);
+INSERT INTO Part VALUES (2, 'nut', 21, 1.5);
+INSERT INTO Part VALUES (3, 'gear', 14, 9.0);
+INSERT INTO Part VALUES (4, 'washer', 7, 0.5);
+INSERT INTO Part VALUES (5, 'spring', 21, 4.0);
+INSERT INTO Part VALUES (6, 'axle', 14, 12.25);
+INSERT INTO Part VALUES (7, 'bolt', 3, 3.5);
+INSERT INTO Part VALUES (8, 'cog', 7, 2.75);
+INSERT INTO Part VALUES (9, 'nut', 3, 1.5);
+INSERT INTO Part VALUES (10, 'pin', 21, 0.25);
+
+-- A single field, ascending by default and descending
+SELECT * FROM Part ORDER BY Price;
+SELECT * FROM Part ORDER BY Price DESC;
+SELECT Name FROM Part ORDER BY Name ASC;
+
+-- Several fields, each with its own direction
+SELECT Size, Name, Partkey FROM Part ORDER BY Size DESC, Name, Partkey DESC;
+
+-- Records that tie keep the order they were read in
+SELECT Partkey, Size FROM Part ORDER BY Size;
+SELECT Partkey, Name FROM Part ORDER BY Name DESC;
+
+-- A field that is not selected and a condition
+SELECT Name FROM Part WHERE Size > 5 ORDER BY Partkey DESC;
+
+-- A field that does not exist
+SELECT * FROM Part ORDER BY Weight;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_order created.
+-- Using database db_order.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Partkey int|Name varchar(10)|Size int|Price float
+-- 10|pin|21|0.25
+-- 4|washer|7|0.5
+-- 2|nut|21|1.5
+-- 9|nut|3|1.5
+-- 8|cog|7|2.75
+-- 1|bolt|7|3.5
+-- 7|bolt|3|3.5
+-- 5|spring|21|4.0
+-- 3|gear|14|9.0
+-- 6|axle|14|12.25
+-- Partkey int|Name varchar(10)|Size int|Price float
+-- 6|axle|14|12.25
+-- 3|gear|14|9.0
+-- 5|spring|21|4.0
+-- 1|bolt|7|3.5
+-- 7|bolt|3|3.5
+-- 8|cog|7|2.75
+-- 2|nut|21|1.5
+-- 9|nut|3|1.5
+-- 4|washer|7|0.5
+-- 10|pin|21|0.25
+-- Name varchar(10)
+-- axle
+-- bolt
+-- bolt
+-- cog
+-- gear
+-- nut
+-- nut
+-- pin
+-- spring
+-- washer
+-- Size int|Name varchar(10)|Partkey int
+-- 21|nut|2
+-- 21|pin|10
+-- 21|spring|5
+-- 14|axle|6
+-- 14|gear|3
+-- 7|bolt|1
+-- 7|cog|8
+-- 7|washer|4
+-- 3|bolt|7
+-- 3|nut|9
+-- Partkey int|Size int
+-- 7|3
+-- 9|3
+-- 1|7
+-- 4|7
+-- 8|7
+-- 3|14
+-- 6|14
+-- 2|21
+-- 5|21
+-- 10|21
+-- Partkey int|Name varchar(10)
+-- 4|washer
+-- 5|spring
+-- 10|pin
+-- 2|nut
+-- 9|nut
+-- 3|gear
+-- 8|cog
+-- 1|bolt
+-- 7|bolt
+-- 6|axle
+-- Name varchar(10)
+-- pin
+-- cog
+-- axle
+-- spring
+-- washer
+-- gear
+-- nut
+-- bolt
+-- !Failed because the field Weight does not exist.
+-- All done.
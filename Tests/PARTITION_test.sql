@@ -0,0 +1,119 @@
+-- python3 dini_db.py -r -f PARTITION_test.sql
+
+-- Tables partitioned by range or by hash of a key field
+-- Each record is stored in the partition its key belongs in, and a condition on the key
+-- only reads the partitions it does not rule out
+
+CREATE DATABASE db_partition;
+USE db_partition;
+
+CREATE TABLE Orders (id int, yr int, item varchar(10)) PARTITION BY RANGE (yr) (PARTITION old VALUES LESS THAN (2000), PARTITION mid VALUES LESS THAN (2010), PARTITION new VALUES LESS THAN MAXVALUE);
+
+INSERT INTO Orders VALUES (1, 1990, 'lamp');
+INSERT INTO Orders VALUES (2, 2005, 'desk');
+INSERT INTO Orders VALUES (3, 2015, 'sofa');
+INSERT INTO Orders VALUES (4, 2000, 'rug');
+
+-- Conditions on the key are pruned to the partitions that may hold it, which are read in order
+SELECT * FROM Orders WHERE yr = 2005;
+SELECT * FROM Orders WHERE yr < 1000;
+SELECT * FROM Orders WHERE yr < 2000;
+SELECT * FROM Orders WHERE yr >= 2000;
+SELECT COUNT(*) FROM Orders;
+
+-- Updates and deletions stay within a partition
+UPDATE Orders SET item = 'chair' WHERE yr = 2015;
+UPDATE Orders SET yr = 1995 WHERE id = 2;
+DELETE FROM Orders WHERE yr > 2010;
+SELECT * FROM Orders;
+
+-- Dropping a partition removes its records, the keys it held then belong to the partition after it
+ALTER TABLE Orders DROP PARTITION old;
+SELECT * FROM Orders;
+INSERT INTO Orders VALUES (5, 1980, 'vase');
+INSERT INTO Orders VALUES (6, 2020, 'bed');
+SELECT * FROM Orders;
+
+CREATE TABLE Users (id int, name varchar(10)) PARTITION BY HASH (id) PARTITIONS 3;
+
+INSERT INTO Users VALUES (1, 'ann');
+INSERT INTO Users VALUES (2, 'bob');
+INSERT INTO Users VALUES (3, 'cid');
+INSERT INTO Users VALUES (4, 'dee');
+INSERT INTO Users VALUES (4, 'eve');
+
+SELECT * FROM Users WHERE id = 2;
+SELECT * FROM Users WHERE id = 4;
+SELECT COUNT(*) FROM Users WHERE id >= 2;
+SELECT * FROM Users;
+SELECT * FROM Orders O, Users U WHERE O.id = U.id;
+DROP TABLE Users;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_partition created.
+-- Using database db_partition.
+-- Table Orders created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- id int|yr int|item varchar
+-- 2|2005|desk
+-- id int|yr int|item varchar
+-- id int|yr int|item varchar
+-- 1|1990|lamp
+-- id int|yr int|item varchar
+-- 2|2005|desk
+-- 4|2000|rug
+-- 3|2015|sofa
+-- COUNT(*)
+-- 4
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- !Failed to update Orders because a record would be moved to another partition.
+-- Error: no transaction active!
+-- 1 record deleted.
+-- id int|yr int|item varchar
+-- 1|1990|lamp
+-- 2|2005|desk
+-- 4|2000|rug
+-- Partition old of Orders dropped.
+-- id int|yr int|item varchar
+-- 2|2005|desk
+-- 4|2000|rug
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- id int|yr int|item varchar
+-- 2|2005|desk
+-- 4|2000|rug
+-- 5|1980|vase
+-- 6|2020|bed
+-- Table Users created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- id int|name varchar
+-- 2|bob
+-- id int|name varchar
+-- 4|dee
+-- 4|eve
+-- COUNT(*)
+-- 4
+-- id int|name varchar
+-- 2|bob
+-- 3|cid
+-- 4|dee
+-- 4|eve
+-- 1|ann
+-- id int|yr int|item varchar|id int|name varchar
+-- 2|2005|desk|2|bob
+-- 4|2000|rug|4|dee
+-- 4|2000|rug|4|eve
+-- Table Users deleted.
+-- All done.
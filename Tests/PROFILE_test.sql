@@ -0,0 +1,82 @@
+-- python3 dini_db.py -r -f PROFILE_test.sql
+
+-- EXPLAIN ANALYZE executes a statement without printing its output, then prints the time, rows and bytes of
+-- each of its phases and operators
+-- The times vary from run to run, the rows and bytes of each operator do not
+
+CREATE DATABASE db_profile;
+USE db_profile;
+
+CREATE TABLE Part (id int, grp varchar(10), price float);
+CREATE TABLE Supply (pid int, qty int);
+
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (2, 'nut', 1.5);
+INSERT INTO Part VALUES (3, 'bolt', 9.0);
+INSERT INTO Supply VALUES (1, 10);
+INSERT INTO Supply VALUES (3, 5);
+
+-- A condition pushed down to the scan, a grouping and a join
+EXPLAIN ANALYZE SELECT * FROM Part WHERE price > 2;
+EXPLAIN ANALYZE SELECT grp, COUNT(*) FROM Part GROUP BY grp;
+EXPLAIN ANALYZE SELECT * FROM Part INNER JOIN Supply ON Part.id = Supply.pid;
+
+-- An update overwrites the updated row in place
+EXPLAIN ANALYZE UPDATE Part SET price = 1 WHERE id = 1;
+SELECT * FROM Part WHERE id = 1;
+
+-- EXPLAIN without ANALYZE and without a statement
+EXPLAIN SELECT * FROM Part;
+EXPLAIN ANALYZE;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_profile created.
+-- Using database db_profile.
+-- Table Part created.
+-- Table Supply created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- PROFILE: EXPLAIN ANALYZE SELECT * FROM Part WHERE price > 2
+-- Total: 0.983 ms, 3 rows scanned, 2 rows decoded, 2 rows returned, 67 bytes read, 0 bytes peak memory
+--   split_arguments                       0.030 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--   execute                               0.868 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     scan part                           0.385 ms  rows in: 3        rows out: 2         bytes read: 67         bytes written: 0  pushed down: price > 2
+--     filter                              0.006 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+--     format                              0.009 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+--     output                              0.012 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+-- PROFILE: EXPLAIN ANALYZE SELECT grp, COUNT(*) FROM Part GROUP BY grp
+-- Total: 0.668 ms, 3 rows scanned, 3 rows decoded, 2 rows returned, 32 bytes read, 458 bytes peak memory
+--   split_arguments                       0.037 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--   execute                               0.545 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     output                              0.300 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+--       hash aggregate                    0.223 ms  rows in: 3        rows out: 2         bytes read: 0          bytes written: 0  groups: 2  peak memory: 458  spilled rows: 0  partitions: 0
+--         scan part                       0.169 ms  rows in: 3        rows out: 3         bytes read: 32         bytes written: 0
+-- PROFILE: EXPLAIN ANALYZE SELECT * FROM Part INNER JOIN Supply ON Part.id = Supply.pid
+-- Total: 1.017 ms, 5 rows scanned, 4 rows decoded, 2 rows returned, 92 bytes read, 0 bytes peak memory
+--   split_arguments                       0.037 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--   execute                               0.897 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     scan supply                         0.030 ms  rows in: 2        rows out: 2         bytes read: 25         bytes written: 0
+--     bloom filter Supply                 0.041 ms  rows in: 2        rows out: 0         bytes read: 0          bytes written: 0
+--     scan part                           0.057 ms  rows in: 3        rows out: 2         bytes read: 67         bytes written: 0  runtime filter: Part.id == Supply.pid
+--     inner join                          0.069 ms  rows in: 4        rows out: 2         bytes read: 0          bytes written: 0
+--     filter                              0.003 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+--     format                              0.010 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+--     output                              0.013 ms  rows in: 2        rows out: 2         bytes read: 0          bytes written: 0
+-- PROFILE: EXPLAIN ANALYZE UPDATE Part SET price = 1 WHERE id = 1
+-- Total: 1.068 ms, 3 rows scanned, 1 rows decoded, 0 rows returned, 32 bytes read, 0 bytes peak memory
+--   split_arguments                       0.032 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--   execute                               0.975 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     update                              0.416 ms  rows in: 1        rows out: 1         bytes read: 0          bytes written: 0
+--       scan part                         0.370 ms  rows in: 3        rows out: 1         bytes read: 32         bytes written: 0  pushed down: id == 1
+--     update in place                     0.169 ms  rows in: 1        rows out: 1         bytes read: 0          bytes written: 10
+-- id int|grp varchar(10)|price float
+-- 1|bolt|1.0
+-- ERROR: Expected EXPLAIN ANALYZE followed by a statement
+-- ERROR: Missing arguments after EXPLAIN
+-- All done.
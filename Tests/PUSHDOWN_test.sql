@@ -0,0 +1,97 @@
+-- python3 dini_db.py -r -f PUSHDOWN_test.sql
+
+-- The comparisons of a condition between a field and a literal are evaluated on the values of each row as they
+-- are read from the table file, so the rows they rule out are never decoded into records
+-- The records selected, updated and deleted are the ones the whole condition is satisfied by
+-- EXPLAIN ANALYZE reports the rows decoded, its times vary from run to run
+
+CREATE DATABASE db_pushdown;
+USE db_pushdown;
+
+CREATE TABLE Part (id int, name varchar(10), price float);
+
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (2, 'nut', 1.5);
+INSERT INTO Part VALUES (3, 'gear', 9.0);
+INSERT INTO Part VALUES (4, 'washer', 0.5);
+
+-- Comparisons joined by and, chained comparisons and comparisons of strings
+SELECT * FROM Part WHERE price > 1 and name != 'gear';
+SELECT * FROM Part WHERE 1 < id <= 3;
+SELECT * FROM Part WHERE name > 'h';
+SELECT * FROM Part WHERE (price > 1) and (id < 3);
+
+-- A number is equal to a number of another type, but not to a string
+SELECT * FROM Part WHERE id = 1.0;
+SELECT * FROM Part WHERE id = '1';
+
+-- A condition joined by or is only evaluated once the records are decoded
+SELECT * FROM Part WHERE id > 3 or name = 'bolt';
+
+-- The rows of an altered table, which hold the default of the added field until they are rewritten
+ALTER TABLE Part ADD qty int DEFAULT 7;
+INSERT INTO Part VALUES (5, 'pin', 0.25, 2);
+SELECT * FROM Part WHERE qty < 5;
+SELECT * FROM Part WHERE qty = 7 and price < 2;
+
+-- Updates and deletes
+UPDATE Part SET price = 1 WHERE name = 'pin';
+DELETE FROM Part WHERE price <= 1 and id > 3;
+SELECT * FROM Part;
+
+-- Only the row satisfying the pushed-down comparisons is decoded
+EXPLAIN ANALYZE SELECT name FROM Part WHERE id >= 2 and price > 2;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_pushdown created.
+-- Using database db_pushdown.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- id int|name varchar(10)|price float
+-- 1|bolt|3.5
+-- 2|nut|1.5
+-- id int|name varchar(10)|price float
+-- 2|nut|1.5
+-- 3|gear|9.0
+-- id int|name varchar(10)|price float
+-- 2|nut|1.5
+-- 4|washer|0.5
+-- id int|name varchar(10)|price float
+-- 1|bolt|3.5
+-- 2|nut|1.5
+-- id int|name varchar(10)|price float
+-- 1|bolt|3.5
+-- id int|name varchar(10)|price float
+-- id int|name varchar(10)|price float
+-- 1|bolt|3.5
+-- 4|washer|0.5
+-- Table Part modified.
+-- 1 new record inserted.
+-- id int|name varchar(10)|price float|qty int
+-- 5|pin|0.25|2
+-- id int|name varchar(10)|price float|qty int
+-- 2|nut|1.5|7
+-- 4|washer|0.5|7
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 2 records deleted.
+-- id int|name varchar(10)|price float|qty int
+-- 1|bolt|3.5|7
+-- 2|nut|1.5|7
+-- 3|gear|9.0|7
+-- PROFILE: EXPLAIN ANALYZE SELECT name FROM Part WHERE id >= 2 and price > 2
+-- Total: 1.099 ms, 3 rows scanned, 1 rows decoded, 1 rows returned, 94 bytes read, 0 bytes peak memory
+--   split_arguments                       0.032 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--   execute                               0.924 ms  rows in: 0        rows out: 0         bytes read: 0          bytes written: 0
+--     scan part                           0.543 ms  rows in: 3        rows out: 1         bytes read: 94         bytes written: 0  pushed down: id >= 2 and price > 2
+--     filter                              0.007 ms  rows in: 1        rows out: 1         bytes read: 0          bytes written: 0
+--     format                              0.004 ms  rows in: 1        rows out: 1         bytes read: 0          bytes written: 0
+--     output                              0.009 ms  rows in: 1        rows out: 1         bytes read: 0          bytes written: 0
+-- All done.
@@ -0,0 +1,35 @@
+-- python3 dini_db.py -r --replica-of <the working directory REPLICA_test.sql was run in> -f REPLICA_READ_test.sql
+
+-- A replica applies the change log of its primary to its own databases folder before it reads statements,
+-- then serves statements that read its tables and refuses the statements that would change them
+
+USE db_replica;
+
+-- The records of the primary, including the changes of its committed transaction
+SELECT * FROM Part;
+SELECT * FROM Supply;
+SELECT Part.name, Supply.qty FROM Part INNER JOIN Supply ON Part.id = Supply.pid;
+
+-- Statements that change the databases
+INSERT INTO Part VALUES (4, 'pin', 0.5);
+DROP TABLE Supply;
+CREATE DATABASE other;
+
+.EXIT
+
+-- Expected output
+--
+-- Using database db_replica.
+-- id int|name varchar(10)|price float|qty int
+-- 1|bolt|3.5|0
+-- 2|nut|2.5|0
+-- pid int|qty int
+-- 1|10
+-- 2|5
+-- name varchar(10)|qty int
+-- bolt|10
+-- nut|5
+-- !Failed because the database is a read-only replica.
+-- !Failed because the database is a read-only replica.
+-- !Failed because the database is a read-only replica.
+-- All done.
@@ -0,0 +1,52 @@
+-- python3 dini_db.py -r -f REPLICA_test.sql
+
+-- The primary publishes every statement that changes its databases to the change log in its databases folder
+-- REPLICA_READ_test.sql is then run by a replica of this program, from a working directory of its own
+
+CREATE DATABASE db_replica;
+USE db_replica;
+
+CREATE TABLE Part (id int, name varchar(10), price float);
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (2, 'nut', 1.5);
+INSERT INTO Part VALUES (3, 'gear', 9.0);
+
+-- The changes of a transaction are published together when it is committed
+begin transaction;
+UPDATE Part SET price = 2.5 WHERE id = 2;
+DELETE FROM Part WHERE id = 3;
+commit;
+
+-- Tables created and altered after the transaction
+CREATE TABLE Supply (pid int, qty int);
+INSERT INTO Supply VALUES (1, 10);
+INSERT INTO Supply VALUES (2, 5);
+ALTER TABLE Part ADD qty int;
+SELECT * FROM Part;
+SELECT * FROM Supply;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_replica created.
+-- Using database db_replica.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Transaction starts.
+-- 1 record modified.
+-- 1 record deleted.
+-- Transaction committed.
+-- Table Supply created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Table Part modified.
+-- id int|name varchar(10)|price float|qty int
+-- 1|bolt|3.5|0
+-- 2|nut|2.5|0
+-- pid int|qty int
+-- 1|10
+-- 2|5
+-- All done.
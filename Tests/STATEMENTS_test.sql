@@ -0,0 +1,56 @@
+-- python3 dini_db.py -r -f STATEMENTS_test.sql
+
+-- SHOW STATEMENTS prints the statistics of each statement shape, from the most to the least total time
+-- Statements that only differ by their literals, the case of their keywords and table names or the sign
+-- of a number share a shape
+-- The times, and so the order of the shapes, vary from run to run, the calls and rows of each shape do not
+
+CREATE DATABASE db_statements;
+USE db_statements;
+
+CREATE TABLE Part (id int, name varchar(10), price float);
+
+INSERT INTO Part VALUES (1, 'bolt', 3.5);
+INSERT INTO Part VALUES (-2, 'nut', 1.5);
+INSERT INTO Part VALUES (3, 'gear', 9.0);
+
+-- Three calls of one shape, each scanning the three records
+select * from part where id = 1;
+SELECT * FROM Part WHERE id = -2;
+SELECT * FROM Part WHERE id = 7;
+
+-- A string literal and the literal of a subquery
+SELECT * FROM Part WHERE name = 'nut';
+SELECT name FROM Part WHERE id IN (SELECT id FROM Part WHERE price > 2);
+
+SHOW STATEMENTS;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_statements created.
+-- Using database db_statements.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- id int|name varchar(10)|price float
+-- 1|bolt|3.5
+-- id int|name varchar(10)|price float
+-- -2|nut|1.5
+-- id int|name varchar(10)|price float
+-- id int|name varchar(10)|price float
+-- -2|nut|1.5
+-- name varchar(10)
+-- bolt
+-- gear
+-- statement|calls|total ms|mean ms|max ms|rows scanned|rows returned|max memory
+-- SELECT * FROM PART WHERE ID = ?|3|1.483|0.494|0.714|9|2|0
+-- SELECT NAME FROM PART WHERE ID IN (SELECT ID FROM PART WHERE PRICE > ?)|1|1.065|1.065|1.065|6|2|0
+-- CREATE TABLE PART (ID INT, NAME VARCHAR(?), PRICE FLOAT)|1|0.613|0.613|0.613|0|0|0
+-- INSERT INTO PART VALUES (?, ?, ?)|3|0.612|0.204|0.332|0|0|0
+-- SELECT * FROM PART WHERE NAME = ?|1|0.605|0.605|0.605|3|1|0
+-- CREATE DATABASE DB_STATEMENTS|1|0.153|0.153|0.153|0|0|0
+-- USE DB_STATEMENTS|1|0.113|0.113|0.113|0|0|0
+-- All done.
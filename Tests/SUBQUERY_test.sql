@@ -0,0 +1,93 @@
+-- python3 dini_db.py -r -f SUBQUERY_test.sql
+
+-- Subqueries after IN, NOT IN, EXISTS and NOT EXISTS, which are executed once before any record is read
+-- A subquery that refers to the outer query by an equality is decorrelated into a semi-join or anti-join,
+-- whether the outer query selects, updates or deletes records
+
+CREATE DATABASE db_subquery;
+USE db_subquery;
+
+CREATE TABLE Product (pid int, name varchar(20), price float);
+CREATE TABLE Supply (sid int, pid int);
+
+INSERT INTO Product VALUES (1, 'Gizmo', 19.99);
+INSERT INTO Product VALUES (2, 'PowerGizmo', 29.99);
+INSERT INTO Product VALUES (3, 'SingleTouch', 149.99);
+INSERT INTO Product VALUES (4, 'MultiTouch', 199.99);
+INSERT INTO Supply VALUES (10, 1);
+INSERT INTO Supply VALUES (11, 3);
+INSERT INTO Supply VALUES (12, 3);
+
+-- Selections
+SELECT * FROM Product WHERE pid IN (SELECT pid FROM Supply);
+SELECT name FROM Product WHERE pid NOT IN (SELECT pid FROM Supply WHERE sid > 10);
+SELECT * FROM Product P WHERE EXISTS (SELECT * FROM Supply S WHERE S.pid = P.pid);
+SELECT * FROM Product P WHERE NOT EXISTS (SELECT * FROM Supply S WHERE S.pid = P.pid) and price > 100;
+
+-- Updates and deletions
+UPDATE Product SET price = 9.99 WHERE pid IN (SELECT pid FROM Supply WHERE sid = 10);
+SELECT * FROM Product;
+UPDATE Product SET price = 0 WHERE NOT EXISTS (SELECT * FROM Supply WHERE Supply.pid = Product.pid);
+SELECT * FROM Product;
+DELETE FROM Product WHERE pid NOT IN (SELECT pid FROM Supply);
+SELECT * FROM Product;
+
+-- A subquery of a table that does not exist, and a subquery that selects more than one field
+DELETE FROM Product WHERE pid IN (SELECT pid FROM Missing);
+UPDATE Product SET price = 1 WHERE pid IN (SELECT * FROM Supply);
+SELECT * FROM Product;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_subquery created.
+-- Using database db_subquery.
+-- Table Product created.
+-- Table Supply created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- pid int|name varchar(20)|price float
+-- 1|Gizmo|19.99
+-- 3|SingleTouch|149.99
+-- name varchar(20)
+-- Gizmo
+-- PowerGizmo
+-- MultiTouch
+-- pid int|name varchar(20)|price float
+-- 1|Gizmo|19.99
+-- 3|SingleTouch|149.99
+-- pid int|name varchar(20)|price float
+-- 4|MultiTouch|199.99
+-- Error: no transaction active!
+-- 1 record modified.
+-- pid int|name varchar(20)|price float
+-- 1|Gizmo|9.99
+-- 2|PowerGizmo|29.99
+-- 3|SingleTouch|149.99
+-- 4|MultiTouch|199.99
+-- Error: no transaction active!
+-- 2 records modified.
+-- pid int|name varchar(20)|price float
+-- 1|Gizmo|9.99
+-- 2|PowerGizmo|0.0
+-- 3|SingleTouch|149.99
+-- 4|MultiTouch|0.0
+-- Error: no transaction active!
+-- 2 records deleted.
+-- pid int|name varchar(20)|price float
+-- 1|Gizmo|9.99
+-- 3|SingleTouch|149.99
+-- Error: no transaction active!
+-- !Failed because Missing does not exist
+-- Error: no transaction active!
+-- !Failed because a subquery after IN has to select a single field.
+-- pid int|name varchar(20)|price float
+-- 1|Gizmo|9.99
+-- 3|SingleTouch|149.99
+-- All done.
@@ -0,0 +1,88 @@
+-- python3 dini_db.py -r -f TIMEOUT_test.sql
+
+-- A SELECT, UPDATE or DELETE statement that runs past the session's statement_timeout is cancelled, and the
+-- time it ran for and the rows it processed are reported, they vary from run to run
+-- A cancelled statement releases its locks and memory, and the transaction it is part of is aborted
+-- Any other statement finishes however long it runs
+
+CREATE DATABASE db_timeout;
+USE db_timeout;
+
+CREATE TABLE Part (id int, name varchar(10));
+
+INSERT INTO Part VALUES (1, 'bolt');
+INSERT INTO Part VALUES (2, 'nut');
+INSERT INTO Part VALUES (3, 'gear');
+INSERT INTO Part VALUES (4, 'washer');
+INSERT INTO Part VALUES (5, 'pin');
+INSERT INTO Part VALUES (6, 'spring');
+INSERT INTO Part VALUES (7, 'rivet');
+INSERT INTO Part VALUES (8, 'screw');
+INSERT INTO Part VALUES (9, 'clip');
+INSERT INTO Part VALUES (10, 'key');
+
+-- A join of a million rows is cancelled, a statement that finishes in time is not
+SET statement_timeout = 10ms;
+SELECT COUNT(*) FROM Part p, Part q, Part r, Part s, Part t, Part u;
+SELECT COUNT(*) FROM Part WHERE id > 5;
+
+-- A statement other than a SELECT, UPDATE or DELETE is never cancelled
+INSERT INTO Part VALUES (11, 'nail');
+
+-- The transaction of a cancelled statement is aborted, discarding its changes
+begin transaction;
+UPDATE Part SET name = 'stud' WHERE id = 1;
+SELECT COUNT(*) FROM Part p, Part q, Part r, Part s, Part t, Part u;
+commit;
+SELECT * FROM Part WHERE id = 1;
+
+-- The locks of the cancelled statement were released, so the table can be written to
+begin transaction;
+DELETE FROM Part WHERE id = 11;
+commit;
+SELECT COUNT(*) FROM Part;
+
+-- Timeouts with units, disabling the timeout, resetting it and an invalid timeout
+SET statement_timeout = 2s;
+SET statement_timeout = 0;
+SET statement_timeout = DEFAULT;
+SET statement_timeout = soon;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_timeout created.
+-- Using database db_timeout.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- statement_timeout set to 10 ms.
+-- !Failed because the statement was cancelled by the statement timeout after 10 ms and 19706 rows processed.
+-- COUNT(*)
+-- 5
+-- 1 new record inserted.
+-- Transaction starts.
+-- 1 record modified.
+-- !Failed because the statement was cancelled by the statement timeout after 16 ms and 43410 rows processed.
+-- Transaction abort.
+-- id int|name varchar
+-- 1|bolt
+-- Transaction starts.
+-- 1 record deleted.
+-- Transaction committed.
+-- COUNT(*)
+-- 10
+-- statement_timeout set to 2000 ms.
+-- statement_timeout disabled.
+-- statement_timeout reset to the default.
+-- !Failed because "soon" is not a valid timeout, expected a duration such as 5000 or 5s.
+-- All done.
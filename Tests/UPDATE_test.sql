@@ -0,0 +1,110 @@
+-- python3 dini_db.py -r -f UPDATE_test.sql
+
+-- Updated rows are overwritten where they are in the table file, found by the table's row offset index
+-- A row whose new values no longer fit is moved to the end of the file, so it is read after the rows before it
+
+CREATE DATABASE db_update;
+USE db_update;
+
+CREATE TABLE Part (id int, name varchar(20), price float);
+
+INSERT INTO Part VALUES (1, 'bolt', 1.5);
+INSERT INTO Part VALUES (2, 'nut', 0.25);
+INSERT INTO Part VALUES (3, 'gear', 12.0);
+INSERT INTO Part VALUES (4, 'cog', 7.75);
+
+-- Updates that fit where the rows are
+UPDATE Part SET price = 2.5 WHERE id = 1;
+UPDATE Part SET name = 'pin' WHERE id = 3;
+SELECT * FROM Part;
+
+-- Updates that move the rows to the end of the file
+UPDATE Part SET name = 'hexagonal_nut' WHERE id = 2;
+UPDATE Part SET name = 'spur_gear_wheel' WHERE id = 3;
+UPDATE Part SET price = 112.125 WHERE id = 3;
+SELECT * FROM Part;
+SELECT * FROM Part WHERE name = 'hexagonal_nut';
+
+-- A moved row can be updated, deleted and vacuumed like any other
+UPDATE Part SET price = 0.5 WHERE id = 2;
+UPDATE Part SET name = 'wide_spur_gear_wheel' WHERE id = 3;
+DELETE FROM Part WHERE id = 2;
+SELECT * FROM Part;
+VACUUM Part;
+SELECT * FROM Part;
+
+-- Updates within a transaction are written when the transaction is committed
+begin transaction;
+UPDATE Part SET name = 'washer_for_bolts' WHERE id = 1;
+UPDATE Part SET price = 3 WHERE id = 4;
+commit;
+SELECT * FROM Part;
+INSERT INTO Part VALUES (5, 'rod', 4.0);
+UPDATE Part SET name = 'threaded_rod' WHERE id = 5;
+SELECT * FROM Part;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_update created.
+-- Using database db_update.
+-- Table Part created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar(20)|price float
+-- 1|bolt|2.5
+-- 2|nut|0.25
+-- 3|pin|12.0
+-- 4|cog|7.75
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar(20)|price float
+-- 1|bolt|2.5
+-- 4|cog|7.75
+-- 2|hexagonal_nut|0.25
+-- 3|spur_gear_wheel|112.125
+-- id int|name varchar(20)|price float
+-- 2|hexagonal_nut|0.25
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record deleted.
+-- id int|name varchar(20)|price float
+-- 1|bolt|2.5
+-- 4|cog|7.75
+-- 3|wide_spur_gear_wheel|112.125
+-- Table Part vacuumed, 5 slots reclaimed.
+-- id int|name varchar(20)|price float
+-- 1|bolt|2.5
+-- 4|cog|7.75
+-- 3|wide_spur_gear_wheel|112.125
+-- Transaction starts.
+-- 1 record modified.
+-- 1 record modified.
+-- Transaction committed.
+-- id int|name varchar(20)|price float
+-- 4|cog|3.0
+-- 3|wide_spur_gear_wheel|112.125
+-- 1|washer_for_bolts|2.5
+-- 1 new record inserted.
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar(20)|price float
+-- 4|cog|3.0
+-- 3|wide_spur_gear_wheel|112.125
+-- 1|washer_for_bolts|2.5
+-- 5|threaded_rod|4.0
+-- All done.
@@ -0,0 +1,129 @@
+-- python3 dini_db.py -r -f VACUUM_test.sql
+
+-- Deleted rows are marked in the table's deletion bitmap and skipped when the table is read
+-- VACUUM rewrites a table without its deleted rows, or every table of the database without a name
+-- It reports the slots it reclaimed, which are the slots of the deleted rows and the old slots of the rows
+-- that an update relocated to the end of the table file
+
+CREATE DATABASE db_vacuum;
+USE db_vacuum;
+
+CREATE TABLE Item (id int, name varchar(10), qty int);
+CREATE TABLE Bin (id int, label varchar(10));
+
+INSERT INTO Item VALUES (1, 'bolt', 5);
+INSERT INTO Item VALUES (2, 'nut', 8);
+INSERT INTO Item VALUES (3, 'gear', 2);
+INSERT INTO Item VALUES (4, 'cog', 9);
+INSERT INTO Bin VALUES (1, 'a');
+INSERT INTO Bin VALUES (2, 'b');
+
+-- Deleted rows are no longer read, whether they are selected, aggregated, updated or deleted again
+DELETE FROM Item WHERE qty < 6;
+SELECT * FROM Item;
+SELECT COUNT(*), SUM(qty) FROM Item;
+UPDATE Item SET qty = 0 WHERE id = 1;
+DELETE FROM Item WHERE id = 3;
+
+-- A record inserted after a deletion is read after the records before it
+INSERT INTO Item VALUES (5, 'pin', 7);
+SELECT * FROM Item;
+
+-- VACUUM removes the deleted rows, the records left are unchanged
+VACUUM Item;
+SELECT * FROM Item;
+VACUUM Item;
+DELETE FROM Item WHERE id = 2;
+DELETE FROM Bin WHERE label = 'b';
+VACUUM;
+SELECT * FROM Item;
+SELECT * FROM Bin;
+UPDATE Item SET qty = 1 WHERE id = 5;
+SELECT * FROM Item;
+
+-- An updated row that no longer fits in its slot is relocated to the end of the table file, so its record
+-- is read last from then on, even once VACUUM has reclaimed its old slot
+UPDATE Item SET name = 'sprocket' WHERE id = 4;
+SELECT * FROM Item;
+VACUUM Item;
+SELECT * FROM Item;
+
+-- A deletion within a transaction is only marked when the transaction is committed
+begin transaction;
+DELETE FROM Item WHERE id = 4;
+SELECT * FROM Item;
+commit;
+SELECT * FROM Item;
+VACUUM Missing;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_vacuum created.
+-- Using database db_vacuum.
+-- Table Item created.
+-- Table Bin created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Error: no transaction active!
+-- 2 records deleted.
+-- id int|name varchar(10)|qty int
+-- 2|nut|8
+-- 4|cog|9
+-- COUNT(*)|SUM(qty)
+-- 2|17
+-- Error: no transaction active!
+-- No records modified.
+-- Error: no transaction active!
+-- No records deleted.
+-- 1 new record inserted.
+-- id int|name varchar(10)|qty int
+-- 2|nut|8
+-- 4|cog|9
+-- 5|pin|7
+-- Table Item vacuumed, 2 slots reclaimed.
+-- id int|name varchar(10)|qty int
+-- 2|nut|8
+-- 4|cog|9
+-- 5|pin|7
+-- Table Item vacuumed, 0 slots reclaimed.
+-- Error: no transaction active!
+-- 1 record deleted.
+-- Error: no transaction active!
+-- 1 record deleted.
+-- Table bin vacuumed, 1 slot reclaimed.
+-- Table item vacuumed, 1 slot reclaimed.
+-- id int|name varchar(10)|qty int
+-- 4|cog|9
+-- 5|pin|7
+-- id int|label varchar
+-- 1|a
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar(10)|qty int
+-- 4|cog|9
+-- 5|pin|1
+-- Error: no transaction active!
+-- 1 record modified.
+-- id int|name varchar(10)|qty int
+-- 5|pin|1
+-- 4|sprocket|9
+-- Table Item vacuumed, 1 slot reclaimed.
+-- id int|name varchar(10)|qty int
+-- 5|pin|1
+-- 4|sprocket|9
+-- Transaction starts.
+-- 1 record deleted.
+-- id int|name varchar(10)|qty int
+-- 5|pin|1
+-- 4|sprocket|9
+-- Transaction committed.
+-- id int|name varchar(10)|qty int
+-- 5|pin|1
+-- !Failed to vacuum Missing because it does not exist.
+-- All done.
@@ -0,0 +1,154 @@
+-- python3 dini_db.py -r -f VIEW_test.sql
+
+-- Materialized views that are maintained from the records inserted, updated and deleted in their tables
+-- Removing the minimum or maximum of a group leaves its new extreme unknown, so the view is refreshed instead
+-- Within a transaction, the views are maintained when the transaction is committed
+-- A changed group's record is overwritten in the view's table, and is moved to the end of the table when it
+-- no longer fits, like an updated record
+
+CREATE DATABASE db_view;
+USE db_view;
+
+CREATE TABLE Sale (id int, store varchar(10), amount int);
+CREATE TABLE Store (store varchar(10), city varchar(10));
+
+INSERT INTO Sale VALUES (1, 'north', 10);
+INSERT INTO Sale VALUES (2, 'north', 30);
+INSERT INTO Sale VALUES (3, 'south', 20);
+INSERT INTO Store VALUES ('north', 'Reno');
+INSERT INTO Store VALUES ('south', 'Vegas');
+
+CREATE MATERIALIZED VIEW Totals AS SELECT store, COUNT(*), SUM(amount) AS total, AVG(amount) AS mean FROM Sale GROUP BY store;
+CREATE MATERIALIZED VIEW Extremes AS SELECT store, MIN(amount) AS low, MAX(amount) AS high FROM Sale GROUP BY store;
+CREATE MATERIALIZED VIEW Large AS SELECT id, amount FROM Sale WHERE amount > 15;
+CREATE MATERIALIZED VIEW Cities AS SELECT S.id, T.city FROM Sale S INNER JOIN Store T ON S.store = T.store;
+SELECT * FROM Totals;
+SELECT * FROM Extremes;
+SELECT * FROM Large;
+SELECT * FROM Cities;
+
+-- Insertions, updates and deletions are applied to each view
+INSERT INTO Sale VALUES (4, 'south', 50);
+UPDATE Sale SET amount = 5 WHERE id = 3;
+DELETE FROM Sale WHERE id = 1;
+SELECT * FROM Totals;
+SELECT * FROM Large;
+SELECT * FROM Cities;
+
+-- Deleting the maximum of a group refreshes the view
+DELETE FROM Sale WHERE amount = 50;
+SELECT * FROM Extremes;
+
+-- The views are maintained when the transaction is committed
+begin transaction;
+INSERT INTO Sale VALUES (5, 'north', 70);
+UPDATE Sale SET amount = 1 WHERE id = 2;
+SELECT * FROM Totals;
+commit;
+SELECT * FROM Totals;
+SELECT * FROM Extremes;
+SELECT * FROM Large;
+SELECT * FROM Cities;
+
+-- A group without any records has its row deleted, and the record of a new group is appended
+DELETE FROM Sale WHERE store = 'south';
+INSERT INTO Sale VALUES (6, 'east', 8);
+SELECT * FROM Totals;
+
+-- A view whose table was rewritten since it was maintained is refreshed
+VACUUM Totals;
+INSERT INTO Sale VALUES (7, 'east', 2);
+SELECT * FROM Totals;
+
+-- A view can not be changed directly, and is rebuilt by REFRESH MATERIALIZED VIEW
+DELETE FROM Totals WHERE store = 'north';
+REFRESH MATERIALIZED VIEW Totals;
+DROP MATERIALIZED VIEW Cities;
+SELECT * FROM Cities;
+
+.EXIT
+
+-- Expected output
+--
+-- Database db_view created.
+-- Using database db_view.
+-- Table Sale created.
+-- Table Store created.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- 1 new record inserted.
+-- Materialized view Totals created with 2 records.
+-- Materialized view Extremes created with 2 records.
+-- Materialized view Large created with 2 records.
+-- Materialized view Cities created with 3 records.
+-- store varchar(10)|count_all int|total int|mean float
+-- north|2|40|20.0
+-- south|1|20|20.0
+-- store varchar(10)|low int|high int
+-- north|10|30
+-- south|20|20
+-- id int|amount int
+-- 2|30
+-- 3|20
+-- id int|city varchar
+-- 1|Reno
+-- 2|Reno
+-- 3|Vegas
+-- 1 new record inserted.
+-- Error: no transaction active!
+-- 1 record modified.
+-- Error: no transaction active!
+-- 1 record deleted.
+-- store varchar(10)|count_all int|total int|mean float
+-- north|1|30|30.0
+-- south|2|55|27.5
+-- id int|amount int
+-- 2|30
+-- 4|50
+-- id int|city varchar
+-- 2|Reno
+-- 4|Vegas
+-- 3|Vegas
+-- Error: no transaction active!
+-- 1 record deleted.
+-- store varchar(10)|low int|high int
+-- north|30|30
+-- south|5|5
+-- Transaction starts.
+-- 1 new record inserted.
+-- 1 record modified.
+-- store varchar(10)|count_all int|total int|mean float
+-- south|1|5|5.0
+-- north|2|100|50.0
+-- Transaction committed.
+-- store varchar(10)|count_all int|total int|mean float
+-- south|1|5|5.0
+-- north|2|71|35.5
+-- store varchar(10)|low int|high int
+-- north|1|70
+-- south|5|5
+-- id int|amount int
+-- 5|70
+-- id int|city varchar
+-- 3|Vegas
+-- 5|Reno
+-- 2|Reno
+-- Error: no transaction active!
+-- 1 record deleted.
+-- 1 new record inserted.
+-- store varchar(10)|count_all int|total int|mean float
+-- north|2|71|35.5
+-- east|1|8|8.0
+-- Table Totals vacuumed, 2 slots reclaimed.
+-- 1 new record inserted.
+-- store varchar(10)|count_all int|total int|mean float
+-- north|2|71|35.5
+-- east|2|10|5.0
+-- Error: no transaction active!
+-- !Failed to delete from Totals because it is a materialized view.
+-- Materialized view Totals refreshed with 2 records.
+-- Materialized view Cities dropped.
+-- !Failed because Cities does not exist
+-- All done.
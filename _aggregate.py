@@ -0,0 +1,293 @@
+# FILE NAME:    _AGGREGATE.PY
+# MODULE NAME:  Aggregate
+# DESCRIPTION:  Provides a hash aggregation that groups records by one or more fields and
+#               computes aggregate functions over each group. When the groups held in memory
+#               exceed a memory limit, the records of any other groups are partitioned to
+#               temporary files by the hash of their group, and each partition is then
+#               aggregated on its own (grace hash aggregation).
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from operator import itemgetter
+import _profiler as _pf
+import _memory as _mem
+import _cancel as _cn
+
+# Internal global variables
+# memory_limit - the most memory in bytes the groups of an aggregation hold before it spills (--aggregate-memory-mb),
+#                unless the session sets its own work_mem
+memory_limit = 64 * 1024 * 1024
+
+# Runtime Constants Variables
+# PARTITION_COUNT - the number of partitions the records of spilled groups are divided between
+# PARTITION_BITS - the number of bits of a group's hash used to choose its partition
+# MAX_DEPTH - the number of times a partition may be partitioned again, after which its groups are kept in memory
+# STATE_SIZE - the estimated memory used by the state of a single aggregate function
+# COLUMN - a selected column, either an aggregate function or a field, with an optional alias
+PARTITION_COUNT = 16
+PARTITION_BITS = 4
+MAX_DEPTH = 4
+STATE_SIZE = 64
+COLUMN = re.compile(r'(?:(?P<function>COUNT|SUM|AVG|MAX|MIN)\s*\(\s*(?P<distinct>DISTINCT\s+)?'
+                    r'(?P<argument>\*|[\w.]+)\s*\)|(?P<field>\*|[\w.]+))(?:\s+AS\s+(?P<alias>\w+))?', re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to describe aggregations
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Column Class
+#
+# Member Variables:
+# function:     The aggregate function of the column, or '' for a field
+# argument:     The field the function is computed over, or the selected field. '*' for COUNT(*)
+# distinct:     Whether the function is only computed over the distinct values of the field
+# name:         The name the column is printed with
+#
+# Description:
+# Describes a single column selected by a statement that groups or aggregates records
+@dataclass
+class Column:
+    function: str
+    argument: str
+    distinct: bool = False
+    name: str = ''
+
+
+# endregion
+
+# region HASH AGGREGATION
+
+# REGION:       HASH AGGREGATION
+# DESCRIPTION:  Provides methods for grouping and aggregating records that may not fit in memory
+
+# --------- METHODS --------- #
+
+
+# METHOD:       parse_columns()
+# DESCRIPTION:  Parses the columns selected by a statement, such as s, COUNT(*), AVG(DISTINCT price) AS avg
+# ARGUMENTS:    text - the columns between SELECT and FROM
+# RETURNS:      A list of Column objects, or None if the columns are invalid
+def parse_columns(text: str):
+    columns = []
+    text = text.strip()
+    position = 0
+
+    # The columns are found one at a time, each separated by commas or whitespace
+    while position < len(text):
+        match = COLUMN.match(text, position)
+        if match is None:
+            print(f'!Failed because the column list "{text}" is invalid.')
+            return None
+
+        function = (match['function'] or '').upper()
+        argument = match['argument'] or match['field']
+        distinct = match['distinct'] is not None
+        name = match['alias'] or (f'{function}({"DISTINCT " if distinct else ""}{argument})' if function else argument)
+        columns.append(Column(function, argument, distinct, name))
+
+        position = match.end()
+        while position < len(text) and text[position] in ', ':
+            position += 1
+
+    return columns
+
+
+# METHOD:       new_state()
+# DESCRIPTION:  Creates the state of an aggregate function for a new group
+# ARGUMENTS:    function - the aggregate function
+#               distinct - whether the function is computed over distinct values
+# RETURNS:      The initial state of the function
+def new_state(function: str, distinct: bool):
+    if distinct:
+        return set()
+
+    match function:
+        case 'COUNT' | 'SUM':
+            return 0
+        case 'AVG':
+            return [0, 0]
+        case _:
+            return None
+
+
+# METHOD:       update_state()
+# DESCRIPTION:  Adds a value to the state of an aggregate function that is not computed over distinct values
+# ARGUMENTS:    function - the aggregate function
+#               state - the current state of the function
+#               value - the value being added
+# RETURNS:      The new state of the function
+def update_state(function: str, state, value):
+    match function:
+        case 'COUNT':
+            return state + 1
+        case 'SUM':
+            return state + value
+        case 'AVG':
+            state[0] += value
+            state[1] += 1
+            return state
+        case 'MAX':
+            return value if state is None or value > state else state
+        case _:
+            return value if state is None or value < state else state
+
+
+# METHOD:       final_value()
+# DESCRIPTION:  Computes the result of an aggregate function from its state
+# ARGUMENTS:    function - the aggregate function
+#               distinct - whether the function is computed over distinct values
+#               state - the final state of the function
+# RETURNS:      The result of the function, or None for an average, minimum or maximum of no values
+def final_value(function: str, distinct: bool, state):
+    if distinct:
+        match function:
+            case 'COUNT':
+                return len(state)
+            case 'SUM':
+                return sum(state)
+            case 'AVG':
+                return sum(state) / len(state) if len(state) > 0 else None
+            case 'MAX':
+                return max(state) if len(state) > 0 else None
+            case _:
+                return min(state) if len(state) > 0 else None
+
+    if function == 'AVG':
+        return state[0] / state[1] if state[1] > 0 else None
+
+    return state
+
+
+# METHOD:       hash_aggregate()
+# DESCRIPTION:  Groups records by the values of some of their fields and computes aggregate functions over
+#               each group. Once the groups exceed the memory limit or the memory budget can not hold them,
+#               records of groups that are not already held in memory are spilled to partitions, which are
+#               aggregated after the groups in memory.
+# ARGUMENTS:    records - an iterable of the records to aggregate
+#               group - the position of each field the records are grouped by
+#               aggregates - the (function, position, distinct) of each aggregate function,
+#                            where the position is None for COUNT(*)
+#               directory - the directory to write the temporary files to
+#               global_group - whether a group with no records is returned when there are no records,
+#                              as when the records are aggregated without being grouped
+#               depth - the number of times the records have been partitioned
+# RETURNS:      A generator of a tuple for each group, holding the group's fields followed by the
+#               result of each aggregate function
+def hash_aggregate(records, group: list[int], aggregates: list[tuple[str, int, bool]], directory: str,
+                   global_group: bool = False, depth: int = 0):
+    # key - the function that finds the group of a record
+    # groups - the state of each aggregate function, keyed by group
+    # entries - the number of groups and distinct values held in memory
+    # size - the estimated memory used by each entry
+    key = itemgetter(*group) if len(group) > 1 else (lambda record: (record[group[0]],)) if group else (lambda _: ())
+    groups = {}
+    entries = 0
+    size = 0
+    count = 0
+
+    # partitions - the SpillFile of each partition, created once the aggregation spills
+    partitions = None
+    spilled = 0
+    budget = _mem.Reservation('hash aggregate', memory_limit)
+
+    try:
+        with _pf.operator('hash aggregate' if depth == 0 else f'hash aggregate (partition depth {depth})') as op:
+            for record in records:
+                count += 1
+                if count % _cn.CHECK_INTERVAL == 0:
+                    _cn.check()
+
+                group_key = key(record)
+                states = groups.get(group_key)
+
+                if states is None:
+                    if size == 0:
+                        size = sys.getsizeof(group_key) + sum([sys.getsizeof(x) for x in group_key]) \
+                            + STATE_SIZE * (len(aggregates) + 1)
+
+                    # A new group is only held once the memory for it is reserved, otherwise the records of
+                    # every new group are spilled from then on
+                    # Each level of partitioning uses different bits of the group's hash
+                    if partitions is None and depth < MAX_DEPTH and not budget.grow((entries + 1) * size):
+                        partitions = [_mem.SpillFile(directory, 'agg') for _ in range(PARTITION_COUNT)]
+                        logging.info(f'Aggregation spilled at {len(groups)} groups to {PARTITION_COUNT} partitions')
+                    if partitions is not None:
+                        partitions[(hash(group_key) >> PARTITION_BITS * depth) % PARTITION_COUNT].write(record)
+                        spilled += 1
+                        continue
+
+                    states = [new_state(function, distinct) for function, _, distinct in aggregates]
+                    groups[group_key] = states
+                    entries += 1
+
+                # The distinct values of a group are counted as entries, since they are held in memory as well
+                for i, (function, position, distinct) in enumerate(aggregates):
+                    value = record[position] if position is not None else None
+                    if distinct:
+                        before = len(states[i])
+                        states[i].add(value)
+                        entries += len(states[i]) - before
+                    else:
+                        states[i] = update_state(function, states[i], value)
+
+                # The distinct values of the groups held can not be spilled, so once they no longer fit
+                # the records of new groups are spilled instead
+                if entries * size > budget.size and not budget.grow(entries * size) \
+                        and partitions is None and depth < MAX_DEPTH:
+                    partitions = [_mem.SpillFile(directory, 'agg') for _ in range(PARTITION_COUNT)]
+                    logging.info(f'Aggregation spilled at {len(groups)} groups to {PARTITION_COUNT} partitions')
+
+            # The groups are held until they are returned, only beyond the limits once they can not be spilled
+            if entries * size > budget.size:
+                budget.force(entries * size)
+
+            op.rows_in = count
+            op.rows_out = len(groups)
+            if partitions is not None:
+                for partition in partitions:
+                    partition.close()
+                op.bytes_written = sum([x.nbytes for x in partitions])
+            if op:
+                op.details['groups'] = len(groups)
+                op.details['peak memory'] = budget.peak
+                op.details['spilled rows'] = spilled
+                op.details['partitions'] = len(partitions) if partitions is not None else 0
+
+        if global_group and len(groups) < 1 and count < 1:
+            groups[()] = [new_state(function, distinct) for function, _, distinct in aggregates]
+
+        # The groups in memory are complete, since no record of theirs was spilled
+        for group_key, states in groups.items():
+            yield group_key + tuple([final_value(function, distinct, state)
+                                     for (function, _, distinct), state in zip(aggregates, states)])
+        groups.clear()
+        budget.release()
+
+        # Every record of a group is in the same partition, so each partition is aggregated on its own
+        for partition in partitions or []:
+            if partition.rows > 0:
+                yield from hash_aggregate(partition.read(), group, aggregates, directory, False, depth + 1)
+    finally:
+        budget.release()
+        for partition in partitions or []:
+            partition.delete()
+
+
+# endregion
+
+# METHOD:       ag_init()
+# DESCRIPTION:  Initializes the aggregate global variables used by the program
+# ARGUMENTS:    memory_mb - the most memory in megabytes the groups of an aggregation hold before it spills
+# RETURNS:      N/A
+def ag_init(memory_mb: float = None):
+    global memory_limit
+
+    memory_limit = int(memory_mb * 1024 * 1024) if memory_mb is not None else 64 * 1024 * 1024
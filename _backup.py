@@ -0,0 +1,309 @@
+# FILE NAME:    _BACKUP.PY
+# MODULE NAME:  Backup
+# DESCRIPTION:  Provides online backups of databases. Each backup of a database is a new generation: a folder
+#               holding a point-in-time copy of every file of the database, which is restored by copying it
+#               into the databases folder. The files are first copied while statements keep changing the
+#               database, then the files that changed during the copy are copied again while writers wait,
+#               so writers only wait for the files they changed. A backup is incremental: the files that have
+#               not changed since the previous generation are hard links to its files instead of copies, and
+#               since the files of a generation are never changed, every generation stays a complete copy.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+import _globals as _gl
+import _filesystem as _fs
+import _session as _ss
+import _storage as _sto
+import _cache as _ch
+import _memory as _mem
+import _replication as _rp
+
+# Runtime Constants Variables
+# MANIFEST_FILE - the name of the file of a generation that lists its files, written once the generation is complete
+# EXCLUDED_FILE_TYPES - the files of a database that are not backed up: the locks of transactions and temporary files
+# RACY_WINDOW - the nanoseconds before a backup in which a file's modification time may not tell a later write apart
+#               from the one that was backed up, so a file modified within it is copied again by the next backup
+# BACKUP_STATEMENT - the database and directory of a BACKUP statement, read from its text to keep the directory's path
+# RESTORE_STATEMENT - the database and directory of a RESTORE statement, read from its text like a BACKUP statement's
+MANIFEST_FILE = 'backup.manifest'
+EXCLUDED_FILE_TYPES = (_sto.LOCK_FILE_TYPE, _mem.SPILL_FILE_TYPE)
+RACY_WINDOW = 1_000_000_000
+BACKUP_STATEMENT = re.compile(r"BACKUP\s+DATABASE\s+(?P<database>\w+)\s+TO\s+'(?P<directory>[^']+)'", re.IGNORECASE)
+RESTORE_STATEMENT = re.compile(r"RESTORE\s+DATABASE\s+(?P<database>\w+)\s+FROM\s+'(?P<directory>[^']+)'",
+                               re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to describe backups
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Generation Class
+#
+# Member Variables:
+# path:         The path of the generation's folder
+# database:     The name of the database that was backed up
+# time:         The time in nanoseconds the copy of the database was completed
+# log_position: The position of the change log the backup holds every change before, or '' without a change log
+# files:        The size and modification time each file had when it was copied, keyed by file name
+#
+# Description:
+# Describes a backup of a database, as listed by its manifest
+@dataclass
+class Generation:
+    path: str
+    database: str
+    time: int = 0
+    log_position: str = ''
+    files: dict = field(default_factory=dict)
+
+
+# endregion
+
+# region BACKUP
+
+# REGION:       BACKUP
+# DESCRIPTION:  Provides methods for backing up databases while they are being used
+
+# --------- METHODS --------- #
+
+
+# METHOD:       backup_database()
+# DESCRIPTION:  Backs up a database to a new generation in a directory, linking the files that have
+#               not changed since the directory's previous generation of the database
+# ARGUMENTS:    statement - the text of the BACKUP statement
+# RETURNS:      N/A
+def backup_database(statement: str):
+    match = BACKUP_STATEMENT.search(statement)
+    if match is None:
+        print("!Failed because the backup is invalid, expected BACKUP DATABASE name TO 'directory'.")
+        return
+
+    database = match['database']
+    folder = _fs.rpath(_gl.DATABASES_DIRECTORY, database)
+    if not _fs.validate_directory(folder):
+        print(f'!Failed to back up {database} because the database does not exist.')
+        return
+
+    directory = os.path.abspath(match['directory'])
+    os.makedirs(directory, exist_ok=True)
+
+    previous = latest_generation(directory, database)
+    target = os.path.join(directory, f'{database}_{next_number(directory, database):04d}')
+    os.mkdir(target)
+
+    # copied - the size and modification time each file had when it was copied, or None if it changed while copied
+    # counts - the number of files copied and linked, and the bytes copied
+    copied = {}
+    counts = [0, 0, 0]
+
+    # The files are first copied while statements keep changing the database
+    # A write made by this program is noticed by the version of its table, which is counted before the copy
+    with _ch.lock:
+        versions = dict(_ch.versions)
+
+    for name in backup_files(folder):
+        copied[name] = copy_file(folder, target, name, previous, counts)
+
+    # The files that changed while they were copied are copied again while writers wait for the lock
+    # Readers keep reading alongside the backup, since it holds the lock shared
+    with _ss.statement_lock('SELECT'):
+        with _ch.lock:
+            changed = {os.path.splitext(os.path.basename(x))[0] for x, v in _ch.versions.items() if versions.get(x) != v}
+
+        names = backup_files(folder)
+        for name in names:
+            if copied.get(name) is None or copied[name] != signature(os.path.join(folder, name)) \
+                    or os.path.splitext(name)[0] in changed:
+                copied[name] = copy_file(folder, target, name, None, counts)
+
+        # The files deleted while they were copied are not part of the backup
+        for name in set(copied) - set(names):
+            if os.path.exists(os.path.join(target, name)):
+                os.remove(os.path.join(target, name))
+            del copied[name]
+
+        generation = Generation(target, database, time.time_ns(), _rp.log_position(),
+                                {x: y for x, y in copied.items() if y is not None})
+
+    # The manifest is written last, so a generation without one was not completed and is never linked to
+    write_manifest(generation)
+
+    logging.info(f'Backed up {database} to {target}, the previous generation was {previous.path if previous else None}')
+    print(f'Database {database} backed up to {os.path.join(match["directory"], os.path.basename(target))} '
+          f'({counts[0]} files copied, {counts[1]} unchanged files linked, {counts[2]} bytes copied).')
+
+
+# METHOD:       restore_database()
+# DESCRIPTION:  Restores a database from the last completed generation of it in a directory
+#               The database must not exist, its folder is created holding the generation's files
+# ARGUMENTS:    statement - the text of the RESTORE statement
+# RETURNS:      N/A
+def restore_database(statement: str):
+    match = RESTORE_STATEMENT.search(statement)
+    if match is None:
+        print("!Failed because the restore is invalid, expected RESTORE DATABASE name FROM 'directory'.")
+        return
+
+    database = match['database']
+    folder = _fs.rpath(_gl.DATABASES_DIRECTORY, database)
+    if _fs.validate_directory(folder):
+        print(f'!Failed to restore {database} because the database already exists.')
+        return
+
+    directory = os.path.abspath(match['directory'])
+    generation = latest_generation(directory, database) if os.path.isdir(directory) else None
+    if generation is None:
+        print(f'!Failed to restore {database} because it has not been backed up to {match["directory"]}.')
+        return
+
+    # The restored files are new versions of the database's tables, so no cached output of them is used
+    os.mkdir(folder)
+    size = 0
+    for name in sorted(generation.files):
+        shutil.copyfile(os.path.join(generation.path, name), os.path.join(folder, name))
+        _ch.bump(os.path.join(folder, name))
+        size += os.path.getsize(os.path.join(folder, name))
+
+    logging.info(f'Restored {database} from {generation.path}')
+    print(f'Database {database} restored from {os.path.join(match["directory"], os.path.basename(generation.path))} '
+          f'({len(generation.files)} files, {size} bytes).')
+
+
+# METHOD:       backup_files()
+# DESCRIPTION:  Lists the files of a database that are backed up
+# ARGUMENTS:    folder - the path of the database's folder
+# RETURNS:      A sorted list of the names of the files
+def backup_files(folder: str) -> list[str]:
+    return sorted([x.name for x in os.scandir(folder) if x.is_file() and not x.name.endswith(EXCLUDED_FILE_TYPES)])
+
+
+# METHOD:       signature()
+# DESCRIPTION:  Finds the size and modification time of a file, which change whenever the file is written
+# ARGUMENTS:    path - the path of the file
+# RETURNS:      A tuple of the file's size and modification time in nanoseconds, or None if it does not exist
+def signature(path: str):
+    try:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# METHOD:       copy_file()
+# DESCRIPTION:  Copies a file of a database to a generation, or links it to the previous generation's
+#               file if the file has not changed since the previous generation was completed
+# ARGUMENTS:    folder - the path of the database's folder
+#               target - the path of the generation's folder
+#               name - the name of the file
+#               previous - the previous Generation, or None to copy the file
+#               counts - the number of files copied and linked and the bytes copied, which are counted
+# RETURNS:      The size and modification time of the file when it was copied, or None if it changed while copied
+def copy_file(folder: str, target: str, name: str, previous: Generation, counts: list[int]):
+    source = os.path.join(folder, name)
+    destination = os.path.join(target, name)
+    before = signature(source)
+
+    # A file copied again may be linked to the previous generation, whose file must not be overwritten
+    if os.path.exists(destination):
+        os.remove(destination)
+
+    if before is None:
+        return None
+
+    if previous is not None and previous.files.get(name) == before and before[1] < previous.time - RACY_WINDOW:
+        os.link(os.path.join(previous.path, name), destination)
+        counts[1] += 1
+        return before
+
+    try:
+        shutil.copyfile(source, destination)
+    except FileNotFoundError:
+        return None
+
+    counts[0] += 1
+    counts[2] += os.path.getsize(destination)
+
+    after = signature(source)
+    return after if after == before else None
+
+
+# endregion
+
+# region GENERATIONS
+
+# REGION:       GENERATIONS
+# DESCRIPTION:  Provides methods for reading and writing the manifests of backups
+
+# --------- METHODS --------- #
+
+
+# METHOD:       next_number()
+# DESCRIPTION:  Finds the number of the next generation of a database in a directory
+# ARGUMENTS:    directory - the directory of the backups
+#               database - the name of the database
+# RETURNS:      One more than the number of the database's last generation, including uncompleted ones
+def next_number(directory: str, database: str) -> int:
+    numbers = [int(x.rsplit('_', 1)[1]) for x in os.listdir(directory) if re.fullmatch(rf'{database}_\d+', x)]
+
+    return max(numbers, default=0) + 1
+
+
+# METHOD:       latest_generation()
+# DESCRIPTION:  Finds the last completed generation of a database in a directory
+# ARGUMENTS:    directory - the directory of the backups
+#               database - the name of the database
+# RETURNS:      The Generation, or None if the database has not been backed up to the directory
+def latest_generation(directory: str, database: str):
+    names = sorted([x for x in os.listdir(directory) if re.fullmatch(rf'{database}_\d+', x)],
+                   key=lambda x: int(x.rsplit('_', 1)[1]), reverse=True)
+
+    for name in names:
+        generation = read_manifest(os.path.join(directory, name))
+        if generation is not None and generation.database == database:
+            return generation
+
+    return None
+
+
+# METHOD:       read_manifest()
+# DESCRIPTION:  Reads the manifest of a generation. The first line holds the database, the time and the log
+#               position of the backup, each other line the name, size and modification time of a file.
+# ARGUMENTS:    path - the path of the generation's folder
+# RETURNS:      The Generation, or None if the generation was not completed
+def read_manifest(path: str):
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), 'r') as f:
+            database, completed, log_position = f.readline().rstrip('\n').split('|')
+            generation = Generation(path, database, int(completed), log_position)
+
+            for line in f:
+                name, size, modified = line.rstrip('\n').split('|')
+                generation.files[name] = (int(size), int(modified))
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return generation
+
+
+# METHOD:       write_manifest()
+# DESCRIPTION:  Writes the manifest of a completed generation
+# ARGUMENTS:    generation - the Generation
+# RETURNS:      N/A
+def write_manifest(generation: Generation):
+    lines = [f'{generation.database}|{generation.time}|{generation.log_position}\n']
+    lines += [f'{name}|{size}|{modified}\n' for name, (size, modified) in sorted(generation.files.items())]
+
+    with open(os.path.join(generation.path, MANIFEST_FILE), 'w') as f:
+        f.writelines(lines)
+
+
+# endregion
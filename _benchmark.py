@@ -0,0 +1,122 @@
+# FILE NAME:    _BENCHMARK.PY
+# MODULE NAME:  Benchmark
+# DESCRIPTION:  Provides a benchmark of the memory used by the records the program holds (--benchmark).
+#               The same rows are converted into dict-based records, as records were held before tables
+#               shared the names of their fields, and into the tuples tables now hold, and the bytes each
+#               row uses are measured with tracemalloc once they are loaded and once they are joined.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import gc
+import logging
+import tracemalloc
+import _dbmanagement as _db
+import _tablemanagement as _tm
+
+# Runtime Constants Variables
+# BENCHMARK_META - the metadata of the table whose rows are converted
+BENCHMARK_META = 'id int|grp int|name varchar(20)|price float'
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to measure the records
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# DictRecord Class
+#
+# Description:
+# Represents a record as a dictionary of its values keyed by the name of each field,
+# which is how records were held before they were held as tuples
+class DictRecord(dict):
+    pass
+
+
+# endregion
+
+# region BENCHMARK
+
+# REGION:       BENCHMARK
+# DESCRIPTION:  Provides methods for measuring the memory used by each representation of the records
+
+# --------- METHODS --------- #
+
+
+# METHOD:       measure()
+# DESCRIPTION:  Measures the memory allocated by a function that builds records, which is kept until it is measured
+# ARGUMENTS:    build - the function, which returns the records it built
+# RETURNS:      The records, the bytes still allocated once they are built and the most bytes allocated at once
+def measure(build) -> tuple[list, int, int]:
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        records = build()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return records, retained, peak
+
+
+# METHOD:       load()
+# DESCRIPTION:  Converts the rows of a table file into records, as a table reads them
+# ARGUMENTS:    lines - the rows of the table file
+#               fields - the name of each field
+#               types - the python type of each field
+#               dict_based - whether the records are dict-based, rather than tuples
+# RETURNS:      The records
+def load(lines: list[str], fields: list[str], types: list[str], dict_based: bool) -> list:
+    converters = [_tm.CONVERTERS[x] for x in types]
+    records = []
+
+    for line in lines:
+        values = [convert(value) for convert, value in zip(converters, line.strip().split('|'))]
+        records.append(DictRecord(zip(fields, values)) if dict_based else tuple(values))
+
+    return records
+
+
+# METHOD:       join()
+# DESCRIPTION:  Joins each record to the next one, as the records of two tables are joined
+# ARGUMENTS:    records - the records
+#               fields - the name of each field, which are qualified by the alias of each table when dict-based
+# RETURNS:      The joined records
+def join(records: list, fields: list[str]) -> list:
+    if len(records) < 1 or isinstance(records[0], tuple):
+        return [x + y for x, y in zip(records, records[1:] + records[:1])]
+
+    # Dict-based records of two tables hold the fields of each table under names qualified by its alias
+    left = [f'L.{x}' for x in fields]
+    right = [f'R.{x}' for x in fields]
+    return [DictRecord(zip(left, x.values())) | DictRecord(zip(right, y.values()))
+            for x, y in zip(records, records[1:] + records[:1])]
+
+
+# METHOD:       run()
+# DESCRIPTION:  Measures the bytes each row uses as dict-based records and as tuples, printing the results
+# ARGUMENTS:    rows - the number of rows converted
+# RETURNS:      N/A
+def run(rows: int):
+    if rows < 1:
+        print('!Failed because the benchmark needs at least 1 row.')
+        return
+
+    logging.info(f'Running the memory benchmark with {rows} rows')
+
+    fields, types = _db.parse_table_meta(BENCHMARK_META)
+    lines = [f'{i}|{i % 7}|name{i}|{i % 100 + 0.5}\n' for i in range(rows)]
+
+    print(f'-- {rows} rows of {BENCHMARK_META}')
+    print('-- records|bytes/row loaded|peak bytes/row loading|bytes/row joined|peak bytes/row joining')
+
+    for name, dict_based in (('dict', True), ('tuple', False)):
+        records, loaded, loading = measure(lambda: load(lines, fields, types, dict_based))
+        joined, retained, joining = measure(lambda: join(records, fields))
+        print(f'-- {name}|{loaded / rows:.1f}|{loading / rows:.1f}|{retained / rows:.1f}|{joining / rows:.1f}')
+        del records, joined
+
+
+# endregion
@@ -0,0 +1,495 @@
+# FILE NAME:    _BLOOM.PY
+# MODULE NAME:  Bloom
+# DESCRIPTION:  Provides Bloom filters of the values of a table's fields. The rows of a table file are
+#               split into blocks, and each filtered field has a Bloom filter for each block kept in a
+#               file alongside the table file, so a scan for field = literal only reads the blocks whose
+#               filters may hold the literal, and skips the table when none do. The filters are added to
+#               as rows are inserted and updated, and rebuilt when the table is rewritten. Joins also
+#               build a Bloom filter of the keys of the table they join to and use it to drop the rows
+#               of the table they scan that can not match before the rows are converted into records.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import ast
+import logging
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+import _storage as _sto
+import _catalog as _cat
+import _pushdown as _pd
+
+# Runtime Constants Variables
+# BLOCK_ROWS - the number of rows of a table file covered by each block's filters
+# BITS_PER_ROW - the number of bits of a filter for each value it holds, about 1% of the values it does
+#                not hold are found in it with 10 bits per value and 7 hashes
+# HASHES - the number of bits set for each value
+# BLOCK_BYTES - the size of the filter of a field for a block
+# HEADER - the size of the table file the filters were last changed with and the number of rows they cover
+BLOCK_ROWS = 4096
+BITS_PER_ROW = 10
+HASHES = 7
+BLOCK_BYTES = BLOCK_ROWS * BITS_PER_ROW // 8
+HEADER = struct.Struct('<QQ')
+
+# CONVERTERS - the function that converts a value of each python type from its string representation
+CONVERTERS = {'int': int, 'float': float, 'str': str}
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to represent Bloom filters
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# BloomFilter Class
+#
+# Member Variables:
+# bits:     The bits of the filter
+#
+# Description:
+# A set of values that may report holding a value it does not hold, but never reports not holding
+# a value it holds. Equal numbers of different types, such as 3 and 3.0, are the same value.
+@dataclass
+class BloomFilter:
+    bits: bytearray
+
+    # Sets the bits of a value
+    def add(self, value) -> None:
+        for position in bit_positions(value, len(self.bits) * 8):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    # Checks the bits of a value, which are all set if the filter may hold it
+    def might_contain(self, value) -> bool:
+        return all([self.bits[x >> 3] >> (x & 7) & 1 for x in bit_positions(value, len(self.bits) * 8)])
+
+
+# FilterFile Class
+#
+# Member Variables:
+# columns:  The names of the filtered fields, in the order of their filters within each block
+# size:     The size of the table file when the filters were last changed
+# rows:     The number of rows of the table file the filters cover, including the rows of its segment
+# offset:   The position of the first block within the filter file
+#
+# Description:
+# Describes the file holding the Bloom filters of a table file. The first line of the file holds the
+# filtered fields, followed by the header and the filter of each field for each block in order.
+@dataclass
+class FilterFile:
+    columns: list[str] = field(default_factory=list)
+    size: int = 0
+    rows: int = 0
+    offset: int = 0
+
+
+# RuntimeFilter Class
+#
+# Member Variables:
+# name:     The name of the field of the scanned table whose values are looked up
+# bloom:    The BloomFilter of the keys of the table being joined to
+# label:    The join key the filter was built from, such as E.id
+#
+# Description:
+# A filter of the rows of a table scanned by a join, built from the keys of the table it is joined to.
+# A row whose value is not in the filter matches nothing, so it is dropped before it is converted.
+@dataclass
+class RuntimeFilter:
+    name: str
+    bloom: BloomFilter
+    label: str = ''
+
+
+# endregion
+
+# region HASHING
+
+# REGION:       HASHING
+# DESCRIPTION:  Provides methods for finding the bits a value sets in a Bloom filter
+
+# --------- METHODS --------- #
+
+
+# METHOD:       canonical()
+# DESCRIPTION:  Converts a value into the bytes that are hashed, which are the same for equal values
+# ARGUMENTS:    value - the value
+# RETURNS:      The bytes of the value
+def canonical(value) -> bytes:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, bool):
+        value = int(value)
+
+    return str(value).encode()
+
+
+# METHOD:       bit_positions()
+# DESCRIPTION:  Finds the bits a value sets in a filter, by combining two hashes of the value
+# ARGUMENTS:    value - the value
+#               bits - the number of bits of the filter
+# RETURNS:      A list of the positions of the bits
+def bit_positions(value, bits: int) -> list[int]:
+    data = canonical(value)
+    first = zlib.crc32(data)
+    second = zlib.adler32(data) | 1
+
+    return [(first + i * second) % bits for i in range(HASHES)]
+
+
+# METHOD:       runtime_filter()
+# DESCRIPTION:  Builds the filter of the keys of a table that is joined to
+# ARGUMENTS:    name - the name of the field of the scanned table whose values are looked up
+#               keys - the values of the key field of the table that is joined to
+#               label - the join key the filter is built from
+# RETURNS:      The RuntimeFilter
+def runtime_filter(name: str, keys: list, label: str = '') -> RuntimeFilter:
+    bloom = BloomFilter(bytearray(max(8, (len(keys) * BITS_PER_ROW + 7) // 8)))
+
+    for key in keys:
+        bloom.add(key)
+
+    return RuntimeFilter(name, bloom, label)
+
+
+# endregion
+
+# region FILTER FILES
+
+# REGION:       FILTER FILES
+# DESCRIPTION:  Provides methods for building, reading and maintaining the Bloom filters of table files
+
+# --------- METHODS --------- #
+
+
+# METHOD:       read_header()
+# DESCRIPTION:  Reads the filtered fields and the header of a table file's Bloom filters
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The FilterFile, or None if the table file has no Bloom filters
+def read_header(path: str):
+    try:
+        with open(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE), 'rb') as f:
+            line = f.readline()
+            size, rows = HEADER.unpack(f.read(HEADER.size))
+    except (FileNotFoundError, struct.error):
+        return None
+
+    return FilterFile(line.decode().strip().split(','), size, rows, len(line) + HEADER.size)
+
+
+# METHOD:       is_current()
+# DESCRIPTION:  Checks that a table file has not been changed since its Bloom filters were last changed
+# ARGUMENTS:    path - the path of the table file
+#               header - the FilterFile of the table file
+# RETURNS:      A bool representing whether the filters hold every value of the table file
+def is_current(path: str, header: FilterFile) -> bool:
+    try:
+        return header.size == os.path.getsize(path)
+    except FileNotFoundError:
+        return False
+
+
+# METHOD:       build()
+# DESCRIPTION:  Builds the Bloom filters of fields of a table file from the table's records
+# ARGUMENTS:    path - the path of the table file
+#               columns - the names of the fields to filter
+#               fields - the names of the table's fields
+#               records - the records of the table
+#               row_ids - the row number of each record
+#               rows - the number of rows of the table file, including the rows of its segment and deleted rows
+# RETURNS:      The number of bytes written
+def build(path: str, columns: list[str], fields: list[str], records: list, row_ids: list[int], rows: int) -> int:
+    positions = [fields.index(x) for x in columns]
+    blocks = (rows + BLOCK_ROWS - 1) // BLOCK_ROWS
+    filters = [BloomFilter(bytearray(BLOCK_BYTES)) for _ in range(blocks * len(columns))]
+
+    for record, row_id in zip(records, row_ids):
+        block = row_id // BLOCK_ROWS * len(columns)
+        for i, position in enumerate(positions):
+            filters[block + i].add(record[position])
+
+    data = f'{",".join(columns)}\n'.encode() + HEADER.pack(os.path.getsize(path), rows) \
+        + b''.join([bytes(x.bits) for x in filters])
+
+    # The filters are written next to the old ones and then moved over them, so they are never partially written
+    temp_path = _sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE) + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, _sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE))
+
+    logging.info(f'Built the Bloom filters of {columns} for {blocks} blocks of {path}')
+
+    return len(data)
+
+
+# METHOD:       add_records()
+# DESCRIPTION:  Adds the values of records written to a table file to its Bloom filters
+#               Filters that were not changed along with the table file no longer hold every value
+#               of the table, so they are deleted instead of being used
+# ARGUMENTS:    path - the path of the table file
+#               records - the row number of each record and the record, whose values are typed or strings
+#               types - the python type names of the table's fields
+#               fields - the names of the table's fields
+#               size - the size of the table file before the records were written
+#               rows - the number of rows added to the end of the table file
+# RETURNS:      N/A
+def add_records(path: str, records: list[tuple[int, tuple]], fields: list[str], types: list[str], size: int,
+                rows: int):
+    header = read_header(path)
+    if header is None:
+        return
+
+    if header.size != size or any([x not in fields for x in header.columns]):
+        logging.info(f'Deleted the Bloom filters of {path}, which were not changed along with the table')
+        delete(path)
+        return
+
+    # blocks - the filters of each block that are changed, read from the file as they are needed
+    positions = [fields.index(x) for x in header.columns]
+    converters = [CONVERTERS[types[x]] for x in positions]
+    stride = len(positions) * BLOCK_BYTES
+    blocks = {}
+
+    fd = os.open(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE), os.O_RDWR)
+    try:
+        for row_id, record in records:
+            block = row_id // BLOCK_ROWS
+            if block not in blocks:
+                blocks[block] = bytearray(os.pread(fd, stride, header.offset + block * stride).ljust(stride, b'\0'))
+            bits = blocks[block]
+            for i, (position, convert) in enumerate(zip(positions, converters)):
+                for x in bit_positions(convert(record[position]), BLOCK_BYTES * 8):
+                    bits[i * BLOCK_BYTES + (x >> 3)] |= 1 << (x & 7)
+
+        for block, bits in blocks.items():
+            os.pwrite(fd, bytes(bits), header.offset + block * stride)
+
+        os.pwrite(fd, HEADER.pack(os.path.getsize(path), header.rows + rows), header.offset - HEADER.size)
+    finally:
+        os.close(fd)
+
+
+# METHOD:       append_rows()
+# DESCRIPTION:  Adds the values of rows appended to the end of a table file to its Bloom filters
+# ARGUMENTS:    path - the path of the table file
+#               lines - the string representations of the appended records
+#               size - the size of the table file before the rows were appended
+# RETURNS:      N/A
+def append_rows(path: str, lines: list[str], size: int):
+    header = read_header(path)
+    if header is None:
+        return
+
+    fields, types = table_fields(path)
+    records = [(header.rows + i, line.strip().split('|')) for i, line in enumerate(lines)]
+    add_records(path, records, fields, types, size, len(lines))
+
+
+# METHOD:       update_rows()
+# DESCRIPTION:  Adds the new values of rows updated in a table file to its Bloom filters. A row that is updated
+#               in place keeps its row number, a relocated row is appended to the end of the file, so the new
+#               values are added to the filters of their rows and of the rows appended by the update.
+# ARGUMENTS:    path - the path of the table file
+#               records - maps the row number of each updated row to its new record
+#               relocated - the number of rows the update appended to the end of the file
+#               size - the size of the table file before the update
+# RETURNS:      N/A
+def update_rows(path: str, records: dict, relocated: int, size: int):
+    header = read_header(path)
+    if header is None:
+        return
+
+    # The update does not report which rows it relocated, so every new value is added to each block they were appended to
+    fields, types = table_fields(path)
+    placed = list(records.items())
+    if relocated > 0:
+        first, last = header.rows // BLOCK_ROWS, (header.rows + relocated - 1) // BLOCK_ROWS
+        placed += [(x * BLOCK_ROWS, record) for x in range(first, last + 1) for record in records.values()]
+    add_records(path, placed, fields, types, size, relocated)
+
+
+# METHOD:       delete()
+# DESCRIPTION:  Deletes the Bloom filters of a table file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      A bool representing whether the table file had Bloom filters
+def delete(path: str) -> bool:
+    try:
+        os.remove(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE))
+    except FileNotFoundError:
+        return False
+
+    return True
+
+
+# METHOD:       drop_column()
+# DESCRIPTION:  Stops filtering a field of table files by rewriting their filter files without its filters
+# ARGUMENTS:    paths - the paths of the table files
+#               name - the name of the field
+# RETURNS:      N/A
+def drop_column(paths: list[str], name: str):
+    for path in paths:
+        header = read_header(path)
+        if header is None or name not in header.columns:
+            continue
+
+        columns = [x for x in header.columns if x != name]
+        if len(columns) < 1:
+            delete(path)
+            continue
+
+        with open(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE), 'rb') as f:
+            f.seek(header.offset)
+            data = f.read()
+
+        # The filters of every block are kept except the dropped field's
+        stride = len(header.columns) * BLOCK_BYTES
+        skip = header.columns.index(name) * BLOCK_BYTES
+        blocks = [data[i:i + stride] for i in range(0, len(data), stride)]
+        blocks = [x[:skip] + x[skip + BLOCK_BYTES:] for x in blocks]
+
+        with open(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE), 'wb') as f:
+            f.write(f'{",".join(columns)}\n'.encode() + HEADER.pack(header.size, header.rows) + b''.join(blocks))
+
+
+# METHOD:       table_fields()
+# DESCRIPTION:  Finds the fields and types of a table file from the catalog, or from its metadata
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      A tuple of the list of field names and the list of python type names
+def table_fields(path: str) -> tuple[list[str], list[str]]:
+    entry = _cat.lookup_path(path)
+    if entry is not None:
+        return entry.fields, entry.types
+
+    layout = _cat.layout(path)
+    if layout is not None:
+        return _cat.parse_meta(layout.meta)
+
+    with open(path, 'r') as f:
+        return _cat.parse_meta(f.readline().strip())
+
+
+# METHOD:       show_filters()
+# DESCRIPTION:  Prints the Bloom filters of tables
+# ARGUMENTS:    tables - the name and path of each table file
+# RETURNS:      N/A
+def show_filters(tables: list[tuple[str, str]]):
+    print('table|fields|blocks|rows|bytes|current')
+
+    for name, path in tables:
+        header = read_header(path)
+        if header is None:
+            continue
+
+        blocks = (header.rows + BLOCK_ROWS - 1) // BLOCK_ROWS
+        nbytes = os.path.getsize(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE))
+
+        print(f'{name}|{",".join(header.columns)}|{blocks}|{header.rows}|{nbytes}|{is_current(path, header)}')
+
+
+# endregion
+
+# region PRUNING
+
+# REGION:       PRUNING
+# DESCRIPTION:  Provides methods for finding the blocks of a table file that may hold records satisfying a condition
+
+# --------- METHODS --------- #
+
+
+# METHOD:       candidate_blocks()
+# DESCRIPTION:  Finds the blocks of a table file whose Bloom filters may hold the literals the condition
+#               requires filtered fields to equal, such as id = 5 or id in (5, 7)
+# ARGUMENTS:    path - the path of the table file
+#               condition - the condition the records will be filtered by
+# RETURNS:      A tuple of the sorted list of the blocks and the number of rows of the table file,
+#               or None if the filters can not rule out any block
+def candidate_blocks(path: str, condition: str):
+    if not condition or condition == 'True':
+        return None
+
+    header = read_header(path)
+    if header is None or not is_current(path, header):
+        return None
+
+    fields, types = table_fields(path)
+    literals = equalities(condition, {x: _pd.KINDS[y] for x, y in zip(fields, types) if x in header.columns})
+    if len(literals) < 1:
+        return None
+
+    # count - the number of blocks of the table file
+    # stride - the size of the filters of a block
+    count = (header.rows + BLOCK_ROWS - 1) // BLOCK_ROWS
+    stride = len(header.columns) * BLOCK_BYTES
+
+    with open(_sto.sidecar_path(path, _sto.BLOOM_FILE_TYPE), 'rb') as f:
+        f.seek(header.offset)
+        data = f.read().ljust(count * stride, b'\0')
+
+    # Every literal a field may equal is looked up in the filter of that field for each block
+    # The positions of a literal's bits are the same in each block's filter, so they are found once
+    blocks = set(range(count))
+    for name, values in literals.items():
+        column = header.columns.index(name) * BLOCK_BYTES
+        lookups = [bit_positions(x, BLOCK_BYTES * 8) for x in values]
+        blocks = {x for x in blocks if any([might_contain(data, x * stride + column, y) for y in lookups])}
+
+    if len(blocks) == count:
+        return None
+
+    return sorted(blocks), header.rows
+
+
+# METHOD:       might_contain()
+# DESCRIPTION:  Checks the bits of a value in the filter of a block
+# ARGUMENTS:    data - the filters of every block
+#               start - the position of the filter within the data
+#               positions - the positions of the value's bits within the filter
+# RETURNS:      True if every bit is set, False otherwise
+def might_contain(data: bytes, start: int, positions: list[int]) -> bool:
+    return all([data[start + (x >> 3)] >> (x & 7) & 1 for x in positions])
+
+
+# METHOD:       equalities()
+# DESCRIPTION:  Finds the literals that the parts of a condition joined by 'and' require fields to equal
+# ARGUMENTS:    condition - the condition as a string
+#               kinds - the kind of value of each filtered field
+# RETURNS:      A dictionary mapping field names to the list of literals they may equal
+def equalities(condition: str, kinds: dict) -> dict:
+    try:
+        tree = ast.parse(condition, mode='eval')
+    except SyntaxError:
+        return {}
+
+    # The literal may be on either side of an equality
+    literals = {}
+    for node in _pd.conjuncts(tree.body):
+        if not isinstance(node, ast.Compare) or len(node.ops) != 1:
+            continue
+
+        left, op, right = node.left, node.ops[0], node.comparators[0]
+        if isinstance(op, ast.Eq) and isinstance(left, ast.Constant) and isinstance(right, ast.Name):
+            left, right = right, left
+
+        if not (isinstance(left, ast.Name) and left.id in kinds):
+            continue
+
+        # Literals of another kind never equal the field's values, they are left to the condition
+        if isinstance(op, ast.Eq) and isinstance(right, ast.Constant):
+            values = [right.value]
+        elif isinstance(op, ast.In) and isinstance(right, (ast.Tuple, ast.List, ast.Set)) \
+                and all([isinstance(x, ast.Constant) for x in right.elts]):
+            values = [x.value for x in right.elts]
+        else:
+            continue
+
+        if any([_pd.KINDS.get(type(x)) != kinds[left.id] for x in values]):
+            continue
+
+        # A field required to equal literals by several parts can only hold the literals every part allows
+        literals[left.id] = [x for x in values if x in literals[left.id]] if left.id in literals else values
+
+    return literals
+
+
+# endregion
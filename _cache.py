@@ -0,0 +1,200 @@
+# FILE NAME:    _CACHE.PY
+# MODULE NAME:  Cache
+# DESCRIPTION:  Provides a cache of the output of SELECT statements that is invalidated
+#               whenever one of the tables read by a statement is written to
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import _storage as _sto
+
+# Internal global variables
+# enabled - whether the output of SELECT statements is cached (--result-cache-mb)
+# capacity - the most memory in bytes the cached results may use
+# entries - the cached results in order from least to most recently used, keyed by statement and table versions
+# used - the memory in bytes used by the cached results
+# versions - the number of times each table file has been written to by this program, keyed by path
+# lock - guards the cached results, since the SELECT statements of several sessions look up and store them at once
+enabled = False
+capacity = 0
+entries = OrderedDict()
+used = 0
+versions = {}
+lock = threading.Lock()
+
+# hits - the number of statements answered from the cache
+# misses - the number of statements executed because their result was not cached
+# evictions - the number of results removed from the cache to stay within its capacity
+hits = 0
+misses = 0
+evictions = 0
+
+# Runtime Constants Variables
+# VERSIONED_FILE_TYPES - the files of a table whose changes change the table's records
+VERSIONED_FILE_TYPES = ('', _sto.TOMBSTONE_FILE_TYPE, _sto.SEGMENT_FILE_TYPE, _sto.PARTITION_FILE_TYPE,
+                        _sto.SCHEMA_FILE_TYPE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to hold cached results
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# CachedResult Class
+#
+# Member Variables:
+# output:   The text printed by the statement
+# rows:     The number of rows returned by the statement
+# size:     The memory in bytes used by the result
+#
+# Description:
+# Holds the output of a SELECT statement so it can be printed again without executing the statement
+@dataclass
+class CachedResult:
+    output: str
+    rows: int
+    size: int
+
+
+# endregion
+
+# region RESULT CACHE
+
+# REGION:       RESULT CACHE
+# DESCRIPTION:  Provides methods for looking up, storing and invalidating cached results
+
+# --------- METHODS --------- #
+
+
+# METHOD:       bump()
+# DESCRIPTION:  Marks a table file as changed, so results read from it are no longer used
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      N/A
+def bump(path: str):
+    with lock:
+        versions[path] = versions.get(path, 0) + 1
+
+
+# METHOD:       table_version()
+# DESCRIPTION:  Finds the version of a table file. Writes made by this program are counted by bump(),
+#               writes made by other programs are noticed by the modification times of the table's files.
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      A tuple that changes whenever the table's records change
+def table_version(path: str) -> tuple:
+    version = [versions.get(path, 0)]
+
+    for file_type in VERSIONED_FILE_TYPES:
+        try:
+            stat = os.stat(_sto.sidecar_path(path, file_type) if file_type else path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append(None)
+
+    return tuple(version)
+
+
+# METHOD:       cache_key()
+# DESCRIPTION:  Creates the key of a statement's result from the statement and the versions of its tables
+# ARGUMENTS:    statement - the normalized statement text
+#               paths - the paths of the table files read by the statement
+# RETURNS:      The key of the statement's result
+def cache_key(statement: str, paths: list[str]) -> tuple:
+    return statement, tuple([(x, table_version(x)) for x in paths])
+
+
+# METHOD:       lookup()
+# DESCRIPTION:  Finds the cached result of a statement and marks it as the most recently used
+# ARGUMENTS:    key - the key created by cache_key()
+# RETURNS:      The CachedResult, or None if the result is not cached
+def lookup(key: tuple):
+    global hits
+    global misses
+
+    with lock:
+        result = entries.get(key)
+
+        if result is None:
+            misses += 1
+            return None
+
+        hits += 1
+        entries.move_to_end(key)
+
+    return result
+
+
+# METHOD:       store()
+# DESCRIPTION:  Caches the result of a statement, evicting the least recently used results
+#               until the cache is within its capacity
+# ARGUMENTS:    key - the key created by cache_key()
+#               output - the text printed by the statement
+#               rows - the number of rows returned by the statement
+# RETURNS:      N/A
+def store(key: tuple, output: str, rows: int):
+    global used
+    global evictions
+
+    result = CachedResult(output, rows, sys.getsizeof(output) + sys.getsizeof(key[0]))
+
+    # Results larger than the whole cache are not worth evicting everything for
+    if result.size > capacity:
+        return
+
+    with lock:
+        # Results of earlier versions of the same statement can no longer be hit
+        stale = [x for x in entries if x[0] == key[0]]
+        for x in stale:
+            used -= entries.pop(x).size
+
+        entries[key] = result
+        used += result.size
+
+        while used > capacity:
+            _, evicted = entries.popitem(last=False)
+            used -= evicted.size
+            evictions += 1
+
+
+# METHOD:       show_cache()
+# DESCRIPTION:  Prints the counters of the result cache
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def show_cache():
+    print('entries|bytes used|capacity|hits|misses|evictions')
+    print(f'{len(entries)}|{used}|{capacity}|{hits}|{misses}|{evictions}')
+
+
+# endregion
+
+# METHOD:       ch_init()
+# DESCRIPTION:  Initializes the result cache global variables used by the program
+# ARGUMENTS:    capacity_mb - the most memory in megabytes the cached results may use, None disables the cache
+# RETURNS:      N/A
+def ch_init(capacity_mb: float = None):
+    global enabled
+    global capacity
+    global entries
+    global used
+    global versions
+    global hits
+    global misses
+    global evictions
+
+    enabled = capacity_mb is not None and capacity_mb > 0
+    capacity = int(capacity_mb * 1024 * 1024) if enabled else 0
+    entries = OrderedDict()
+    used = 0
+    versions = {}
+    hits = 0
+    misses = 0
+    evictions = 0
+
+    if enabled:
+        logging.info(f'Result cache enabled with a capacity of {capacity} bytes')
@@ -0,0 +1,229 @@
+# FILE NAME:    _CANCEL.PY
+# MODULE NAME:  Cancel
+# DESCRIPTION:  Provides statement timeouts and the cancellation of statements with Ctrl-C. A statement
+#               is never stopped part of the way through an operation, the operators that read or join
+#               rows check every so many rows whether the statement was cancelled and raise an exception
+#               that unwinds it, releasing its locks, memory and temporary files as it goes. Statements
+#               only stop where their operators check, so the changes of a statement to the table files
+#               are either written whole or not written at all.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import contextlib
+import logging
+import re
+import signal
+import time
+from dataclasses import dataclass, field
+import _session as _ss
+
+# Runtime Constants Variables
+# CHECK_INTERVAL - the number of rows an operator processes between checks of whether its statement was cancelled
+# CANCELLABLE_STATEMENTS - the statements that are stopped when they are cancelled, any other statement finishes,
+#                          including when they are explained
+# TIMEOUT_REASON - the reason a statement that ran past the session's statement_timeout was cancelled
+# INTERRUPT_REASON - the reason a statement cancelled with Ctrl-C was cancelled
+# UNITS - the milliseconds in each unit of a timeout, a timeout without a unit is in milliseconds
+# DURATION - a timeout, such as 500, 5s or 2min
+CHECK_INTERVAL = 1024
+CANCELLABLE_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+TIMEOUT_REASON = 'the statement timeout'
+INTERRUPT_REASON = 'the user'
+UNITS = {'MS': 1, 'S': 1000, 'MIN': 60 * 1000, 'H': 60 * 60 * 1000}
+DURATION = re.compile(r'(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>MS|S|MIN|H)?', re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to cancel statements
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# StatementCancelled Class
+#
+# Description:
+# When an operator finds that its statement was cancelled, this exception will be raised
+class StatementCancelled(Exception):
+    pass
+
+
+# Cancellation Class
+#
+# Member Variables:
+# deadline:     The time.perf_counter() time the statement is cancelled at, or None if it has no timeout
+# reason:       Why the statement was cancelled, or None if it has not been
+# rows:         The number of rows processed by the statement's operators, counted as they check
+# shielded:     The number of operations of the statement that can not be stopped part of the way through
+# parent:       The Cancellation of the statement that was executing when this one started
+#
+# Description:
+# Describes whether a single statement was cancelled. A statement executed by another statement,
+# such as the statements of a script, is stopped along with the statement that executes it.
+@dataclass
+class Cancellation:
+    deadline: float = None
+    reason: str = None
+    rows: int = 0
+    shielded: int = 0
+    parent: 'Cancellation' = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    # The time the statement has been executing in milliseconds
+    def elapsed(self) -> int:
+        return int((time.perf_counter() - self._start) * 1000)
+
+
+# endregion
+
+# region CANCELLATION
+
+# REGION:       CANCELLATION
+# DESCRIPTION:  Provides methods for cancelling statements and checking whether they were cancelled
+
+# --------- METHODS --------- #
+
+
+# METHOD:       statement()
+# DESCRIPTION:  Makes the statement being executed by the current session cancellable for the body of the
+#               'with' statement it is used in. A statement that can not be stopped is shielded throughout.
+# ARGUMENTS:    text - the text of the statement
+# RETURNS:      A context manager that yields the statement's Cancellation
+@contextlib.contextmanager
+def statement(text: str):
+    session = _ss.current()
+
+    # A statement executed by a cancelled statement is not started
+    reason = cancelled(session.cancellation)
+    if reason is not None:
+        raise StatementCancelled(reason)
+
+    timeout = session.statement_timeout
+    cancellation = Cancellation(parent=session.cancellation)
+    cancellation.deadline = cancellation._start + timeout / 1000 if timeout is not None else None
+    cancellation.shielded = 0 if _ss.statement_verb(text) in CANCELLABLE_STATEMENTS else 1
+    session.cancellation = cancellation
+
+    try:
+        yield cancellation
+    finally:
+        session.cancellation = cancellation.parent
+        if cancellation.parent is not None:
+            cancellation.parent.rows += cancellation.rows
+
+
+# METHOD:       shield()
+# DESCRIPTION:  Keeps the statement being executed from being stopped for the body of the 'with' statement
+#               it is used in, which is used while a statement writes its changes to the table files
+# ARGUMENTS:    N/A
+# RETURNS:      A context manager the operation is executed in
+@contextlib.contextmanager
+def shield():
+    cancellation = _ss.current().cancellation
+    if cancellation is None:
+        yield
+        return
+
+    cancellation.shielded += 1
+    try:
+        yield
+    finally:
+        cancellation.shielded -= 1
+
+
+# METHOD:       check()
+# DESCRIPTION:  Stops the statement being executed if it was cancelled or ran past its timeout
+#               Operators call it every CHECK_INTERVAL rows, so that checking costs next to nothing
+# ARGUMENTS:    rows - the number of rows processed since the last check
+# RETURNS:      N/A
+def check(rows: int = CHECK_INTERVAL):
+    cancellation = _ss.current().cancellation
+    if cancellation is None:
+        return
+
+    cancellation.rows += rows
+    if cancellation.shielded > 0:
+        return
+
+    if cancellation.reason is None and cancellation.deadline is not None \
+            and time.perf_counter() > cancellation.deadline:
+        cancellation.reason = TIMEOUT_REASON
+
+    reason = cancelled(cancellation)
+    if reason is not None:
+        raise StatementCancelled(reason)
+
+
+# METHOD:       cancelled()
+# DESCRIPTION:  Finds whether a statement or any statement executing it was cancelled
+# ARGUMENTS:    cancellation - the Cancellation of the statement, or None
+# RETURNS:      The reason the statement was cancelled, or None if it was not
+def cancelled(cancellation: Cancellation):
+    while cancellation is not None:
+        if cancellation.reason is not None:
+            return cancellation.reason
+        cancellation = cancellation.parent
+
+    return None
+
+
+# METHOD:       interrupt()
+# DESCRIPTION:  Handles Ctrl-C by cancelling the statement the program's own input is executing
+#               When no statement is executing, Ctrl-C stops the program as it otherwise would
+# ARGUMENTS:    signum - the number of the signal
+#               frame - the frame that was executing when the signal was received
+# RETURNS:      N/A
+def interrupt(signum, frame):
+    cancellation = _ss.default.cancellation
+    if cancellation is None:
+        signal.default_int_handler(signum, frame)
+
+    logging.info('Cancelling the statement being executed')
+
+    while cancellation is not None:
+        cancellation.reason = INTERRUPT_REASON
+        cancellation = cancellation.parent
+
+
+# METHOD:       parse_duration()
+# DESCRIPTION:  Parses a timeout, such as 500, 5s or 2min, which is in milliseconds without a unit
+# ARGUMENTS:    text - the timeout
+# RETURNS:      The timeout in milliseconds, or None if it is invalid
+def parse_duration(text: str):
+    match = DURATION.fullmatch(text.strip().strip("'").strip())
+    if match is None:
+        return None
+
+    return int(float(match['number']) * UNITS[(match['unit'] or 'MS').upper()])
+
+
+# METHOD:       set_statement_timeout()
+# DESCRIPTION:  Sets how long the statements of the current session execute before they are cancelled
+# ARGUMENTS:    value - the timeout, 0 or DEFAULT to let statements execute for as long as they need
+# RETURNS:      N/A
+def set_statement_timeout(value: str):
+    session = _ss.current()
+
+    if value.strip("'").upper() == 'DEFAULT':
+        session.statement_timeout = None
+        print('statement_timeout reset to the default.')
+        return
+
+    timeout = parse_duration(value)
+    if timeout is None:
+        print(f'!Failed because "{value}" is not a valid timeout, expected a duration such as 5000 or 5s.')
+        return
+
+    session.statement_timeout = timeout if timeout > 0 else None
+    logging.info(f'Set statement_timeout of session {session.id} to {timeout} ms')
+    print(f'statement_timeout set to {timeout} ms.' if timeout > 0 else 'statement_timeout disabled.')
+
+
+# endregion
+
+# METHOD:       cn_init()
+# DESCRIPTION:  Initializes the cancellation of statements, which are cancelled by Ctrl-C from then on
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def cn_init():
+    signal.signal(signal.SIGINT, interrupt)
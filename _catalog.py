@@ -0,0 +1,526 @@
+# FILE NAME:    _CATALOG.PY
+# MODULE NAME:  Catalog
+# DESCRIPTION:  Provides the catalog of the database being used, which holds the path, metadata,
+#               fields, types and storage of every table. The catalog is kept in a file in the
+#               database's folder, loaded when the database is used, shared by every session using
+#               the database and updated by every
+#               statement that creates, alters or drops a table, so statements read the metadata
+#               of tables from memory instead of from the table files. Fields are added to and
+#               dropped from a table without rewriting its file, by keeping the layout of the rows
+#               stored in the file alongside it until the rows are rewritten.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+import _globals as _gl
+import _storage as _sto
+import _partition as _pt
+import _session as _ss
+
+# Internal global variables
+# catalogs - maps the folder of each database whose catalog has been loaded to its Catalog
+catalogs = {}
+
+# Runtime Constants Variables
+# CATALOG_FILE_NAME - the name of the file in each database's folder that holds its catalog
+# STORAGE_TYPES - how the records of a table are stored: in its own file, in the files of its partitions,
+#                 in the file of a partition of another table, or as the records of a materialized view
+CATALOG_FILE_NAME = 'catalog.cat'
+STORAGE_TYPES = ('rows', 'partitioned', 'partition', 'view')
+
+# DEFAULT_VALUES - the value of an added field without a DEFAULT in the rows stored before it was added, by type
+DEFAULT_VALUES = {'int': '0', 'float': '0.0', 'str': ''}
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to describe the tables of a database
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# TableEntry Class
+#
+# Member Variables:
+# name:     The name of the table, which is the name of its file without the extension
+# path:     The path of the table file
+# meta:     The table metadata string, held by the first line of the table file until the table is altered
+# fields:   The names of the table's fields, in the order of their positions within a record
+# types:    The python type names of the table's fields
+# storage:  How the table's records are stored, one of STORAGE_TYPES
+# scheme:   The PartitionScheme of a partitioned table, or None
+# layout:   The Layout of the rows stored in the table file, or None if the rows hold the fields of the metadata
+#
+# Description:
+# Describes a single table of the database being used
+@dataclass
+class TableEntry:
+    name: str
+    path: str
+    meta: str
+    fields: list[str] = field(default_factory=list)
+    types: list[str] = field(default_factory=list)
+    storage: str = 'rows'
+    scheme: _pt.PartitionScheme = None
+    layout: 'Layout' = None
+
+
+# Catalog Class
+#
+# Member Variables:
+# folder:   The path of the folder of the database
+# tables:   Maps the name of each table in the catalog to its TableEntry
+# schemas:  Maps the metadata string of each table in the catalog to its fields and types
+#
+# Description:
+# Holds the catalog of a single database, which every session using the database shares
+@dataclass
+class Catalog:
+    folder: str
+    tables: dict[str, TableEntry] = field(default_factory=dict)
+    schemas: dict[str, tuple[list[str], list[str]]] = field(default_factory=dict)
+
+
+# Layout Class
+#
+# Member Variables:
+# version:      The version of the table's schema, incremented by every field added or dropped
+# columns:      The definition of every field stored in the rows of the table file, such as 'a1 int',
+#               including the fields that have been dropped since the rows were last rewritten
+# dropped:      The positions of the dropped fields within the stored rows
+# defaults:     The value of each added field in the rows stored before it was added, keyed by position
+# meta:         The table metadata string of the fields that have not been dropped
+# positions:    The position of each field that has not been dropped within the stored rows
+# types:        The python type names of every stored field
+# fill:         The value of every stored field in a row too short to hold it
+#
+# Description:
+# Describes how the rows of a table file are stored after fields were added to or dropped from
+# the table. Rows stored before a field was added are shorter than the rows stored after it,
+# and the values of dropped fields are kept in the rows until they are rewritten.
+@dataclass
+class Layout:
+    version: int
+    columns: list[str]
+    dropped: set[int] = field(default_factory=set)
+    defaults: dict[int, str] = field(default_factory=dict)
+    meta: str = field(init=False)
+    positions: list[int] = field(init=False)
+    types: list[str] = field(init=False)
+    fill: list[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.positions = [i for i in range(len(self.columns)) if i not in self.dropped]
+        self.meta = '|'.join([self.columns[i] for i in self.positions])
+        self.types = parse_meta('|'.join(self.columns))[1]
+        self.fill = [self.defaults.get(i, '') for i in range(len(self.columns))]
+
+    # Converts the string representation of a record into the row stored in the table file,
+    # which holds an empty value for each dropped field
+    def encode(self, line: str) -> str:
+        if len(self.dropped) < 1:
+            return line
+
+        row = [''] * len(self.columns)
+        for position, value in zip(self.positions, line.split('|')):
+            row[position] = value
+
+        return '|'.join(row)
+
+
+# endregion
+
+# region CATALOG
+
+# REGION:       CATALOG
+# DESCRIPTION:  Provides methods for loading, saving, reading and changing the catalog
+
+# --------- METHODS --------- #
+
+
+# METHOD:       parse_meta()
+# DESCRIPTION:  Parses the field names and types out of a table metadata string
+# ARGUMENTS:    meta - the table metadata string
+# RETURNS:      A tuple of the list of field names and the list of python type names of the fields
+def parse_meta(meta: str) -> tuple[list[str], list[str]]:
+    # The field names are the words followed by a type, any type that is not a number is a str
+    fields = re.findall(r'\w+(?=\s\w+)', meta)
+    types = [x if x in ('int', 'float') else 'str' for x in re.findall(r'(?<=\w\s)\w+', meta)]
+
+    return fields, types
+
+
+# METHOD:       current()
+# DESCRIPTION:  Finds the catalog of the database used by the current session
+# ARGUMENTS:    N/A
+# RETURNS:      The Catalog of the database, or None if no database is being used
+def current():
+    return _ss.current().catalog
+
+
+# METHOD:       load()
+# DESCRIPTION:  Loads the catalog of a database for the current session. The catalog is checked against the
+#               table files in the database's folder, so tables whose files are missing are removed from it and
+#               tables created without it, such as by an earlier version of the program, are read from their files.
+#               A catalog already loaded by another session is loaded again in place, so the sessions share it.
+# ARGUMENTS:    path - the path of the database's folder
+# RETURNS:      N/A
+def load(path: str):
+    catalog = catalogs.setdefault(path, Catalog(path))
+    catalog.tables.clear()
+    catalog.schemas.clear()
+    _ss.current().catalog = catalog
+    tables = catalog.tables
+
+    # names - the name of each table file in the database's folder
+    names = {os.path.splitext(x)[0] for x in os.listdir(path) if x.endswith(_gl.TABLE_FILE_TYPE)}
+    changed = False
+
+    try:
+        with open(os.path.join(path, CATALOG_FILE_NAME), 'r') as f:
+            for line in f:
+                name, storage, meta = line.rstrip('\n').split('|', 2)
+                if name in names:
+                    add_entry(name, meta, storage)
+                else:
+                    changed = True
+    except FileNotFoundError:
+        changed = len(names) > 0
+
+    for name in sorted(names - tables.keys()):
+        table_path = os.path.join(path, name + _gl.TABLE_FILE_TYPE)
+        with open(table_path, 'r') as f:
+            meta = f.readline().strip()
+
+        # The first line of an altered table file holds the fields of its rows rather than its metadata
+        table_layout = read_layout(table_path)
+        add_entry(name, table_layout.meta if table_layout is not None else meta, storage_type(table_path))
+        changed = True
+
+    if changed:
+        save()
+
+    logging.info(f'Loaded the catalog of {path} with {len(tables)} tables')
+
+
+# METHOD:       unload()
+# DESCRIPTION:  Unloads the catalog of the current session when it uses no database
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def unload():
+    _ss.current().catalog = None
+
+
+# METHOD:       discard()
+# DESCRIPTION:  Discards the catalog of a database that has been dropped
+# ARGUMENTS:    path - the path of the database's folder
+# RETURNS:      N/A
+def discard(path: str):
+    catalogs.pop(path, None)
+
+    if current() is not None and current().folder == path:
+        unload()
+
+
+# METHOD:       save()
+# DESCRIPTION:  Writes the catalog to its file. The catalog is written to a temporary file that then
+#               replaces the catalog file, so the file always holds either the old or the new catalog.
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def save():
+    catalog = current()
+    if catalog is None or not os.path.isdir(catalog.folder):
+        return
+
+    path = os.path.join(catalog.folder, CATALOG_FILE_NAME)
+
+    with open(f'{path}.tmp', 'w') as f:
+        for entry in sorted(catalog.tables.values(), key=lambda x: x.name):
+            f.write(f'{entry.name}|{entry.storage}|{entry.meta}\n')
+
+    os.replace(f'{path}.tmp', path)
+
+
+# METHOD:       storage_type()
+# DESCRIPTION:  Finds how the records of a table are stored from the files stored alongside its file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      One of STORAGE_TYPES
+def storage_type(path: str) -> str:
+    if os.path.isfile(_sto.sidecar_path(path, _sto.PARTITION_FILE_TYPE)):
+        return 'partitioned'
+    if os.path.isfile(_sto.sidecar_path(path, _sto.MATVIEW_FILE_TYPE)):
+        return 'view'
+    if _pt.parent_path(path) != path:
+        return 'partition'
+
+    return 'rows'
+
+
+# METHOD:       add_entry()
+# DESCRIPTION:  Adds a table to the catalog held in memory
+# ARGUMENTS:    name - the name of the table
+#               meta - the table metadata string
+#               storage - how the table's records are stored, one of STORAGE_TYPES
+# RETURNS:      The TableEntry of the table
+def add_entry(name: str, meta: str, storage: str) -> TableEntry:
+    catalog = current()
+    path = os.path.join(catalog.folder, name + _gl.TABLE_FILE_TYPE)
+    entry = TableEntry(name, path, meta, *parse_meta(meta), storage)
+
+    if storage == 'partitioned':
+        entry.scheme = _pt.read_scheme(path)
+    entry.layout = read_layout(path)
+
+    catalog.tables[name] = entry
+    catalog.schemas[meta] = (entry.fields, entry.types)
+
+    return entry
+
+
+# METHOD:       lookup()
+# DESCRIPTION:  Finds a table in the catalog
+# ARGUMENTS:    name - the name of the table
+# RETURNS:      The TableEntry of the table, or None if the catalog has no such table
+def lookup(name: str):
+    catalog = current()
+
+    return catalog.tables.get(name.lower()) if catalog is not None and isinstance(name, str) else None
+
+
+# METHOD:       lookup_path()
+# DESCRIPTION:  Finds a table in the catalog by the path of its file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The TableEntry of the table, or None if the catalog has no such table
+def lookup_path(path: str):
+    catalog = current()
+    if catalog is None or os.path.dirname(path) != catalog.folder:
+        return None
+
+    return catalog.tables.get(os.path.splitext(os.path.basename(path))[0])
+
+
+# METHOD:       register()
+# DESCRIPTION:  Adds a table whose file has been created to the catalog and saves the catalog
+# ARGUMENTS:    path - the path of the table file
+#               meta - the table metadata string
+#               storage - how the table's records are stored, one of STORAGE_TYPES
+# RETURNS:      N/A
+def register(path: str, meta: str, storage: str = 'rows'):
+    catalog = current()
+    if catalog is None or os.path.dirname(path) != catalog.folder:
+        return
+
+    add_entry(os.path.splitext(os.path.basename(path))[0], meta, storage)
+    save()
+
+
+# METHOD:       unregister()
+# DESCRIPTION:  Removes tables whose files have been deleted from the catalog and saves the catalog
+# ARGUMENTS:    paths - the paths of the table files
+# RETURNS:      N/A
+def unregister(paths: list[str]):
+    catalog = current()
+    if catalog is None:
+        return
+
+    for path in paths:
+        entry = lookup_path(path)
+        if entry is not None:
+            del catalog.tables[entry.name]
+
+    # The schemas are shared by tables with the same metadata, such as the partitions of a table
+    catalog.schemas.clear()
+    for entry in catalog.tables.values():
+        catalog.schemas[entry.meta] = (entry.fields, entry.types)
+
+    save()
+
+
+# METHOD:       alter()
+# DESCRIPTION:  Changes the metadata or partition scheme of tables in the catalog and saves the catalog
+# ARGUMENTS:    paths - the paths of the table files
+#               meta - the new table metadata string, or None to keep the metadata
+#               scheme - the new PartitionScheme, or None to keep the scheme
+# RETURNS:      N/A
+def alter(paths: list[str], meta: str = None, scheme: _pt.PartitionScheme = None):
+    for path in paths:
+        entry = lookup_path(path)
+        if entry is None:
+            continue
+        if meta is not None:
+            entry.meta = meta
+            entry.fields, entry.types = parse_meta(meta)
+            current().schemas[meta] = (entry.fields, entry.types)
+        if scheme is not None:
+            entry.scheme = scheme
+
+    save()
+
+
+# METHOD:       scheme()
+# DESCRIPTION:  Finds the partition scheme of a table without reading its partition file
+#               when the table is in the catalog
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The PartitionScheme of the table, or None if the table is not partitioned
+def scheme(path: str):
+    entry = lookup_path(path)
+
+    if entry is None:
+        return _pt.read_scheme(path)
+
+    return entry.scheme
+
+
+# endregion
+
+# region SCHEMA VERSIONS
+
+# REGION:       SCHEMA VERSIONS
+# DESCRIPTION:  Provides methods for adding and dropping the fields of a table by changing only the layout
+#               of its rows, which is kept in a file alongside the table file until its rows are rewritten
+
+# --------- METHODS --------- #
+
+
+# METHOD:       read_layout()
+# DESCRIPTION:  Reads the layout of the rows of a table file from the file stored alongside it
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The Layout of the table file's rows, or None if the rows hold the fields of the table's metadata
+def read_layout(path: str):
+    try:
+        with open(_sto.sidecar_path(path, _sto.SCHEMA_FILE_TYPE), 'r') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+
+    # The first line holds the version, every line after it holds a stored field,
+    # whether it has been dropped and its value in the rows stored before it was added
+    columns = []
+    dropped = set()
+    defaults = {}
+
+    for position, line in enumerate(lines[1:]):
+        definition, is_dropped, default = line.split('|', 2)
+        columns.append(definition)
+        if is_dropped == '1':
+            dropped.add(position)
+        if default:
+            defaults[position] = default
+
+    return Layout(int(lines[0]), columns, dropped, defaults)
+
+
+# METHOD:       write_layout()
+# DESCRIPTION:  Writes the layout of the rows of a table file to the file stored alongside it
+#               and changes the metadata of the table in the catalog to match it
+# ARGUMENTS:    path - the path of the table file
+#               table_layout - the Layout of the table file's rows
+# RETURNS:      N/A
+def write_layout(path: str, table_layout: Layout):
+    lines = [str(table_layout.version)]
+    for position, definition in enumerate(table_layout.columns):
+        lines.append(f'{definition}|{int(position in table_layout.dropped)}|{table_layout.defaults.get(position, "")}')
+
+    with open(_sto.sidecar_path(path, _sto.SCHEMA_FILE_TYPE), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    entry = lookup_path(path)
+    if entry is not None:
+        entry.layout = table_layout
+        entry.meta = table_layout.meta
+        entry.fields, entry.types = parse_meta(table_layout.meta)
+        current().schemas[entry.meta] = (entry.fields, entry.types)
+
+    logging.info(f'Altered {path} to version {table_layout.version} of its schema')
+
+
+# METHOD:       layout()
+# DESCRIPTION:  Finds the layout of the rows of a table file, without reading the file stored alongside it
+#               when the table is in the catalog
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The Layout of the table file's rows, or None if the rows hold the fields of the table's metadata
+def layout(path: str):
+    entry = lookup_path(path)
+
+    if entry is None:
+        return read_layout(path)
+
+    return entry.layout
+
+
+# METHOD:       current_layout()
+# DESCRIPTION:  Finds the layout of the rows of a table file, describing rows that hold the fields
+#               of the table's metadata when the table has not been altered since they were written
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The Layout of the table file's rows
+def current_layout(path: str) -> Layout:
+    table_layout = layout(path)
+    if table_layout is not None:
+        return table_layout
+
+    entry = lookup_path(path)
+    if entry is not None:
+        meta = entry.meta
+    else:
+        with open(path, 'r') as f:
+            meta = f.readline().strip()
+
+    return Layout(0, meta.split('|'))
+
+
+# METHOD:       add_field()
+# DESCRIPTION:  Adds a field to tables without rewriting their files. The field is added to the end of the
+#               layout of each file's rows, so the rows stored before it was added are read with its default.
+# ARGUMENTS:    paths - the paths of the table files
+#               definition - the definition of the field, such as 'a3 float'
+#               default - the string representation of the field's value in the rows stored before it was added
+# RETURNS:      N/A
+def add_field(paths: list[str], definition: str, default: str):
+    for path in paths:
+        table_layout = current_layout(path)
+        defaults = dict(table_layout.defaults)
+        defaults[len(table_layout.columns)] = default
+        write_layout(path, Layout(table_layout.version + 1, table_layout.columns + [definition],
+                                  set(table_layout.dropped), defaults))
+
+    save()
+
+
+# METHOD:       drop_field()
+# DESCRIPTION:  Drops a field from tables without rewriting their files. The field's values are kept in the
+#               rows and skipped when the rows are read, until the rows are rewritten.
+# ARGUMENTS:    paths - the paths of the table files
+#               name - the name of the field
+# RETURNS:      N/A
+def drop_field(paths: list[str], name: str):
+    for path in paths:
+        table_layout = current_layout(path)
+        position = next(x for x in table_layout.positions if table_layout.columns[x].split()[0] == name)
+        write_layout(path, Layout(table_layout.version + 1, list(table_layout.columns),
+                                  table_layout.dropped | {position}, dict(table_layout.defaults)))
+
+    save()
+
+
+# METHOD:       clear_layout()
+# DESCRIPTION:  Deletes the layout of the rows of a table file once its rows have been rewritten
+#               to hold the fields of the table's metadata
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      N/A
+def clear_layout(path: str):
+    try:
+        os.remove(_sto.sidecar_path(path, _sto.SCHEMA_FILE_TYPE))
+    except FileNotFoundError:
+        return
+
+    entry = lookup_path(path)
+    if entry is not None:
+        entry.layout = None
+
+    logging.info(f'Rewrote the rows of {path} in the newest version of its schema')
+
+
+# endregion
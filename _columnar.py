@@ -0,0 +1,415 @@
+# FILE NAME:    _COLUMNAR.PY
+# MODULE NAME:  Columnar
+# DESCRIPTION:  Provides an optional execution mode that loads tables into column
+#               batches backed by NumPy arrays and evaluates conditions and
+#               aggregates over whole columns at once
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import ast
+import logging
+import operator
+import os
+from dataclasses import dataclass, field
+import _dbmanagement as _db
+import _profiler as _pf
+import _storage as _sto
+
+# NumPy is an optional dependency, the columnar mode is unavailable without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Internal global variables
+# enabled - whether selections are attempted with column batches before falling back to records
+# batch_size - the number of records loaded into each column batch
+enabled = False
+batch_size = 65536
+
+# COMPARISONS - maps the comparison operators of a condition to the functions that perform them
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to represent batches of columns
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# ColumnBatch Class
+#
+# Member Variables:
+# size:         The number of records in the batch
+# types:        Maps each field name to its python type name
+# columns:      Maps each field name to its array. Numbers are stored in int64 or float64 arrays,
+#               strings are stored as an array of codes into the field's dictionary
+# dictionaries: Maps each string field name to the sorted array of its distinct values
+#
+# Description:
+# Holds a batch of records from a table in columnar form. Since each dictionary is sorted,
+# the order of the codes is the same as the order of the strings they represent.
+@dataclass
+class ColumnBatch:
+    size: int = 0
+    types: dict = field(default_factory=dict)
+    columns: dict = field(default_factory=dict)
+    dictionaries: dict = field(default_factory=dict)
+
+    # Returns the values of a field as an array, decoding strings from the field's dictionary
+    def values(self, name: str):
+        if name in self.dictionaries:
+            return self.dictionaries[name][self.columns[name]]
+        return self.columns[name]
+
+
+# endregion
+
+# region BATCHES
+
+# REGION:       BATCHES
+# DESCRIPTION:  Provides methods for loading tables into column batches
+
+# --------- METHODS --------- #
+
+
+# METHOD:       scan_batches()
+# DESCRIPTION:  Reads a table file into column batches
+# ARGUMENTS:    path - the path of the table file
+#               needed - the names of the fields to load, or None to load every field
+# RETURNS:      A tuple of the table's schema, the list of field names and a generator of ColumnBatch objects
+def scan_batches(path: str, needed: set = None):
+    with open(path, 'r') as f:
+        data = [line for line in f.readlines() if not line.startswith('&')]
+        nbytes = os.fstat(f.fileno()).st_size
+
+    if len(data) < 1:
+        return '', [], iter(())
+
+    meta = data[0].strip()
+    fields, types = _db.parse_table_meta(meta)
+    lines = data[1:]
+
+    # Deleted rows are skipped before they are loaded
+    dead = _sto.read_tombstones(path)
+    if len(dead) > 0:
+        lines = [line for row_id, line in enumerate(lines) if row_id not in dead]
+
+    _pf.count_scanned(len(lines), nbytes)
+
+    return meta, fields, (load_batch(lines[i:i + batch_size], fields, types, needed)
+                          for i in range(0, len(lines), batch_size))
+
+
+# METHOD:       load_batch()
+# DESCRIPTION:  Converts the string representations of a list of records into a column batch
+# ARGUMENTS:    lines - the records as they are read from the table file
+#               fields - the field names of the table
+#               types - the python type names of the fields
+#               needed - the names of the fields to load, or None to load every field
+# RETURNS:      A ColumnBatch holding the records
+def load_batch(lines: list[str], fields: list[str], types: list[str], needed: set = None) -> ColumnBatch:
+    batch = ColumnBatch(len(lines), dict(zip(fields, types)))
+
+    # Splits every record at once and slices out one list of strings per field
+    # If any record has the wrong number of values, the records are split one at a time instead
+    values = '|'.join([line.strip() for line in lines]).split('|')
+    if len(values) == len(lines) * len(fields):
+        columns = [values[i::len(fields)] for i in range(len(fields))]
+    else:
+        columns = list(zip(*[line.strip().split('|') for line in lines])) or [()] * len(fields)
+
+    # Numbers are parsed by NumPy, strings are dictionary encoded
+    # Fields that are not needed are never converted
+    for name, field_type, column in zip(fields, types, columns):
+        if needed is not None and name not in needed:
+            continue
+        if field_type == 'int':
+            batch.columns[name] = np.array(column, dtype=np.int64)
+        elif field_type == 'float':
+            batch.columns[name] = np.array(column, dtype=np.float64)
+        else:
+            batch.dictionaries[name], batch.columns[name] = np.unique(np.array(column, dtype=object),
+                                                                      return_inverse=True)
+
+    return batch
+
+
+# endregion
+
+# region PREDICATES
+
+# REGION:       PREDICATES
+# DESCRIPTION:  Provides methods for turning conditions into functions that evaluate
+#               a whole column batch to a boolean mask
+
+# --------- METHODS --------- #
+
+
+# METHOD:       compile_predicate()
+# DESCRIPTION:  Compiles a condition into a function that evaluates a batch into a boolean mask
+# ARGUMENTS:    condition - the condition as a string
+# RETURNS:      The function, or None if the condition can not be vectorized
+def compile_predicate(condition: str):
+    try:
+        tree = ast.parse(condition or 'True', mode='eval')
+    except SyntaxError:
+        return None
+
+    return compile_node(tree.body)
+
+
+# METHOD:       referenced_fields()
+# DESCRIPTION:  Finds the names of the fields used by a condition
+# ARGUMENTS:    condition - the condition as a string
+# RETURNS:      The set of field names
+def referenced_fields(condition: str) -> set:
+    try:
+        tree = ast.parse(condition or 'True', mode='eval')
+    except SyntaxError:
+        return set()
+
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+# METHOD:       compile_node()
+# DESCRIPTION:  Compiles a node of a condition's syntax tree into a function that evaluates a batch
+# ARGUMENTS:    node - the syntax tree node
+# RETURNS:      The function, or None if the node can not be vectorized
+def compile_node(node):
+    # Constant conditions such as 'True'
+    if isinstance(node, ast.Constant) and isinstance(node.value, bool):
+        return lambda batch: np.full(batch.size, node.value)
+
+    # 'and' and 'or' combine the masks of each of their operands
+    if isinstance(node, ast.BoolOp):
+        operands = [compile_node(x) for x in node.values]
+        if None in operands:
+            return None
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return lambda batch: combine.reduce([x(batch) for x in operands])
+
+    # 'not' inverts the mask of its operand
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = compile_node(node.operand)
+        return None if operand is None else lambda batch: ~operand(batch)
+
+    # Comparisons such as 'a < 5' or chained comparisons such as '1 < a < 5'
+    if isinstance(node, ast.Compare):
+        terms = [node.left] + node.comparators
+        comparisons = [compile_comparison(terms[i], op, terms[i + 1]) for i, op in enumerate(node.ops)]
+        if None in comparisons:
+            return None
+        return lambda batch: np.logical_and.reduce([x(batch) for x in comparisons])
+
+    return None
+
+
+# METHOD:       compile_comparison()
+# DESCRIPTION:  Compiles a single comparison between fields and literals
+# ARGUMENTS:    left - the syntax tree node on the left of the operator
+#               op - the comparison operator node
+#               right - the syntax tree node on the right of the operator
+# RETURNS:      The function, or None if the comparison can not be vectorized
+def compile_comparison(left, op, right):
+    compare = COMPARISONS.get(type(op))
+    if compare is None:
+        return None
+
+    # Literals on the left are moved to the right by mirroring the operator
+    if isinstance(left, ast.Constant) and isinstance(right, ast.Name):
+        mirrored = {ast.Lt: ast.Gt(), ast.LtE: ast.GtE(), ast.Gt: ast.Lt(), ast.GtE: ast.LtE()}
+        return compile_comparison(right, mirrored.get(type(op), op), left)
+
+    if not isinstance(left, ast.Name):
+        return None
+
+    name = left.id
+
+    # Comparison between two fields of the batch
+    if isinstance(right, ast.Name):
+        def compare_fields(batch):
+            if name not in batch.columns or right.id not in batch.columns:
+                raise KeyError(name if name not in batch.columns else right.id)
+            if (batch.types[name] == 'str') != (batch.types[right.id] == 'str'):
+                raise TypeError(f'{name} and {right.id} can not be compared')
+            return compare(batch.values(name), batch.values(right.id))
+        return compare_fields
+
+    if not isinstance(right, ast.Constant) or isinstance(right.value, bool):
+        return None
+
+    literal = right.value
+
+    # Comparison between a field and a literal
+    def compare_literal(batch):
+        if name not in batch.columns:
+            raise KeyError(name)
+
+        is_string = batch.types[name] == 'str'
+        if is_string != isinstance(literal, str):
+            raise TypeError(f'{name} can not be compared to {literal!r}')
+
+        if not is_string:
+            return compare(batch.columns[name], literal)
+
+        # Strings are compared by their codes, the sorted dictionary gives the code the literal would have
+        dictionary = batch.dictionaries[name]
+        codes = batch.columns[name]
+        left_code = np.searchsorted(dictionary, literal, 'left')
+        right_code = np.searchsorted(dictionary, literal, 'right')
+        match type(op):
+            case ast.Eq:
+                return codes == left_code if left_code < right_code else np.zeros(batch.size, dtype=bool)
+            case ast.NotEq:
+                return codes != left_code if left_code < right_code else np.ones(batch.size, dtype=bool)
+            case ast.Lt:
+                return codes < left_code
+            case ast.LtE:
+                return codes < right_code
+            case ast.Gt:
+                return codes >= right_code
+            case _:
+                return codes >= left_code
+
+    return compare_literal
+
+
+# endregion
+
+# region SELECTION
+
+# REGION:       SELECTION
+# DESCRIPTION:  Provides methods for selecting and aggregating records from column batches
+
+# --------- METHODS --------- #
+
+
+# METHOD:       select()
+# DESCRIPTION:  Selects fields from the records of a table file that satisfy a condition
+# ARGUMENTS:    path - the path of the table file
+#               fields - the fields to select, or ['*'] for every field
+#               condition - the condition as a string
+# RETURNS:      A tuple of the schema of the selected fields and the list of selected records,
+#               or None if the selection could not be vectorized
+def select(path: str, fields: list[str], condition: str):
+    predicate = compile_predicate(condition)
+    if predicate is None:
+        return None
+
+    meta, table_fields, batches = scan_batches(path, None if '*' in fields else
+                                               set(fields) | referenced_fields(condition))
+    fields = table_fields if '*' in fields else fields
+
+    if any(x not in table_fields for x in fields):
+        return None
+
+    schema = meta.split('|')
+    records = []
+
+    try:
+        with _pf.operator('columnar filter') as op:
+            for batch in batches:
+                # Only the records that satisfy the condition are converted back into tuples
+                positions = np.flatnonzero(predicate(batch))
+                columns = [batch.values(x)[positions].tolist() for x in fields]
+                records.extend(zip(*columns))
+                op.rows_in += batch.size
+            op.rows_out = len(records)
+    except (KeyError, TypeError) as err:
+        logging.info(f'Falling back to records because the condition could not be vectorized: {err}')
+        return None
+
+    return '|'.join([schema[table_fields.index(x)] for x in fields]), records
+
+
+# METHOD:       aggregate()
+# DESCRIPTION:  Computes COUNT, SUM, AVG, MIN or MAX over the records of a table file that satisfy a condition
+# ARGUMENTS:    path - the path of the table file
+#               function - the name of the aggregate function
+#               key - the argument of the aggregate function, such as '(*)' or '(Size)'
+#               condition - the condition as a string
+# RETURNS:      A tuple of the number of records that satisfy the condition and the result of the aggregate,
+#               which is None for an average, minimum or maximum of no records, or None if it could not be vectorized
+def aggregate(path: str, function: str, key: str, condition: str):
+    predicate = compile_predicate(condition)
+    if predicate is None:
+        return None
+
+    name = key.strip('()')
+    _, table_fields, batches = scan_batches(path, {name} | referenced_fields(condition))
+
+    if function != 'COUNT' and name not in table_fields:
+        return None
+
+    count = 0
+    total = 0
+    minimum = None
+    maximum = None
+
+    try:
+        with _pf.operator('columnar aggregate') as op:
+            for batch in batches:
+                mask = predicate(batch)
+                op.rows_in += batch.size
+
+                # COUNT only needs the mask, every other function needs the selected values
+                selected = int(np.count_nonzero(mask))
+                count += selected
+                if function == 'COUNT' or selected == 0:
+                    continue
+
+                # Strings are compared by their codes, which are in the same order as the strings
+                if batch.types[name] == 'str':
+                    if function not in ('MIN', 'MAX'):
+                        return None
+                    codes = batch.columns[name][mask]
+                    dictionary = batch.dictionaries[name]
+                    batch_min, batch_max = dictionary[codes.min()], dictionary[codes.max()]
+                else:
+                    values = batch.columns[name][mask]
+                    total += values.sum().item()
+                    batch_min, batch_max = values.min().item(), values.max().item()
+
+                minimum = batch_min if minimum is None else min(minimum, batch_min)
+                maximum = batch_max if maximum is None else max(maximum, batch_max)
+            op.rows_out = 1
+    except (KeyError, TypeError) as err:
+        logging.info(f'Falling back to records because the condition could not be vectorized: {err}')
+        return None
+
+    match function:
+        case 'COUNT':
+            return count, count
+        case 'SUM':
+            return count, total
+        case 'AVG':
+            return count, total / count if count > 0 else None
+        case 'MIN':
+            return count, minimum
+        case _:
+            return count, maximum
+
+
+# endregion
+
+# METHOD:       cl_init()
+# DESCRIPTION:  Initializes the columnar global variables used by the program
+# ARGUMENTS:    columnar - whether the columnar execution mode should be used
+# RETURNS:      N/A
+def cl_init(columnar: bool = False):
+    global enabled
+
+    # The columnar mode is disabled if NumPy could not be imported
+    if columnar and np is None:
+        logging.warning('NumPy is not installed, the columnar execution mode is disabled')
+
+    enabled = columnar and np is not None
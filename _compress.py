@@ -0,0 +1,385 @@
+# FILE NAME:    _COMPRESS.PY
+# MODULE NAME:  Compression
+# DESCRIPTION:  Provides the column encodings used to store the records of a compressed table
+#               in a segment file alongside the table file, and the compression report
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate, chain, repeat
+import _storage as _sto
+
+# Runtime Constants Variables
+# SEGMENT_MAGIC - the first value of a segment file's header, used to recognize the file
+# INT_WIDTHS - the array type codes that packed integers are stored with, from narrowest to widest
+SEGMENT_MAGIC = 'DINISEG1'
+INT_WIDTHS = ('B', 'H', 'I', 'Q')
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to hold the encoded columns of a table
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Segment Class
+#
+# Member Variables:
+# rows:             The number of records stored in the segment
+# fields:           The field name of each column
+# types:            The python type of each column
+# encodings:        The name of the encoding used for each column
+# blobs:            The encoded bytes of each column
+# raw_bytes:        The size of the records in the table file's text format
+# text_scan_time:   The time taken to parse the records from the text format when the segment was written
+# scan_time:        The time taken to decode the records from the segment when the segment was written
+#
+# Description:
+# Holds the records of a table as encoded columns. The records written to a table when it is
+# compressed are stored in its segment, the records added after that are appended to the table
+# file as usual. The segment's records are numbered before the rows of the table file.
+@dataclass
+class Segment:
+    rows: int = 0
+    fields: list[str] = field(default_factory=list)
+    types: list[str] = field(default_factory=list)
+    encodings: list[str] = field(default_factory=list)
+    blobs: list[bytes] = field(default_factory=list)
+    raw_bytes: int = 0
+    text_scan_time: float = 0.0
+    scan_time: float = 0.0
+
+    # The size of the encoded columns in bytes
+    @property
+    def size(self) -> int:
+        return sum([len(x) for x in self.blobs])
+
+
+# endregion
+
+# region ENCODINGS
+
+# REGION:       ENCODINGS
+# DESCRIPTION:  Provides methods for encoding and decoding columns. Every encoding decodes with
+#               functions implemented in C (array, str.split, map and itertools) so that decoding
+#               a column is faster than parsing its values from text.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       pack_ints()
+# DESCRIPTION:  Packs integers into the narrowest array that holds their distance from the smallest integer
+# ARGUMENTS:    values - the list of integers to pack
+# RETURNS:      The packed integers as bytes
+def pack_ints(values: list[int]) -> bytes:
+    low = min(values, default=0)
+    span = max(values, default=0) - low
+
+    # Raises OverflowError if the integers do not fit within 64 bits
+    code = next((x for x in INT_WIDTHS if span < 1 << 8 * array(x).itemsize), None)
+    if code is None:
+        raise OverflowError
+
+    packed = array(code, [x - low for x in values])
+    if sys.byteorder == 'big':
+        packed.byteswap()
+
+    return struct.pack('<cq', code.encode(), low) + packed.tobytes()
+
+
+# METHOD:       unpack_ints()
+# DESCRIPTION:  Unpacks integers packed by pack_ints()
+# ARGUMENTS:    blob - the packed integers
+# RETURNS:      The list of integers
+def unpack_ints(blob: bytes) -> list[int]:
+    code, low = struct.unpack_from('<cq', blob)
+
+    packed = array(code.decode())
+    packed.frombytes(blob[struct.calcsize('<cq'):])
+    if sys.byteorder == 'big':
+        packed.byteswap()
+
+    return list(map(low.__add__, packed)) if low != 0 else packed.tolist()
+
+
+# METHOD:       pack_parts()
+# DESCRIPTION:  Joins the parts of an encoded column, prefixing each part with its length
+# ARGUMENTS:    parts - the byte strings to join
+# RETURNS:      The joined bytes
+def pack_parts(*parts: bytes) -> bytes:
+    return b''.join([struct.pack('<I', len(x)) + x for x in parts])
+
+
+# METHOD:       unpack_parts()
+# DESCRIPTION:  Splits bytes joined by pack_parts() back into their parts
+# ARGUMENTS:    blob - the joined bytes
+# RETURNS:      The list of parts
+def unpack_parts(blob: bytes) -> list[bytes]:
+    parts = []
+    offset = 0
+
+    while offset < len(blob):
+        length, = struct.unpack_from('<I', blob, offset)
+        parts.append(blob[offset + 4:offset + 4 + length])
+        offset += 4 + length
+
+    return parts
+
+
+# METHOD:       encode_plain()
+# DESCRIPTION:  Encodes values without compressing them beyond their type's packed representation
+# ARGUMENTS:    type_name - the python type of the values
+#               values - the values to encode
+# RETURNS:      The encoded values
+def encode_plain(type_name: str, values: list) -> bytes:
+    if type_name == 'int':
+        return pack_ints(values)
+    if type_name == 'float':
+        packed = array('d', values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed.tobytes()
+
+    # Values are never allowed to contain a newline, since the rows of a table are stored as lines
+    return '\n'.join(values).encode()
+
+
+# METHOD:       decode_plain()
+# DESCRIPTION:  Decodes values encoded by encode_plain()
+# ARGUMENTS:    type_name - the python type of the values
+#               blob - the encoded values
+#               count - the number of values encoded
+# RETURNS:      The list of values
+def decode_plain(type_name: str, blob: bytes, count: int) -> list:
+    if type_name == 'int':
+        return unpack_ints(blob)
+    if type_name == 'float':
+        packed = array('d', blob)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed.tolist()
+
+    return blob.decode().split('\n') if count > 0 else []
+
+
+# METHOD:       encode_column()
+# DESCRIPTION:  Encodes a column with every encoding suited to its type and keeps the smallest
+#                   plain - the values packed by type
+#                   delta - integers stored as the difference from the previous integer, for sorted keys
+#                   rle   - each run of repeated values stored once along with the length of the run
+#                   dict  - strings stored once in a dictionary and referred to by their position in it
+#                   text  - the values as text, for integers that do not fit within 64 bits
+# ARGUMENTS:    type_name - the python type of the column
+#               values - the values of the column
+# RETURNS:      A tuple of the name of the encoding and the encoded column
+def encode_column(type_name: str, values: list) -> tuple[str, bytes]:
+    candidates = []
+
+    # Runs of repeated values are found once and shared by the run length encoding
+    starts = [i for i in range(len(values)) if i == 0 or values[i] != values[i - 1]]
+    run_values = [values[i] for i in starts]
+    run_lengths = [b - a for a, b in zip(starts, starts[1:] + [len(values)])]
+
+    try:
+        candidates.append(('plain', encode_plain(type_name, values)))
+        candidates.append(('rle', pack_parts(encode_plain(type_name, run_values), pack_ints(run_lengths))))
+
+        if type_name == 'int':
+            deltas = [b - a for a, b in zip([0] + values, values)]
+            candidates.append(('delta', pack_ints(deltas)))
+        elif type_name == 'str':
+            dictionary = list(dict.fromkeys(values))
+            positions = {x: i for i, x in enumerate(dictionary)}
+            candidates.append(('dict', pack_parts(encode_plain('str', dictionary),
+                                                  pack_ints([positions[x] for x in values]))))
+    except (OverflowError, struct.error):
+        pass
+
+    if len(candidates) < 1:
+        return 'text', '\n'.join(map(str, values)).encode()
+
+    return min(candidates, key=lambda x: len(x[1]))
+
+
+# METHOD:       decode_column()
+# DESCRIPTION:  Decodes a column encoded by encode_column()
+# ARGUMENTS:    type_name - the python type of the column
+#               encoding - the name of the encoding used
+#               blob - the encoded column
+#               rows - the number of values in the column
+# RETURNS:      The list of values
+def decode_column(type_name: str, encoding: str, blob: bytes, rows: int) -> list:
+    match encoding:
+        case 'plain':
+            return decode_plain(type_name, blob, rows)
+        case 'delta':
+            return list(accumulate(unpack_ints(blob)))
+        case 'rle':
+            values_blob, lengths_blob = unpack_parts(blob)
+            lengths = unpack_ints(lengths_blob)
+            values = decode_plain(type_name, values_blob, len(lengths))
+            return list(chain.from_iterable(map(repeat, values, lengths)))
+        case 'dict':
+            dictionary_blob, positions_blob = unpack_parts(blob)
+            positions = unpack_ints(positions_blob)
+            dictionary = decode_plain('str', dictionary_blob, 1 if len(positions) > 0 else 0)
+            return list(map(dictionary.__getitem__, positions))
+        case 'text':
+            return list(map(int, blob.decode().split('\n'))) if rows > 0 else []
+
+    raise ValueError(f'Unknown column encoding {encoding}')
+
+
+# endregion
+
+# region SEGMENTS
+
+# REGION:       SEGMENTS
+# DESCRIPTION:  Provides methods for encoding, decoding, reading and writing segments
+
+# --------- METHODS --------- #
+
+
+# METHOD:       encode_segment()
+# DESCRIPTION:  Encodes records into a segment, one column at a time
+# ARGUMENTS:    fields - the field name of each column
+#               types - the python type of each column
+#               records - the records to encode
+# RETURNS:      The Segment holding the encoded records
+def encode_segment(fields: list[str], types: list[str], records: list) -> Segment:
+    segment = Segment(len(records), list(fields), list(types))
+    columns = list(zip(*records)) if len(records) > 0 else [()] * len(fields)
+
+    for type_name, values in zip(types, columns):
+        encoding, blob = encode_column(type_name, list(values))
+        segment.encodings.append(encoding)
+        segment.blobs.append(blob)
+
+    return segment
+
+
+# METHOD:       decode_segment()
+# DESCRIPTION:  Decodes the records held by a segment
+# ARGUMENTS:    segment - the Segment to decode
+# RETURNS:      The list of records as tuples
+def decode_segment(segment: Segment) -> list[tuple]:
+    columns = [decode_column(*x, segment.rows) for x in zip(segment.types, segment.encodings, segment.blobs)]
+
+    return list(zip(*columns)) if len(columns) > 0 else [()] * segment.rows
+
+
+# METHOD:       write_segment()
+# DESCRIPTION:  Writes a segment to the segment file of a table. The header lines describe the
+#               segment and each of its columns, and are followed by the encoded columns.
+# ARGUMENTS:    path - the path of the table file
+#               segment - the Segment to write
+# RETURNS:      The number of bytes written
+def write_segment(path: str, segment: Segment) -> int:
+    header = [f'{SEGMENT_MAGIC}|{segment.rows}|{segment.raw_bytes}|'
+              f'{segment.text_scan_time:.6f}|{segment.scan_time:.6f}']
+    header.extend([f'{x[0]}|{x[1]}|{x[2]}|{len(x[3])}'
+                   for x in zip(segment.fields, segment.types, segment.encodings, segment.blobs)])
+
+    data = ('\n'.join(header) + '\n\n').encode() + b''.join(segment.blobs)
+
+    # The segment is written next to the table and then moved over the old segment
+    temp_path = f'{segment_path(path)}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, segment_path(path))
+
+    return len(data)
+
+
+# METHOD:       read_segment()
+# DESCRIPTION:  Reads the segment of a table
+# ARGUMENTS:    path - the path of the table file
+#               header_only - reads the segment without its encoded columns
+# RETURNS:      The Segment of the table, or None if the table is not compressed
+def read_segment(path: str, header_only: bool = False):
+    try:
+        with open(segment_path(path), 'rb') as f:
+            data = f.read() if not header_only else f.readline()
+    except FileNotFoundError:
+        return None
+
+    header, _, body = data.partition(b'\n\n')
+    lines = header.decode().splitlines()
+    magic, rows, raw_bytes, text_scan_time, scan_time = lines[0].split('|')
+
+    if magic != SEGMENT_MAGIC:
+        logging.error(f'ERROR: {segment_path(path)} is not a segment file')
+        return None
+
+    segment = Segment(int(rows), raw_bytes=int(raw_bytes),
+                      text_scan_time=float(text_scan_time), scan_time=float(scan_time))
+
+    # The encoded columns are stored one after another in the order of the header lines
+    offset = 0
+    for line in lines[1:]:
+        name, type_name, encoding, length = line.split('|')
+        segment.fields.append(name)
+        segment.types.append(type_name)
+        segment.encodings.append(encoding)
+        segment.blobs.append(body[offset:offset + int(length)])
+        offset += int(length)
+
+    return segment
+
+
+# METHOD:       segment_rows()
+# DESCRIPTION:  Finds the number of records held by the segment of a table
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The number of records in the segment, 0 if the table is not compressed
+def segment_rows(path: str) -> int:
+    segment = read_segment(path, header_only=True)
+
+    return segment.rows if segment is not None else 0
+
+
+# METHOD:       segment_path()
+# DESCRIPTION:  Creates the path of the segment file of a table
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The path of the segment file
+def segment_path(path: str) -> str:
+    return _sto.sidecar_path(path, _sto.SEGMENT_FILE_TYPE)
+
+
+# METHOD:       clear_segment()
+# DESCRIPTION:  Removes the segment of a table once its records have been written to the table file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      N/A
+def clear_segment(path: str):
+    try:
+        os.remove(segment_path(path))
+    except FileNotFoundError:
+        pass
+
+
+# METHOD:       show_compression()
+# DESCRIPTION:  Prints the compression ratio and scan speedup of each compressed table
+# ARGUMENTS:    tables - a list of tuples of the name and path of each table
+# RETURNS:      N/A
+def show_compression(tables: list[tuple[str, str]]):
+    print('table|rows|text bytes|compressed bytes|ratio|text scan ms|compressed scan ms|speedup|encodings')
+
+    for name, path in tables:
+        segment = read_segment(path)
+        if segment is None:
+            continue
+
+        ratio = segment.raw_bytes / segment.size if segment.size > 0 else 0.0
+        speedup = segment.text_scan_time / segment.scan_time if segment.scan_time > 0 else 0.0
+        encodings = ','.join([f'{x}:{y}' for x, y in zip(segment.fields, segment.encodings)])
+
+        print(f'{name}|{segment.rows}|{segment.raw_bytes}|{segment.size}|{ratio:.2f}|'
+              f'{segment.text_scan_time * 1000:.3f}|{segment.scan_time * 1000:.3f}|{speedup:.2f}|{encodings}')
+
+
+# endregion
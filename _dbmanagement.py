@@ -5,6 +5,13 @@ import shutil
 import _globals
 import _utils
 import _filesystem
+import _storage
+import _partition
+import _cache
+import _matview
+import _catalog
+import _session
+import _bloom
 
 # region DATABASE MANAGEMENT
 
@@ -70,18 +77,21 @@ def use_database(name: str = ''):
     # Guard clause that aborts if the name is an empty string or None
     if name is None or name == '':
         print(f'!Failed because the database "{name}" is invalid')
-        _globals.active_db = None
+        _session.current().active_db = None
         return
 
     logging.info(f'Attempting to use database "{name}"...')
 
-    # Confirm that the database exists, then sets the 'active_db' global variable
-    # If the database does not exist, set the 'active_db' global variable to None
+    # Confirm that the database exists, then sets the database used by the session
+    # If the database does not exist, the session uses no database
+    # The catalog of the database is loaded once, so statements read the metadata of its tables from memory
     if validate_database(name):
-        _globals.active_db = name
+        _session.current().active_db = name
+        _catalog.load(_filesystem.rpath(_globals.DATABASES_DIRECTORY, name))
         print('Using database ' + name + '.')
     else:
-        _globals.active_db = None
+        _session.current().active_db = None
+        _catalog.unload()
         print('!Failed to use ' + name + ' because the database does not exist.')
 
 
@@ -139,6 +149,7 @@ def drop_database(arguments):
     # If the database was deleted, print the success message to the console
     # Otherwise, print an error message
     if _filesystem.delete_directory(directory_name):
+        _catalog.discard(directory_name)
         print("Database " + database_name + " deleted.")
     else:
         print('!Failed to delete database ' + database_name + ' because it does not exist.')
@@ -170,14 +181,19 @@ def generate_table_meta(parameters):
     return meta if isinstance(meta, str) else ''
 
 
-# METHOD:       alter_table_meta()
-# DESCRIPTION:  Modifies the table meta string of a table
+# METHOD:       parse_table_meta()
+# DESCRIPTION:  Parses the field names and types out of a table metadata string
 # ARGUMENTS:    meta - the table metadata string
-#               param - the new parameter
-# RETURNS:      A string containing the new metadata
-def alter_table_meta(meta, param):
-    # Appends a field to the table metadata string provided
-    return f'{meta}|{param}'
+# RETURNS:      A tuple of the list of field names and the list of python type names of the fields
+def parse_table_meta(meta):
+    # The metadata of every table in the catalog was parsed when the table was added to it
+    # Copies are returned, since the lists of the catalog are shared by every reader of the table
+    catalog = _catalog.current()
+    schema = catalog.schemas.get(meta) if catalog is not None else None
+    if schema is not None:
+        return list(schema[0]), list(schema[1])
+
+    return _catalog.parse_meta(meta)
 
 
 # METHOD:       validate_table()
@@ -188,6 +204,10 @@ def validate_table(arguments):
     # Takes the table name from the list of arguments, discarding any remaining arguments
     table_name, _ = _utils.pop_argument(arguments)
 
+    # The tables of the database being used are found in its catalog without checking their files
+    if _catalog.current() is not None:
+        return _catalog.lookup(table_name) is not None
+
     # path - the path to the table in the database's folder
     path = tbl_path(table_name)
 
@@ -196,12 +216,13 @@ def validate_table(arguments):
 
 
 # METHOD:       alter_table()
-# DESCRIPTION:  Alters the table metadata
+# DESCRIPTION:  Alters the table metadata by adding or dropping a field, or drops a partition
+#               Fields are added and dropped by changing only the catalog, without rewriting the table's records
 # ARGUMENTS:    arguments - the list of argument strings
 # RETURNS:      N/A
 def alter_table(arguments):
     # Guard clause that aborts if no database is being used
-    if _globals.active_db is None:
+    if _session.current().active_db is None:
         print("!Failed because no database is being used.")
         return
 
@@ -210,31 +231,172 @@ def alter_table(arguments):
     table_name, args_list = _utils.pop_argument(arguments)
 
     # operation - the operation being performed to alter the table
+    # words - the arguments of the operation
     operation, param = _utils.pop_argument(args_list)
+    operation = operation.upper() if isinstance(operation, str) else operation
+    words = [param] if isinstance(param, str) else list(param or [])
 
-    # parameter - the field to add to the table metadata
-    parameter = ' '.join([param[0], param[1]])
+    # Dropping a partition deletes its file instead of deleting its records
+    if operation == 'DROP' and len(words) > 1 and words[0].upper() == 'PARTITION':
+        drop_partition(table_name, words[1])
+        return
 
     # file_path - the file path to the table in the database
+    # entry - the table's entry in the catalog
     file_path = tbl_path(table_name)
+    entry = _catalog.lookup(table_name)
+
+    if entry is None:
+        print(f'!Failed to modify {table_name} because it does not exist!')
+        return
+    if _matview.is_view(file_path):
+        print(f'!Failed to modify {table_name} because it is a materialized view.')
+        return
+
+    # The records of a materialized view are selected with the fields of the tables it reads from
+    for view_path, _ in _matview.dependents(file_path):
+        print(f'!Failed to modify {table_name} because materialized view '
+              f'{os.path.splitext(os.path.basename(view_path))[0]} depends on it.')
+        return
+
+    # The fields of each partition of a partitioned table are altered along with the table's
+    scheme = _catalog.scheme(file_path)
+    paths = [file_path] + ([_partition.partition_path(file_path, x) for x in scheme.names] if scheme is not None else [])
+
+    # A transaction holding a lock on the table has read its records with the fields they had before
+    if any([_storage.lock_owner(x) is not None for x in paths]):
+        print(f'Error: Table {table_name} is locked!')
+        return
+
+    if operation == 'ADD' and len(words) > 1:
+        add_field(table_name, entry, paths, words)
+    elif operation == 'DROP' and len(words) > 0:
+        drop_field(table_name, entry, scheme, paths, words[-1])
+    else:
+        print(f'!Failed because the change to {table_name} is not supported.')
+        return
+
+    for path in paths:
+        _cache.bump(path)
+
+
+# METHOD:       add_field()
+# DESCRIPTION:  Adds a field to a table, such as ADD a3 float or ADD a3 float DEFAULT 1.5
+#               The rows stored before the field was added are read with its default value
+# ARGUMENTS:    table_name - the name of the table
+#               entry - the table's entry in the catalog
+#               paths - the paths of the table file and the files of its partitions
+#               words - the name, type and default of the field
+# RETURNS:      N/A
+def add_field(table_name, entry, paths, words):
+    # position - the position of the DEFAULT keyword within the words, or the number of words without it
+    position = next((i for i, x in enumerate(words) if x.upper() == 'DEFAULT'), len(words))
+
+    # A type with a length, such as varchar(20), is split into two words
+    definition = generate_table_meta(f'{words[0]} {"".join(words[1:position])}')
+    if words[0] in entry.fields:
+        print(f'!Failed because the field {words[0]} has already been declared')
+        return
+
+    # field_type - the python type name of the field
+    # default - the value of the field in the rows stored before it was added
+    field_type = _catalog.parse_meta(definition)[1][0]
+    # A negative default is split into its sign and its digits, which are joined again
+    default = ''.join(words[position + 1:]).strip("'") if position + 1 < len(words) \
+        else _catalog.DEFAULT_VALUES[field_type]
 
-    # Stub logic since the alter_table function will only receive 'ADD' for PA1
-    # Reads in the first line of the file which contains the table metadata
-    # Then, alter that metadata by adding a field to the metadata string
-    # If that field with the same name has already been declared, print an error message
-    # Otherwise, print a success message
     try:
-        f = open(file_path, 'r')
-        old_meta = f.readline().strip()
-        f.close()
-        if param[0] in old_meta:
-            print(f'!Failed because the field {param[0]} has already been declared')
-        else:
-            new_meta = alter_table_meta(old_meta, parameter)
-            print(f'Table {table_name} modified.')
-            _filesystem.write_line(new_meta, file_path, echo=False, append=False)
-    except FileNotFoundError as err:
+        if field_type != 'str':
+            default = str({'int': int, 'float': float}[field_type](default))
+    except ValueError:
+        print(f'!Failed because the default {default} of {words[0]} is not a valid {field_type}.')
+        return
+
+    _catalog.add_field(paths, definition, default)
+    print(f'Table {table_name} modified.')
+
+
+# METHOD:       drop_field()
+# DESCRIPTION:  Drops a field from a table, such as DROP COLUMN a3 or DROP a3
+#               The field's values are skipped when the rows stored before it was dropped are read
+# ARGUMENTS:    table_name - the name of the table
+#               entry - the table's entry in the catalog
+#               scheme - the PartitionScheme of a partitioned table, or None
+#               paths - the paths of the table file and the files of its partitions
+#               name - the name of the field
+# RETURNS:      N/A
+def drop_field(table_name, entry, scheme, paths, name):
+    if name not in entry.fields:
+        print(f'!Failed because {table_name} has no field {name}.')
+        return
+    if len(entry.fields) < 2:
+        print(f'!Failed because {name} is the only field of {table_name}.')
+        return
+    if scheme is not None and scheme.key == name:
+        print(f'!Failed because {table_name} is partitioned by {name}.')
+        return
+
+    _catalog.drop_field(paths, name)
+    _bloom.drop_column(paths, name)
+
+    # The partition key of a record is found by its position, which moves when a field before it is dropped
+    if scheme is not None:
+        scheme.position = entry.fields.index(scheme.key)
+        _partition.write_scheme(paths[0], scheme)
+        _catalog.alter([paths[0]], scheme=scheme)
+
+    print(f'Table {table_name} modified.')
+
+
+# METHOD:       drop_partition()
+# DESCRIPTION:  Drops a partition of a range partitioned table by deleting its file
+#               The values the partition held are then assigned to the partition after it
+# ARGUMENTS:    table_name - the name of the partitioned table
+#               name - the name of the partition to drop
+# RETURNS:      N/A
+def drop_partition(table_name, name):
+    # file_path - the path to the table file in the database
+    # scheme - how the table's records are split across partitions
+    file_path = tbl_path(table_name)
+    scheme = _catalog.scheme(file_path)
+
+    if not validate_table(table_name):
         print(f'!Failed to modify {table_name} because it does not exist!')
+        return
+    if scheme is None or name not in scheme.names:
+        print(f'!Failed because {table_name} has no partition {name}.')
+        return
+
+    # Removing a hash partition would change the partition every other record belongs to
+    if scheme.method != 'RANGE':
+        print(f'!Failed because the partitions of {table_name} are not partitioned by range.')
+        return
+    if len(scheme.names) < 2:
+        print(f'!Failed because {name} is the only partition of {table_name}.')
+        return
+
+    path = _partition.partition_path(file_path, name)
+    if _storage.lock_owner(path) is not None:
+        print(f'Error: Table {table_name}.{name} is locked!')
+        return
+
+    i = scheme.names.index(name)
+    del scheme.names[i]
+    del scheme.bounds[i]
+
+    # The last partition keeps accepting every value above the previous bound
+    if i == len(scheme.names):
+        scheme.bounds[-1] = None
+
+    _partition.write_scheme(file_path, scheme)
+    _filesystem.delete_file(path)
+    _storage.delete_sidecars(path)
+    _cache.bump(file_path)
+    _cache.bump(path)
+    _catalog.alter([file_path], scheme=scheme)
+    _catalog.unregister([path])
+
+    print(f'Partition {name} of {table_name} dropped.')
 
 
 # METHOD:       create_table
@@ -243,7 +405,7 @@ def alter_table(arguments):
 # RETURNS:      N/A
 def create_table(arguments):
     # Guard clause that aborts if no database is being used
-    if _globals.active_db is None:
+    if _session.current().active_db is None:
         print("!Failed because no database is being used.")
         return
 
@@ -254,18 +416,39 @@ def create_table(arguments):
     # file_path - the path to the table file in the database
     file_path = tbl_path(table_name)
 
+    # definition - the field definitions of the table
+    # partitioning - the clause following PARTITION BY, if the table is partitioned
+    definition, partitioning = (re.split(r'\)\s*PARTITION\s+BY\s+',
+                                         ' '.join(args_list) if isinstance(args_list, list) else args_list,
+                                         1, re.IGNORECASE) + [''])[:2]
+
     # data - the data string that will become the table's metadata
-    data = args_list.strip('() \n')
+    data = definition.strip('() \n')
 
     # meta - the metadata string that will be placed in the table
     meta = generate_table_meta(data)
 
+    # scheme - how the table's records are split across partitions, if the table is partitioned
+    scheme = None
+    if meta and partitioning:
+        scheme = _partition.parse_clause(partitioning, *parse_table_meta(meta))
+        if scheme is None:
+            return
+
     # If the meta is not None and the table was created, print a success message
     # If the meta IS none, print an error message
     # If the file already exists, print an error message
+    # A partitioned table's file only holds its metadata, its records are held by the partition files
     if meta and _filesystem.create_file(file_path):
         print('Table ' + table_name + ' created.')
+        _cache.bump(file_path)
         _filesystem.write_line(meta, file_path, echo=False)
+        if scheme is not None:
+            _partition.write_scheme(file_path, scheme)
+            for name in scheme.names:
+                _filesystem.write_line(meta, _partition.partition_path(file_path, name), echo=False, append=False)
+                _catalog.register(_partition.partition_path(file_path, name), meta, 'partition')
+        _catalog.register(file_path, meta, 'partitioned' if scheme is not None else 'rows')
     else:
         if not meta:
             print('!Failed to create table ' + table_name + ' because the provided metadata ' + data + ' is invalid.')
@@ -279,7 +462,7 @@ def create_table(arguments):
 # RETURNS:      N/A
 def drop_table(arguments):
     # Guard clause that aborts if no database is being used
-    if _globals.active_db is None:
+    if _session.current().active_db is None:
         print("!Failed because no database is being used.")
         return
 
@@ -288,12 +471,45 @@ def drop_table(arguments):
     table_name, _ = _utils.pop_argument(arguments)
     file_path = tbl_path(table_name)
 
+    # A table can not be dropped while a materialized view reads from it
+    for view_path, _ in _matview.dependents(file_path):
+        print(f'!Failed to delete table {table_name} because materialized view '
+              f'{os.path.splitext(os.path.basename(view_path))[0]} depends on it.')
+        return
+
+    # The partitions of a partitioned table are deleted along with it
+    scheme = _catalog.scheme(file_path)
+    partitions = [_partition.partition_path(file_path, x) for x in scheme.names] if scheme is not None else []
+
     if _filesystem.delete_file(file_path):
+        _storage.delete_sidecars(file_path)
+        _cache.bump(file_path)
+        for path in partitions:
+            _filesystem.delete_file(path)
+            _storage.delete_sidecars(path)
+            _cache.bump(path)
+        _catalog.unregister([file_path] + partitions)
         print("Table " + table_name + " deleted.")
     else:
         print('!Failed to delete database ' + table_name + ' because it does not exist.')
 
 
+# METHOD:       list_tables()
+# DESCRIPTION:  Lists the tables within the database being used
+# ARGUMENTS:    N/A
+# RETURNS:      A list of the table names
+def list_tables():
+    # The tables of the database being used are listed by its catalog
+    if _catalog.current() is not None:
+        return sorted(_catalog.current().tables)
+
+    # directory - the path to the database's folder
+    directory = _filesystem.rpath(_globals.DATABASES_DIRECTORY, _session.current().active_db)
+
+    return sorted([os.path.splitext(x)[0] for x in os.listdir(directory)
+                   if x.endswith(_globals.TABLE_FILE_TYPE)])
+
+
 # METHOD:       read_table()
 # DESCRIPTION:  Reads in a table within the database
 # ARGUMENTS:    arguments - the list of argument strings
@@ -301,7 +517,7 @@ def drop_table(arguments):
 def read_table(arguments):
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _globals.active_db is None:
+    if _session.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -327,7 +543,12 @@ def read_table(arguments):
 # ARGUMENTS:    name - the name of the table to assemble a path to
 # RETURNS:      A string representing the path assembled from the table name
 def tbl_path(name):
-    return _filesystem.rpath(_globals.DATABASES_DIRECTORY, _globals.active_db, name + _globals.TABLE_FILE_TYPE)
+    # The path of a table in the catalog was assembled when the table was added to it
+    entry = _catalog.lookup(name)
+    if entry is not None:
+        return entry.path
+
+    return _filesystem.rpath(_globals.DATABASES_DIRECTORY, _session.current().active_db, name + _globals.TABLE_FILE_TYPE)
 
 
 # METHOD:       tbl_path()
@@ -335,7 +556,7 @@ def tbl_path(name):
 # ARGUMENTS:    name - the name of the database to assemble a path to
 # RETURNS:      A string representing the path assembled from the database name
 def db_path(name):
-    return _filesystem.rpath(_globals.DATABASES_DIRECTORY, _globals.active_db, name)
+    return _filesystem.rpath(_globals.DATABASES_DIRECTORY, _session.current().active_db, name)
 
 
 # endregion
@@ -16,9 +16,6 @@ TABLE_FILE_TYPE = ''
 
 KEYWORDS = []
 
-# Globals Variables
-active_db = None
-
 # endregion
 
 
@@ -43,8 +40,6 @@ def gl_init():
     global KEYWORDS
     KEYWORDS = ['CREATE', 'DROP', 'DATABASE', 'TABLE', 'USE', 'ALTER', 'SELECT', 'FROM', 'WHERE', 'INSERT', 'INTO',
                 'VALUES', 'UPDATE', 'SET', 'DELETE', 'ON', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'JOIN', 'BEGIN',
-                'COMMIT', 'COUNT', 'AVG', 'MAX', 'MIN']
-
-    # Globals Variables
-    global active_db
-    active_db = None
+                'COMMIT', 'COUNT', 'SUM', 'AVG', 'MAX', 'MIN', 'EXPLAIN', 'ANALYZE', 'SHOW', 'VACUUM',
+                'COMPRESS', 'REFRESH', 'MATERIALIZED', 'VIEW', 'ORDER', 'BY', 'ASC', 'DESC',
+                'LIMIT', 'OFFSET', 'GROUP', 'DISTINCT', 'BACKUP', 'RESTORE']
@@ -5,11 +5,25 @@
 # DATE:         MAY 7, 2022
 
 import logging
-import re
-import _globals as _gl
+import os
+import sys
 import _dbmanagement as _db
 import _utils as _ut
 import _tablemanagement as _tm
+import _profiler as _pf
+import _statistics as _st
+import _compress as _cmp
+import _cache as _ch
+import _session as _ss
+import _replication as _rp
+import _backup as _bk
+import _bloom as _bf
+import _memory as _mem
+import _cancel as _cn
+
+# Internal global variables
+# insert_batch_size - the most consecutive INSERT statements whose records are appended together (--insert-batch)
+insert_batch_size = 0
 
 # region INPUT
 
@@ -19,65 +33,97 @@ import _tablemanagement as _tm
 # --------- METHODS --------- #
 
 
-# METHOD:       preprocess_file_input()
-# DESCRIPTION:  Preprocesses the lines of the file into commands readable
-#               by the program's parser
-# ARGUMENTS:    file_name - the path of the specified file
+# METHOD:       read_statements()
+# DESCRIPTION:  Reads the statements of a script one line at a time, so a script of any size is executed
+#               as it is read. Comments starting with '--' are ignored, a statement may span several lines
+#               and several statements may share a line.
+# ARGUMENTS:    stream - the file or pipe the script is read from
+# RETURNS:      A generator of each statement, without its semicolon
+def read_statements(stream):
+    # statement - the statement being assembled from the lines read so far
+    statement = ''
+
+    for line in stream:
+        line = line.split('--', 1)[0].strip()
+        if line == '':
+            continue
+
+        statement += f' {line}'
+
+        # Every statement ended by a semicolon is complete, .EXIT does not need a semicolon
+        while ';' in statement:
+            complete, statement = statement.split(';', 1)
+            if complete.strip() != '':
+                logging.info(f'Read statement: {complete.strip()}')
+                yield complete.strip()
+
+        if '.EXIT' in statement.upper():
+            yield statement.strip()
+            statement = ''
+
+    # The last statement of a script may be missing its semicolon
+    if statement.strip() != '':
+        yield statement.strip()
+
+
+# METHOD:       execute_statements()
+# DESCRIPTION:  Executes statements as they are read. When batching is enabled, runs of consecutive
+#               INSERT statements are executed as batches whose records are appended together.
+# ARGUMENTS:    statements - an iterable of the statements
+# RETURNS:      False if a statement exits the program, True otherwise
+def execute_statements(statements):
+    # batch - the INSERT statements of the batch being collected
+    batch = []
+
+    for statement in statements:
+        if insert_batch_size > 1 and statement.split(None, 1)[0].upper() == 'INSERT':
+            batch.append(statement)
+            if len(batch) >= insert_batch_size:
+                execute_batch(batch)
+                batch = []
+            continue
+
+        execute_batch(batch)
+        batch = []
+
+        if not parse(statement):
+            return False
+
+    execute_batch(batch)
+
+    return True
+
+
+# METHOD:       execute_batch()
+# DESCRIPTION:  Executes a batch of INSERT statements, appending their records to each table at once
+# ARGUMENTS:    statements - the INSERT statements
 # RETURNS:      N/A
-def preprocess_file_input(file_name):
-    # commands - the list of processed commands
-    commands = []
-
-    logging.info('Adding commands..\n')
-
-    # Reads each line in the file and preprocesses each line
-    # cur_com - the current command being assembled by the preprocessor loop
-    # Ignore each line starting with '--'
-    # If the line does not end with a ';' we append it to cur_com
-    # If the line does end with a ';' we add it to the list of commands and reset cur_com to ''
-    # Strips each line of whitespace characters
-    with open(file_name, 'r') as f:
-        cur_com = ''
-        for line in f.readlines():
-            if line.startswith('--') or line.isspace():
-                continue
-            else:
-                cur_com += f" {line.split('--', 1)[0].strip()}"
-                if cur_com.endswith(';') or '.EXIT' in cur_com.upper():
-                    logging.info(f'Adding commands: {cur_com}')
-                    commands.append(cur_com.strip())
-                    cur_com = ''
+def execute_batch(statements: list[str]):
+    if len(statements) < 1:
+        return
 
-    return commands
+    # The batch holds the engine's lock until its records are appended
+    with _ss.statement_lock('INSERT'), _tm.batched_inserts():
+        for statement in statements:
+            parse(statement)
 
 
 # METHOD:       file_input()
 # DESCRIPTION:  Takes input from a specified file
 # ARGUMENTS:    file_name - the path of the specified file
-# RETURNS:      N/A
+# RETURNS:      False if a statement exits the program, True otherwise
 def file_input(file_name):
-    # Preprocesses the file into lines of input usable by the parser
-    commands = preprocess_file_input(file_name)
-
-    # Executes each command in the list of commands in the file
-    # Returns false if the parser returns false (on .EXIT)
-    for com in commands:
-        logging.info(f'Performing commands: {com}')
-        if not parse(com.rstrip(';')):
-            return False
-
-    return True
+    with open(file_name, 'r') as f:
+        return execute_statements(read_statements(f))
 
 
 # METHOD:       terminal_input()
-# DESCRIPTION:  Takes in input from the terminal
+# DESCRIPTION:  Takes in input from the terminal, or from a script piped to the program
 # ARGUMENTS:    N/A
 # RETURNS:      N/A
 def terminal_input():
-    # Provides input from the user until parse() returns false
-    while True:
-        if not parse(input()):
-            break
+    # Provides input from the user until a statement exits the program or the input ends
+    execute_statements(read_statements(sys.stdin))
 
 
 # endregion
@@ -102,14 +148,63 @@ def parse(arguments):
 
     logging.info('Parsing...')
 
+    # Statements that only read tables are executed alongside those of other sessions
+    # Every statement is profiled, the operator profiles are only collected when requested
+    with _ss.statement_lock(arguments), _cn.statement(arguments) as cancellation:
+        profile = _pf.begin_statement(arguments)
+
+        try:
+            with _pf.operator('split_arguments'):
+                arg_list = split_arguments(arguments)
+
+            # A statement that changes the databases is published while it still holds the engine's lock,
+            # so the change log is in the order the changes were applied
+            result = execute(arg_list)
+            _rp.record(arguments)
+            return result
+        except _cn.StatementCancelled as cancelled:
+            # A statement of a cancelled script stops the script as well, which reports the cancellation
+            if _cn.cancelled(cancellation.parent) is not None:
+                raise
+            cancel(cancellation, str(cancelled))
+            return True
+        finally:
+            _st.record(_pf.end_statement(profile))
+
+
+# METHOD:       cancel()
+# DESCRIPTION:  Reports a cancelled statement. The statement's locks and memory were released as it stopped,
+#               and a transaction it was part of is aborted, discarding the changes held by its workspaces.
+# ARGUMENTS:    cancellation - the Cancellation of the statement
+#               reason - why the statement was cancelled
+# RETURNS:      N/A
+def cancel(cancellation: _cn.Cancellation, reason: str):
+    logging.info(f'Cancelled by {reason} after {cancellation.elapsed()} ms and {cancellation.rows} rows')
+    print(f'!Failed because the statement was cancelled by {reason} '
+          f'after {cancellation.elapsed()} ms and {cancellation.rows} rows processed.')
+
+    if _ss.current().transaction_active:
+        _tm.abort_transaction()
+
+
+# METHOD:       execute()
+# DESCRIPTION:  Executes a statement that has been split into a list of arguments
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      False if the program should exit, True otherwise
+def execute(arguments):
     # arg - first argument from the arguments list
     # args - the argument new list without the first argument
     # arg is converted into upper case for the purposes of pattern matching
-    arg, args = _ut.pop_argument(split_arguments(arguments))
+    arg, args = _ut.pop_argument(arguments)
     arg = arg.upper() if isinstance(arg, str) else ''
 
     logging.info(f'PARSE passed argument {arg}')
 
+    # A replica only changes its databases by applying the changes of its primary
+    if _ss.current().read_only and arg in _rp.WRITE_STATEMENTS + ('BEGIN', 'COMMIT'):
+        print('!Failed because the database is a read-only replica.')
+        return True
+
     # Match the first argument to a method call
     match arg:
         case 'CREATE':
@@ -134,6 +229,22 @@ def parse(arguments):
             commit()
         case 'READ':
             read(args)
+        case 'EXPLAIN':
+            explain(args)
+        case 'SHOW':
+            show(args)
+        case 'VACUUM':
+            vacuum(args)
+        case 'COMPRESS':
+            compress(args)
+        case 'REFRESH':
+            refresh(args)
+        case 'BACKUP':
+            backup()
+        case 'RESTORE':
+            restore()
+        case 'SET':
+            set_setting(args)
         case '.EXIT':
             return False
         case '':
@@ -170,6 +281,16 @@ def create(arguments):
             _db.create_database(args)
         case 'TABLE':
             _db.create_table(args)
+        case 'MATERIALIZED':
+            if _ss.current().active_db is None:
+                print("!Failed because no database is being used.")
+                return
+            _tm.create_view(args)
+        case 'BLOOM':
+            if _ss.current().active_db is None:
+                print("!Failed because no database is being used.")
+                return
+            _tm.create_bloom_filter(args)
         case '':
             print('ERROR: Missing arguments after CREATE')
         case _:
@@ -202,6 +323,16 @@ def drop(arguments):
             _db.drop_database(args)
         case 'TABLE':
             _db.drop_table(args)
+        case 'MATERIALIZED':
+            if _ss.current().active_db is None:
+                print("!Failed because no database is being used.")
+                return
+            _tm.drop_view(args)
+        case 'BLOOM':
+            if _ss.current().active_db is None:
+                print("!Failed because no database is being used.")
+                return
+            _tm.drop_bloom_filter(args)
         case '':
             print('ERROR: Missing arguments after DROP')
         case _:
@@ -234,7 +365,7 @@ def use(arguments):
 # RETURNS:      N/A
 def select(arguments):
 
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -251,7 +382,7 @@ def select(arguments):
 def alter(arguments):
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -277,7 +408,7 @@ def alter(arguments):
 def insert(arguments):
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -308,7 +439,7 @@ def insert(arguments):
 def update(arguments):
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -328,7 +459,7 @@ def update(arguments):
 def delete(arguments):
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -348,7 +479,7 @@ def delete(arguments):
 def begin(arguments):
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
     if arguments is None:
@@ -373,13 +504,120 @@ def begin(arguments):
 def commit():
     # First guard close aborts if no database is being used
     # Second guard clause aborts if the input is None
-    if _gl.active_db is None:
+    if _ss.current().active_db is None:
         print("!Failed because no database is being used.")
         return
 
     _tm.commit_transaction()
 
 
+# METHOD:       vacuum()
+# DESCRIPTION:  Parses the argument list after the VACUUM argument
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      N/A
+def vacuum(arguments):
+    # Guard clause that aborts if no database is being used
+    if _ss.current().active_db is None:
+        print("!Failed because no database is being used.")
+        return
+
+    logging.info('Vacuuming...')
+
+    _tm.vacuum_tables(arguments)
+
+
+# METHOD:       compress()
+# DESCRIPTION:  Parses the argument list after the COMPRESS argument
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      N/A
+def compress(arguments):
+    # Guard clause that aborts if no database is being used
+    if _ss.current().active_db is None:
+        print("!Failed because no database is being used.")
+        return
+
+    # arg - first argument from the arguments list
+    # args - the argument new list without the first argument
+    # arg is converted into upper case for the purposes of pattern matching
+    arg, args = _ut.pop_argument(arguments)
+    arg = arg.upper() if isinstance(arg, str) else ''
+
+    logging.info('Compressing...')
+
+    # Match the first argument to a method call
+    match arg:
+        case 'TABLE':
+            _tm.compress_tables(args)
+        case '':
+            print('ERROR: Missing arguments after COMPRESS')
+        case _:
+            print('ERROR: Unrecognized argument "' + arg + '" after COMPRESS')
+
+
+# METHOD:       refresh()
+# DESCRIPTION:  Parses the argument list after the REFRESH argument
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      N/A
+def refresh(arguments):
+    # Guard clause that aborts if no database is being used
+    if _ss.current().active_db is None:
+        print("!Failed because no database is being used.")
+        return
+
+    logging.info('Refreshing...')
+
+    _tm.refresh_views(arguments)
+
+
+# METHOD:       backup()
+# DESCRIPTION:  Backs up a database. The statement's text is parsed instead of its arguments,
+#               since the arguments do not keep the path of the directory it is backed up to.
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def backup():
+    logging.info('Backing up...')
+
+    _bk.backup_database(_pf.current().text)
+
+
+# METHOD:       restore()
+# DESCRIPTION:  Restores a database from a backup. The statement's text is parsed instead of its arguments,
+#               like a BACKUP statement's.
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def restore():
+    logging.info('Restoring...')
+
+    _bk.restore_database(_pf.current().text)
+
+
+# METHOD:       set_setting()
+# DESCRIPTION:  Parses the argument list after the SET argument, such as work_mem = 16MB,
+#               which changes a setting of the current session
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      N/A
+def set_setting(arguments):
+    # Guard clause that aborts if the setting or its value is missing
+    if arguments is None or isinstance(arguments, str) or len(arguments) < 2:
+        print('ERROR: Expected SET setting = value')
+        return
+
+    # The value may be separated from the setting by '=' or TO, and from its unit by whitespace
+    name, args = arguments[0], arguments[1:]
+    if args[0].upper() in ('=', 'TO'):
+        args = args[1:]
+    value = ''.join(args)
+
+    # Match the setting to a method call
+    match name.lower():
+        case 'work_mem':
+            _mem.set_work_mem(value)
+        case 'statement_timeout':
+            _cn.set_statement_timeout(value)
+        case _:
+            print(f'!Failed because {name} is not a setting.')
+
+
 # METHOD:       read()
 # DESCRIPTION:  Parses the argument list after the READ argument
 # ARGUMENTS:    arguments - the list of arguments
@@ -396,6 +634,69 @@ def read(arguments):
 
     file_input(file)
 
+
+# METHOD:       show()
+# DESCRIPTION:  Parses the argument list after the SHOW argument
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      N/A
+def show(arguments):
+    # arg - first argument from the arguments list
+    # arg is converted into upper case for the purposes of pattern matching
+    arg, _ = _ut.pop_argument(arguments)
+    arg = arg.upper() if isinstance(arg, str) else ''
+
+    # Match the first argument to a method call
+    match arg:
+        case 'STATEMENTS':
+            _st.show_statements()
+        case 'CACHE':
+            _ch.show_cache()
+        case 'REPLICATION':
+            _rp.show_replication()
+        case 'MEMORY':
+            _mem.show_memory()
+        case 'COMPRESSION':
+            if _ss.current().active_db is None:
+                print("!Failed because no database is being used.")
+                return
+            _cmp.show_compression([(x, _db.tbl_path(x)) for x in _db.list_tables()])
+        case 'BLOOM':
+            if _ss.current().active_db is None:
+                print("!Failed because no database is being used.")
+                return
+            _bf.show_filters([(x, _db.tbl_path(x)) for y in _db.list_tables() for x in _tm.partition_tables(y)])
+        case '':
+            print('ERROR: Missing arguments after SHOW')
+        case _:
+            print('ERROR: Unrecognized argument "' + arg + '" after SHOW')
+
+
+# METHOD:       explain()
+# DESCRIPTION:  Parses the argument list after the EXPLAIN argument
+#               The statement is executed with its output discarded, then its profile is printed
+# ARGUMENTS:    arguments - the list of arguments
+# RETURNS:      N/A
+def explain(arguments):
+    # Guard clause that aborts if the input is None
+    if arguments is None or isinstance(arguments, str):
+        print('ERROR: Missing arguments after EXPLAIN')
+        return
+
+    # Only EXPLAIN ANALYZE is supported, the statement must be executed to be profiled
+    if arguments[0].upper() != 'ANALYZE' or len(arguments) < 2:
+        print('ERROR: Expected EXPLAIN ANALYZE followed by a statement')
+        return
+
+    profile = _pf.current()
+
+    # Executes the statement while discarding anything it prints
+    with open(os.devnull, 'w') as devnull, _ss.redirect_output(devnull):
+        with _pf.operator('execute'):
+            execute(arguments[1:])
+
+    profile.wall_time = _pf.elapsed(profile)
+    _pf.print_profile(profile)
+
 # endregion
 
 # region UTILITY
@@ -414,8 +715,15 @@ def read(arguments):
 # RETURNS:      A list of arguments
 def split_arguments(arguments: str):
     stripped = arguments.split(';', 1)[0]
-    arg_list = re.findall(r'(?:VALUES|values)\s*\([\s\S]+\)|\([\s\S]+\)|\w*\.*\w+|\*|[<>=!]+|\'\w+\'', stripped)
-    arguments = [x.upper() if x.upper() in _gl.KEYWORDS else x for x in arg_list]
-    return arguments
+    return _ut.split_statement(stripped)
 
 # endregion
+
+# METHOD:       in_init()
+# DESCRIPTION:  Initializes the input global variables used by the program
+# ARGUMENTS:    batch_size - the most consecutive INSERT statements executed as a batch, None disables batching
+# RETURNS:      N/A
+def in_init(batch_size: int = None):
+    global insert_batch_size
+
+    insert_batch_size = batch_size or 0
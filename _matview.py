@@ -0,0 +1,506 @@
+# FILE NAME:    _MATVIEW.PY
+# MODULE NAME:  Matview
+# DESCRIPTION:  Provides methods for defining materialized views, for reading and writing
+#               their definitions and aggregate state, and for updating that state from
+#               the records added to and removed from the tables a view is defined over
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import ast
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+import _globals as _gl
+import _storage as _sto
+
+# Internal global variables
+# views - the definitions of the materialized views last read, keyed by the path of each view's table
+# directory - the directory the views were read from and its modification time, a view being
+#             created or dropped changes the modification time so the views are read again
+views = {}
+directory = None
+
+# Runtime Constants Variables
+# QUERY - the parts of the SELECT statement a view is defined by
+# COLUMN - a column of the SELECT statement, either an aggregate function or a field, with an optional alias
+QUERY = re.compile(r'SELECT\s+(?P<columns>.+?)\s+FROM\s+(?P<tables>.+?)(?:\s+ON\s+(?P<on>.+?))?'
+                   r'(?:\s+WHERE\s+(?P<where>.+?))?(?:\s+GROUP\s+BY\s+(?P<group>.+?))?\s*', re.IGNORECASE | re.DOTALL)
+COLUMN = re.compile(r'(?:(?P<function>COUNT|SUM|AVG|MAX|MIN)\s*\(\s*(?P<argument>\*|[\w.]+)\s*\)|(?P<field>\*|[\w.]+))'
+                    r'(?:\s+AS\s+(?P<alias>\w+))?', re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to describe materialized views
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# ViewDefinition Class
+#
+# Member Variables:
+# query:    The SELECT statement the view is defined by
+# tables:   The names of the tables the view reads from
+# aliases:  The identifier of each table, used by the conditions and columns to refer to it
+# join:     '' for a view of a single table, otherwise 'INNER', 'LEFT' or 'RIGHT'
+# on:       The condition two tables are joined by, formatted as a python expression
+# where:    The condition the records of the view satisfy, formatted as a python expression
+# columns:  The (function, argument, name) of each column of the view, the function is '' for a field
+# group_by: The fields the records are grouped by before they are aggregated
+# keys:     The (alias, field) pair compared by each side of the join's equality, or None
+#
+# Description:
+# Describes the query a materialized view holds the result of. A view can be maintained from
+# the changes to its tables when it reads a single table or the inner equi-join of two different
+# tables, other views are only brought up to date by REFRESH MATERIALIZED VIEW.
+@dataclass
+class ViewDefinition:
+    query: str
+    tables: list[str]
+    aliases: list[str]
+    join: str = ''
+    on: str = 'True'
+    where: str = 'True'
+    columns: list[tuple[str, str, str]] = field(default_factory=list)
+    group_by: list[str] = field(default_factory=list)
+    keys: tuple = None
+
+    # Whether the records of the view are aggregates of groups of records
+    @property
+    def aggregated(self) -> bool:
+        return len(self.group_by) > 0 or any([x[0] for x in self.columns])
+
+    # Whether the view can be maintained from the records added to and removed from its tables
+    @property
+    def incremental(self) -> bool:
+        return len(set(self.tables)) == len(self.tables) \
+            and (self.join == '' or self.join == 'INNER' and self.keys is not None)
+
+
+# ViewPlan Class
+#
+# Member Variables:
+# schema:       The metadata of the view's table
+# widths:       The number of fields of each table, used to split a joined record into its tables' records
+# fields:       The field names of each table
+# positions:    The position within a joined record of each column's field, None for COUNT(*)
+# types:        The python type of each column's field, None for COUNT(*)
+# group:        The position within a joined record of each field the records are grouped by
+# keys:         The (table, position) of each side of the join's equality, or None
+#
+# Description:
+# Describes where the values of a view's columns come from in the records of its tables.
+# The plan is created from the tables' current metadata each time the view is maintained.
+@dataclass
+class ViewPlan:
+    schema: str
+    widths: list[int]
+    fields: list[list[str]]
+    positions: list
+    types: list
+    group: list[int]
+    keys: tuple = None
+
+
+# endregion
+
+# region VIEW DEFINITIONS
+
+# REGION:       VIEW DEFINITIONS
+# DESCRIPTION:  Provides methods for parsing view definitions and planning how they are computed
+
+# --------- METHODS --------- #
+
+
+# METHOD:       parse_definition()
+# DESCRIPTION:  Parses the SELECT statement following AS in a CREATE MATERIALIZED VIEW statement, such as
+#               SELECT s, COUNT(*), AVG(price) FROM Parts WHERE price > 10 GROUP BY s
+#               SELECT E.name, S.amount FROM Employee E INNER JOIN Sales S ON E.id = S.eid
+# ARGUMENTS:    query - the SELECT statement
+# RETURNS:      The ViewDefinition described by the statement, or None if the statement is invalid
+def parse_definition(query: str):
+    match = QUERY.fullmatch(query.strip())
+
+    if match is None:
+        print(f'!Failed because the query "{query}" is not a valid SELECT statement.')
+        return None
+
+    # The words naming the kind of join are removed, leaving the tables and their identifiers
+    words = match['tables'].replace(',', ' ').split()
+    names = [x for x in words if x.upper() not in ('INNER', 'LEFT', 'RIGHT', 'OUTER', 'JOIN')]
+    tables = names[::2] if len(names) > 1 else names
+    aliases = names[1::2] if len(names) > 1 else names
+
+    if len(tables) not in (1, 2) or len(tables) != len(aliases):
+        print('!Failed because a materialized view must select from one table or join two tables.')
+        return None
+
+    view = ViewDefinition(' '.join(query.split()), tables, aliases)
+    view.where = format_condition(match['where'])
+
+    # Records of two tables are joined by the ON condition, or by the WHERE condition when the tables are listed
+    # An inner join has no records that fail its condition, so both conditions become the join's condition
+    if len(tables) == 2:
+        upper = [x.upper() for x in words]
+        view.join = 'LEFT' if 'LEFT' in upper else 'RIGHT' if 'RIGHT' in upper else 'INNER'
+        view.on = format_condition(match['on'])
+        if view.join == 'INNER':
+            view.on = ' and '.join([f'({x})' for x in (view.on, view.where) if x != 'True']) or 'True'
+            view.where = 'True'
+        view.keys = equi_keys(view.on, aliases)
+    elif match['on'] is not None:
+        print('!Failed because ON can only be used to join two tables.')
+        return None
+
+    # The columns are found one at a time, each separated by commas or whitespace
+    columns = match['columns'].strip()
+    position = 0
+    while position < len(columns):
+        column = COLUMN.match(columns, position)
+        if column is None:
+            print(f'!Failed because the column list "{columns}" is invalid.')
+            return None
+
+        function = (column['function'] or '').upper()
+        argument = column['argument'] or column['field']
+        name = column['alias'] or default_name(function, argument)
+        view.columns.append((function, argument, name))
+
+        position = column.end()
+        while position < len(columns) and columns[position] in ', ':
+            position += 1
+
+    view.group_by = match['group'].replace(',', ' ').split() if match['group'] else []
+
+    # Every field selected alongside an aggregate has to be one of the fields the records are grouped by
+    if view.aggregated:
+        fields = [x[1] for x in view.columns if not x[0]]
+        if '*' in fields or any([x not in view.group_by for x in fields]):
+            print('!Failed because each field selected with an aggregate must be listed in GROUP BY.')
+            return None
+
+    return view
+
+
+# METHOD:       format_condition()
+# DESCRIPTION:  Formats a condition of a view into a python expression by replacing each '=' with '=='
+# ARGUMENTS:    condition - the condition, or None if the view has no condition
+# RETURNS:      The condition formatted as a python expression
+def format_condition(condition) -> str:
+    if condition is None or condition.strip() == '':
+        return 'True'
+
+    return re.sub(r'(?<![=><!])=(?!=)', '==', condition.strip())
+
+
+# METHOD:       default_name()
+# DESCRIPTION:  Names a column that was not given an alias with AS
+# ARGUMENTS:    function - the aggregate function of the column, or '' for a field
+#               argument - the field of the column, or '*'
+# RETURNS:      The name of the column, such as 'count_all', 'avg_price' or 'name'
+def default_name(function: str, argument: str) -> str:
+    argument = argument.split('.')[-1]
+
+    if not function:
+        return argument
+
+    # Keywords are upper cased when a statement is split, so a column is never named after its function alone
+    return f'{function.lower()}_{"all" if argument == "*" else argument}'
+
+
+# METHOD:       equi_keys()
+# DESCRIPTION:  Finds an equality between a field of each table in a join's condition,
+#               such as E.id == S.eid, which the join can be computed by with a hash table
+# ARGUMENTS:    condition - the join's condition formatted as a python expression
+#               aliases - the identifiers of the two tables
+# RETURNS:      The (alias, field) compared by each side of the equality, or None if there is none
+def equi_keys(condition: str, aliases: list[str]):
+    try:
+        tree = ast.parse(condition, mode='eval').body
+    except SyntaxError:
+        return None
+
+    # Only an equality that every joined record has to satisfy can be used, so only the
+    # comparisons joined by 'and' at the top of the condition are searched
+    parts = tree.values if isinstance(tree, ast.BoolOp) and isinstance(tree.op, ast.And) else [tree]
+
+    for part in parts:
+        if not (isinstance(part, ast.Compare) and len(part.ops) == 1 and isinstance(part.ops[0], ast.Eq)):
+            continue
+
+        sides = [part.left, part.comparators[0]]
+        if all([isinstance(x, ast.Attribute) and isinstance(x.value, ast.Name) for x in sides]):
+            keys = [(x.value.id, x.attr) for x in sides]
+            if keys[0][0] != keys[1][0] and {keys[0][0], keys[1][0]} == set(aliases):
+                return tuple(sorted(keys, key=lambda x: aliases.index(x[0])))
+
+    return None
+
+
+# METHOD:       plan_view()
+# DESCRIPTION:  Finds where the values of a view's columns come from in the records of its tables
+# ARGUMENTS:    view - the ViewDefinition of the view
+#               metas - the metadata of each of the view's tables
+# RETURNS:      The ViewPlan of the view, or None if a column refers to a field that does not exist
+def plan_view(view: ViewDefinition, metas: list[str]):
+    # definitions - the 'name type' definition of each field of each table
+    definitions = [[x for x in meta.split('|') if x] for meta in metas]
+
+    # The fields of the table an outer join pads with empty values are held as text, since an empty value is not a number
+    if view.join in ('LEFT', 'RIGHT'):
+        padded = 1 if view.join == 'LEFT' else 0
+        definitions[padded] = [f"{x.split(' ', 1)[0]} varchar" for x in definitions[padded]]
+    fields = [[x.split(' ', 1)[0] for x in table] for table in definitions]
+    widths = [len(x) for x in fields]
+    combined = [x for table in definitions for x in table]
+
+    # position() - finds the position of a field, optionally prefixed by its table's identifier, in a joined record
+    def position(reference: str):
+        alias, _, name = reference.rpartition('.')
+        for i, table in enumerate(fields):
+            if (alias == '' or alias == view.aliases[i]) and name in table:
+                return sum(widths[:i]) + table.index(name)
+        print(f'!Failed because the field {reference} does not exist.')
+        return None
+
+    plan = ViewPlan('', widths, fields, [], [], [])
+    schema = []
+
+    for function, argument, name in view.columns:
+        # The wildcard selects every field of every table
+        if argument == '*' and not function:
+            plan.positions.extend(range(len(combined)))
+            plan.types.extend([python_type(x) for x in combined])
+            schema.extend(combined)
+            continue
+
+        i = position(argument) if argument != '*' else None
+        if argument != '*' and i is None:
+            return None
+
+        # column_type - the type of the column as written in the view's metadata
+        column_type = combined[i].split(' ', 1)[1] if i is not None else 'int'
+        if function == 'COUNT':
+            column_type = 'int'
+        elif function == 'AVG':
+            column_type = 'float'
+
+        if function in ('SUM', 'AVG') and python_type(combined[i]) == 'str':
+            print(f'!Failed because {function} can not be computed over the field {argument}.')
+            return None
+
+        plan.positions.append(i)
+        plan.types.append(python_type(combined[i]) if i is not None else None)
+        schema.append(f'{name} {column_type}')
+
+    for reference in view.group_by:
+        i = position(reference)
+        if i is None:
+            return None
+        plan.group.append(i)
+
+    if view.keys is not None:
+        plan.keys = tuple([(view.aliases.index(alias), fields[view.aliases.index(alias)].index(name))
+                           if name in fields[view.aliases.index(alias)] else None for alias, name in view.keys])
+        if None in plan.keys:
+            print('!Failed because a field compared by the join does not exist.')
+            return None
+
+    plan.schema = '|'.join(schema)
+
+    return plan
+
+
+# METHOD:       python_type()
+# DESCRIPTION:  Finds the python type of a field from its definition in a table's metadata
+# ARGUMENTS:    definition - the definition of the field, such as 'price float'
+# RETURNS:      The name of the python type of the field
+def python_type(definition: str) -> str:
+    column_type = definition.split(' ', 1)[1]
+
+    return column_type if column_type in ('int', 'float') else 'str'
+
+
+# endregion
+
+# region AGGREGATE STATE
+
+# REGION:       AGGREGATE STATE
+# DESCRIPTION:  Provides methods for maintaining the aggregates of each group of a view's records.
+#               The state maps the values of each group's GROUP BY fields to a list holding the
+#               number of records in the group followed by the running value of each column,
+#               the sum for SUM and AVG and the current extreme for MIN and MAX.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       accumulate()
+# DESCRIPTION:  Adds records to or removes records from the aggregates of their groups
+# ARGUMENTS:    view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               state - the aggregate state of the view, which is changed in place
+#               records - the joined records to add or remove
+#               sign - 1 to add the records, -1 to remove them
+# RETURNS:      False if a removed record was the minimum or maximum of its group, in which case
+#               the group's new extreme is unknown and the view has to be refreshed, True otherwise
+def accumulate(view: ViewDefinition, plan: ViewPlan, state: dict, records: list[tuple], sign: int) -> bool:
+    exact = True
+
+    for record in records:
+        key = tuple([record[x] for x in plan.group])
+        entry = state.get(key)
+
+        if entry is None:
+            if sign < 0:
+                return False
+            entry = state[key] = [0] + [None] * len(view.columns)
+
+        entry[0] += sign
+
+        for i, (function, _, _) in enumerate(view.columns, 1):
+            if function in ('SUM', 'AVG'):
+                entry[i] = (entry[i] or 0) + sign * record[plan.positions[i - 1]]
+            elif function in ('MIN', 'MAX'):
+                value = record[plan.positions[i - 1]]
+                if sign < 0:
+                    exact = exact and value != entry[i]
+                elif entry[i] is None or (value < entry[i] if function == 'MIN' else value > entry[i]):
+                    entry[i] = value
+
+        # A group without any records no longer has a record in the view
+        if entry[0] <= 0:
+            del state[key]
+
+    return exact
+
+
+# METHOD:       aggregate_record()
+# DESCRIPTION:  Creates the view's record for a group from the group's aggregates
+# ARGUMENTS:    view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               key - the values of the group's GROUP BY fields
+#               entry - the group's number of records and running values
+# RETURNS:      The view's record for the group
+def aggregate_record(view: ViewDefinition, plan: ViewPlan, key: tuple, entry: list) -> tuple:
+    record = []
+
+    for i, (function, _, _) in enumerate(view.columns, 1):
+        match function:
+            case '':
+                record.append(key[plan.group.index(plan.positions[i - 1])])
+            case 'COUNT':
+                record.append(entry[0])
+            case 'AVG':
+                record.append(entry[i] / entry[0])
+            case _:
+                record.append(entry[i])
+
+    return tuple(record)
+
+
+# endregion
+
+# region VIEW FILES
+
+# REGION:       VIEW FILES
+# DESCRIPTION:  Provides methods for reading and writing the file holding a view's definition and
+#               aggregate state. The file is stored alongside the view's table, its first line holds
+#               the view's query, its second line the number of rows of the view's table and every
+#               line after it holds a group, its aggregates and the row of the table holding its record.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       read_view()
+# DESCRIPTION:  Reads the definition and aggregate state of a view
+# ARGUMENTS:    path - the path of the view's table file
+# RETURNS:      A tuple of the ViewDefinition, the aggregate state, the row of each group's record and the
+#               number of rows of the view's table when the file was written, or None if the table is not
+#               a materialized view
+def read_view(path: str):
+    try:
+        with open(_sto.sidecar_path(path, _sto.MATVIEW_FILE_TYPE), 'r') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+
+    view = views.get(path) or parse_definition(lines[0])
+    groups = [ast.literal_eval(x) for x in lines[2:] if x]
+    state = {key: entry for key, entry, _ in groups}
+    rows = {key: row for key, _, row in groups}
+
+    return view, state, rows, int(lines[1])
+
+
+# METHOD:       write_view()
+# DESCRIPTION:  Writes the definition and aggregate state of a view
+# ARGUMENTS:    path - the path of the view's table file
+#               view - the ViewDefinition of the view
+#               state - the aggregate state of the view
+#               rows - the row of the view's table holding each group's record
+#               total - the number of rows of the view's table, including deleted rows
+# RETURNS:      N/A
+def write_view(path: str, view: ViewDefinition, state: dict, rows: dict, total: int):
+    lines = [view.query, str(total)] + [repr((key, entry, rows.get(key))) for key, entry in state.items()]
+
+    with open(_sto.sidecar_path(path, _sto.MATVIEW_FILE_TYPE), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+# METHOD:       read_views()
+# DESCRIPTION:  Reads the definitions of every materialized view in a database's folder
+#               The definitions are only read again once a view has been created or dropped
+# ARGUMENTS:    folder - the path of the database's folder
+# RETURNS:      The ViewDefinitions of the views, keyed by the path of each view's table file
+def read_views(folder: str) -> dict:
+    global views
+    global directory
+
+    try:
+        version = (folder, os.stat(folder).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+
+    if version == directory:
+        return views
+
+    # The definitions are read before they replace the definitions of the previous folder,
+    # since statements of other sessions may be reading those at the same time
+    found = {}
+    for name in os.listdir(folder):
+        if name.endswith(_sto.MATVIEW_FILE_TYPE):
+            with open(os.path.join(folder, name), 'r') as f:
+                query = f.readline().strip()
+            view = parse_definition(query)
+            if view is not None:
+                found[os.path.join(folder, os.path.splitext(name)[0] + _gl.TABLE_FILE_TYPE)] = view
+
+    views = found
+    directory = version
+    logging.info(f'Read {len(found)} materialized views from {folder}')
+
+    return found
+
+
+# METHOD:       is_view()
+# DESCRIPTION:  Checks whether a table is a materialized view
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      A bool representing whether the table is a materialized view
+def is_view(path: str) -> bool:
+    return path in read_views(os.path.dirname(path))
+
+
+# METHOD:       dependents()
+# DESCRIPTION:  Finds the materialized views that read from a table
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      A list of the (path, ViewDefinition) of each view that reads from the table
+def dependents(path: str) -> list[tuple[str, ViewDefinition]]:
+    folder, name = os.path.split(path)
+    table_name = os.path.splitext(name)[0]
+
+    return [(x, view) for x, view in read_views(folder).items()
+            if table_name in [y.lower() for y in view.tables]]
+
+
+# endregion
@@ -0,0 +1,312 @@
+# FILE NAME:    _MEMORY.PY
+# MODULE NAME:  Memory
+# DESCRIPTION:  Provides the memory budget shared by the operators of every session and the temporary files
+#               operators spill to. Each operator that holds records in memory, such as a sort, a hash
+#               aggregation, the build side of a hash join or the workspace of a transaction, reserves the
+#               memory it holds from the budget. A reservation may grow up to the session's work_mem as long
+#               as the engine's memory limit is not exceeded, and an operator whose reservation can not grow
+#               spills to disk instead. The memory reserved by a statement is recorded by its profile.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+import _globals as _gl
+import _filesystem as _fs
+import _session as _ss
+
+# Internal global variables
+# memory_limit - the most memory in bytes reserved by every operator of every session at once, or None (--memory-limit)
+# reserved - the memory in bytes reserved by the operators executing
+# peak - the most memory in bytes reserved at once since the program started
+# reservations - the Reservations holding memory
+# lock - the lock held while the memory reserved is changed
+memory_limit = None
+reserved = 0
+peak = 0
+reservations = set()
+lock = threading.Lock()
+
+# Runtime Constants Variables
+# DEFAULT_WORK_MEM - the most memory in bytes a single operator reserves when neither it nor the session sets another
+# SPILL_FILE_TYPE - the file extension of the temporary files operators spill to
+# SPILL_BATCH - the number of records pickled together when a temporary file is written
+# TEXT_EXPANSION - the estimated memory used by the records read from each byte of a table file
+# UNITS - the bytes in each unit of a memory setting, a setting without a unit is in kilobytes
+# SIZE - a memory setting, such as 16MB or 4096
+DEFAULT_WORK_MEM = 64 * 1024 * 1024
+SPILL_FILE_TYPE = '.spill'
+SPILL_BATCH = 1024
+TEXT_EXPANSION = 8
+UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+SIZE = re.compile(r'(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>B|KB|MB|GB)?', re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to reserve memory and spill records to disk
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Reservation Class
+#
+# Member Variables:
+# name:     The name of the operator holding the memory
+# cap:      The most memory in bytes the operator may reserve
+# size:     The memory in bytes the operator has reserved
+# peak:     The most memory in bytes the operator has reserved at once
+# profile:  The StatementProfile of the statement the operator is part of, or None
+#
+# Description:
+# Describes the memory reserved by a single operator. It is used as a context manager
+# that releases the memory when the body of the 'with' statement it is used in ends.
+class Reservation:
+    def __init__(self, name: str, limit: int = None):
+        self.name = name
+        self.cap = work_mem(limit)
+        self.size = 0
+        self.peak = 0
+        self.profile = _ss.current().profile
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+    # Changes the memory reserved to nbytes, refusing to grow beyond the cap or the engine's memory limit
+    # The memory is checked and reserved while the lock is held, so operators reserving at once can not both fit
+    def resize(self, nbytes: int) -> bool:
+        with lock:
+            if nbytes > self.size and (nbytes > self.cap or not available(nbytes - self.size)):
+                return False
+            self.change(nbytes)
+
+        return True
+
+    # Makes sure at least nbytes are reserved, reserving ahead of an operator that keeps growing so that
+    # it changes its reservation a few times rather than for every record it holds
+    def grow(self, nbytes: int) -> bool:
+        if nbytes <= self.size:
+            return True
+        if nbytes > self.cap:
+            return False
+
+        return self.resize(min(max(nbytes, self.size * 2), self.cap)) or self.resize(nbytes)
+
+    # Changes the memory reserved to nbytes even beyond the limits, for memory an operator can not spill
+    def force(self, nbytes: int):
+        with lock:
+            self.change(nbytes)
+
+    # Changes the memory reserved to nbytes, which is only done while the lock is held
+    def change(self, nbytes: int):
+        global reserved
+        global peak
+
+        reserved += nbytes - self.size
+        peak = max(peak, reserved)
+        if nbytes > 0:
+            reservations.add(self)
+        else:
+            reservations.discard(self)
+
+        # The memory reserved by the operators of a statement is counted towards the statement
+        if self.profile is not None:
+            self.profile.memory += nbytes - self.size
+            self.profile.peak_memory = max(self.profile.peak_memory, self.profile.memory)
+
+        self.size = nbytes
+        self.peak = max(self.peak, nbytes)
+
+    # Releases all the memory reserved
+    def release(self):
+        if self.size != 0:
+            self.force(0)
+
+
+# SpillFile Class
+#
+# Member Variables:
+# path:     The path of the temporary file
+# rows:     The number of records written to the file
+# nbytes:   The size of the file in bytes once it is closed
+#
+# Description:
+# Describes a temporary file an operator spills records to. The records are buffered and
+# pickled in batches, and read back in the order they were written once the file is closed.
+class SpillFile:
+    def __init__(self, directory: str, prefix: str):
+        handle, self.path = tempfile.mkstemp(prefix=f'{prefix}_', suffix=SPILL_FILE_TYPE, dir=directory)
+        self.rows = 0
+        self.nbytes = 0
+        self._file = os.fdopen(handle, 'wb')
+        self._buffer = []
+
+    # Writes a record to the file
+    def write(self, record):
+        self._buffer.append(record)
+        self.rows += 1
+        if len(self._buffer) >= SPILL_BATCH:
+            self.flush()
+
+    # Writes a list of records to the file
+    def write_all(self, records: list):
+        self.flush()
+        for i in range(0, len(records), SPILL_BATCH):
+            pickle.dump(records[i:i + SPILL_BATCH], self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(records)
+
+    # Writes the buffered records to the file
+    def flush(self):
+        if len(self._buffer) > 0:
+            pickle.dump(self._buffer, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            self._buffer = []
+
+    # Finishes writing the file
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self.nbytes = self._file.tell()
+            self._file.close()
+
+    # Reads the records of the file, closing it first
+    def read(self):
+        self.close()
+        with open(self.path, 'rb') as f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    return
+                yield from batch
+
+    # Closes and deletes the file
+    def delete(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# endregion
+
+# region MEMORY BUDGET
+
+# REGION:       MEMORY BUDGET
+# DESCRIPTION:  Provides methods for reserving memory and changing the memory settings
+
+# --------- METHODS --------- #
+
+
+# METHOD:       work_mem()
+# DESCRIPTION:  Finds the most memory a single operator of the current session may reserve
+# ARGUMENTS:    limit - the operator's own limit in bytes, used when the session has not set work_mem
+# RETURNS:      The limit in bytes
+def work_mem(limit: int = None) -> int:
+    session_limit = _ss.current().work_mem
+    if session_limit is not None:
+        return session_limit
+
+    return limit if limit is not None else DEFAULT_WORK_MEM
+
+
+# METHOD:       available()
+# DESCRIPTION:  Decides whether more memory can be reserved without exceeding the engine's memory limit
+# ARGUMENTS:    nbytes - the memory in bytes to reserve
+# RETURNS:      True if the memory fits within the limit, False otherwise
+def available(nbytes: int) -> bool:
+    return memory_limit is None or reserved + nbytes <= memory_limit
+
+
+# METHOD:       fits()
+# DESCRIPTION:  Decides whether an operator could hold the records read from table files in memory
+# ARGUMENTS:    nbytes - the size in bytes of the table files
+#               limit - the operator's own limit in bytes, used when the session has not set work_mem
+# RETURNS:      True if the estimated memory fits within the operator's limit and the engine's memory limit
+def fits(nbytes: int, limit: int = None) -> bool:
+    estimate = nbytes * TEXT_EXPANSION
+    return estimate <= work_mem(limit) and available(estimate)
+
+
+# METHOD:       spill_directory()
+# DESCRIPTION:  Finds the directory the temporary files of the current session are written to
+# ARGUMENTS:    N/A
+# RETURNS:      The folder of the database being used, or the current directory when none is
+def spill_directory() -> str:
+    active_db = _ss.current().active_db
+    return _fs.rpath(_gl.DATABASES_DIRECTORY, active_db) if active_db is not None else os.getcwd()
+
+
+# METHOD:       parse_size()
+# DESCRIPTION:  Parses a memory setting, such as 16MB, 512kB or 4096, which is in kilobytes without a unit
+# ARGUMENTS:    text - the setting
+# RETURNS:      The setting in bytes, or None if it is invalid
+def parse_size(text: str):
+    match = SIZE.fullmatch(text.strip().strip("'").strip())
+    if match is None:
+        return None
+
+    return int(float(match['number']) * UNITS[(match['unit'] or 'KB').upper()])
+
+
+# METHOD:       set_work_mem()
+# DESCRIPTION:  Sets the most memory a single operator of the current session may reserve
+# ARGUMENTS:    value - the setting, or DEFAULT to use the limit of each operator
+# RETURNS:      N/A
+def set_work_mem(value: str):
+    session = _ss.current()
+
+    if value.strip("'").upper() == 'DEFAULT':
+        session.work_mem = None
+        print('work_mem reset to the default.')
+        return
+
+    nbytes = parse_size(value)
+    if nbytes is None or nbytes < 1:
+        print(f'!Failed because "{value}" is not a valid amount of memory, expected a size such as 16MB.')
+        return
+
+    session.work_mem = nbytes
+    logging.info(f'Set work_mem of session {session.id} to {nbytes} bytes')
+    print(f'work_mem set to {nbytes} bytes.')
+
+
+# METHOD:       show_memory()
+# DESCRIPTION:  Prints the memory settings and the memory reserved by each operator executing
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def show_memory():
+    with lock:
+        held = sorted([(x.name, x.size) for x in reservations], key=lambda x: -x[1])
+        totals = (reserved, peak)
+
+    print('memory limit|work_mem|reserved|peak reserved')
+    print(f'{memory_limit if memory_limit is not None else "none"}|{work_mem()}|{totals[0]}|{totals[1]}')
+
+    if len(held) > 0:
+        print('operator|reserved')
+        for name, size in held:
+            print(f'{name}|{size}')
+
+
+# endregion
+
+# METHOD:       mem_init()
+# DESCRIPTION:  Initializes the memory global variables used by the program
+# ARGUMENTS:    limit_mb - the most memory in megabytes reserved by every operator at once, None leaves it unlimited
+# RETURNS:      N/A
+def mem_init(limit_mb: float = None):
+    global memory_limit
+    global reserved
+    global peak
+
+    memory_limit = int(limit_mb * 1024 * 1024) if limit_mb is not None else None
+    reserved = 0
+    peak = 0
+    reservations.clear()
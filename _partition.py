@@ -0,0 +1,329 @@
+# FILE NAME:    _PARTITION.PY
+# MODULE NAME:  Partition
+# DESCRIPTION:  Provides methods for splitting a table's records across partition files
+#               by range or by hash, and for pruning the partitions a condition rules out
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import ast
+import bisect
+import logging
+import os
+import re
+import zlib
+from dataclasses import dataclass, field
+import _storage as _sto
+
+# Runtime Constants Variables
+# METHODS - the supported ways of assigning records to partitions
+METHODS = ('RANGE', 'HASH')
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to describe how a table is partitioned
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# PartitionScheme Class
+#
+# Member Variables:
+# method:       How records are assigned to partitions, either 'RANGE' or 'HASH'
+# key:          The name of the field records are partitioned by
+# position:     The position of the key within the table's records
+# key_type:     The python type of the key
+# names:        The names of the partitions in order
+# bounds:       For range partitioning, the exclusive upper bound of each partition,
+#               None for a partition without an upper bound (MAXVALUE)
+#
+# Description:
+# Describes how the records of a partitioned table are assigned to its partition files.
+# The table's own file only holds the table's metadata, each partition is stored in its
+# own file next to it.
+@dataclass
+class PartitionScheme:
+    method: str
+    key: str
+    position: int
+    key_type: str
+    names: list[str] = field(default_factory=list)
+    bounds: list = field(default_factory=list)
+
+
+# endregion
+
+# region PARTITION SCHEMES
+
+# REGION:       PARTITION SCHEMES
+# DESCRIPTION:  Provides methods for parsing, reading and writing partition schemes
+
+# --------- METHODS --------- #
+
+
+# METHOD:       parse_clause()
+# DESCRIPTION:  Parses the clause following PARTITION BY in a CREATE TABLE statement, such as
+#               RANGE (a) (PARTITION p0 VALUES LESS THAN (10), PARTITION p1 VALUES LESS THAN MAXVALUE)
+#               or HASH (a) PARTITIONS 4
+# ARGUMENTS:    clause - the clause following PARTITION BY
+#               fields - the field names of the table
+#               types - the python types of the fields of the table
+# RETURNS:      The PartitionScheme described by the clause, or None if the clause is invalid
+def parse_clause(clause: str, fields: list[str], types: list[str]):
+    match = re.fullmatch(r'(\w+)\s*\(\s*(\w+)\s*\)\s*(.*?)\s*', clause, re.IGNORECASE | re.DOTALL)
+
+    if match is None or match[1].upper() not in METHODS:
+        print(f'!Failed because the partitioning "{clause}" is invalid.')
+        return None
+
+    method, key, rest = match[1].upper(), match[2], match[3]
+
+    if key not in fields:
+        print(f'!Failed because the partition key {key} is not a field of the table.')
+        return None
+
+    scheme = PartitionScheme(method, key, fields.index(key), types[fields.index(key)])
+
+    # Hash partitions are named in order, p0 through pN
+    if method == 'HASH':
+        count = re.fullmatch(r'PARTITIONS\s+(\d+)', rest, re.IGNORECASE)
+        if count is None or int(count[1]) < 1:
+            print('!Failed because HASH partitioning requires PARTITIONS followed by the number of partitions.')
+            return None
+        scheme.names = [f'p{i}' for i in range(int(count[1]))]
+        return scheme
+
+    # Range partitions are listed with their exclusive upper bounds in ascending order
+    definitions = re.findall(r'PARTITION\s+(\w+)\s+VALUES\s+LESS\s+THAN\s+(?:\(\s*([^)]*?)\s*\)|(MAXVALUE))',
+                             rest, re.IGNORECASE)
+
+    if len(definitions) < 1:
+        print('!Failed because RANGE partitioning requires a list of partitions.')
+        return None
+
+    for name, bound, maxvalue in definitions:
+        value = None
+
+        if not maxvalue:
+            try:
+                value = canonical(scheme, ast.literal_eval(bound))
+            except (ValueError, SyntaxError):
+                pass
+
+            if value is None:
+                print(f'!Failed because the bound of partition {name} is not a valid {scheme.key_type}.')
+                return None
+
+        scheme.names.append(name)
+        scheme.bounds.append(value)
+
+    # Only the last partition may be unbounded, and the bounds must increase
+    finite = [x for x in scheme.bounds if x is not None]
+    if len(set(scheme.names)) != len(scheme.names) or None in scheme.bounds[:-1] or finite != sorted(set(finite)):
+        print('!Failed because the partition names must be unique and their bounds must increase.')
+        return None
+
+    return scheme
+
+
+# METHOD:       read_scheme()
+# DESCRIPTION:  Reads the partition scheme of a table
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The PartitionScheme of the table, or None if the table is not partitioned
+def read_scheme(path: str):
+    try:
+        with open(_sto.sidecar_path(path, _sto.PARTITION_FILE_TYPE), 'r') as f:
+            lines = [line.strip() for line in f.readlines() if not line.isspace()]
+    except FileNotFoundError:
+        return None
+
+    # The first line holds the method and key, every line after it holds a partition and its bound
+    method, key, position, key_type = lines[0].split('|')
+    scheme = PartitionScheme(method, key, int(position), key_type)
+
+    for line in lines[1:]:
+        name, _, bound = line.partition('|')
+        scheme.names.append(name)
+        if method == 'RANGE':
+            scheme.bounds.append(ast.literal_eval(bound) if bound != '' else None)
+
+    return scheme
+
+
+# METHOD:       write_scheme()
+# DESCRIPTION:  Writes the partition scheme of a table
+# ARGUMENTS:    path - the path of the table file
+#               scheme - the PartitionScheme of the table
+# RETURNS:      N/A
+def write_scheme(path: str, scheme: PartitionScheme):
+    lines = [f'{scheme.method}|{scheme.key}|{scheme.position}|{scheme.key_type}']
+
+    for i, name in enumerate(scheme.names):
+        if scheme.method == 'RANGE':
+            lines.append(f'{name}|{repr(scheme.bounds[i]) if scheme.bounds[i] is not None else ""}')
+        else:
+            lines.append(name)
+
+    with open(_sto.sidecar_path(path, _sto.PARTITION_FILE_TYPE), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+# METHOD:       partition_path()
+# DESCRIPTION:  Creates the path of the file holding a partition of a table
+# ARGUMENTS:    path - the path of the table file
+#               name - the name of the partition
+# RETURNS:      The path of the partition file
+def partition_path(path: str, name: str) -> str:
+    base, ext = os.path.splitext(path)
+    return f'{base}.{name}{ext}'
+
+
+# METHOD:       parent_path()
+# DESCRIPTION:  Finds the path of the table a partition file belongs to
+# ARGUMENTS:    path - the path of the partition file, or of a table file
+# RETURNS:      The path of the partitioned table's file, or the path itself if it is not a partition
+def parent_path(path: str) -> str:
+    base, ext = os.path.splitext(path)
+    folder, name = os.path.split(base)
+    return os.path.join(folder, name.split('.')[0] + ext)
+
+
+# endregion
+
+# region ROUTING
+
+# REGION:       ROUTING
+# DESCRIPTION:  Provides methods for finding the partitions that hold a record or may
+#               hold the records that satisfy a condition
+
+# --------- METHODS --------- #
+
+
+# METHOD:       canonical()
+# DESCRIPTION:  Converts a value to the type of the partition key so that equal values
+#               are always assigned to the same partition
+# ARGUMENTS:    scheme - the PartitionScheme of the table
+#               value - the value to convert
+# RETURNS:      The converted value, or None if the value can not be compared with the key
+def canonical(scheme: PartitionScheme, value):
+    if scheme.key_type == 'str':
+        return value if isinstance(value, str) else None
+
+    if isinstance(value, (str, bool)) or not isinstance(value, (int, float)):
+        return None
+
+    if scheme.key_type == 'float':
+        return float(value)
+
+    return value
+
+
+# METHOD:       route()
+# DESCRIPTION:  Finds the partition a record belongs in by the value of its key
+# ARGUMENTS:    scheme - the PartitionScheme of the table
+#               value - the value of the record's key
+# RETURNS:      The name of the partition, or None if no partition accepts the value
+def route(scheme: PartitionScheme, value):
+    value = canonical(scheme, value)
+
+    if value is None:
+        return None
+
+    # Hashes are computed with crc32 since python's hash() of a string changes between runs
+    if scheme.method == 'HASH':
+        return scheme.names[zlib.crc32(str(value).encode()) % len(scheme.names)]
+
+    # A value belongs to the first partition whose upper bound is greater than it
+    finite = scheme.bounds[:-1] if scheme.bounds[-1] is None else scheme.bounds
+    i = bisect.bisect_right(finite, value)
+
+    return scheme.names[i] if i < len(scheme.names) else None
+
+
+# METHOD:       prune()
+# DESCRIPTION:  Finds the partitions that may hold records satisfying a condition
+# ARGUMENTS:    scheme - the PartitionScheme of the table
+#               condition - the condition formatted as a python expression
+# RETURNS:      The names of the partitions that have to be read, in order
+def prune(scheme: PartitionScheme, condition: str) -> list[str]:
+    try:
+        tree = ast.parse(condition or 'True', mode='eval')
+    except SyntaxError:
+        return scheme.names
+
+    partitions = prune_node(scheme, tree.body)
+
+    return [x for x in scheme.names if x in partitions]
+
+
+# METHOD:       prune_node()
+# DESCRIPTION:  Finds the partitions that may hold records satisfying part of a condition
+#               Any expression that is not understood keeps every partition
+# ARGUMENTS:    scheme - the PartitionScheme of the table
+#               node - the node of the condition's syntax tree
+# RETURNS:      A set of the names of the partitions that have to be read
+def prune_node(scheme: PartitionScheme, node: ast.AST) -> set[str]:
+    if isinstance(node, ast.BoolOp):
+        parts = [prune_node(scheme, x) for x in node.values]
+        return set.intersection(*parts) if isinstance(node.op, ast.And) else set.union(*parts)
+
+    # Chained comparisons such as 1 < a < 5 are pruned by each of their comparisons
+    if isinstance(node, ast.Compare):
+        partitions = set(scheme.names)
+        operands = [node.left] + node.comparators
+        for i, op in enumerate(node.ops):
+            partitions &= prune_comparison(scheme, operands[i], op, operands[i + 1])
+        return partitions
+
+    return set(scheme.names)
+
+
+# METHOD:       prune_comparison()
+# DESCRIPTION:  Finds the partitions that may hold records satisfying a comparison
+#               between the partition key and a literal
+# ARGUMENTS:    scheme - the PartitionScheme of the table
+#               left - the node on the left of the comparison
+#               op - the comparison operator
+#               right - the node on the right of the comparison
+# RETURNS:      A set of the names of the partitions that have to be read
+def prune_comparison(scheme: PartitionScheme, left: ast.AST, op: ast.cmpop, right: ast.AST) -> set[str]:
+    # mirrored - the operator to use when the literal is on the left of the comparison
+    mirrored = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq}
+
+    if isinstance(right, ast.Name) and isinstance(left, ast.Constant) and type(op) in mirrored:
+        left, op, right = right, mirrored[type(op)](), left
+
+    if not (isinstance(left, ast.Name) and left.id == scheme.key and isinstance(right, ast.Constant)):
+        return set(scheme.names)
+
+    value = canonical(scheme, right.value)
+
+    if value is None:
+        return set(scheme.names)
+
+    if isinstance(op, ast.Eq):
+        partition = route(scheme, value)
+        return {partition} if partition is not None else set()
+
+    # Hash partitions can only be pruned by equality
+    if scheme.method == 'HASH':
+        return set(scheme.names)
+
+    # Each range partition holds the values from the previous partition's bound up to its own bound
+    partitions = set()
+    for i, name in enumerate(scheme.names):
+        lower = scheme.bounds[i - 1] if i > 0 else None
+        upper = scheme.bounds[i]
+
+        if isinstance(op, ast.Lt) and (lower is None or lower < value) \
+                or isinstance(op, ast.LtE) and (lower is None or lower <= value) \
+                or isinstance(op, (ast.Gt, ast.GtE)) and (upper is None or upper > value) \
+                or not isinstance(op, (ast.Lt, ast.LtE, ast.Gt, ast.GtE)):
+            partitions.add(name)
+
+    logging.info(f'Pruned partitions of {scheme.key} to {sorted(partitions)}')
+
+    return partitions
+
+
+# endregion
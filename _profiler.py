@@ -0,0 +1,332 @@
+# FILE NAME:    _PROFILER.PY
+# MODULE NAME:  Profiler
+# DESCRIPTION:  Provides per-statement instrumentation of the phases and operators
+#               used to execute a statement
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+import _session as _ss
+
+# Internal global variables
+# enabled - prints a profile after every statement when set (--profile)
+# dump_directory - the directory to write a cProfile dump for every statement to (--profile-dump)
+# collect_operators - collects the operator profiles of every statement without printing them
+enabled = False
+dump_directory = None
+collect_operators = False
+
+# statement_count - the number of top level statements profiled, used to name the cProfile dumps
+# lock - the lock held while statement_count is changed, since sessions profile statements at once
+statement_count = 0
+lock = threading.Lock()
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to record the cost of statements and operators
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# OperatorProfile Class
+#
+# Member Variables:
+# name:             The name of the phase or operator
+# depth:            How deeply the operator is nested within other operators
+# wall_time:        The time spent in the operator in seconds
+# rows_in:          The number of rows consumed by the operator
+# rows_out:         The number of rows produced by the operator
+# bytes_read:       The number of bytes read from disk by the operator
+# bytes_written:    The number of bytes written to disk by the operator
+# details:          Any other measurements of the operator, such as its throughput, printed after the counters
+#
+# Description:
+# Records the cost of a single phase or operator. It is used as a context manager
+# that times the body of the 'with' statement it is used in.
+@dataclass
+class OperatorProfile:
+    name: str
+    depth: int = 0
+    wall_time: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    details: dict = field(default_factory=dict)
+    _start: float = field(default=0.0, repr=False)
+    _statement: 'StatementProfile' = field(default=None, repr=False)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall_time = time.perf_counter() - self._start
+        self._statement.depth -= 1
+        return False
+
+
+# NullOperator Class
+#
+# Description:
+# Stands in for an OperatorProfile when the statement is not being profiled.
+# Every assignment is discarded and the instance evaluates as False, so callers
+# can skip any work that is only needed for the profile.
+class NullOperator:
+    __slots__ = ()
+
+    rows_in = 0
+    rows_out = 0
+    bytes_read = 0
+    bytes_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, key, value):
+        pass
+
+    def __bool__(self):
+        return False
+
+
+NULL_OPERATOR = NullOperator()
+
+
+# StatementProfile Class
+#
+# Member Variables:
+# text:             The statement as it was passed to the parser
+# analyze:          Whether operator level profiles are collected for the statement
+# operators:        The operator profiles in the order they were started
+# wall_time:        The time spent executing the statement in seconds
+# rows_scanned:     The number of rows read from tables by the statement
+# rows_decoded:     The number of rows read from tables that were converted into records
+# rows_returned:    The number of rows printed by the statement
+# bytes_read:       The number of bytes read from tables by the statement
+# memory:           The memory in bytes reserved by the statement's operators that are executing
+# peak_memory:      The most memory in bytes reserved by the statement's operators at once
+# depth:            The nesting depth of the operator currently executing
+# parent:           The profile of the statement that was executing when this one started
+# number:           The number the statement's cProfile dump is named by, or 0 if it is not dumped
+#
+# Description:
+# Records the cost of a single statement. The counters are always maintained, the
+# operator profiles are only collected when profiling or EXPLAIN ANALYZE is used.
+@dataclass
+class StatementProfile:
+    text: str
+    analyze: bool = False
+    operators: list[OperatorProfile] = field(default_factory=list)
+    wall_time: float = 0.0
+    rows_scanned: int = 0
+    rows_decoded: int = 0
+    rows_returned: int = 0
+    bytes_read: int = 0
+    memory: int = 0
+    peak_memory: int = 0
+    depth: int = 0
+    parent: 'StatementProfile' = None
+    number: int = 0
+    _start: float = field(default=0.0, repr=False)
+    _profiler: cProfile.Profile = field(default=None, repr=False)
+
+
+# endregion
+
+# region PROFILING
+
+# REGION:       PROFILING
+# DESCRIPTION:  Provides methods for starting, ending and recording profiles
+
+# --------- METHODS --------- #
+
+
+# METHOD:       current()
+# DESCRIPTION:  Finds the profile of the statement the current session is executing
+# ARGUMENTS:    N/A
+# RETURNS:      The StatementProfile of the statement, or None
+def current():
+    return _ss.current().profile
+
+
+# METHOD:       begin_statement()
+# DESCRIPTION:  Starts the profile of a statement and makes it the current profile of the session
+# ARGUMENTS:    text - the statement being executed
+# RETURNS:      The profile of the statement
+def begin_statement(text: str) -> StatementProfile:
+    global statement_count
+
+    # Operator profiles are collected when profiling is enabled or EXPLAIN ANALYZE is used
+    analyze = enabled or collect_operators or re.match(r'\s*EXPLAIN\s+ANALYZE\b', text, re.IGNORECASE) is not None
+
+    session = _ss.current()
+    profile = StatementProfile(text, analyze, parent=session.profile)
+    session.profile = profile
+
+    # Only top level statements are dumped, cProfile can not be nested
+    # Each statement takes its number when it starts, so statements of different sessions never share a dump
+    if dump_directory is not None and profile.parent is None:
+        with lock:
+            statement_count += 1
+            profile.number = statement_count
+        profile._profiler = cProfile.Profile()
+        profile._profiler.enable()
+
+    profile._start = time.perf_counter()
+
+    return profile
+
+
+# METHOD:       end_statement()
+# DESCRIPTION:  Ends the profile of a statement and restores the profile of the enclosing statement
+# ARGUMENTS:    profile - the profile returned by begin_statement()
+# RETURNS:      The finished profile
+def end_statement(profile: StatementProfile) -> StatementProfile:
+    profile.wall_time = time.perf_counter() - profile._start
+
+    # Write out the cProfile statistics of the statement
+    if profile._profiler is not None:
+        profile._profiler.disable()
+        path = os.path.join(dump_directory, f'statement_{profile.number:05d}.prof')
+        try:
+            profile._profiler.dump_stats(path)
+        except OSError:
+            logging.error(f'ERROR: Could not write profile dump {path}')
+        profile._profiler = None
+
+    parent = _ss.current().profile = profile.parent
+
+    # Rows read by a nested statement (such as READ) count towards the enclosing statement
+    if parent is not None:
+        parent.rows_scanned += profile.rows_scanned
+        parent.rows_decoded += profile.rows_decoded
+        parent.rows_returned += profile.rows_returned
+        parent.bytes_read += profile.bytes_read
+        parent.peak_memory = max(parent.peak_memory, parent.memory + profile.peak_memory)
+
+    if enabled:
+        print_profile(profile, sys.stderr)
+
+    return profile
+
+
+# METHOD:       elapsed()
+# DESCRIPTION:  Finds the time that has passed since a statement began
+# ARGUMENTS:    profile - the profile of the statement
+# RETURNS:      The elapsed time in seconds
+def elapsed(profile: StatementProfile) -> float:
+    return time.perf_counter() - profile._start
+
+
+# METHOD:       operator()
+# DESCRIPTION:  Creates the profile of an operator within the current statement
+# ARGUMENTS:    name - the name of the phase or operator
+# RETURNS:      An OperatorProfile to use as a context manager, or NULL_OPERATOR when not profiling
+def operator(name: str):
+    profile = _ss.current().profile
+    if profile is None or not profile.analyze:
+        return NULL_OPERATOR
+
+    op = OperatorProfile(name, profile.depth, _statement=profile)
+    profile.operators.append(op)
+    profile.depth += 1
+
+    return op
+
+
+# METHOD:       count_scanned()
+# DESCRIPTION:  Adds rows read from a table to the counters of the current statement
+# ARGUMENTS:    rows - the number of rows read
+#               nbytes - the number of bytes read
+# RETURNS:      N/A
+def count_scanned(rows: int, nbytes: int = 0):
+    profile = _ss.current().profile
+    if profile is not None:
+        profile.rows_scanned += rows
+        profile.bytes_read += nbytes
+
+
+# METHOD:       count_decoded()
+# DESCRIPTION:  Adds rows read from a table that were converted into records to the counters of the current statement
+# ARGUMENTS:    rows - the number of rows converted
+# RETURNS:      N/A
+def count_decoded(rows: int):
+    profile = _ss.current().profile
+    if profile is not None:
+        profile.rows_decoded += rows
+
+
+# METHOD:       count_returned()
+# DESCRIPTION:  Adds rows returned to the client to the counters of the current statement
+# ARGUMENTS:    rows - the number of rows returned
+# RETURNS:      N/A
+def count_returned(rows: int):
+    profile = _ss.current().profile
+    if profile is not None:
+        profile.rows_returned += rows
+
+
+# METHOD:       print_profile()
+# DESCRIPTION:  Prints the report of a statement profile
+# ARGUMENTS:    profile - the profile to print
+#               file - the stream to print the report to, or None to print it to the session's output
+# RETURNS:      N/A
+def print_profile(profile: StatementProfile, file=None):
+    for line in format_profile(profile):
+        print(line, file=file)
+
+
+# METHOD:       format_profile()
+# DESCRIPTION:  Formats the report of a statement profile into lines
+# ARGUMENTS:    profile - the profile to format
+# RETURNS:      A list of strings representing the report
+def format_profile(profile: StatementProfile) -> list[str]:
+    lines = [f'PROFILE: {profile.text.strip()}',
+             f'Total: {profile.wall_time * 1000:.3f} ms, {profile.rows_scanned} rows scanned, '
+             f'{profile.rows_decoded} rows decoded, {profile.rows_returned} rows returned, {profile.bytes_read} bytes read, '
+             f'{profile.peak_memory} bytes peak memory']
+
+    # Each operator is indented by its depth to show which operators it is a part of
+    for op in profile.operators:
+        name = f'{"  " * op.depth}{op.name}'
+        lines.append(f'  {name:<32} {op.wall_time * 1000:>10.3f} ms'
+                     f'  rows in: {op.rows_in:<8} rows out: {op.rows_out:<8}'
+                     f'  bytes read: {op.bytes_read:<10} bytes written: {op.bytes_written}'
+                     + ''.join([f'  {key}: {value}' for key, value in op.details.items()]))
+
+    return lines
+
+
+# endregion
+
+# METHOD:       pf_init()
+# DESCRIPTION:  Initializes the profiler global variables used by the program
+# ARGUMENTS:    profile - whether every statement should be profiled
+#               dump - the directory to write cProfile dumps to, or None
+# RETURNS:      N/A
+def pf_init(profile: bool = False, dump: str = None):
+    global enabled
+    global dump_directory
+    global collect_operators
+    global statement_count
+
+    enabled = profile
+    dump_directory = dump
+    collect_operators = profile
+    statement_count = 0
+
+    # Create the dump directory if it does not already exist
+    if dump_directory is not None:
+        os.makedirs(dump_directory, exist_ok=True)
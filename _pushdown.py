@@ -0,0 +1,194 @@
+# FILE NAME:    _PUSHDOWN.PY
+# MODULE NAME:  Pushdown
+# DESCRIPTION:  Provides predicate pushdown into the reading of table files. The parts of a condition
+#               that compare fields with literals are compiled into a function of a row's values as they
+#               are split from the table file, which converts only the fields it compares. Rows it rules
+#               out are skipped without converting their other fields or building their records.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import ast
+import functools
+import logging
+from dataclasses import dataclass
+
+# Runtime Constants Variables
+# CONVERSIONS - the function that converts a value of each python type from its string representation,
+#               None for strings, which are compared as they are read
+# KINDS - the kind of value each python type and literal is, values of different kinds are only compared for equality
+# ORDERINGS - the comparisons that fail between values of different kinds
+# CACHE_SIZE - the number of compiled predicates kept, so the chunks of a streamed table are not compiled again
+CONVERSIONS = {'int': 'int', 'float': 'float', 'str': None}
+KINDS = {'int': 'number', 'float': 'number', 'str': 'str', bool: 'number', int: 'number', float: 'number',
+         str: 'str'}
+ORDERINGS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+CACHE_SIZE = 64
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to evaluate conditions on unconverted rows
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Predicate Class
+#
+# Member Variables:
+# text:     The parts of the condition that are evaluated before the rows are converted
+# test:     The function that evaluates them on the list of a row's values as strings
+#
+# Description:
+# Describes the parts of a condition pushed down into the reading of a table file.
+# A row the test rules out can not satisfy the condition, the rows it keeps are still
+# filtered by the whole condition once they are converted.
+@dataclass
+class Predicate:
+    text: str
+    test: object
+
+
+# RawFields Class
+#
+# Member Variables:
+# positions:    Maps each field name to its position within the row
+# conversions:  Maps each field name to the function that converts its values, or None
+#
+# Description:
+# Rewrites the fields used by part of a condition to read them from a row's values,
+# converting only the fields that are used.
+class RawFields(ast.NodeTransformer):
+    def __init__(self, positions: dict, conversions: dict):
+        self.positions = positions
+        self.conversions = conversions
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        value = ast.Subscript(ast.Name('v', ast.Load()), ast.Constant(self.positions[node.id]), ast.Load())
+        if self.conversions[node.id] is None:
+            return value
+        return ast.Call(ast.Name(self.conversions[node.id], ast.Load()), [value], [])
+
+
+# endregion
+
+# region PUSHDOWN
+
+# REGION:       PUSHDOWN
+# DESCRIPTION:  Provides methods for compiling the parts of a condition that can be evaluated
+#               before a row is converted
+
+# --------- METHODS --------- #
+
+
+# METHOD:       compile_predicate()
+# DESCRIPTION:  Compiles the parts of a condition joined by 'and' that only compare fields of a table
+#               with literals or each other into a Predicate
+# ARGUMENTS:    condition - the condition as a string
+#               fields - the tuple of the table's field names
+#               types - the tuple of the python type names of the fields
+# RETURNS:      The Predicate, or None if no part of the condition can be pushed down
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_predicate(condition: str, fields: tuple, types: tuple):
+    if not condition or condition == 'True':
+        return None
+
+    try:
+        tree = ast.parse(condition, mode='eval')
+    except SyntaxError:
+        return None
+
+    # kinds - the kind of value of each field
+    # Fields that share a name, which only happens in joined tables, are never pushed down
+    kinds = {name: KINDS[x] for name, x in zip(fields, types)}
+    if len(kinds) != len(fields):
+        return None
+
+    pushed = [x for x in conjuncts(tree.body) if pushable(x, kinds)]
+    if len(pushed) < 1:
+        return None
+
+    text = ' and '.join([ast.unparse(x) for x in pushed])
+
+    # The parts of the condition are evaluated in the order they were written, as 'and' would evaluate them
+    rewriter = RawFields({name: i for i, name in enumerate(fields)},
+                         {name: CONVERSIONS[x] for name, x in zip(fields, types)})
+    body = rewriter.visit(ast.BoolOp(ast.And(), pushed) if len(pushed) > 1 else pushed[0])
+    test = eval(f'lambda v: {ast.unparse(body)}', {})
+
+    logging.info(f'Pushed down {text} from the condition {condition}')
+
+    return Predicate(text, test)
+
+
+# METHOD:       conjuncts()
+# DESCRIPTION:  Splits a condition into the parts joined by 'and' at its top level
+# ARGUMENTS:    node - the node of the condition's syntax tree
+# RETURNS:      A list of the nodes of the parts
+def conjuncts(node: ast.AST) -> list[ast.AST]:
+    if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+        return [x for value in node.values for x in conjuncts(value)]
+
+    return [node]
+
+
+# METHOD:       pushable()
+# DESCRIPTION:  Decides whether part of a condition can be evaluated on a row before it is converted
+#               Only comparisons that can not fail are pushed down, since a part that is pushed down
+#               is evaluated for rows that the parts before it would have ruled out
+# ARGUMENTS:    node - the node of the part's syntax tree
+#               kinds - the kind of value of each field of the table
+# RETURNS:      True if the part only compares fields with literals or each other, False otherwise
+def pushable(node: ast.AST, kinds: dict) -> bool:
+    if isinstance(node, ast.BoolOp):
+        return all([pushable(x, kinds) for x in node.values])
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return pushable(node.operand, kinds)
+
+    if not isinstance(node, ast.Compare):
+        return False
+
+    # Chained comparisons such as 1 < a < 5 are pushed down if each of their comparisons can be
+    operands = [node.left] + node.comparators
+    if not any([isinstance(x, ast.Name) and x.id in kinds for x in operands]):
+        return False
+
+    for i, op in enumerate(node.ops):
+        left, right = operands[i], operands[i + 1]
+
+        # Membership in a list of literals compares the value with each literal for equality
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not (operand_kind(left, kinds) is not False and isinstance(right, (ast.Tuple, ast.List, ast.Set))
+                    and all([isinstance(x, ast.Constant) for x in right.elts])):
+                return False
+            continue
+
+        left_kind = operand_kind(left, kinds)
+        right_kind = operand_kind(right, kinds)
+        if left_kind is False or right_kind is False:
+            return False
+        if isinstance(op, ORDERINGS) and (left_kind is None or left_kind != right_kind):
+            return False
+        if not isinstance(op, ORDERINGS + (ast.Eq, ast.NotEq)):
+            return False
+
+    return True
+
+
+# METHOD:       operand_kind()
+# DESCRIPTION:  Finds the kind of value an operand of a comparison is
+# ARGUMENTS:    node - the node of the operand
+#               kinds - the kind of value of each field of the table
+# RETURNS:      The kind of the field or literal, None for a literal of another type,
+#               or False if the operand is neither a field of the table nor a literal
+def operand_kind(node: ast.AST, kinds: dict):
+    if isinstance(node, ast.Name):
+        return kinds.get(node.id, False)
+
+    if isinstance(node, ast.Constant):
+        return KINDS.get(type(node.value))
+
+    return False
+
+
+# endregion
@@ -0,0 +1,393 @@
+# FILE NAME:    _REPLICATION.PY
+# MODULE NAME:  Replication
+# DESCRIPTION:  Provides log shipping to read replicas. The program publishes every statement that changes
+#               its databases to a change log in its databases folder, in the order they are applied, and
+#               a transaction's changes once it is committed. A replica (--replica-of) runs in a working
+#               directory of its own, applies the change log of its primary to its own databases folder
+#               from a background session, and only executes statements that read tables.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import io
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+import _globals as _gl
+import _filesystem as _fs
+import _session as _ss
+import _catalog as _cat
+import _dbmanagement as _db
+import _input as _in
+
+# Internal global variables
+# log - the descriptor of the change log the program publishes to, or None if it does not publish changes
+# log_id - the name of the change log the program publishes to
+# replica - the Replica applying the changes of the primary, or None if the program is not a replica
+log = None
+log_id = ''
+replica = None
+
+# Runtime Constants Variables
+# CHANGE_LOG - the name of the change log in the databases folder
+# POSITION_FILE - the name of the file in a replica's databases folder holding how much of the change log it applied
+# LOG_HEADER - the first line of a change log, which names the log so a replica notices when it is recreated
+# POLL_INTERVAL - the seconds a replica waits before reading the change log again once it has applied it
+# WRITE_STATEMENTS - the statements that change the databases, which are published and refused by a replica
+# TRANSACTION_STATEMENTS - the statements whose changes are held by a transaction until it is committed
+# ANALYZE_PREFIX - the EXPLAIN ANALYZE a published statement is executed under, which is not published
+CHANGE_LOG = 'changes.log'
+POSITION_FILE = 'replica.pos'
+LOG_HEADER = '#change log '
+POLL_INTERVAL = 0.05
+WRITE_STATEMENTS = ('CREATE', 'DROP', 'ALTER', 'INSERT', 'UPDATE', 'DELETE', 'VACUUM', 'COMPRESS', 'REFRESH',
+                    'RESTORE')
+TRANSACTION_STATEMENTS = ('UPDATE', 'DELETE')
+ANALYZE_PREFIX = re.compile(r'^\s*EXPLAIN\s+ANALYZE\s+', re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to apply the changes of a primary
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Replica Class
+#
+# Member Variables:
+# log_path:     The path of the primary's change log
+# log_id:       The name of the change log the applied changes were read from
+# offset:       The number of bytes of the change log that have been applied
+# applied_time: The time the last applied change was published by the primary, or None
+# session:      The Session the changes are applied in
+# stopped:      Set once the replica should stop applying changes
+# thread:       The thread applying the changes, or None before it starts
+#
+# Description:
+# Holds the state of a replica applying the change log of its primary
+@dataclass
+class Replica:
+    log_path: str
+    log_id: str = ''
+    offset: int = 0
+    applied_time: float = None
+    session: _ss.Session = field(default_factory=lambda: _ss.Session(output=io.StringIO()))
+    stopped: threading.Event = field(default_factory=threading.Event)
+    thread: threading.Thread = None
+
+
+# endregion
+
+# region CHANGE LOG
+
+# REGION:       CHANGE LOG
+# DESCRIPTION:  Provides methods for publishing the changes of the program's databases
+
+# --------- METHODS --------- #
+
+
+# METHOD:       open_log()
+# DESCRIPTION:  Opens the change log of the databases folder, creating it with a new name if it does not exist
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def open_log():
+    global log
+    global log_id
+
+    path = _fs.rpath(_gl.DATABASES_DIRECTORY, CHANGE_LOG)
+
+    # The log is created exclusively, so only one process writes its header
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        os.write(fd, f'{LOG_HEADER}{time.time_ns()}.{os.getpid()}\n'.encode())
+        os.close(fd)
+    except FileExistsError:
+        pass
+
+    # Every change is appended with a single write, so the changes of several processes are not interleaved
+    log = os.open(path, os.O_WRONLY | os.O_APPEND)
+
+    with open(path, 'r') as f:
+        log_id = f.readline().strip()[len(LOG_HEADER):]
+
+
+# METHOD:       publish()
+# DESCRIPTION:  Appends changes to the change log
+# ARGUMENTS:    changes - the database each statement was executed in and the statement
+# RETURNS:      N/A
+def publish(changes: list[tuple[str, str]]):
+    if log is None or len(changes) < 1:
+        return
+
+    # Each change is a line of the time it was published, its database and its statement
+    now = f'{time.time():.6f}'
+    lines = [f'{now}|{database or ""}|{" ".join(statement.splitlines())}\n' for database, statement in changes]
+    os.write(log, ''.join(lines).encode())
+
+
+# METHOD:       log_position()
+# DESCRIPTION:  Finds the position of the change log every change published so far is before. A replica
+#               finds the position of its primary's change log every change it applied is before.
+# ARGUMENTS:    N/A
+# RETURNS:      The name of the change log and the position within it, or '' without a change log
+def log_position() -> str:
+    if replica is not None:
+        return f'{replica.log_id}:{replica.offset}'
+
+    return f'{log_id}:{os.fstat(log).st_size}' if log is not None else ''
+
+
+# METHOD:       record()
+# DESCRIPTION:  Publishes a statement once it has been executed if it changes the databases.
+#               The updates and deletes of a transaction are held until the transaction is
+#               committed, every other change is applied as it is executed and published at once.
+# ARGUMENTS:    statement - the text of the statement
+# RETURNS:      N/A
+def record(statement: str):
+    if log is None:
+        return
+
+    statement = ANALYZE_PREFIX.sub('', statement)
+    words = statement.split(None, 1)
+    if len(words) < 1 or words[0].upper() not in WRITE_STATEMENTS:
+        return
+
+    session = _ss.current()
+    if session.transaction_active and words[0].upper() in TRANSACTION_STATEMENTS:
+        session.changes.append((session.active_db, statement))
+    else:
+        publish([(session.active_db, statement)])
+
+
+# METHOD:       publish_transaction()
+# DESCRIPTION:  Publishes the changes held by the committed transaction of the current session,
+#               wrapped in a transaction so a replica applies them together
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def publish_transaction():
+    session = _ss.current()
+
+    if len(session.changes) > 0:
+        database = session.changes[0][0]
+        publish([(database, 'BEGIN TRANSACTION')] + session.changes + [(session.changes[-1][0], 'COMMIT')])
+
+    session.changes = []
+
+
+# endregion
+
+# region REPLICA
+
+# REGION:       REPLICA
+# DESCRIPTION:  Provides methods for applying the change log of a primary
+
+# --------- METHODS --------- #
+
+
+# METHOD:       start()
+# DESCRIPTION:  Makes the program a replica of a primary. The changes already published by the primary
+#               are applied before the program reads statements, the rest as they are published.
+# ARGUMENTS:    primary - the working directory of the primary, or its databases folder
+# RETURNS:      A bool representing whether the replica was started
+def start(primary: str) -> bool:
+    global replica
+
+    # The paths of the databases folder are in lower case, like every path the program creates
+    folder = primary if os.path.isfile(os.path.join(primary, CHANGE_LOG)) else \
+        os.path.join(primary, _gl.DATABASES_DIRECTORY.lower())
+    log_path = os.path.abspath(os.path.join(folder, CHANGE_LOG))
+
+    if os.path.abspath(folder) == _fs.rpath(_gl.DATABASES_DIRECTORY):
+        print('!Failed to start the replica because it shares the databases folder of its primary.')
+        return False
+
+    replica = Replica(log_path)
+    replica.log_id, replica.offset = read_position()
+    _ss.default.read_only = True
+
+    with _ss.activate(replica.session):
+        apply_changes()
+
+    replica.thread = threading.Thread(target=follow, name='replica', daemon=True)
+    replica.thread.start()
+
+    logging.info(f'Replicating {log_path} from offset {replica.offset}')
+    return True
+
+
+# METHOD:       stop()
+# DESCRIPTION:  Stops applying the changes of the primary, once the changes being applied are done
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def stop():
+    if replica is not None and replica.thread is not None:
+        replica.stopped.set()
+        replica.thread.join()
+
+
+# METHOD:       follow()
+# DESCRIPTION:  Applies the changes of the primary as they are published until the replica is stopped
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def follow():
+    with _ss.activate(replica.session):
+        while not replica.stopped.wait(POLL_INTERVAL):
+            try:
+                apply_changes()
+            except OSError as error:
+                logging.info(f'The change log could not be read due to an OSError: {error}')
+
+
+# METHOD:       apply_changes()
+# DESCRIPTION:  Applies the changes published by the primary since those applied last. If the primary's
+#               change log was recreated, the replica's databases are reset and the new log is applied.
+# ARGUMENTS:    N/A
+# RETURNS:      The number of changes applied
+def apply_changes() -> int:
+    if not os.path.isfile(replica.log_path):
+        return 0
+
+    count = 0
+
+    with open(replica.log_path, 'rb') as f:
+        header = f.readline()
+        if not header.endswith(b'\n'):
+            return 0
+
+        log_id = header.decode().strip()[len(LOG_HEADER):]
+        if log_id != replica.log_id:
+            reset_replica(log_id, len(header))
+
+        # Only whole lines are applied, a change still being written is applied once it is complete
+        f.seek(replica.offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+
+            apply_change(line.decode().rstrip('\n'))
+            replica.offset += len(line)
+            count += 1
+
+    if count > 0:
+        write_position()
+
+    return count
+
+
+# METHOD:       apply_change()
+# DESCRIPTION:  Applies a single change, in the database the primary executed it in
+# ARGUMENTS:    line - the change's line of the change log
+# RETURNS:      N/A
+def apply_change(line: str):
+    published, database, statement = line.split('|', 2)
+    session = _ss.current()
+
+    if (database or None) != session.active_db:
+        if database:
+            _in.parse(f'USE {database}')
+        else:
+            with _ss.statement_lock('USE'):
+                session.active_db = None
+                _cat.unload()
+
+    logging.info(f'Applying change: {statement}')
+    _in.parse(statement)
+    replica.applied_time = float(published)
+
+    # The output of the applied statements is not kept
+    session.output.seek(0)
+    session.output.truncate()
+
+
+# METHOD:       reset_replica()
+# DESCRIPTION:  Deletes the replica's databases, so that a new change log is applied from its start
+# ARGUMENTS:    log_id - the name of the new change log
+#               offset - the size of the new change log's header
+# RETURNS:      N/A
+def reset_replica(log_id: str, offset: int):
+    logging.info(f'Applying the change log {log_id} from its start')
+
+    with _ss.statement_lock('DROP'):
+        _db.reset_databases_folder()
+        _db.initialize_databases_folder()
+        _cat.catalogs.clear()
+        replica.session.active_db = None
+        replica.session.catalog = None
+        _ss.default.active_db = None
+        _ss.default.catalog = None
+
+    replica.log_id = log_id
+    replica.offset = offset
+    write_position()
+
+
+# METHOD:       read_position()
+# DESCRIPTION:  Reads how much of its primary's change log the replica applied before
+# ARGUMENTS:    N/A
+# RETURNS:      A tuple of the name of the change log and the number of its bytes that were applied
+def read_position() -> tuple[str, int]:
+    try:
+        with open(_fs.rpath(_gl.DATABASES_DIRECTORY, POSITION_FILE), 'r') as f:
+            log_id, offset = f.read().strip().split('|')
+            return log_id, int(offset)
+    except (FileNotFoundError, ValueError):
+        return '', 0
+
+
+# METHOD:       write_position()
+# DESCRIPTION:  Writes how much of its primary's change log the replica has applied
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def write_position():
+    with open(_fs.rpath(_gl.DATABASES_DIRECTORY, POSITION_FILE), 'w') as f:
+        f.write(f'{replica.log_id}|{replica.offset}')
+
+
+# METHOD:       show_replication()
+# DESCRIPTION:  Prints the role of the program. A replica prints how far it is behind its primary, where
+#               the lag is how long ago the oldest change it has not applied was published.
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def show_replication():
+    if replica is None:
+        path = _fs.rpath(_gl.DATABASES_DIRECTORY, CHANGE_LOG)
+        print('role|change log|bytes')
+        print(f'primary|{path}|{os.path.getsize(path) if os.path.isfile(path) else 0}')
+        return
+
+    # pending - the first change that has not been applied, if the replica is behind
+    size = os.path.getsize(replica.log_path) if os.path.isfile(replica.log_path) else 0
+    pending = b''
+    if size > replica.offset:
+        with open(replica.log_path, 'rb') as f:
+            f.seek(replica.offset)
+            pending = f.readline()
+
+    lag = max(time.time() - float(pending.split(b'|', 1)[0]), 0.0) if pending.endswith(b'\n') else 0.0
+
+    print('role|primary|applied bytes|behind bytes|lag s')
+    print(f'replica|{replica.log_path}|{replica.offset}|{max(size - replica.offset, 0)}|{lag:.3f}')
+
+
+# endregion
+
+# METHOD:       rp_init()
+# DESCRIPTION:  Initializes the replication global variables used by the program
+#               A replica applies its primary's changes instead of publishing its own
+# ARGUMENTS:    primary - the working directory of the primary if the program is a replica, otherwise None
+# RETURNS:      A bool representing whether the program was initialized
+def rp_init(primary: str = None) -> bool:
+    global log
+    global replica
+
+    log = None
+    replica = None
+
+    if primary is not None:
+        return start(primary)
+
+    open_log()
+    return True
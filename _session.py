@@ -0,0 +1,284 @@
+# FILE NAME:    _SESSION.PY
+# MODULE NAME:  Session
+# DESCRIPTION:  Provides the sessions statements are executed in and the locks that let several threads
+#               execute statements at once. Each session holds the database it is using, its transaction
+#               and the state of the statement it is executing, and each thread executes statements in
+#               its own session. Statements that only read tables share the engine's lock while every
+#               other statement holds it alone.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import contextlib
+import itertools
+import logging
+import sys
+import threading
+from dataclasses import dataclass, field
+
+# Internal global variables
+# default - the session of the program's own input, used by any thread that has not activated a session
+# local - holds the session activated by each thread
+# engine_lock - the lock every statement holds while it is executed
+default = None
+local = threading.local()
+engine_lock = None
+
+# session_ids - numbers each session created by the program
+session_ids = itertools.count()
+
+# Runtime Constants Variables
+# READ_STATEMENTS - the statements that only read tables or change the settings of their session, which are executed
+#                   while sharing the engine's lock, including when they are explained
+READ_STATEMENTS = ('SELECT', 'SHOW', 'SET')
+
+# UNLOCKED_STATEMENTS - the statements that are executed without the engine's lock, which hold it themselves
+#                       only while they need to
+UNLOCKED_STATEMENTS = ('BACKUP',)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to hold the state of a session and to lock the engine
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Session Class
+#
+# Member Variables:
+# id:                   The number of the session, which tells the locks of its transaction apart
+# active_db:            The name of the database being used, or None
+# catalog:              The Catalog of the database being used, or None
+# transaction_active:   Whether a transaction has begun and has not been committed
+# transaction_key:      The key the tables locked by the transaction are locked with
+# transaction:          Maps the path of each table changed by the transaction to its Workspace
+# subqueries:           The hash set of values found by each subquery of the statement being selected
+# insert_batch:         The records held by a batch of inserts until they are appended, or None
+# profile:              The StatementProfile of the statement being executed, or None
+# output:               The stream the session's output is written to, or None to write it to the terminal
+# changes:              The database and text of each statement the transaction holds until it is committed
+# read_only:            Whether the session refuses statements that change the databases, as on a replica
+# work_mem:             The most memory in bytes a single operator of the session reserves, or None for each
+#                       operator's own limit
+# statement_timeout:    The milliseconds a statement of the session executes for before it is cancelled, or None
+# cancellation:         The Cancellation of the statement being executed, or None
+#
+# Description:
+# Holds the state of a single session. A session is used by one thread at a time.
+@dataclass
+class Session:
+    id: int = field(default_factory=lambda: next(session_ids))
+    active_db: str = None
+    catalog: object = None
+    transaction_active: bool = False
+    transaction_key: str = ''
+    transaction: dict = field(default_factory=dict)
+    subqueries: dict = field(default_factory=dict)
+    insert_batch: dict = None
+    profile: object = None
+    output: object = None
+    changes: list = field(default_factory=list)
+    read_only: bool = False
+    work_mem: int = None
+    statement_timeout: int = None
+    cancellation: object = None
+
+
+# ReadWriteLock Class
+#
+# Member Variables:
+# readers:          The number of threads holding the lock for reading
+# writer:           Whether a thread holds the lock for writing
+# waiting:          The number of threads waiting to hold the lock for writing
+# waiting_readers:  The number of threads waiting to hold the lock for reading
+# read_turn:        Whether the readers that were waiting when a writer released the lock go before the next writer
+# tickets:          The number of writers that have asked for the lock
+# serving:          The ticket of the next writer to hold the lock
+#
+# Description:
+# A lock that any number of readers hold at once, or a single writer holds alone. Readers wait
+# while a writer is waiting, so that a steady stream of readers can not keep a writer waiting,
+# and the readers waiting when a writer releases the lock go before the next writer, so that a
+# steady stream of writers can not keep readers waiting either. Writers hold the lock in the
+# order they asked for it.
+class ReadWriteLock:
+    def __init__(self):
+        self.readers = 0
+        self.writer = False
+        self.waiting = 0
+        self.waiting_readers = 0
+        self.read_turn = False
+        self.tickets = 0
+        self.serving = 0
+        self._condition = threading.Condition(threading.Lock())
+
+    # Holds the lock for reading for the body of the 'with' statement it is used in
+    @contextlib.contextmanager
+    def read(self):
+        with self._condition:
+            self.waiting_readers += 1
+            while self.writer or (self.waiting > 0 and not self.read_turn):
+                self._condition.wait()
+            self.waiting_readers -= 1
+            if self.waiting_readers == 0:
+                self.read_turn = False
+            self.readers += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.readers -= 1
+                if self.readers == 0:
+                    self._condition.notify_all()
+
+    # Holds the lock for writing for the body of the 'with' statement it is used in
+    @contextlib.contextmanager
+    def write(self):
+        with self._condition:
+            self.waiting += 1
+            ticket = self.tickets
+            self.tickets += 1
+            while self.writer or self.readers > 0 or self.read_turn or ticket != self.serving:
+                self._condition.wait()
+            self.waiting -= 1
+            self.writer = True
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.writer = False
+                self.serving += 1
+                self.read_turn = self.waiting_readers > 0
+                self._condition.notify_all()
+
+
+# SessionOutput Class
+#
+# Member Variables:
+# terminal: The stream the output of sessions without their own stream is written to
+#
+# Description:
+# Stands in for sys.stdout, writing everything printed by a thread to the output of its session
+class SessionOutput:
+    def __init__(self, terminal):
+        self.terminal = terminal
+
+    def write(self, text: str) -> int:
+        return (current().output or self.terminal).write(text)
+
+    def flush(self):
+        (current().output or self.terminal).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.terminal, name)
+
+
+# endregion
+
+# region SESSIONS
+
+# REGION:       SESSIONS
+# DESCRIPTION:  Provides methods for executing statements in sessions
+
+# --------- METHODS --------- #
+
+
+# METHOD:       current()
+# DESCRIPTION:  Finds the session the current thread executes statements in
+# ARGUMENTS:    N/A
+# RETURNS:      The Session of the current thread
+def current() -> Session:
+    return getattr(local, 'session', None) or default
+
+
+# METHOD:       activate()
+# DESCRIPTION:  Executes the statements of the current thread in a session
+# ARGUMENTS:    session - the Session to execute the statements in
+# RETURNS:      A context manager the statements are executed in
+@contextlib.contextmanager
+def activate(session: Session):
+    previous = getattr(local, 'session', None)
+    local.session = session
+
+    try:
+        yield session
+    finally:
+        local.session = previous
+
+
+# METHOD:       redirect_output()
+# DESCRIPTION:  Writes the output of the current session to a stream instead of its own output
+# ARGUMENTS:    stream - the stream to write the output to
+# RETURNS:      A context manager the output is redirected in
+@contextlib.contextmanager
+def redirect_output(stream):
+    session = current()
+    previous = session.output
+    session.output = stream
+
+    try:
+        yield stream
+    finally:
+        session.output = previous
+
+
+# METHOD:       statement_lock()
+# DESCRIPTION:  Holds the engine's lock while a statement is executed, shared with the other
+#               statements that only read tables. A statement executed by another statement
+#               of the same thread is executed under the lock its thread already holds.
+# ARGUMENTS:    statement - the text of the statement
+# RETURNS:      A context manager the statement is executed in
+@contextlib.contextmanager
+def statement_lock(statement: str):
+    if getattr(local, 'locked', False):
+        yield
+        return
+
+    verb = statement_verb(statement)
+    if verb in UNLOCKED_STATEMENTS:
+        yield
+        return
+
+    lock = engine_lock.read() if verb in READ_STATEMENTS else engine_lock.write()
+
+    with lock:
+        local.locked = True
+        try:
+            yield
+        finally:
+            local.locked = False
+
+
+# METHOD:       statement_verb()
+# DESCRIPTION:  Finds the word that tells what a statement does, which follows EXPLAIN and ANALYZE when
+#               the statement is explained
+# ARGUMENTS:    statement - the text of the statement
+# RETURNS:      The word in upper case, or an empty string if the statement is empty
+def statement_verb(statement: str) -> str:
+    words = statement.upper().split(None, 3)[:3]
+    while len(words) > 0 and words[0] in ('EXPLAIN', 'ANALYZE'):
+        words = words[1:]
+
+    return words[0] if len(words) > 0 else ''
+
+
+# endregion
+
+# METHOD:       ss_init()
+# DESCRIPTION:  Initializes the session global variables used by the program
+#               The output of the program is written through the output of each thread's session
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def ss_init():
+    global default
+    global engine_lock
+
+    default = Session()
+    engine_lock = ReadWriteLock()
+
+    if not isinstance(sys.stdout, SessionOutput):
+        sys.stdout = SessionOutput(sys.stdout)
+
+    logging.info('Initialized the default session')
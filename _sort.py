@@ -0,0 +1,261 @@
+# FILE NAME:    _SORT.PY
+# MODULE NAME:  Sort
+# DESCRIPTION:  Provides an external merge sort that sorts records in memory up to a
+#               memory limit, spills sorted runs to temporary files beyond it and
+#               merges the runs as the sorted records are read, and a bounded heap
+#               that keeps only the first records when a sort is limited
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import heapq
+import itertools
+import logging
+import sys
+import time
+from operator import itemgetter
+import _profiler as _pf
+import _memory as _mem
+import _cancel as _cn
+
+# Internal global variables
+# memory_limit - the most memory in bytes a sort holds before it spills a sorted run to disk (--sort-memory-mb),
+#                unless the session sets its own work_mem
+memory_limit = 64 * 1024 * 1024
+
+# Runtime Constants Variables
+# SAMPLE_INTERVAL - the size of every this many records is measured to estimate the memory used by a sort
+# MERGE_FAN_IN - the most runs read at once by a merge, more runs are first merged into fewer, longer runs
+SAMPLE_INTERVAL = 1024
+MERGE_FAN_IN = 64
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to compare records
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# Descending Class
+#
+# Member Variables:
+# value:    The value being compared
+#
+# Description:
+# Wraps a value so that it sorts in descending order. It is used for the fields sorted
+# in descending order when a sort mixes ascending and descending fields.
+class Descending:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+# endregion
+
+# region EXTERNAL SORT
+
+# REGION:       EXTERNAL SORT
+# DESCRIPTION:  Provides methods for sorting records that may not fit in memory
+
+# --------- METHODS --------- #
+
+
+# METHOD:       sort_key()
+# DESCRIPTION:  Creates the key function sorted runs are merged by
+# ARGUMENTS:    positions - the position of each field to sort by within a record
+#               descending - whether each field is sorted in descending order
+# RETURNS:      A tuple of the key function and whether the records are sorted in reverse
+def sort_key(positions: list[int], descending: list[bool]):
+    # When every field is sorted in the same direction, the whole sort is reversed instead
+    if len(set(descending)) == 1:
+        return itemgetter(*positions), descending[0]
+
+    return (lambda record: tuple([Descending(record[x]) if d else record[x] for x, d in zip(positions, descending)]),
+            False)
+
+
+# METHOD:       sort_buffer()
+# DESCRIPTION:  Sorts records held in memory. Since sorts are stable, fields sorted in different directions
+#               are sorted one group at a time from the last field to the first instead of being wrapped.
+# ARGUMENTS:    buffer - the records to sort in place
+#               positions - the position of each field to sort by within a record
+#               descending - whether each field is sorted in descending order
+# RETURNS:      N/A
+def sort_buffer(buffer: list[tuple], positions: list[int], descending: list[bool]):
+    end = len(positions)
+
+    while end > 0:
+        start = end - 1
+        while start > 0 and descending[start - 1] == descending[end - 1]:
+            start -= 1
+        buffer.sort(key=itemgetter(*positions[start:end]), reverse=descending[start])
+        end = start
+
+
+# METHOD:       record_size()
+# DESCRIPTION:  Estimates the memory used by a record held in a list
+# ARGUMENTS:    record - the record
+# RETURNS:      The estimated size of the record in bytes
+def record_size(record: tuple) -> int:
+    return sys.getsizeof(record) + sum([sys.getsizeof(x) for x in record]) + 8
+
+
+# METHOD:       sort_records()
+# DESCRIPTION:  Sorts records, spilling sorted runs to temporary files whenever the records
+#               held in memory exceed the memory limit or the memory budget can not hold them
+# ARGUMENTS:    records - an iterable of the records to sort
+#               positions - the position of each field to sort by within a record
+#               descending - whether each field is sorted in descending order
+#               directory - the directory to write the temporary files to
+#               limit - the number of sorted records that are read, or None if every record is read
+# RETURNS:      An iterator over the sorted records. If runs were spilled, the runs are merged
+#               and their files deleted as the iterator is read. A limited sort returns only
+#               the first limit records.
+def sort_records(records, positions: list[int], descending: list[bool], directory: str, limit: int = None):
+    # buffer - the records held in memory
+    # size - the estimated size of each record in the buffer
+    # runs - the SpillFile of each run spilled to disk
+    buffer = []
+    size = 0
+    runs = []
+    start = time.perf_counter()
+    records = iter(records)
+
+    with _pf.operator('sort') as op, _mem.Reservation('sort', memory_limit) as budget:
+        # A limited sort only keeps the first records in a heap, as long as they fit in the memory limit
+        first = next(records, None) if limit is not None else None
+        if first is not None:
+            records = itertools.chain([first], records)
+
+        if first is not None and budget.resize(limit * record_size(first)):
+            buffer, count = top_records(records, positions, descending, limit)
+            op.rows_in = count
+            op.rows_out = len(buffer)
+            if op:
+                op.details['heap'] = limit
+                op.details['peak memory'] = budget.peak
+                op.details['rows/s'] = int(count / max(time.perf_counter() - start, 1e-9))
+            return buffer
+
+        for record in records:
+            if len(buffer) % SAMPLE_INTERVAL == 0:
+                size = max(size, record_size(record))
+
+            # A record is only held once the memory for it is reserved, otherwise the records held are spilled
+            if not budget.grow((len(buffer) + 1) * size) and len(buffer) > 0:
+                sort_buffer(buffer, positions, descending)
+                run = _mem.SpillFile(directory, 'sort')
+                run.write_all(buffer)
+                run.close()
+                runs.append(run)
+                op.rows_in += len(buffer)
+                buffer = []
+                budget.resize(0)
+                budget.grow(size)
+
+            buffer.append(record)
+
+        # The records are held until they are merged, only beyond the limits once a single record can not be held
+        if len(buffer) * size > budget.size:
+            budget.force(len(buffer) * size)
+        sort_buffer(buffer, positions, descending)
+
+        op.rows_in += len(buffer)
+        op.rows_out = op.rows_in
+        op.bytes_written = sum([x.nbytes for x in runs])
+        if op:
+            op.details['runs'] = len(runs) + 1
+            op.details['peak memory'] = budget.peak
+            op.details['rows/s'] = int(op.rows_in / max(time.perf_counter() - start, 1e-9))
+
+    if len(runs) < 1:
+        return buffer
+
+    logging.info(f'Sort spilled {len(runs)} runs of {sum([x.nbytes for x in runs])} bytes to {directory}')
+
+    # The first runs are merged into one that takes their place, so equal records keep the order they were read in
+    key, reverse = sort_key(positions, descending)
+    while len(runs) >= MERGE_FAN_IN:
+        run = _mem.SpillFile(directory, 'sort')
+        for record in merge_runs(runs[:MERGE_FAN_IN], [], key, reverse):
+            run.write(record)
+        run.close()
+        runs = [run] + runs[MERGE_FAN_IN:]
+
+    return merge_runs(runs, buffer, key, reverse)
+
+
+# METHOD:       top_records()
+# DESCRIPTION:  Finds the first records in sorted order using a heap that holds at most limit records
+# ARGUMENTS:    records - an iterable of the records to sort
+#               positions - the position of each field to sort by within a record
+#               descending - whether each field is sorted in descending order
+#               limit - the number of records to keep
+# RETURNS:      A tuple of a list of the first records in sorted order and the number of records read
+def top_records(records, positions: list[int], descending: list[bool], limit: int) -> tuple[list[tuple], int]:
+    key, reverse = sort_key(positions, descending)
+    count = 0
+
+    # The records are counted as they are read, since the heap only returns the records it kept
+    def counted():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    # Both functions keep equal records in the order they were read, like a stable sort
+    top = (heapq.nlargest if reverse else heapq.nsmallest)(limit, counted(), key=key)
+
+    return top, count
+
+
+# METHOD:       merge_runs()
+# DESCRIPTION:  Merges the sorted runs spilled to disk with the sorted records left in memory
+# ARGUMENTS:    runs - the SpillFile of each run
+#               buffer - the sorted records held in memory
+#               key - the key function the records are sorted by
+#               reverse - whether the records are sorted in reverse
+# RETURNS:      A generator of the sorted records
+def merge_runs(runs: list[_mem.SpillFile], buffer: list[tuple], key, reverse: bool):
+    readers = [x.read() for x in runs]
+    count = 0
+    start = time.perf_counter()
+
+    try:
+        with _pf.operator('merge') as op:
+            for record in heapq.merge(*readers, buffer, key=key, reverse=reverse):
+                count += 1
+                if count % _cn.CHECK_INTERVAL == 0:
+                    _cn.check()
+                yield record
+
+            op.rows_in = op.rows_out = count
+            op.bytes_read = sum([x.nbytes for x in runs])
+            if op:
+                op.details['runs'] = len(runs) + 1
+                op.details['rows/s'] = int(count / max(time.perf_counter() - start, 1e-9))
+    finally:
+        # The files are deleted even when the merged records are not read to the end
+        for reader in readers:
+            reader.close()
+        for run in runs:
+            run.delete()
+
+
+# endregion
+
+# METHOD:       so_init()
+# DESCRIPTION:  Initializes the sort global variables used by the program
+# ARGUMENTS:    memory_mb - the most memory in megabytes a sort holds before it spills to disk, None keeps the default
+# RETURNS:      N/A
+def so_init(memory_mb: float = None):
+    global memory_limit
+
+    memory_limit = int(memory_mb * 1024 * 1024) if memory_mb is not None else 64 * 1024 * 1024
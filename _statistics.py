@@ -0,0 +1,187 @@
+# FILE NAME:    _STATISTICS.PY
+# MODULE NAME:  Statistics
+# DESCRIPTION:  Provides a registry of statistics for each statement shape
+#               executed by the program and the slow query log
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import datetime
+import logging
+import re
+import threading
+from dataclasses import dataclass, replace
+import _profiler as _pf
+
+# Internal global variables
+# registry - the statistics of each statement shape, keyed by its fingerprint
+# slow_query_threshold - statements that take longer than this many milliseconds are logged, None disables the log
+# slow_query_log - the path of the slow query log file
+# lock - guards the registry and the slow query log, which the statements of several sessions record to at once
+registry = {}
+slow_query_threshold = None
+slow_query_log = ''
+lock = threading.Lock()
+
+# Runtime Constants Variables
+# MAX_STATEMENTS - the most statement shapes kept in the registry, the cheapest is evicted to make room for another
+# STRING_LITERAL - a quoted string literal
+# NUMBER_LITERAL - a numeric literal, which may be fractional or have an exponent, such as 3.5e2
+# NEGATIVE_LITERAL - a literal replaced by '?' with a '-' sign, which is a sign rather than a subtraction
+#                    when it follows an operator, a '(', a ',' or the start of the statement
+# IN_LIST - an IN list whose literals have been replaced by '?'
+MAX_STATEMENTS = 5000
+STRING_LITERAL = re.compile(r"'[^']*'")
+NUMBER_LITERAL = re.compile(r'(?<![\w.])(?:\d+(?:\.\d*)?|\.\d+)(?:E[-+]?\d+)?(?![\w.])', re.IGNORECASE)
+NEGATIVE_LITERAL = re.compile(r'(^|[^\w\s)?])(\s*)-\s*\?')
+IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+
+# region CLASSES
+
+# REGION:       CLASSES
+# DESCRIPTION:  Contains the classes used to accumulate statement statistics
+
+# --------- CLASS DEFINITIONS --------- #
+
+
+# StatementStatistics Class
+#
+# Member Variables:
+# fingerprint:      The statement with its literals replaced by '?' and its IN lists collapsed
+# calls:            The number of times the statement has been executed
+# total_time:       The total time spent executing the statement in seconds
+# max_time:         The longest time spent executing the statement in seconds
+# rows_scanned:     The total number of rows read from tables by the statement
+# rows_returned:    The total number of rows returned by the statement
+# max_memory:       The most memory in bytes the statement's operators reserved at once
+#
+# Description:
+# Accumulates the cost of every execution of a statement shape
+@dataclass
+class StatementStatistics:
+    fingerprint: str
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows_scanned: int = 0
+    rows_returned: int = 0
+    max_memory: int = 0
+
+    # The mean time spent executing the statement in seconds
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls > 0 else 0.0
+
+
+# endregion
+
+# region STATISTICS
+
+# REGION:       STATISTICS
+# DESCRIPTION:  Provides methods for recording and reporting statement statistics
+
+# --------- METHODS --------- #
+
+
+# METHOD:       fingerprint()
+# DESCRIPTION:  Strips the literals out of a statement so statements of the same shape are grouped
+# ARGUMENTS:    text - the statement text
+# RETURNS:      The fingerprint of the statement
+def fingerprint(text: str) -> str:
+    # Removes comments and the terminating semicolon
+    stripped = text.split('--', 1)[0].split(';', 1)[0]
+
+    # Replaces string and numeric literals with '?', along with the sign of negative numbers
+    stripped = STRING_LITERAL.sub('?', stripped)
+    stripped = NUMBER_LITERAL.sub('?', stripped)
+    stripped = NEGATIVE_LITERAL.sub(r'\1\2?', stripped)
+
+    # Collapses IN lists, so that lists of any length share the fingerprint
+    stripped = IN_LIST.sub('IN (?)', stripped)
+
+    # Normalizes the whitespace and the case of the statement
+    return ' '.join(stripped.split()).upper()
+
+
+# METHOD:       record()
+# DESCRIPTION:  Records the profile of an executed statement in the registry
+#               and writes it to the slow query log if it exceeds the threshold
+# ARGUMENTS:    profile - the finished profile of the statement
+# RETURNS:      N/A
+def record(profile: _pf.StatementProfile):
+    key = fingerprint(profile.text)
+
+    # Empty statements are not worth recording
+    if key == '':
+        return
+
+    with lock:
+        stats = registry.get(key)
+        if stats is None:
+            # The registry is capped, so that statements of endlessly many shapes do not use up the memory
+            if len(registry) >= MAX_STATEMENTS:
+                evicted = min(registry.values(), key=lambda x: x.total_time)
+                del registry[evicted.fingerprint]
+                logging.info(f'Evicted the statistics of {evicted.fingerprint} from the registry')
+            stats = registry[key] = StatementStatistics(key)
+
+        stats.calls += 1
+        stats.total_time += profile.wall_time
+        stats.max_time = max(stats.max_time, profile.wall_time)
+        stats.rows_scanned += profile.rows_scanned
+        stats.rows_returned += profile.rows_returned
+        stats.max_memory = max(stats.max_memory, profile.peak_memory)
+
+        if slow_query_threshold is not None and profile.wall_time * 1000 >= slow_query_threshold:
+            log_slow_query(profile)
+
+
+# METHOD:       log_slow_query()
+# DESCRIPTION:  Appends a statement along with its plan and timings to the slow query log
+# ARGUMENTS:    profile - the finished profile of the statement
+# RETURNS:      N/A
+def log_slow_query(profile: _pf.StatementProfile):
+    try:
+        with open(slow_query_log, 'a') as f:
+            f.write(f'# Time: {datetime.datetime.now().isoformat(timespec="seconds")}\n')
+            for line in _pf.format_profile(profile):
+                f.write(f'{line}\n')
+            f.write('\n')
+    except OSError:
+        logging.error(f'ERROR: Could not write to the slow query log {slow_query_log}')
+
+
+# METHOD:       show_statements()
+# DESCRIPTION:  Prints the statistics of every statement shape, most expensive first
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def show_statements():
+    # The statistics are copied while the lock is held, since other sessions record to them at once
+    with lock:
+        rows = [replace(x) for x in registry.values()]
+
+    print('statement|calls|total ms|mean ms|max ms|rows scanned|rows returned|max memory')
+
+    for stats in sorted(rows, key=lambda x: x.total_time, reverse=True):
+        print(f'{stats.fingerprint}|{stats.calls}|{stats.total_time * 1000:.3f}|{stats.mean_time * 1000:.3f}|'
+              f'{stats.max_time * 1000:.3f}|{stats.rows_scanned}|{stats.rows_returned}|{stats.max_memory}')
+
+
+# endregion
+
+# METHOD:       st_init()
+# DESCRIPTION:  Initializes the statistics global variables used by the program
+# ARGUMENTS:    threshold - the slow query threshold in milliseconds, or None to disable the log
+#               log - the path of the slow query log file
+# RETURNS:      N/A
+def st_init(threshold: float = None, log: str = 'slow_query.log'):
+    global registry
+    global slow_query_threshold
+    global slow_query_log
+
+    registry = {}
+    slow_query_threshold = threshold
+    slow_query_log = log
+
+    # The plan of a slow statement is only known if its operators were profiled
+    if slow_query_threshold is not None:
+        _pf.collect_operators = True
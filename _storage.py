@@ -0,0 +1,456 @@
+# FILE NAME:    _STORAGE.PY
+# MODULE NAME:  Storage
+# DESCRIPTION:  Provides methods for managing the files that store a table's records
+#               alongside the table file, such as the deletion bitmap, the row offset
+#               index and the lock
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import logging
+import os
+import struct
+
+# Internal global variables
+# vacuum_threshold - tables are vacuumed after a delete once this ratio of their rows are deleted, None disables it
+vacuum_threshold = None
+
+# Runtime Constants Variables
+TOMBSTONE_FILE_TYPE = '.del'
+INDEX_FILE_TYPE = '.idx'
+LOCK_FILE_TYPE = '.lock'
+PARTITION_FILE_TYPE = '.part'
+SEGMENT_FILE_TYPE = '.seg'
+MATVIEW_FILE_TYPE = '.mv'
+SCHEMA_FILE_TYPE = '.sch'
+BLOOM_FILE_TYPE = '.blm'
+
+# INDEX_ENTRY - the layout of each entry of a row offset index: the offset of the row
+#               within the table file and the length of the row without its newline
+INDEX_ENTRY = struct.Struct('<QI')
+
+# region SIDECAR FILES
+
+# REGION:       SIDECAR FILES
+# DESCRIPTION:  Provides methods for locating the files stored alongside a table file
+
+# --------- METHODS --------- #
+
+
+# METHOD:       sidecar_path()
+# DESCRIPTION:  Creates the path of a file stored alongside a table file
+# ARGUMENTS:    path - the path of the table file
+#               file_type - the file extension of the sidecar file
+# RETURNS:      The path of the sidecar file
+def sidecar_path(path: str, file_type: str) -> str:
+    return os.path.splitext(path)[0] + file_type
+
+
+# METHOD:       delete_sidecars()
+# DESCRIPTION:  Deletes every file stored alongside a table file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      N/A
+def delete_sidecars(path: str):
+    for file_type in (TOMBSTONE_FILE_TYPE, INDEX_FILE_TYPE, LOCK_FILE_TYPE, PARTITION_FILE_TYPE, SEGMENT_FILE_TYPE,
+                      MATVIEW_FILE_TYPE, SCHEMA_FILE_TYPE, BLOOM_FILE_TYPE):
+        try:
+            os.remove(sidecar_path(path, file_type))
+        except FileNotFoundError:
+            pass
+
+
+# endregion
+
+# region TOMBSTONES
+
+# REGION:       TOMBSTONES
+# DESCRIPTION:  Provides methods for marking rows as deleted in a table's deletion bitmap.
+#               Bit i of the bitmap is set when the i-th row of the table file is deleted,
+#               rows are numbered from 0 starting at the line after the table's metadata.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       read_tombstones()
+# DESCRIPTION:  Reads the set of deleted rows of a table file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      A set of the deleted row numbers
+def read_tombstones(path: str) -> set[int]:
+    try:
+        with open(sidecar_path(path, TOMBSTONE_FILE_TYPE), 'rb') as f:
+            bitmap = f.read()
+    except FileNotFoundError:
+        return set()
+
+    # Only the bytes with bits set are expanded into row numbers
+    return {i * 8 + bit for i, byte in enumerate(bitmap) if byte for bit in range(8) if byte >> bit & 1}
+
+
+# METHOD:       delete_rows()
+# DESCRIPTION:  Marks rows of a table file as deleted by setting their bits in the deletion bitmap.
+#               Only the bytes of the bitmap that hold the rows are read and written.
+# ARGUMENTS:    path - the path of the table file
+#               row_ids - the row numbers to mark as deleted
+# RETURNS:      The number of bytes written to the bitmap
+def delete_rows(path: str, row_ids) -> int:
+    # masks - the bits to set in each byte of the bitmap
+    masks = {}
+    for row_id in row_ids:
+        masks[row_id // 8] = masks.get(row_id // 8, 0) | 1 << row_id % 8
+
+    if len(masks) < 1:
+        return 0
+
+    fd = os.open(sidecar_path(path, TOMBSTONE_FILE_TYPE), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        for offset, mask in sorted(masks.items()):
+            current = os.pread(fd, 1, offset)
+            os.pwrite(fd, bytes([(current[0] if current else 0) | mask]), offset)
+    finally:
+        os.close(fd)
+
+    return len(masks)
+
+
+# METHOD:       clear_tombstones()
+# DESCRIPTION:  Removes the deletion bitmap of a table file once its rows have been rewritten
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      N/A
+def clear_tombstones(path: str):
+    try:
+        os.remove(sidecar_path(path, TOMBSTONE_FILE_TYPE))
+    except FileNotFoundError:
+        pass
+
+
+# METHOD:       vacuum()
+# DESCRIPTION:  Compacts a table file by rewriting it without the rows marked in its deletion bitmap, which
+#               are the deleted rows and the old slots of the rows update_rows() relocated
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The number of slots reclaimed from the file
+def vacuum(path: str) -> int:
+    dead = read_tombstones(path)
+    if len(dead) < 1:
+        return 0
+
+    with open(path, 'r') as f:
+        data = [line for line in f.readlines() if not line.startswith('&')]
+
+    if len(data) < 1:
+        clear_tombstones(path)
+        return 0
+
+    # The compacted table is written next to the table and then moved over it,
+    # so the table is never left partially written
+    temp_path = f'{path}.vacuum'
+    with open(temp_path, 'w') as f:
+        f.write(data[0])
+        f.writelines([line for i, line in enumerate(data[1:]) if i not in dead])
+
+    os.replace(temp_path, path)
+    clear_tombstones(path)
+    build_index(path)
+
+    logging.info(f'Vacuumed {len(dead)} slots from {path}')
+
+    return len(dead)
+
+
+# METHOD:       needs_vacuum()
+# DESCRIPTION:  Checks whether the ratio of deleted rows in a table exceeds the vacuum threshold
+# ARGUMENTS:    dead - the number of deleted rows in the table file
+#               total - the total number of rows in the table file, deleted or not
+# RETURNS:      A bool representing whether the table should be vacuumed
+def needs_vacuum(dead: int, total: int) -> bool:
+    return vacuum_threshold is not None and total > 0 and dead / total >= vacuum_threshold
+
+
+# endregion
+
+# region ROW OFFSET INDEX
+
+# REGION:       ROW OFFSET INDEX
+# DESCRIPTION:  Provides methods for maintaining a table's row offset index. Entry i of the
+#               index holds the location of the i-th row of the table file, so a row can be
+#               read or overwritten without reading the rows before it.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       build_index()
+# DESCRIPTION:  Builds the row offset index of a table file by reading through the file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The list of (offset, length) entries of the index
+def build_index(path: str) -> list[tuple[int, int]]:
+    entries = []
+
+    with open(path, 'rb') as f:
+        offset = 0
+        meta_read = False
+        for line in f:
+            # Lock strings left by earlier versions and the metadata are not rows
+            if meta_read and not line.startswith(b'&'):
+                entries.append((offset, len(line.rstrip(b'\r\n'))))
+            elif not line.startswith(b'&'):
+                meta_read = True
+            offset += len(line)
+
+    write_index(path, entries)
+
+    return entries
+
+
+# METHOD:       write_index()
+# DESCRIPTION:  Writes the row offset index of a table file
+# ARGUMENTS:    path - the path of the table file
+#               entries - the list of (offset, length) entries of the index
+# RETURNS:      N/A
+def write_index(path: str, entries: list[tuple[int, int]]):
+    with open(sidecar_path(path, INDEX_FILE_TYPE), 'wb') as f:
+        f.write(b''.join([INDEX_ENTRY.pack(*x) for x in entries]))
+
+
+# METHOD:       read_index()
+# DESCRIPTION:  Reads the row offset index of a table file, rebuilding it if it is missing
+#               or no longer ends where the table file ends
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The list of (offset, length) entries of the index
+def read_index(path: str) -> list[tuple[int, int]]:
+    try:
+        with open(sidecar_path(path, INDEX_FILE_TYPE), 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return build_index(path)
+
+    entries = list(INDEX_ENTRY.iter_unpack(data[:len(data) - len(data) % INDEX_ENTRY.size]))
+
+    if not index_is_current(path, entries):
+        return build_index(path)
+
+    return entries
+
+
+# METHOD:       index_is_current()
+# DESCRIPTION:  Checks that the last entry of a row offset index ends where the table file ends
+# ARGUMENTS:    path - the path of the table file
+#               entries - the list of (offset, length) entries of the index
+# RETURNS:      A bool representing whether the index matches the table file
+def index_is_current(path: str, entries: list[tuple[int, int]]) -> bool:
+    if len(entries) < 1:
+        return False
+
+    offset, length = entries[-1]
+
+    return offset + length + 1 == os.path.getsize(path)
+
+
+# METHOD:       append_index()
+# DESCRIPTION:  Adds the entry of a row appended to a table file to the table's row offset index
+#               The index is left to be rebuilt when it is next read if it does not exist yet
+# ARGUMENTS:    path - the path of the table file
+#               offset - the offset the row was written at
+#               length - the length of the row without its newline
+# RETURNS:      N/A
+def append_index(path: str, offset: int, length: int):
+    append_indexes(path, [(offset, length)])
+
+
+# METHOD:       append_indexes()
+# DESCRIPTION:  Adds the entries of several rows appended to a table file to the table's row offset index
+# ARGUMENTS:    path - the path of the table file
+#               entries - the offset and length of each row, in the order they were written
+# RETURNS:      N/A
+def append_indexes(path: str, entries: list[tuple[int, int]]):
+    index_path = sidecar_path(path, INDEX_FILE_TYPE)
+
+    if os.path.isfile(index_path):
+        with open(index_path, 'ab') as f:
+            f.write(b''.join([INDEX_ENTRY.pack(offset, length) for offset, length in entries]))
+
+
+# METHOD:       read_index_range()
+# DESCRIPTION:  Reads the entries of a range of rows from a table file's row offset index without reading
+#               the rest of the index, rebuilding the index if it no longer ends where the table file ends
+# ARGUMENTS:    path - the path of the table file
+#               start - the position of the first row within the table file
+#               stop - the position after the last row within the table file
+# RETURNS:      The list of (offset, length) entries of the rows
+def read_index_range(path: str, start: int, stop: int) -> list[tuple[int, int]]:
+    try:
+        with open(sidecar_path(path, INDEX_FILE_TYPE), 'rb') as f:
+            count = os.fstat(f.fileno()).st_size // INDEX_ENTRY.size
+            f.seek(max(count - 1, 0) * INDEX_ENTRY.size)
+            last = [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))] if count > 0 else []
+            if not index_is_current(path, last):
+                return read_index(path)[start:stop]
+
+            stop = min(stop, count)
+            if start >= stop:
+                return []
+            f.seek(start * INDEX_ENTRY.size)
+            return list(INDEX_ENTRY.iter_unpack(f.read((stop - start) * INDEX_ENTRY.size)))
+    except FileNotFoundError:
+        return build_index(path)[start:stop]
+
+
+# METHOD:       count_rows()
+# DESCRIPTION:  Counts the rows of a table file from the size of its row offset index, reading only the last
+#               entry of the index, and rebuilds the index if it no longer ends where the table file ends
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The number of rows in the table file, including deleted rows
+def count_rows(path: str) -> int:
+    try:
+        with open(sidecar_path(path, INDEX_FILE_TYPE), 'rb') as f:
+            count = os.fstat(f.fileno()).st_size // INDEX_ENTRY.size
+            if count > 0:
+                f.seek((count - 1) * INDEX_ENTRY.size)
+                if index_is_current(path, [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))]):
+                    return count
+    except FileNotFoundError:
+        pass
+
+    return len(read_index(path))
+
+
+# METHOD:       read_rows()
+# DESCRIPTION:  Reads a range of rows of a table file without reading the rows before it
+# ARGUMENTS:    path - the path of the table file
+#               start - the position of the first row within the table file
+#               stop - the position after the last row within the table file
+# RETURNS:      The list of the rows' lines, along with any lock strings between them
+def read_rows(path: str, start: int, stop: int) -> list[str]:
+    entries = read_index_range(path, start, stop)
+    if len(entries) < 1:
+        return []
+
+    offset = entries[0][0]
+    end = entries[-1][0] + entries[-1][1] + 1
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(end - offset)
+
+    return data.decode().splitlines(keepends=True)
+
+
+# METHOD:       clear_index()
+# DESCRIPTION:  Removes the row offset index of a table file so it is rebuilt when it is next read
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      N/A
+def clear_index(path: str):
+    try:
+        os.remove(sidecar_path(path, INDEX_FILE_TYPE))
+    except FileNotFoundError:
+        pass
+
+
+# METHOD:       update_rows()
+# DESCRIPTION:  Overwrites rows of a table file in place. A row that fits in its old slot is
+#               padded with spaces and written over it, a row that does not fit is appended
+#               to the end of the file and its old slot is marked as deleted.
+# ARGUMENTS:    path - the path of the table file
+#               rows - maps the row number of each updated row to its new string representation
+#               first_row - the row number of the first row of the table file, the rows before it
+#                           are held by the table's segment and are always relocated
+# RETURNS:      A tuple of the number of bytes written and the row numbers of the relocated rows,
+#               in the order they were appended
+def update_rows(path: str, rows: dict[int, str], first_row: int = 0) -> tuple[int, list[int]]:
+    if len(rows) < 1:
+        return 0, []
+
+    entries = read_index(path)
+    written = 0
+    relocated = []
+
+    fd = os.open(path, os.O_RDWR)
+    try:
+        end = os.fstat(fd).st_size
+
+        for row_id, row in sorted(rows.items()):
+            data = row.encode()
+            offset, length = entries[row_id - first_row] if row_id >= first_row else (0, -1)
+
+            # Rows that fit are overwritten in place, rows that do not are relocated to the end
+            if len(data) <= length:
+                written += os.pwrite(fd, data.ljust(length), offset)
+            else:
+                written += os.pwrite(fd, data + b'\n', end)
+                entries.append((end, len(data)))
+                relocated.append(row_id)
+                end += len(data) + 1
+    finally:
+        os.close(fd)
+
+    # Only the entries of the relocated rows are added to the index
+    if len(relocated) > 0:
+        with open(sidecar_path(path, INDEX_FILE_TYPE), 'ab') as f:
+            f.write(b''.join([INDEX_ENTRY.pack(*x) for x in entries[-len(relocated):]]))
+        written += len(relocated) * INDEX_ENTRY.size + delete_rows(path, relocated)
+
+    return written, relocated
+
+
+# endregion
+
+# region LOCKS
+
+# REGION:       LOCKS
+# DESCRIPTION:  Provides methods for locking tables. The lock of a table is a file next to
+#               the table file holding the key of the transaction that owns it.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       lock_owner()
+# DESCRIPTION:  Reads the key of the transaction that has locked a table file
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The key of the owning transaction, or None if the table is not locked
+def lock_owner(path: str):
+    try:
+        with open(sidecar_path(path, LOCK_FILE_TYPE), 'r') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+# METHOD:       try_lock()
+# DESCRIPTION:  Locks a table file for a transaction unless another transaction owns its lock
+# ARGUMENTS:    path - the path of the table file
+#               key - the key of the transaction
+# RETURNS:      A bool representing whether the transaction owns the lock
+def try_lock(path: str, key: str) -> bool:
+    # The lock file is created exclusively so only one transaction can create it
+    try:
+        fd = os.open(sidecar_path(path, LOCK_FILE_TYPE), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return lock_owner(path) == key
+
+    try:
+        os.write(fd, key.encode())
+    finally:
+        os.close(fd)
+
+    return True
+
+
+# METHOD:       unlock()
+# DESCRIPTION:  Releases the lock of a table file if it is owned by a transaction
+# ARGUMENTS:    path - the path of the table file
+#               key - the key of the transaction
+# RETURNS:      N/A
+def unlock(path: str, key: str):
+    if lock_owner(path) == key:
+        try:
+            os.remove(sidecar_path(path, LOCK_FILE_TYPE))
+        except FileNotFoundError:
+            pass
+
+
+# endregion
+
+# METHOD:       sto_init()
+# DESCRIPTION:  Initializes the storage global variables used by the program
+# ARGUMENTS:    threshold - the ratio of deleted rows that triggers a vacuum, or None to disable it
+# RETURNS:      N/A
+def sto_init(threshold: float = None):
+    global vacuum_threshold
+    vacuum_threshold = threshold
@@ -0,0 +1,201 @@
+# FILE NAME:    _STRESS.PY
+# MODULE NAME:  Stress
+# DESCRIPTION:  Provides a stress test of sessions executing statements from several threads at once.
+#               Reader threads select from a table in their own sessions while a writer thread changes
+#               the same table one transaction at a time (--stress-threads). Each transaction moves part
+#               of the price of a record to the record with id 0, so the results of most queries never
+#               change and are compared with the result of the same statement executed by a single thread,
+#               while the price of that record only ever rises. The result cache is enabled throughout,
+#               so a reader that is answered from a result the writer made out of date is found as well.
+# AUTHOR:       HOLDEN BOWMAN
+# DATE:         OCTOBER 18, 2026
+
+import io
+import logging
+import threading
+import time
+import _cache as _ch
+import _input as _in
+import _session as _ss
+
+# Runtime Constants Variables
+# STRESS_DATABASE - the database the stress test creates, and drops once it is done
+# STRESS_ROWS - the number of records in the table the readers select from
+# STRESS_ROUNDS - the number of times each reader executes every query
+# STRESS_TRANSACTIONS - the number of transactions the writer commits
+# STRESS_AMOUNT - the price each transaction moves from a record to the record with id 0
+# STRESS_CACHE_MB - the capacity of the result cache when the program did not enable it
+# STRESS_QUERIES - the statements the readers execute, whose results the writer's transactions do not change,
+#                  the records are sorted since the records the writer updates may be moved within the table
+# STRESS_VERSION - the statement that selects the price of the record with id 0, which only rises
+STRESS_DATABASE = 'stress_test'
+STRESS_ROWS = 2000
+STRESS_ROUNDS = 5
+STRESS_TRANSACTIONS = 50
+STRESS_AMOUNT = 0.25
+STRESS_CACHE_MB = 4
+STRESS_QUERIES = (
+    'SELECT COUNT(*) FROM item',
+    'SELECT SUM(price) FROM item',
+    'SELECT id, name FROM item WHERE id < 25 ORDER BY id',
+    'SELECT grp, COUNT(*) FROM item GROUP BY grp ORDER BY grp',
+    'SELECT id, name FROM item WHERE id > 1990 ORDER BY id DESC',
+)
+STRESS_VERSION = 'SELECT price FROM item WHERE id = 0'
+
+# region STRESS TEST
+
+# REGION:       STRESS TEST
+# DESCRIPTION:  Provides methods for executing statements from several threads and checking their results
+
+# --------- METHODS --------- #
+
+
+# METHOD:       capture()
+# DESCRIPTION:  Executes a statement in the current session and captures what it prints
+# ARGUMENTS:    statement - the statement
+# RETURNS:      The output of the statement
+def capture(statement: str) -> str:
+    buffer = io.StringIO()
+
+    with _ss.redirect_output(buffer):
+        _in.parse(statement)
+
+    return buffer.getvalue()
+
+
+# METHOD:       setup()
+# DESCRIPTION:  Creates the database of the stress test, with the table the readers select from
+# ARGUMENTS:    N/A
+# RETURNS:      The price of each record, keyed by its id
+def setup() -> dict:
+    prices = {i: i % 100 + 0.5 for i in range(STRESS_ROWS)}
+    statements = [f'CREATE DATABASE {STRESS_DATABASE}', f'USE {STRESS_DATABASE}',
+                  'CREATE TABLE item (id int, name varchar(20), grp int, price float)']
+    statements += [f"INSERT INTO item values({i}, 'item{i}', {i % 7}, {prices[i]})" for i in range(STRESS_ROWS)]
+
+    _in.execute_statements(statements)
+
+    return prices
+
+
+# METHOD:       price()
+# DESCRIPTION:  Finds the price selected by STRESS_VERSION from its output
+# ARGUMENTS:    output - the output of the statement
+# RETURNS:      The price, or None if the statement did not select one
+def price(output: str):
+    try:
+        return float(output.split()[-1])
+    except (IndexError, ValueError):
+        return None
+
+
+# METHOD:       read()
+# DESCRIPTION:  Executes every query in a session of its own, at least STRESS_ROUNDS times and until the writer
+#               is done, and compares each result with the expected result. Each price of the record with id 0
+#               has to be at least the one before it.
+# ARGUMENTS:    expected - the output of each query executed by a single thread
+#               mismatches - the list the statements whose results differ are added to
+#               done - the event set once the writer is done
+#               executed - the list the number of statements executed by the reader is added to
+# RETURNS:      N/A
+def read(expected: dict, mismatches: list, done: threading.Event, executed: list):
+    with _ss.activate(_ss.Session(output=io.StringIO())):
+        capture(f'USE {STRESS_DATABASE}')
+        rounds = 0
+        last = 0.0
+
+        while rounds < STRESS_ROUNDS or not done.is_set():
+            for statement in STRESS_QUERIES:
+                if capture(statement) != expected[statement]:
+                    mismatches.append(statement)
+
+            version = price(capture(STRESS_VERSION))
+            if version is None or version < last:
+                mismatches.append(STRESS_VERSION)
+            last = version or last
+            rounds += 1
+
+        executed.append(rounds * (len(STRESS_QUERIES) + 1))
+
+
+# METHOD:       write()
+# DESCRIPTION:  Moves STRESS_AMOUNT of the price of a different record to the record with id 0
+#               in each transaction, in a session of its own
+# ARGUMENTS:    prices - the price of each record, which is changed along with the table
+#               done - the event set once the writer is done
+# RETURNS:      N/A
+def write(prices: dict, done: threading.Event):
+    with _ss.activate(_ss.Session(output=io.StringIO())):
+        capture(f'USE {STRESS_DATABASE}')
+
+        try:
+            for i in range(STRESS_TRANSACTIONS):
+                source = 1 + i * 7 % (STRESS_ROWS - 1)
+                prices[source] -= STRESS_AMOUNT
+                prices[0] += STRESS_AMOUNT
+
+                capture('BEGIN TRANSACTION')
+                capture(f'UPDATE item SET price = {prices[source]} WHERE id = {source}')
+                capture(f'UPDATE item SET price = {prices[0]} WHERE id = 0')
+                capture('COMMIT')
+        finally:
+            done.set()
+
+
+# METHOD:       run()
+# DESCRIPTION:  Runs the stress test, printing the throughput of the queries executed by a single thread
+#               and by several threads, and whether every result matched
+# ARGUMENTS:    threads - the number of reader threads
+# RETURNS:      True if every result matched, False otherwise
+def run(threads: int) -> bool:
+    logging.info(f'Running the stress test with {threads} reader threads')
+
+    # The results the readers are answered with from the cache have to be invalidated by the writer
+    if not _ch.enabled:
+        _ch.ch_init(STRESS_CACHE_MB)
+
+    with _ss.activate(_ss.Session(output=io.StringIO())):
+        prices = setup()
+
+        # The queries are first executed by a single thread, which gives the results the readers should find
+        start = time.perf_counter()
+        expected = {}
+        for _ in range(STRESS_ROUNDS):
+            for statement in STRESS_QUERIES + (STRESS_VERSION,):
+                expected[statement] = capture(statement)
+        serial = time.perf_counter() - start
+
+        # mismatches - the statements whose results differed from the expected results
+        # done - the event set once the writer is done
+        # executed - the number of statements executed by each reader
+        mismatches = []
+        done = threading.Event()
+        executed = []
+        workers = [threading.Thread(target=read, args=(expected, mismatches, done, executed)) for _ in range(threads)]
+        workers.append(threading.Thread(target=write, args=(prices, done)))
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        threaded = time.perf_counter() - start
+
+        # Once the writer is done, the cached result from before its transactions has to be out of date
+        final = price(capture(STRESS_VERSION))
+        capture(f'DROP DATABASE {STRESS_DATABASE}')
+
+    statements = STRESS_ROUNDS * (len(STRESS_QUERIES) + 1)
+    passed = len(mismatches) < 1 and final == prices[0]
+
+    print(f'-- 1 thread: {statements} statements in {serial:.3f} s ({statements / max(serial, 1e-9):.1f}/s)')
+    print(f'-- {threads} threads: {sum(executed)} statements and {STRESS_TRANSACTIONS} transactions in '
+          f'{threaded:.3f} s ({(sum(executed) + STRESS_TRANSACTIONS) / max(threaded, 1e-9):.1f}/s)')
+    print(f'-- {len(mismatches)} mismatched results, final price {final} of {prices[0]}')
+    print(f'-- Stress test {"passed" if passed else "failed"}.')
+
+    return passed
+
+
+# endregion
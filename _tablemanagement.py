@@ -3,20 +3,38 @@
 # DESCRIPTION:  Provides methods for managing the data within tables
 # AUTHOR:       HOLDEN BOWMAN
 # DATE:         MAY 7, 2022
+import ast
+import bisect
+import contextlib
+import io
+import itertools
 import logging
 import os
 import re
 import sys
+import time
 from dataclasses import dataclass, field
+from operator import itemgetter
 import _dbmanagement as _db
 import _utils as _ut
 import _filesystem as _fs
 import _globals as _gl
-
-# Internal global variables
-transaction_active = False
-transaction_key = ''
-transaction = []
+import _profiler as _pf
+import _columnar as _cl
+import _storage as _sto
+import _partition as _pt
+import _compress as _cmp
+import _cache as _ch
+import _matview as _mv
+import _sort as _so
+import _aggregate as _ag
+import _catalog as _cat
+import _session as _ss
+import _replication as _rp
+import _pushdown as _pd
+import _bloom as _bf
+import _memory as _mem
+import _cancel as _cn
 
 # region CLASSES
 
@@ -34,14 +52,85 @@ class TableLockedError(Exception):
     pass
 
 
-# Record Class
+# Record Type
+#
+# Description:
+# A record is a plain tuple holding the values of a row in the order of its table's fields.
+# The field names are only stored once per table, records are accessed by name through a RecordView.
+Record = tuple
+
+
+# RecordView Class
+#
+# Member Variables:
+# _positions:   The dictionary that maps each field name to its position in the record
+# _record:      The record being viewed
+#
+# Description:
+# Provides access to the fields of a record by name, either with the subscript operator
+# (used when evaluating conditions with the view as the local variables) or with the dot
+# operator (used when a table identifier such as 'E' in 'E.id' refers to the view).
+# A single view is reused for every record of a table by reassigning its record.
+class RecordView:
+    __slots__ = ('_positions', '_record')
+
+    def __init__(self, fields: list[str], record=()):
+        self._positions = {name: i for i, name in enumerate(fields)}
+        self._record = record
+
+    def __getitem__(self, key):
+        return self._record[self._positions[key]]
+
+    def __setitem__(self, key, value):
+        self._record[self._positions[key]] = value
+
+    def __getattr__(self, name):
+        position = self._positions.get(name)
+        return self._record[position] if position is not None else None
+
+
+# Workspace Class
+#
+# Member Variables:
+# table:    The table whose file the changes are applied to, holding the records of the table file when
+#           they are held in memory, or only the table's metadata when they are read from the file
+# deleted:  The row numbers of the records deleted from the table file by the transaction
+# updated:  Maps the row number of each record updated by the transaction to its new values
+# original: Maps the row number of each record updated or deleted by the transaction to its values
+#           before the transaction changed it, used to maintain the materialized views of the table
+# condition: The condition the records read from the table file may be ruled out by
+# held:     Whether the table holds the records of the table file
+# budget:   The Reservation of the memory used by the records held, or None
 #
 # Description:
-# The Record class inherits from the 'dict' class. It's effectively a dictionary with a dot operator.
-class Record(dict):
-    __getattr__ = dict.get
-    __setattr__ = dict.__setitem__
-    __delattr__ = dict.__delitem__
+# Holds the changes a transaction has made to a table until they are applied to the table's file.
+# Deletes only mark rows in the table's deletion bitmap, updates overwrite only the changed rows.
+# A transaction's workspace holds the records of the table file when the memory budget can hold them,
+# otherwise they are read from the file each time the workspace is used, which the transaction's lock
+# keeps unchanged. The workspace of a statement outside of a transaction reads them once.
+@dataclass
+class Workspace:
+    table: 'Table'
+    deleted: set[int] = field(default_factory=set)
+    updated: dict[int, Record] = field(default_factory=dict)
+    original: dict[int, Record] = field(default_factory=dict)
+    condition: str = 'True'
+    held: bool = False
+    budget: object = None
+
+    # Reads the row number and values of each record the transaction has not deleted, as it has changed them
+    def rows(self):
+        if self.table.path is None:
+            return
+
+        rows = zip(self.table.row_ids, self.table.records) if self.held \
+            else stream_file(self.table.path, self.condition, numbered=True)
+
+        for i, (row_id, record) in enumerate(rows, 1):
+            if self.held and i % _cn.CHECK_INTERVAL == 0:
+                _cn.check()
+            if row_id not in self.deleted:
+                yield row_id, self.updated.get(row_id, record)
 
 
 # Table Class
@@ -51,12 +140,20 @@ class Record(dict):
 # schema:   The metadata string of the table
 # types:    The data types of each element in the record
 # fields:   The list of strings representing the field name of each element in the record
-# records:  The list of dictionaries that represent each record
+# records:  The list of tuples that represent each record
+# row_ids:  The row number of each record within the table file
+# skipped:  The number of rows of the table file ruled out by the condition before they were converted
+# condition: The condition the records will be filtered by, whose comparisons of fields with
+#           literals are evaluated on each row before it is converted into a record
+# filters:  The RuntimeFilters of the joins the table is scanned for, which drop the rows that can
+#           not match before they are converted
 #
 # Description:
 # The Table class represent tables in their logical form when loaded into the program.
 # This is used by the program to store useful information about the table and allow for
 # the table to be easily modified before it is written back to the file.
+# A table read with a condition only holds the records that may satisfy it, and only reads the
+# blocks of rows whose Bloom filters may hold the values the condition requires.
 
 @dataclass
 class Table:
@@ -64,7 +161,11 @@ class Table:
     schema: str = field(default_factory=str)
     types: list[str] = field(default_factory=list)
     fields: list[str] = field(default_factory=list)
-    records: list[Record[str, str]] = field(default_factory=list)
+    records: list[Record] = field(default_factory=list)
+    row_ids: list[int] = field(default_factory=list)
+    skipped: int = 0
+    condition: str = field(default='True', repr=False)
+    filters: list = field(default_factory=list, repr=False)
 
     # Represents the table when printed as a string
     def __str__(self) -> str:
@@ -101,58 +202,165 @@ class Table:
             return
 
         data = []
+        nbytes = 0
+
+        # blocks - the blocks of rows whose Bloom filters may hold the values the condition requires and the
+        #          number of rows of the table file, or None to read every row
+        blocks = _bf.candidate_blocks(self.path, self.condition)
 
         # Attempt to read the file specified by the table's file path
+        # Only the metadata is read when the rows are read a block at a time
         try:
             # data - The lines read from the table file
-            data = open(self.path, 'r').readlines()
+            # nbytes - The size of the table file in bytes
+            with open(self.path, 'r') as f:
+                if blocks is None:
+                    data = f.readlines()
+                    nbytes = os.fstat(f.fileno()).st_size
+                else:
+                    data = [f.readline()]
+                    nbytes = len(data[0])
         except FileNotFoundError as err:
             logging.error(f'ERROR: Attempt was made to create a table from the nonexistent file {self.path}')
             raise err
 
-        if len(data) < 1:
+        if len(data) < 1 or len(data[0]) < 1:
             return
 
-        # remove lock string if the table is locked
-        if data[0].startswith('&'):
-            data.remove(data[0])
+        # name - the name of the table, used to label its operators
+        # dead - the row numbers of the records that have been deleted from the table
+        # first_row - the row number of the first row of the table file
+        # layout - how the rows of the table file are stored, when fields were added or dropped since they were written
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        dead = _sto.read_tombstones(self.path)
+        layout = _cat.layout(self.path)
+        first_row = 0
+
+        # The records of a compressed table are decoded from its segment before the table file is read
+        # The segment is not decoded when the Bloom filters rule out every block it holds
+        segment = _cmp.read_segment(self.path, header_only=True)
+        wanted = set(blocks[0]) if blocks is not None else None
+        if segment is not None:
+            first_row = segment.rows
+            if wanted is None or any([x * _bf.BLOCK_ROWS < first_row for x in wanted]):
+                segment = _cmp.read_segment(self.path)
+                with _pf.operator(f'decode {name}') as op:
+                    for row_id, record in enumerate(upgrade_records(_cmp.decode_segment(segment), layout)):
+                        if row_id not in dead and (wanted is None or row_id // _bf.BLOCK_ROWS in wanted):
+                            self.records.append(record)
+                            self.row_ids.append(row_id)
+                    op.rows_out = len(self.records)
+                    op.bytes_read = segment.size
+                nbytes += segment.size
+
+        with _pf.operator(f'scan {name}') as op:
+            decoded = len(self.records)
+            if blocks is None:
+                self.parse_lines(data, dead, first_row, layout, self.condition, self.filters)
+            else:
+                self.parse_lines(data, layout=layout)
+                with open(self.path, 'r') as f:
+                    for row_id, lines in read_chunks(f, self.path, first_row, blocks[0]):
+                        self.parse_lines(data + lines, dead, row_id, layout, self.condition, self.filters)
+                        nbytes += sum([len(x) for x in lines])
+            op.rows_in = len(self.records) - decoded + self.skipped
+            op.rows_out = len(self.records) - decoded
+            op.bytes_read = nbytes - (segment.size if segment is not None else 0)
+            if op:
+                scan_details(op, self.condition, self.fields, self.types, self.filters, blocks)
+
+        # The rows of the blocks that were not read are skipped along with the rows the condition ruled out
+        scanned = len(self.records) + self.skipped
+        if blocks is not None:
+            self.skipped = blocks[1] - len(dead) - len(self.records)
+
+        _pf.count_scanned(scanned, nbytes)
+        _pf.count_decoded(len(self.records))
+        _cn.check(scanned)
+
+    # Parses the lines read from the table's file into the schema, fields, types and records
+    # dead - the row numbers of the deleted records, which are skipped
+    # first_row - the row number of the first line after the metadata
+    # layout - the Layout of the rows of an altered table file, whose first line holds the fields of its rows
+    # condition - the condition the records will be filtered by, the rows its pushed down comparisons
+    #             rule out are counted as skipped instead of being converted
+    # filters - the RuntimeFilters of the joins the records are read for, the rows they drop are also skipped
+    def parse_lines(self, data: list[str], dead: set[int] = frozenset(), first_row: int = 0,
+                    layout: _cat.Layout = None, condition: str = 'True', filters: list = ()) -> None:
+        # remove lock strings left in the file by earlier versions of the program
+        data = [line for line in data if not line.startswith('&')]
+
+        if len(data) < 1:
+            return
 
         # meta - The metadata of the table
         # lines - the records of the table in their string representation
-        meta = data[0].strip()
+        meta = data[0].strip() if layout is None else layout.meta
         lines = data[1:]
 
         # Since the meta variable already contains the metadata, assign the schema of the table
         self.schema = meta
 
-        # Reads in the field names from the metadata of the table and turns them into a list
-        # of strings that act as their keys in the dictionaries that represent each record.
-        # This is done by using a regular expression to extract the variable names from the
-        # metadata string.
-        self.fields = re.findall(r'\w+(?=\s\w+)', meta)
+        # Reads in the field names and the python types of the fields from the metadata
+        self.fields, self.types = _db.parse_table_meta(meta)
+
+        # converters - the functions that convert each field's string representation to its type
+        converters = [CONVERTERS[x] for x in self.types]
+
+        # predicate - the comparisons of the condition that are evaluated on each row's values before they are converted
+        predicate = _pd.compile_predicate(condition, tuple(self.fields), tuple(self.types))
+        test = predicate.test if predicate is not None else None
 
-        # Reads in the datatypes from the metadata of the table and convert them into strings
-        # representing their types in python. This is done by using a regular expression to
-        # extract the types from the metadata string to create a list of data types. Then, a
-        # list generator is used to create a list of the datatypes. Any type with varchar is
-        # replaced by the str datatype for use in python.
-        self.types = [x.replace('varchar', 'str') for x in re.findall(r'(?!\w+\s)(?:int|varchar|float)', meta)]
+        # checks - the position of the field each runtime filter looks up, the field's converter and the filter
+        checks = [(self.fields.index(x.name), converters[self.fields.index(x.name)], x.bloom) for x in filters]
 
         # Converts each record's string representation as read from the table's file into a
-        # dictionary that represents each of the records. This is done by splitting the record's
+        # tuple that represents each of the records. This is done by splitting the record's
         # string representation using the split() function to get the values of each field
-        for line in lines:
-            if line.startswith('&'):
+        for row_id, line in enumerate(lines, first_row):
+            if row_id in dead:
                 continue
 
             record_strings = line.strip().split('|')
 
-            # Converts all members of the record to their equivalent types in python.
-            record_dict = Record({self.fields[i]: eval(f'{self.types[i]}("{record_strings[i]}")')
-                                  for i in range(len(self.fields))})
+            # The rows of an altered table are filled with the defaults of the fields added after they were
+            # stored, and the values of the fields dropped since are skipped
+            if layout is not None:
+                if len(record_strings) < len(layout.fill):
+                    record_strings += layout.fill[len(record_strings):]
+                record_strings = [record_strings[x] for x in layout.positions]
 
-            self.records.append(record_dict)
+            # Rows that can not satisfy the condition are skipped before any of their values are converted
+            if test is not None and not test(record_strings):
+                self.skipped += 1
+                continue
 
+            # Rows whose keys are not in the filters of the tables they are joined to can not match
+            if checks and not all([bloom.might_contain(convert(record_strings[position]))
+                                   for position, convert, bloom in checks]):
+                self.skipped += 1
+                continue
+
+            # Converts all members of the record to their equivalent types in python.
+            self.records.append(tuple([convert(value) for convert, value in zip(converters, record_strings)]))
+            self.row_ids.append(row_id)
+
+
+# CONVERTERS - maps the name of each python type used by tables to the function that converts to it
+# AGGREGATES - the names of the aggregate functions that can be selected
+CONVERTERS = {'int': int, 'float': float, 'str': str}
+AGGREGATES = ('COUNT', 'SUM', 'AVG', 'MAX', 'MIN')
+
+# STREAM_CHUNK_BYTES - the number of bytes of lines read at a time when a table is read one record at a time
+# JOIN_ENTRY_SIZE - the estimated memory used by the entry of each record in the hash table of a join
+# JOIN_PARTITIONS - the number of partitions the records of a join are divided between when it spills
+# SINGLE_AGGREGATE - the argument of a single aggregate function of a field, such as (*) or (price)
+# JOIN_KEYWORDS - the keywords that begin the join of another table
+STREAM_CHUNK_BYTES = 64 * 1024
+JOIN_ENTRY_SIZE = 64
+JOIN_PARTITIONS = 16
+SINGLE_AGGREGATE = re.compile(r'\(\s*(\*|[\w.]+)\s*\)')
+JOIN_KEYWORDS = ('INNER', 'LEFT', 'RIGHT', 'OUTER', 'JOIN')
 
 # endregion
 
@@ -169,7 +377,7 @@ class Table:
 # ARGUMENTS:    record - the name of the table to retrieve
 # RETURNS:      A string representation of the record
 def format_record(record: Record) -> str:
-    return '|'.join([str(x) for x in record.values()])
+    return '|'.join(map(str, record))
 
 
 # METHOD:       format_records()
@@ -179,8 +387,10 @@ def format_record(record: Record) -> str:
 def format_records(records: list[Record]) -> list[str]:
     formatted_records = []
 
-    for record in records:
-        formatted_records.append(format_record(record))
+    with _pf.operator('format') as op:
+        for record in records:
+            formatted_records.append(format_record(record))
+        op.rows_in = op.rows_out = len(formatted_records)
 
     return formatted_records
 
@@ -193,36 +403,89 @@ def filter_table(table: Table, fields: list[str], condition: str = 'True') -> Ta
     # Make a copy of the table
     new_table = Table(None)
 
-    # Filter out the types of each field by removing all
-    # field type elements for each of the field name elements
-    # that are not in the fields parameter
-    new_table.types = [table.types[x] for x in range(len(new_table.types)) if table.fields[x] in fields]
-
-    # Filter the fields and remove all fields not within the fields parameter
-    new_table.fields = [x for x in table.fields if x in fields]
+    # positions - the position of each of the selected fields within the table's records
+    # Selecting every field keeps every position, even when a joined table repeats a field name
+    if fields == table.fields:
+        positions = list(range(len(table.fields)))
+    else:
+        positions = [table.fields.index(x) for x in fields]
+
+    # Filter the types, fields and schema to only contain the selected fields
+    schema = table.schema.split('|')
+    new_table.types = [table.types[x] for x in positions]
+    new_table.fields = [table.fields[x] for x in positions]
+    new_table.schema = '|'.join([schema[x] for x in positions])
+
+    # code - the compiled condition
+    # subqueries - the hash sets of the statement's subqueries, the global scope the condition is evaluated in
+    # view - the view used to access the fields of each record by name while evaluating the condition
+    code = compile(condition or 'True', '<condition>', 'eval')
+    subqueries = _ss.current().subqueries
+    view = RecordView(table.fields)
+    project = positions != list(range(len(table.fields)))
+
+    # Filter the records and only keep the values of the fields in the fields parameter
+    with _pf.operator('filter') as op:
+        for record in table.records:
+            view._record = record
+            if eval(code, subqueries, view):
+                new_table.records.append(tuple([record[x] for x in positions]) if project else record)
+        op.rows_in = len(table.records)
+        op.rows_out = len(new_table.records)
 
-    # Filter the records and remove all dictionary keys that are not in the fields parameter
-    new_table.records = [Record({k: v for (k, v) in x.items() if k in fields})
-                         for x in table.records
-                         if eval(condition, {}, dict(x))]
+    return new_table
 
-    # Filters out the schema of the list by using list comprehension hackery
-    new_table.schema = '|'.join([[y for y in table.schema.split('|') if x in y][0] for x in fields])
 
-    return new_table
+# METHOD:       filter_records()
+# DESCRIPTION:  Filters records one at a time as they are read
+# ARGUMENTS:    fields - the fields of the records
+#               records - an iterable of the records to filter
+#               condition - the condition formatted as a string to use for evaluation
+# RETURNS:      A generator of the records that satisfy the condition
+def filter_records(fields: list[str], records, condition: str = 'True'):
+    code = compile(condition or 'True', '<condition>', 'eval')
+    subqueries = _ss.current().subqueries
+    view = RecordView(fields)
+    count = 0
+    kept = 0
+
+    with _pf.operator('filter') as op:
+        try:
+            for record in records:
+                count += 1
+                view._record = record
+                if eval(code, subqueries, view):
+                    kept += 1
+                    yield record
+        finally:
+            op.rows_in = count
+            op.rows_out = kept
 
 
 # METHOD:       retrieve_table()
 # DESCRIPTION:  Retrieves a table as an instance of the Table class
+#               A partitioned table is assembled from the partitions the condition does not rule out
 # ARGUMENTS:    name - the name of the table to retrieve
-# RETURNS:      A table object representing the specified table
-def retrieve_table(name: str, block_on_locked: bool = True) -> Table:
-    table = Table(_db.tbl_path(name))
-
+#               block_on_locked - whether to lock the table, or fail if it is locked
+#               condition - the condition the records will be filtered by
+#               filters - the RuntimeFilters of the joins the table is read for
+# RETURNS:      A table object representing the specified table, holding only the records
+#               that were not ruled out by the condition's pushed down comparisons or the filters
+def retrieve_table(name: str, block_on_locked: bool = True, condition: str = 'True', filters: list = ()) -> Table:
     if not _db.validate_table(name):
         print(f'!Failed because {name} does not exist')
         return Table(None)
 
+    # The table's own file holds its metadata, its records are read from its partitions
+    partitions = partition_tables(name, condition)
+    if partitions != [name]:
+        table = Table(_db.tbl_path(name))
+        for partition in partitions:
+            part = retrieve_table(partition, block_on_locked, condition, filters)
+            table.records.extend(part.records)
+            table.skipped += part.skipped
+        return table
+
     if block_on_locked:
         try:
             acquire_lock(name)
@@ -230,19 +493,358 @@ def retrieve_table(name: str, block_on_locked: bool = True) -> Table:
             print(f'Error: Table {name} is locked!')
             raise TableLockedError
 
-    return table
+    return Table(_db.tbl_path(name), condition=condition, filters=list(filters))
+
+
+# METHOD:       partition_tables()
+# DESCRIPTION:  Finds the names of the tables that hold the records of a table. The partitions of a
+#               partitioned table are read as tables of their own, named after the table and partition.
+# ARGUMENTS:    name - the name of the table
+#               condition - the condition used to rule out partitions
+# RETURNS:      The names of the partitions that may hold records satisfying the condition,
+#               or a list containing only the table's name if the table is not partitioned
+def partition_tables(name: str, condition: str = 'True') -> list[str]:
+    scheme = _cat.scheme(_db.tbl_path(name))
+
+    if scheme is None:
+        return [name]
+
+    with _pf.operator(f'prune {name}') as op:
+        partitions = _pt.prune(scheme, condition)
+        op.rows_in = len(scheme.names)
+        op.rows_out = len(partitions)
+
+    return [f'{name}.{x}' for x in partitions]
+
+
+# METHOD:       stream_table()
+# DESCRIPTION:  Reads the records of a table one at a time instead of holding every record in memory
+#               A partitioned table is read from the partitions the condition does not rule out
+# ARGUMENTS:    name - the name of the table to read
+#               condition - the condition the records will be filtered by
+#               filters - the RuntimeFilters of the joins the table is read for
+# RETURNS:      A tuple of a Table holding only the table's metadata and an iterator over its records
+def stream_table(name: str, condition: str = 'True', filters: list = ()):
+    if not _db.validate_table(name):
+        print(f'!Failed because {name} does not exist')
+        return Table(None), []
+
+    table = Table(None)
+    table.parse_lines([table_meta(name)])
+
+    return table, (x for partition in partition_tables(name, condition)
+                   for x in stream_file(_db.tbl_path(partition), condition, filters))
+
+
+# METHOD:       stream_file()
+# DESCRIPTION:  Reads the records of a table file a chunk of lines at a time
+# ARGUMENTS:    path - the path of the table file
+#               condition - the condition the records will be filtered by
+#               filters - the RuntimeFilters of the joins the table is read for
+#               numbered - whether each record is read along with its row number
+# RETURNS:      A generator of the records of the table file that have not been deleted or ruled out
+#               by the condition's pushed down comparisons or the filters, or of (row number, record) tuples
+#               The file stops being read as soon as the generator is no longer read from
+def stream_file(path: str, condition: str = 'True', filters: list = (), numbered: bool = False):
+    name = os.path.splitext(os.path.basename(path))[0]
+    dead = _sto.read_tombstones(path)
+    layout = _cat.layout(path)
+    count = 0
+    skipped = 0
+    nbytes = 0
+
+    # blocks - the blocks of rows whose Bloom filters may hold the values the condition requires, or None
+    # chunk - the table each chunk of lines is parsed into
+    blocks = _bf.candidate_blocks(path, condition)
+    wanted = set(blocks[0]) if blocks is not None else None
+    chunk = Table(None)
+
+    # The counters are kept in a finally block, since a LIMIT closes the generator part of the way through
+    with _pf.operator(f'scan {name}') as op:
+        try:
+            # The records of a compressed table are decoded from its segment before the table file is read
+            # The segment is not decoded when the Bloom filters rule out every block it holds
+            segment = _cmp.read_segment(path, header_only=True)
+            first_row = segment.rows if segment is not None else 0
+            if segment is not None and (wanted is None or any([x * _bf.BLOCK_ROWS < first_row for x in wanted])):
+                segment = _cmp.read_segment(path)
+                nbytes += segment.size
+                for row_id, record in enumerate(upgrade_records(_cmp.decode_segment(segment), layout)):
+                    if row_id % _cn.CHECK_INTERVAL == 0:
+                        _cn.check()
+                    if row_id not in dead and (wanted is None or row_id // _bf.BLOCK_ROWS in wanted):
+                        count += 1
+                        yield (row_id, record) if numbered else record
+
+            # row_id - the row number of the first line of the chunk
+            with open(path, 'r') as f:
+                meta = f.readline()
+                chunk.parse_lines([meta], layout=layout)
+                for row_id, lines in read_chunks(f, path, first_row, blocks[0] if blocks is not None else None):
+                    _cn.check(len(lines))
+                    chunk = Table(None)
+                    chunk.parse_lines([meta] + lines, dead, row_id, layout, condition, filters)
+                    nbytes += sum([len(x) for x in lines])
+                    skipped += chunk.skipped
+                    count += len(chunk.records)
+                    yield from zip(chunk.row_ids, chunk.records) if numbered else chunk.records
+        finally:
+            op.rows_in = count + skipped
+            op.rows_out = count
+            op.bytes_read = nbytes
+            if op:
+                scan_details(op, condition, chunk.fields, chunk.types, filters, blocks)
+            _pf.count_scanned(count + skipped, nbytes)
+            _pf.count_decoded(count)
+
+
+# METHOD:       read_chunks()
+# DESCRIPTION:  Reads the rows of a table file a chunk of lines at a time, or only the rows of some of its blocks
+#               The rows of the blocks are found with the table's row offset index, so no other row is read
+# ARGUMENTS:    f - the table file, opened and read past its metadata
+#               path - the path of the table file
+#               first_row - the row number of the first row of the table file
+#               blocks - the sorted list of the blocks of rows to read, or None to read every row
+# RETURNS:      A generator of tuples of the row number of the first row of each chunk and the chunk's lines
+def read_chunks(f, path: str, first_row: int, blocks: list[int] = None):
+    if blocks is None:
+        row_id = first_row
+        lines = f.readlines(STREAM_CHUNK_BYTES)
+        while len(lines) > 0:
+            yield row_id, lines
+            row_id += len(lines) - sum([x.startswith('&') for x in lines])
+            lines = f.readlines(STREAM_CHUNK_BYTES)
+        return
+
+    for block in blocks:
+        start = max(block * _bf.BLOCK_ROWS, first_row)
+        stop = (block + 1) * _bf.BLOCK_ROWS
+        if stop > first_row:
+            yield start, _sto.read_rows(path, start - first_row, stop - first_row)
+
+
+# METHOD:       scan_details()
+# DESCRIPTION:  Adds what ruled out rows of a table before they were converted to the profile of its scan
+# ARGUMENTS:    op - the OperatorProfile of the scan
+#               condition - the condition the records are filtered by
+#               fields - the fields of the table
+#               types - the python type names of the fields
+#               filters - the RuntimeFilters of the joins the table is scanned for
+#               blocks - the blocks of rows that were read and the number of rows of the table, or None
+# RETURNS:      N/A
+def scan_details(op: _pf.OperatorProfile, condition: str, fields: list[str], types: list[str], filters: list,
+                 blocks):
+    predicate = _pd.compile_predicate(condition, tuple(fields), tuple(types))
+    if predicate is not None:
+        op.details['pushed down'] = predicate.text
+    if len(filters) > 0:
+        op.details['runtime filter'] = ', '.join([x.label or x.name for x in filters])
+    if blocks is not None:
+        op.details['bloom blocks'] = f'{len(blocks[0])} of {(blocks[1] + _bf.BLOCK_ROWS - 1) // _bf.BLOCK_ROWS}'
+
+
+# METHOD:       upgrade_records()
+# DESCRIPTION:  Converts the records decoded from the segment of an altered table, which hold the fields
+#               the table had when it was compressed, into records holding the table's fields
+# ARGUMENTS:    records - the decoded records
+#               layout - the Layout of the table's rows, or None if the table has not been altered
+# RETURNS:      The records holding the table's fields
+def upgrade_records(records: list[tuple], layout: _cat.Layout = None) -> list[tuple]:
+    if layout is None or len(records) < 1:
+        return records
+
+    # tail - the defaults of the fields added after the records were encoded
+    width = len(records[0])
+    tail = tuple([CONVERTERS[x](value) for x, value in zip(layout.types[width:], layout.fill[width:])])
+
+    return [tuple([record[x] for x in layout.positions]) for record in (y + tail for y in records)]
+
+
+# METHOD:       retrieve_workspace()
+# DESCRIPTION:  Retrieves the workspace holding the changes made to a table by the current transaction
+#               Outside of a transaction, a new workspace is created for the statement
+# ARGUMENTS:    name - the name of the table to retrieve
+#               condition - the condition of the statement the workspace is used by
+# RETURNS:      The Workspace of the table
+def retrieve_workspace(name: str, condition: str = 'True') -> Workspace:
+    path = _db.tbl_path(name)
+
+    session = _ss.current()
+    if path in session.transaction:
+        return session.transaction[path]
+
+    if not _db.validate_table(name):
+        print(f'!Failed because {name} does not exist')
+        workspace = Workspace(Table(None))
+    else:
+        try:
+            acquire_lock(name)
+        except TableLockedError:
+            print(f'Error: Table {name} is locked!')
+            raise TableLockedError
+
+        table = Table(None)
+        table.parse_lines([table_meta(name)], layout=_cat.layout(path))
+        table.path = path
+        workspace = Workspace(table, condition=condition)
+
+    # The workspace of a statement only reads the records that may satisfy its condition
+    # A transaction's workspace is used by its later statements, so it holds every record if the budget can hold them
+    # The workspace joins the transaction before its records are read, so the table's lock is released
+    # along with the transaction's other locks if the statement is cancelled while they are read
+    if session.transaction_active:
+        workspace.condition = 'True'
+        workspace.budget = _mem.Reservation(f'workspace {name}')
+        session.transaction[path] = workspace
+        if workspace.table.path is not None and workspace.budget.resize(table_size(name) * _mem.TEXT_EXPANSION):
+            workspace.table = Table(path)
+            workspace.held = True
+
+    return workspace
+
+
+# METHOD:       apply_workspace()
+# DESCRIPTION:  Applies the changes held by a workspace to the table's file
+# ARGUMENTS:    workspace - the Workspace to apply
+# RETURNS:      N/A
+def apply_workspace(workspace: Workspace):
+    table = workspace.table
+
+    if table.path is None or len(workspace.updated) + len(workspace.deleted) < 1:
+        return
+
+    _ch.bump(table.path)
+
+    # Updates overwrite the updated rows where they are in the table file
+    # Rows that no longer fit are moved to the end of the file instead
+    if len(workspace.updated) > 0:
+        with _pf.operator('update in place') as op:
+            layout = _cat.layout(table.path)
+            rows = {row_id: format_record(record) for row_id, record in workspace.updated.items()}
+            if layout is not None:
+                rows = {row_id: layout.encode(row) for row_id, row in rows.items()}
+            size = os.path.getsize(table.path)
+            op.bytes_written, relocated = _sto.update_rows(table.path, rows, _cmp.segment_rows(table.path))
+            op.rows_in = len(rows)
+            op.rows_out = len(rows) - len(relocated)
+
+        # The new values are added to the Bloom filters, the old values stay in them until the table is rewritten
+        _bf.update_rows(table.path, workspace.updated, len(relocated), size)
+
+    # Deletes only set the bits of the deleted rows in the table's deletion bitmap
+    if len(workspace.deleted) > 0:
+        with _pf.operator('tombstone') as op:
+            op.rows_in = len(workspace.deleted)
+            op.bytes_written = _sto.delete_rows(table.path, workspace.deleted)
+
+    # Compacts the table once enough of its rows have been deleted
+    dead = len(_sto.read_tombstones(table.path))
+    if _sto.needs_vacuum(dead, _cmp.segment_rows(table.path) + _sto.count_rows(table.path)):
+        vacuum_table(table.path)
+
+    # The views of a partitioned table are maintained from the changes to each of its partitions
+    path = _pt.parent_path(table.path)
+    if len(_mv.dependents(path)) > 0:
+        removed = [workspace.original[x] for x in sorted(workspace.deleted | workspace.updated.keys())]
+        maintain_views(path, removed, list(workspace.updated.values()))
 
 
 # METHOD:       write_table()
 # DESCRIPTION:  Writes a table to memory
+#               A compressed table's records are written to its segment, leaving only the metadata in its file
 # ARGUMENTS:    table - the table to write to memory
+#               segment - the table's records encoded by encode_table(), or None to write them as text
 # RETURNS:      N/A
-def write_table(table: Table):
-    with open(table.path, 'w') as f:
-        f.write(f'{table.schema}\n')
-        for record in table.records:
-            f.write(f'{format_record(record)}\n')
-        f.close()
+def write_table(table: Table, segment: _cmp.Segment = None):
+    # entries - the row offset index of the rewritten file
+    entries = []
+
+    _ch.bump(table.path)
+
+    with _pf.operator('write') as op:
+        if segment is not None:
+            op.bytes_written = _cmp.write_segment(table.path, segment)
+
+        with open(table.path, 'w') as f:
+            f.write(f'{table.schema}\n')
+            offset = len(table.schema.encode()) + 1
+            for record in table.records if segment is None else []:
+                line = format_record(record)
+                f.write(f'{line}\n')
+                entries.append((offset, len(line.encode())))
+                offset += entries[-1][1] + 1
+            op.bytes_written += offset
+
+        op.rows_in = len(table.records)
+
+    # The deleted rows are no longer in the file, so the records are renumbered
+    # The rewritten rows hold the table's fields, so the layout of the rows of an altered table is deleted
+    if segment is None:
+        _cmp.clear_segment(table.path)
+    _sto.clear_tombstones(table.path)
+    _cat.clear_layout(table.path)
+    _sto.write_index(table.path, entries)
+    table.row_ids = list(range(len(table.records)))
+
+    # The Bloom filters are rebuilt for the renumbered rows, without the fields the table no longer has
+    header = _bf.read_header(table.path)
+    if header is not None:
+        columns = [x for x in header.columns if x in table.fields]
+        if len(columns) > 0:
+            _bf.build(table.path, columns, table.fields, table.records, table.row_ids, len(table.records))
+        else:
+            _bf.delete(table.path)
+
+
+# METHOD:       encode_table()
+# DESCRIPTION:  Encodes the records of a table into a segment, and measures how long the records
+#               take to scan from the segment compared to parsing them from the table file's text
+# ARGUMENTS:    table - the table to encode
+# RETURNS:      The Segment holding the table's records
+def encode_table(table: Table) -> _cmp.Segment:
+    with _pf.operator('encode') as op:
+        segment = _cmp.encode_segment(table.fields, table.types, table.records)
+        op.rows_in = len(table.records)
+
+    # The text is parsed and the segment decoded in memory so that only the decoding is compared
+    lines = [f'{table.schema}\n'] + [f'{format_record(x)}\n' for x in table.records]
+    segment.raw_bytes = sum([len(x.encode()) for x in lines[1:]])
+
+    start = time.perf_counter()
+    Table(None).parse_lines(lines)
+    segment.text_scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _cmp.decode_segment(segment)
+    segment.scan_time = time.perf_counter() - start
+
+    return segment
+
+
+# METHOD:       vacuum_table()
+# DESCRIPTION:  Compacts a table by rewriting it without its deleted rows
+#               A compressed table is encoded again, along with the rows appended to its file
+#               The rows of an altered table are rewritten to hold the fields the table has now
+# ARGUMENTS:    path - the path of the table file
+# RETURNS:      The number of slots reclaimed from the table, each held by a deleted row or by the
+#               old copy of a row that an update relocated to the end of the table file
+def vacuum_table(path: str) -> int:
+    compressed = _cmp.read_segment(path, header_only=True) is not None
+    if not compressed and _cat.layout(path) is None:
+        _ch.bump(path)
+        removed = _sto.vacuum(path)
+        if removed > 0 and _bf.read_header(path) is not None:
+            rebuild_filters(path)
+        return removed
+
+    removed = len(_sto.read_tombstones(path))
+    table = Table(path)
+
+    # A compressed table whose segment would no longer be smaller than its rows keeps them as text
+    segment = encode_table(table) if compressed else None
+    write_table(table, segment if segment is not None and segment.size < segment.raw_bytes else None)
+
+    return removed
 
 
 # METHOD:       combine_tables()
@@ -267,6 +869,49 @@ def combine_tables(table1: Table, table2: Table) -> Table:
     return new_table
 
 
+# METHOD:       join_records()
+# DESCRIPTION:  Finds every pair of records from two tables that satisfies a condition
+# ARGUMENTS:    table_tup1 - A tuple of a name that represents a table and the table being represented
+#               table_tup2 - A tuple of a name that represents a table and the table being represented
+#               condition - the condition to evaluate as a string
+# RETURNS:      A tuple of the joined records, the set of positions of the matched records in
+#               the first table and the set of positions of the matched records in the second table
+def join_records(table_tup1: tuple[str, Table], table_tup2: tuple[str, Table], condition: str):
+    # The tables to be joined and their identifiers
+    left_name, left_table = table_tup1
+    right_name, right_table = table_tup2
+
+    # The views are bound to each table's identifier so the condition can use the dot operator
+    left_view = RecordView(left_table.fields)
+    right_view = RecordView(right_table.fields)
+    scope = {left_name: left_view, right_name: right_view}
+    code = compile(condition or 'True', '<condition>', 'eval')
+    subqueries = _ss.current().subqueries
+
+    records = []
+    left_matched = set()
+    right_matched = set()
+    pairs = 0
+
+    # Joined records are created by concatenating the tuples of both records
+    # Every pair of records is compared, so the statement is checked as the pairs are compared
+    for i, l_rec in enumerate(left_table.records):
+        pairs += len(right_table.records)
+        if pairs >= _cn.CHECK_INTERVAL:
+            _cn.check(pairs)
+            pairs = 0
+
+        left_view._record = l_rec
+        for j, r_rec in enumerate(right_table.records):
+            right_view._record = r_rec
+            if eval(code, subqueries, scope):
+                records.append(l_rec + r_rec)
+                left_matched.add(i)
+                right_matched.add(j)
+
+    return records, left_matched, right_matched
+
+
 # METHOD:       inner_join()
 # DESCRIPTION:  Performs an inner join operation on two tables
 # ARGUMENTS:    table_tup1 - A tuple of a name that represents a table and the table being represented
@@ -274,23 +919,19 @@ def combine_tables(table1: Table, table2: Table) -> Table:
 #               condition - the condition to evaluate as a string
 # RETURNS:      A joined table
 def inner_join(table_tup1: tuple[str, Table], table_tup2: tuple[str, Table], condition: str) -> Table:
-    # The tables to be joined and their identifiers
-    left_name = table_tup1[0]
+    # The tables to be joined
     left_table = table_tup1[1]
-
-    right_name = table_tup2[0]
     right_table = table_tup2[1]
 
     # Combine the table schemas, fields and types
     new_table = combine_tables(left_table, right_table)
 
-    # Create a list containing lists of records where the condition was satisfied
-    nested_records = [[l_rec | r_rec for r_rec in right_table.records
-                       if eval(condition, {}, {left_name: l_rec, right_name: r_rec})]
-                      for l_rec in left_table.records]
+    with _pf.operator('inner join') as op:
+        # Create a list containing the records where the condition was satisfied
+        new_table.records, _, _ = join_records(table_tup1, table_tup2, condition)
 
-    # Flatten out the nested records by using list comprehension
-    new_table.records = [record for nested_record in nested_records for record in nested_record]
+        op.rows_in = len(left_table.records) + len(right_table.records)
+        op.rows_out = len(new_table.records)
 
     return new_table
 
@@ -306,24 +947,23 @@ def left_outer_join(table_tup1: tuple[str, Table], table_tup2: tuple[str, Table]
     left_table = table_tup1[1]
     right_table = table_tup2[1]
 
-    # Perform an inner join to get the intersecting elements in the join
-    new_table = inner_join(table_tup1, table_tup2, condition)
-
-    # Create an empty dictionary for any records that don't find a match
-    right_empty_dict = {x: '' for x in right_table.fields}
-
-    # Check each record in the left table to see if it was found in the
-    # table created from the inner join. If the record was not found,
-    # append it to the list of dictionaries with the fields from the
-    # right dictionary set to empty.
-    for left_record in left_table.records:
-        found = False
-        for new_record in new_table.records:
-            if all(x in new_record.items() for x in left_record.items()):
-                found = True
-                break
-        if not found:
-            new_table.records.append(Record(left_record | right_empty_dict))
+    with _pf.operator('left outer join') as op:
+        # Join the tables to get the intersecting elements in the join
+        new_table = combine_tables(left_table, right_table)
+        new_table.records, left_matched, _ = join_records(table_tup1, table_tup2, condition)
+
+        # Create an empty record for any records that don't find a match
+        right_empty = ('',) * len(right_table.fields)
+
+        # Check each record in the left table to see if it was matched by
+        # the join. If the record was not matched, append it to the list
+        # of records with the fields from the right table set to empty.
+        for i, left_record in enumerate(left_table.records):
+            if i not in left_matched:
+                new_table.records.append(left_record + right_empty)
+
+        op.rows_in = len(left_table.records) + len(right_table.records)
+        op.rows_out = len(new_table.records)
 
     return new_table
 
@@ -339,68 +979,568 @@ def right_outer_join(table_tup1: tuple[str, Table], table_tup2: tuple[str, Table
     left_table = table_tup1[1]
     right_table = table_tup2[1]
 
-    # Perform an inner join to get the intersecting elements in the join
-    new_table = inner_join(table_tup1, table_tup2, condition)
-
-    # Create an empty dictionary for any records that don't find a match
-    left_empty_dict = {x: '' for x in left_table.fields}
-
-    # Check each record in the right table to see if it was found in the
-    # table created from the inner join. If the record was not found,
-    # append it to the list of dictionaries with the fields from the
-    # right dictionary set to empty.
-    for right_record in right_table.records:
-        found = False
-        for new_record in new_table.records:
-            if all(x in new_record.items() for x in right_record.items()):
-                found = True
-                break
-        if not found:
-            new_table.records.append(Record(left_empty_dict | right_record))
+    with _pf.operator('right outer join') as op:
+        # Join the tables to get the intersecting elements in the join
+        new_table = combine_tables(left_table, right_table)
+        new_table.records, _, right_matched = join_records(table_tup1, table_tup2, condition)
+
+        # Create an empty record for any records that don't find a match
+        left_empty = ('',) * len(left_table.fields)
+
+        # Check each record in the right table to see if it was matched by
+        # the join. If the record was not matched, append it to the list
+        # of records with the fields from the left table set to empty.
+        for i, right_record in enumerate(right_table.records):
+            if i not in right_matched:
+                new_table.records.append(left_empty + right_record)
+
+        op.rows_in = len(left_table.records) + len(right_table.records)
+        op.rows_out = len(new_table.records)
 
     return new_table
 
 
+# METHOD:       retrieve_joined()
+# DESCRIPTION:  Reads the two tables of a join. The equalities of the condition between the tables become
+#               runtime filters: the table whose every record the join may keep is read first, and the keys
+#               of its records filter the rows of the other table, which can not match without them
+# ARGUMENTS:    tables - the names of the two tables
+#               aliases - the identifiers of the two tables
+#               kind - 'INNER', 'LEFT' or 'RIGHT', or None if the tables are not joined
+#               condition - the condition of the join
+# RETURNS:      A tuple of the (identifier, Table) tuples of both tables, in the order they were listed
+def retrieve_joined(tables: list[str], aliases: list[str], kind: str, condition: str):
+    keys = join_keys(condition, aliases[0], aliases[1]) if kind is not None and aliases[0] != aliases[1] else []
+    if len(keys) < 1 or not all([_db.validate_table(x) for x in tables]):
+        return (aliases[0], retrieve_table(tables[0], False)), (aliases[1], retrieve_table(tables[1], False))
+
+    # An inner join filters the larger table by the keys of the smaller one
+    # An outer join keeps every record of one table, so only the other table's rows are filtered
+    if kind == 'INNER':
+        build = 0 if table_size(tables[0]) <= table_size(tables[1]) else 1
+    else:
+        build = 0 if kind == 'LEFT' else 1
+    probe = 1 - build
+
+    built = retrieve_table(tables[build], False)
+    fields, _ = _db.parse_table_meta(table_meta(tables[probe]))
+    filters = []
+    for names, part in keys:
+        if names[build] in built.fields and names[probe] in fields:
+            with _pf.operator(f'bloom filter {aliases[build]}') as op:
+                column = built.fields.index(names[build])
+                filters.append(_bf.runtime_filter(names[probe], [x[column] for x in built.records], part))
+                op.rows_in = len(built.records)
+
+    probed = retrieve_table(tables[probe], False, filters=filters)
+    tups = {build: (aliases[build], built), probe: (aliases[probe], probed)}
+
+    return tups[0], tups[1]
+
+
+# METHOD:       join_keys()
+# DESCRIPTION:  Finds the equalities between a field of each of two tables that a joined record has to
+#               satisfy, such as E.id = S.eid
+# ARGUMENTS:    condition - the condition of the join
+#               left - the identifier of the first table
+#               right - the identifier of the second table
+# RETURNS:      A list of tuples of the names of the fields of both tables and the part of the condition
+def join_keys(condition: str, left: str, right: str) -> list[tuple[tuple[str, str], str]]:
+    keys = []
+
+    for part, used in split_conjuncts(condition, [left, right]):
+        tree = ast.parse(part, mode='eval').body
+        if used != {left, right} or not (isinstance(tree, ast.Compare) and len(tree.ops) == 1
+                                         and isinstance(tree.ops[0], ast.Eq)):
+            continue
+
+        sides = [tree.left, tree.comparators[0]]
+        if all([isinstance(x, ast.Attribute) and isinstance(x.value, ast.Name) for x in sides]):
+            fields = {x.value.id: x.attr for x in sides}
+            if len(fields) == 2:
+                keys.append(((fields[left], fields[right]), part))
+
+    return keys
+
+
+# METHOD:       table_size()
+# DESCRIPTION:  Finds the number of bytes the records of a table are stored in
+# ARGUMENTS:    name - the name of the table
+# RETURNS:      The size of the table's files and of the files of its partitions and segments
+def table_size(name: str) -> int:
+    path = _db.tbl_path(name)
+    scheme = _cat.scheme(path)
+    paths = [path] if scheme is None else [_db.tbl_path(f'{name}.{x}') for x in scheme.names]
+
+    return sum([os.path.getsize(x) for y in paths for x in (y, _cmp.segment_path(y)) if os.path.isfile(x)])
+
+
+# METHOD:       join_tables()
+# DESCRIPTION:  Joins any number of tables with a left-deep pipeline of join operators. The records of the
+#               first table are read one at a time and each joined record is passed on to the next join as
+#               soon as it is found, so only the tables being joined to, and never an intermediate result,
+#               are held in memory. Joins on equalities probe a hash table of the table being joined to.
+# ARGUMENTS:    steps - the (name, identifier, kind, condition) of each table in the order they are joined,
+#                       where the kind is 'INNER', 'LEFT' or 'RIGHT' and the condition is the ON condition
+#               where - the WHERE condition formatted as a string to use for evaluation
+# RETURNS:      A tuple of a Table holding the combined fields of the tables, an iterator over the joined
+#               records and the position of the first field of each table identifier
+def join_tables(steps: list[tuple[str, str, str, str]], where: str):
+    aliases = [x[1] for x in steps]
+    tables = []
+    for name, _, _, _ in steps:
+        table = Table(None)
+        table.parse_lines([table_meta(name)])
+        tables.append(table)
+
+    # offsets - the position of the first field of each table within the joined records
+    # views - the view of each table's fields within a joined record, so conditions can use the dot operator
+    header = Table(None)
+    offsets = {}
+    views = {}
+    for alias, table in zip(aliases, tables):
+        offsets[alias] = len(header.fields)
+        views[alias] = RecordView([''] * len(header.fields) + table.fields)
+        header.fields = header.fields + table.fields
+        header.types = header.types + table.types
+    header.schema = '|'.join([x.schema for x in tables])
+
+    # conditions - the conditions evaluated by each join, where the first are evaluated on the first table
+    # A condition of the WHERE clause is evaluated as soon as the tables it refers to have been joined,
+    # which can only be done when no outer join has to pad records that the condition would remove
+    conditions = [[] for _ in steps]
+    remaining = []
+    outer = any([x[2] != 'INNER' for x in steps[1:]])
+    for part, used in split_conjuncts(where, aliases):
+        if outer or len(used) < 1:
+            remaining.append(part)
+        else:
+            conditions[max([aliases.index(x) for x in used])].append(part)
+    for i, step in enumerate(steps[1:], 1):
+        conditions[i].extend([x for x, _ in split_conjuncts(step[3], aliases)])
+
+    # The tables being joined to are read into their joins before the first table is read, so that the keys of
+    # their records can filter the first table's rows. The rows of the first table that a join on its fields can
+    # not match are dropped by it, unless a right outer join before it would pad the records they match instead.
+    filters = []
+    _, records = stream_table(steps[0][0], filters=filters)
+    if len(conditions[0]) > 0:
+        records = join_filter(records, views, conditions[0])
+
+    for i, (name, alias, kind, _) in enumerate(steps[1:], 1):
+        filtered = kind != 'LEFT' and not any([x[2] == 'RIGHT' for x in steps[1:i]])
+        _, build = stream_table(name)
+        records = join_step(records, (alias, tables[i]), build, kind, conditions[i], aliases[:i], offsets, views,
+                            (tables[0].fields, filters) if filtered else None)
+
+    if len(remaining) > 0:
+        records = join_filter(records, views, remaining)
+
+    return header, records, offsets
+
+
+# METHOD:       join_step()
+# DESCRIPTION:  Joins records as they are read to the records of a table. The equalities of the condition
+#               between the table and the tables already joined become the keys of a hash join, any other
+#               part of the condition is evaluated on each pair of records the keys match. When the memory
+#               budget can not hold the table's records, the table and the joined records are partitioned
+#               to temporary files by the hash of their keys and each partition is joined on its own, or
+#               without keys, the joined records are joined a block at a time to the table's spilled records.
+# ARGUMENTS:    records - an iterable of the records joined so far
+#               table_tup - A tuple of a name that represents a table and the table being represented
+#               build - an iterable of the table's records
+#               kind - 'INNER', 'LEFT' or 'RIGHT'
+#               conditions - the parts of the condition the pairs of records have to satisfy
+#               joined - the identifiers of the tables already joined
+#               offsets - the position of the first field of each table within the joined records
+#               views - the view of each table's fields within a joined record
+#               filters - the fields of the first table and the RuntimeFilters its rows are read with, which the
+#                         keys of the table's records are added to, or None if they can not filter the first table
+# RETURNS:      A generator of the joined records
+def join_step(records, table_tup: tuple[str, Table], build, kind: str, conditions: list[str], joined: list[str],
+              offsets: dict, views: dict, filters: tuple = None):
+    alias, table = table_tup
+    width = offsets[alias]
+
+    # probe - the positions of the key fields within the joined records
+    # keys - the positions of the key fields within the table's records
+    # labels - the part of the condition each key comes from
+    # A condition that only refers to the table removes its records before an inner join
+    probe = []
+    keys = []
+    labels = []
+    residual = []
+    for part, used in split_conjuncts(' and '.join([f'({x})' for x in conditions]), list(offsets)):
+        key = join_key(part, alias, joined, offsets, views)
+        if key is not None:
+            probe.append(key[0])
+            keys.append(key[1])
+            labels.append(part)
+        elif kind == 'INNER' and used == {alias}:
+            build = join_filter(build, {alias: RecordView(table.fields)}, [part])
+        else:
+            residual.append(part)
+
+    code = compile(' and '.join([f'({x})' for x in residual]) or 'True', '<condition>', 'eval')
+    subqueries = _ss.current().subqueries
+    left_empty = ('',) * width
+    right_empty = ('',) * len(table.fields)
+    matched = set()
+    count = 0
+    built = 0
+    returned = 0
+
+    # pairs - the rows probed and pairs of records compared since the statement was last checked
+    pairs = 0
+
+    # partitions - the SpillFiles the table's records and the joined records are partitioned to once the
+    #              memory budget can not hold the table's records, a join without keys only spills the table's
+    partitions = None
+    spilled = []
+
+    # Evaluates the parts of the condition that are not keys on a pair of records
+    def satisfies(result) -> bool:
+        if residual:
+            for view in views.values():
+                view._record = result
+            return eval(code, subqueries, views)
+        return True
+
+    with _pf.operator(f'{kind.lower()} {"hash" if keys else "nested loop"} join {alias}') as op, \
+            _mem.Reservation(f'join {alias}') as budget:
+        try:
+            # buckets - the table's records and their positions, keyed by the values of their key fields
+            # candidates - the table's records and their positions, when the join has no keys
+            # size - the estimated memory used by each record of the table
+            key_of = itemgetter(*keys) if keys else None
+            probe_of = itemgetter(*probe) if keys else None
+            buckets = {}
+            candidates = []
+            size = 0
+
+            for j, record in enumerate(build):
+                built += 1
+                if partitions is None and j % _so.SAMPLE_INTERVAL == 0:
+                    size = max(size, _so.record_size(record) + JOIN_ENTRY_SIZE)
+
+                # A record is only held once the memory for it is reserved, otherwise the records held are spilled,
+                # and every later record with them
+                if partitions is None and not budget.grow(built * size):
+                    partitions = ([_mem.SpillFile(_mem.spill_directory(), 'join') for _ in range(JOIN_PARTITIONS)],
+                                  [_mem.SpillFile(_mem.spill_directory(), 'join') for _ in range(JOIN_PARTITIONS)]) \
+                        if keys else ([_mem.SpillFile(_mem.spill_directory(), 'join')], [])
+                    spilled = partitions[0] + partitions[1]
+                    for key, entries in buckets.items():
+                        partitions[0][hash(key) % JOIN_PARTITIONS].write_all(entries)
+                    partitions[0][0].write_all(candidates)
+                    buckets = {}
+                    candidates = []
+                    budget.resize(0)
+                    logging.info(f'Join of {alias} spilled at {built} records to {len(partitions[0])} partitions')
+
+                if partitions is not None:
+                    partitions[0][hash(key_of(record)) % JOIN_PARTITIONS if keys else 0].write((j, record))
+                    continue
+
+                if keys:
+                    buckets.setdefault(key_of(record), []).append((j, record))
+                else:
+                    candidates.append((j, record))
+
+            if partitions is None:
+                budget.resize(built * size)
+
+                # The keys of the table's records filter the rows of the first table before they are converted
+                if filters is not None:
+                    for position, key, label in zip(probe, keys, labels):
+                        if position < len(filters[0]):
+                            with _pf.operator(f'bloom filter {alias}') as bloom_op:
+                                values = [x[key] for entries in buckets.values() for _, x in entries]
+                                filters[1].append(_bf.runtime_filter(filters[0][position], values, label))
+                                bloom_op.rows_in = len(values)
+
+                for record in records:
+                    count += 1
+                    found = False
+                    matches = buckets.get(probe_of(record), ()) if keys else candidates
+                    pairs += len(matches) + 1
+                    if pairs >= _cn.CHECK_INTERVAL:
+                        _cn.check(pairs)
+                        pairs = 0
+
+                    for j, match in matches:
+                        result = record + match
+                        if residual:
+                            for view in views.values():
+                                view._record = result
+                            if not eval(code, subqueries, views):
+                                continue
+                        found = True
+                        matched.add(j)
+                        returned += 1
+                        yield result
+
+                    # A left outer join keeps the records that match nothing, padded with empty values
+                    if kind == 'LEFT' and not found:
+                        returned += 1
+                        yield record + right_empty
+
+                # A right outer join keeps the table's records that matched nothing once every record is joined
+                if kind == 'RIGHT':
+                    for j, match in sorted([x for entries in buckets.values() for x in entries]) if keys \
+                            else candidates:
+                        if j not in matched:
+                            returned += 1
+                            yield left_empty + match
+
+            elif keys:
+                # Every record that can match a record of the table is in the partition of the same number
+                for record in records:
+                    count += 1
+                    partitions[1][hash(probe_of(record)) % JOIN_PARTITIONS].write(record)
+
+                for side, joining in zip(*partitions):
+                    # A partition is not partitioned again, so it is held even beyond the limits when it does not fit
+                    entries = list(side.read())
+                    budget.force(len(entries) * size)
+                    buckets = {}
+                    for j, match in entries:
+                        buckets.setdefault(key_of(match), []).append((j, match))
+
+                    for record in joining.read():
+                        found = False
+                        matches = buckets.get(probe_of(record), ())
+                        pairs += len(matches) + 1
+                        if pairs >= _cn.CHECK_INTERVAL:
+                            _cn.check(pairs)
+                            pairs = 0
+
+                        for j, match in matches:
+                            if satisfies(record + match):
+                                found = True
+                                matched.add(j)
+                                returned += 1
+                                yield record + match
+                        if kind == 'LEFT' and not found:
+                            returned += 1
+                            yield record + right_empty
+
+                    if kind == 'RIGHT':
+                        for j, match in sorted(entries):
+                            if j not in matched:
+                                returned += 1
+                                yield left_empty + match
+
+            else:
+                # The joined records are held a block at a time, and each block reads the table's records once
+                for block in record_blocks(records, budget):
+                    count += len(block)
+                    found = [False] * len(block)
+                    for j, match in partitions[0][0].read():
+                        pairs += len(block)
+                        if pairs >= _cn.CHECK_INTERVAL:
+                            _cn.check(pairs)
+                            pairs = 0
+
+                        for b, record in enumerate(block):
+                            if satisfies(record + match):
+                                found[b] = True
+                                matched.add(j)
+                                returned += 1
+                                yield record + match
+                    if kind == 'LEFT':
+                        for b, record in enumerate(block):
+                            if not found[b]:
+                                returned += 1
+                                yield record + right_empty
+
+                if kind == 'RIGHT':
+                    for j, match in partitions[0][0].read():
+                        if j not in matched:
+                            returned += 1
+                            yield left_empty + match
+        finally:
+            for spill in spilled:
+                spill.delete()
+            op.rows_in = count + built
+            op.rows_out = returned
+            op.bytes_written = sum([x.nbytes for x in spilled])
+            if op:
+                op.details['build rows'] = built
+                op.details['peak memory'] = budget.peak
+                if partitions is not None:
+                    op.details['spilled partitions'] = len(partitions[0])
+
+
+# METHOD:       record_blocks()
+# DESCRIPTION:  Divides records into blocks that each fit in the memory an operator can reserve
+# ARGUMENTS:    records - an iterable of the records
+#               budget - the Reservation of the operator, which holds the memory of a block until the next
+# RETURNS:      A generator of the lists of records of each block
+def record_blocks(records, budget: _mem.Reservation):
+    block = []
+    size = 0
+
+    for record in records:
+        if len(block) % _so.SAMPLE_INTERVAL == 0:
+            size = max(size, _so.record_size(record))
+
+        # A block holds at least one record, even when the memory for it can not be reserved
+        if len(block) > 0 and not budget.grow((len(block) + 1) * size):
+            yield block
+            block = []
+            budget.resize(0)
+        block.append(record)
+
+    if len(block) > 0:
+        yield block
+
+
+# METHOD:       join_key()
+# DESCRIPTION:  Finds whether a part of a join's condition is an equality between a field of the table
+#               being joined to and a field of a table already joined, such as E.id = S.eid
+# ARGUMENTS:    part - the part of the condition
+#               alias - the identifier of the table being joined to
+#               joined - the identifiers of the tables already joined
+#               offsets - the position of the first field of each table within the joined records
+#               views - the view of each table's fields within a joined record
+# RETURNS:      A tuple of the position of the field within the joined records and within the
+#               table's records, or None if the part is not such an equality
+def join_key(part: str, alias: str, joined: list[str], offsets: dict, views: dict):
+    tree = ast.parse(part, mode='eval').body
+    if not (isinstance(tree, ast.Compare) and len(tree.ops) == 1 and isinstance(tree.ops[0], ast.Eq)):
+        return None
+
+    sides = [tree.left, tree.comparators[0]]
+    if not all([isinstance(x, ast.Attribute) and isinstance(x.value, ast.Name) for x in sides]):
+        return None
+
+    # Both sides of the equality must be one of the tables already joined and the table being joined to
+    fields = {x.value.id: x.attr for x in sides}
+    other = next((x for x in fields if x != alias), None)
+    if alias not in fields or other not in joined:
+        return None
+
+    probe = views[other]._positions.get(fields[other])
+    build = views[alias]._positions.get(fields[alias])
+    if probe is None or build is None:
+        return None
+
+    return probe, build - offsets[alias]
+
+
+# METHOD:       split_conjuncts()
+# DESCRIPTION:  Splits a condition into the parts joined by 'and' at its top, each of which a record has to satisfy
+# ARGUMENTS:    condition - the condition formatted as a string to use for evaluation
+#               aliases - the identifiers of the tables the condition may refer to
+# RETURNS:      A list of tuples of each part and the set of table identifiers it refers to
+def split_conjuncts(condition: str, aliases: list[str]) -> list[tuple[str, set]]:
+    if not condition or condition == 'True':
+        return []
+
+    tree = ast.parse(condition, mode='eval').body
+    parts = tree.values if isinstance(tree, ast.BoolOp) and isinstance(tree.op, ast.And) else [tree]
+
+    return [(ast.unparse(x), {y.id for y in ast.walk(x) if isinstance(y, ast.Name) and y.id in aliases})
+            for x in parts]
+
+
+# METHOD:       join_filter()
+# DESCRIPTION:  Filters joined records one at a time as they are read
+# ARGUMENTS:    records - an iterable of the joined records
+#               views - the view of each table's fields within a joined record
+#               conditions - the parts of the condition the records have to satisfy
+# RETURNS:      A generator of the records that satisfy every part of the condition
+def join_filter(records, views: dict, conditions: list[str]):
+    code = compile(' and '.join([f'({x})' for x in conditions]) or 'True', '<condition>', 'eval')
+    subqueries = _ss.current().subqueries
+    count = 0
+    kept = 0
+
+    with _pf.operator('filter') as op:
+        try:
+            for record in records:
+                count += 1
+                for view in views.values():
+                    view._record = record
+                if eval(code, subqueries, views):
+                    kept += 1
+                    yield record
+        finally:
+            op.rows_in = count
+            op.rows_out = kept
+
+
 # METHOD:       find_max()
 # DESCRIPTION:  Performs a right outer join operation on two tables
 # ARGUMENTS:    table - The table to find the max from
 #               key - The field to find the max from
-# RETURNS:      N/A
+# RETURNS:      The maximum of the field, or None if the table has no records
 def find_max(table: Table, key: str):
-    nums = []
-
-    for record in table.records:
-        nums.append(record[key.strip('()')])
+    position = table.fields.index(key.strip('()'))
+    nums = [record[position] for record in table.records]
 
-    return max(nums)
+    return max(nums) if len(nums) > 0 else None
 
 
 # METHOD:       find_min()
 # DESCRIPTION:  Performs a right outer join operation on two tables
 # ARGUMENTS:    table - The table to find the min from
 #               key - The field to find the min from
-# RETURNS:      N/A
+# RETURNS:      The minimum of the field, or None if the table has no records
 def find_min(table: Table, key: str):
-    nums = []
+    position = table.fields.index(key.strip('()'))
+    nums = [record[position] for record in table.records]
 
-    for record in table.records:
-        nums.append(record[key.strip('()')])
+    return min(nums) if len(nums) > 0 else None
 
-    return min(nums)
 
+# METHOD:       find_sum()
+# DESCRIPTION:  Finds the sum of a field over every record of a table
+# ARGUMENTS:    table - The table to find the sum from
+#               key - The field to find the sum from
+# RETURNS:      The sum of the field
+def find_sum(table: Table, key: str):
+    position = table.fields.index(key.strip('()'))
 
-# METHOD:       find_min()
-# DESCRIPTION:  Performs a right outer join operation on two tables
-# ARGUMENTS:    table - The table to find the min from
-#               key - The field to find the min from
-# RETURNS:      N/A
-def find_avg(table: Table, key: str):
-    nums = []
+    return sum([record[position] for record in table.records])
 
-    for record in table.records:
-        nums.append(record[key.strip('()')])
 
-    return sum(nums) / len(nums)
+# METHOD:       find_avg()
+# DESCRIPTION:  Finds the average of a field over every record of a table
+# ARGUMENTS:    table - The table to find the average from
+#               key - The field to find the average from
+# RETURNS:      The average of the field, or None if the table has no records
+def find_avg(table: Table, key: str):
+    position = table.fields.index(key.strip('()'))
+    nums = [record[position] for record in table.records]
+
+    return sum(nums) / len(nums) if len(nums) > 0 else None
+
+
+# METHOD:       aggregate_table()
+# DESCRIPTION:  Computes an aggregate function over every record of a table
+# ARGUMENTS:    table - The table to aggregate
+#               function - The name of the aggregate function
+#               key - The argument of the aggregate function, such as '(*)' or '(Size)'
+# RETURNS:      The result of the aggregate function
+def aggregate_table(table: Table, function: str, key: str):
+    with _pf.operator('aggregate') as op:
+        match function:
+            case 'COUNT':
+                result = len(table.records)
+            case 'SUM':
+                result = find_sum(table, key)
+            case 'MAX':
+                result = find_max(table, key)
+            case 'MIN':
+                result = find_min(table, key)
+            case _:
+                result = find_avg(table, key)
+        op.rows_in = len(table.records)
+        op.rows_out = 1
+
+    return result
 
 # endregion
 
@@ -418,7 +1558,8 @@ def find_avg(table: Table, key: str):
 # RETURNS:      The values() object as a string
 def generate_record_string(values):
     # Use a regular expression to generate a list of strings from the values() object
-    data = re.findall(r'\d+(?:\.\d+)?|(?!\')[\w\d]*(?=\')', values)
+    # A negative number keeps its sign
+    data = re.findall(r'-?\d+(?:\.\d+)?|(?!\')[\w\d]*(?=\')', values)
 
     # Joins the records together into a string
     values_str = '|'.join(data)
@@ -441,24 +1582,138 @@ def add_record(arguments):
     if not _db.validate_table(table_name):
         print(f'!Failed to insert record because table {table_name} does not exist.')
         return
+    if _mv.is_view(_db.tbl_path(table_name)):
+        print(f'!Failed to insert record because {table_name} is a materialized view.')
+        return
 
     # values_str - the values() object as a string
     # table_path - the path of the table in the database's folder
     values_str = generate_record_string(values)
     table_path = _db.tbl_path(table_name)
 
-    # Appends the new record to the end of the table file
-    _fs.write_line(values_str, table_path)
+    # A record inserted into a partitioned table is appended to the partition its key belongs in
+    scheme = _cat.scheme(table_path)
+    if scheme is not None:
+        try:
+            key = CONVERTERS[scheme.key_type](values_str.split('|')[scheme.position])
+        except (ValueError, IndexError):
+            key = None
+
+        partition = _pt.route(scheme, key)
+        if partition is None:
+            print(f'!Failed to insert record because no partition of {table_name} accepts it.')
+            return
+
+        table_path = _pt.partition_path(table_path, partition)
+
+    # Appends the new record to the end of the table file and adds its location to the index
+    # A batch of inserts holds the record until the batch is written, unless the table has views to maintain
+    dependents = _mv.dependents(_db.tbl_path(table_name))
+    insert_batch = _ss.current().insert_batch
+    if insert_batch is not None and len(dependents) < 1:
+        insert_batch.setdefault(table_path, []).append(values_str)
+    else:
+        append_line(table_path, values_str)
 
     # Print a success message
     print('1 new record inserted.')
 
+    # The record is parsed with the table's metadata to maintain the views of the table
+    if len(dependents) > 0:
+        table = Table(None)
+        table.parse_lines([table_meta(table_name), values_str])
+        maintain_views(_db.tbl_path(table_name), [], table.records)
+
+
+# METHOD:       append_line()
+# DESCRIPTION:  Appends a record's string representation to the end of a table file
+#               and adds its location to the table's row offset index
+# ARGUMENTS:    path - the path of the table file
+#               line - the record's string representation
+# RETURNS:      N/A
+def append_line(path: str, line: str):
+    # The row of an altered table holds an empty value for each field dropped since the table was rewritten
+    # The Bloom filters hold the values of the table's fields, so they are added from the record as it was given
+    layout = _cat.layout(path)
+    row = line
+    if layout is not None:
+        line = layout.encode(line)
+
+    offset = os.path.getsize(path)
+    _fs.write_line(line, path)
+    _ch.bump(path)
+    _sto.append_index(path, offset, len(line.encode()))
+    _bf.append_rows(path, [row], offset)
+
+
+# METHOD:       append_lines()
+# DESCRIPTION:  Appends the string representations of several records to the end of a table file
+#               with a single write and adds their locations to the table's row offset index
+# ARGUMENTS:    path - the path of the table file
+#               lines - the records' string representations
+# RETURNS:      N/A
+def append_lines(path: str, lines: list[str]):
+    layout = _cat.layout(path)
+    rows = lines
+    if layout is not None:
+        lines = [layout.encode(x) for x in lines]
+
+    offset = os.path.getsize(path)
+    size = offset
+    entries = []
+
+    for line in lines:
+        length = len(line.encode())
+        entries.append((offset, length))
+        offset += length + 1
+
+    with open(path, 'a') as f:
+        f.write(''.join([f'{x}\n' for x in lines]))
+
+    _ch.bump(path)
+    _sto.append_indexes(path, entries)
+    _bf.append_rows(path, rows, size)
+
+
+# METHOD:       batched_inserts()
+# DESCRIPTION:  Holds the records inserted by a run of INSERT statements and appends the records
+#               of each table file together once the run is finished
+# ARGUMENTS:    N/A
+# RETURNS:      A context manager the INSERT statements of the batch are executed in
+@contextlib.contextmanager
+def batched_inserts():
+    session = _ss.current()
+    session.insert_batch = {}
+
+    try:
+        yield
+    finally:
+        batch, session.insert_batch = session.insert_batch, None
+        for path, lines in batch.items():
+            append_lines(path, lines)
+
 
 # METHOD:       select_records()
 # DESCRIPTION:  Selects fields from a record that satisfy a condition
 # ARGUMENTS:    arguments - the arguments passed down to the method
 # RETURNS:      N/A
 def select_records(arguments):
+    # The result cache answers the statement when none of its tables have changed since it was cached
+    # The hash sets of the statement's subqueries are only kept until the statement is finished
+    try:
+        if _ch.enabled:
+            select_cached(arguments)
+        else:
+            perform_select(arguments)
+    finally:
+        _ss.current().subqueries.clear()
+
+
+# METHOD:       perform_select()
+# DESCRIPTION:  Performs a selection of fields from records that satisfy a condition
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      N/A
+def perform_select(arguments):
     # fields - the fields to select from the table/tables
     # from_data - the arguments that come after the 'FROM' keyword
     # table_data - the string containing table names and identifiers
@@ -466,27 +1721,99 @@ def select_records(arguments):
     # table_names - the identifiers of the tables used to create the condition
     # condition_data - the arguments that come after the 'WHERE' or 'ON' keyword
     # condition - the condition formatted as a string to use for evaluation
+    # limit - the most records to print, or None to print every record
+    # offset - the number of records to skip before printing
+    # order - the fields listed after 'ORDER BY' and whether each is sorted in descending order
+    # group - the fields listed after 'GROUP BY'
+    arguments, limit, offset = limit_clause(arguments)
+    arguments, order = order_clause(arguments)
+    arguments, group = group_clause(arguments)
+
+    # The values are checked before any subquery is executed
+    # A negative value keeps its sign, and a value followed by any other argument is not a whole number either
+    if not all([x is None or x.isdecimal() for x in (limit, offset)]):
+        print('!Failed because LIMIT and OFFSET must be whole numbers.')
+        return
+
     fields = combine_arguments_between(None, 'FROM', arguments)
-    from_data = combine_arguments_between('FROM', 'WHERE' if 'WHERE' in arguments else 'ON', arguments)
-    table_data = [x for x in from_data if x not in _gl.KEYWORDS]
+    table_data = selected_tables(arguments)
     tables = table_data[::2]
     table_names = table_data[1::2]
     condition_data = combine_arguments_between('WHERE' if 'WHERE' in arguments else 'ON', None, arguments)
     condition = format_condition(condition_data) if 'WHERE' in arguments or 'ON' in arguments else 'True'
 
+    # Each subquery of the condition is executed once, before any record is selected
+    subquery = 'WHERE' in arguments and any([_ut.SUBQUERY.match(x) for x in condition_data])
+    if subquery:
+        condition_data = resolve_subqueries(condition_data, join_clauses(arguments))
+        if condition_data is None:
+            return
+        condition = format_subquery_condition(condition_data)
+
     # Checks the arguments to see if there are an invalid number of tables and table identifiers
-    if len(tables) > 1 and len(tables) != len(table_names) or len(tables) > 2:
+    if len(tables) > 1 and len(tables) != len(table_names):
         logging.error('ERROR: Invalid number of arguments provided after FROM')
 
+    # aggregate - the aggregate function being selected, if any
+    # grouped - whether the records are grouped by a hash aggregation, which is used for GROUP BY,
+    # SELECT DISTINCT and any selection of aggregates other than a single aggregate function of a field
+    aggregate = next((x for x in fields if x in AGGREGATES), None)
+    grouped = len(group) > 0 or 'DISTINCT' in fields \
+        or aggregate is not None and (len(fields) != 2 or SINGLE_AGGREGATE.fullmatch(fields[1]) is None)
+
+    # streamed - whether the selected records are read one at a time, so that a sort only holds the
+    # records it needs and a LIMIT stops reading the table once enough records have been printed
+    limit = int(limit) if limit is not None else None
+    offset = int(offset) if offset is not None else 0
+    streamed = grouped or len(order) > 0 or limit is not None or offset > 0
+
+    # The columnar mode handles selections from a single table whenever it can vectorize the condition
+    # Partitioned, compressed and altered tables are not read by the columnar mode, so they are left to the record path
+    # Sorted and limited selections are left to the record path, which streams the selected records
+    if _cl.enabled and len(tables) == 1 and not streamed and not subquery and 'JOIN' not in arguments \
+            and _db.validate_table(tables[0]) \
+            and _cat.scheme(_db.tbl_path(tables[0])) is None and _cat.layout(_db.tbl_path(tables[0])) is None \
+            and _cmp.read_segment(_db.tbl_path(tables[0]), header_only=True) is None:
+        if select_columnar(tables[0], fields, condition, aggregate):
+            return
+
     # Initialize a blank table
+    # records - the records of a streamed selection, which are read one at a time
+    # offsets - the position of the first field of each table identifier within the selected records
     selected_table = Table(None)
+    records = None
+    offsets = {}
+
+    # kind - how two tables are joined, or None if they are not
+    # spilled - whether the memory budget can not hold the records of the selected tables, which are then read
+    # one at a time, and joined by the pipeline whose joins spill to disk
+    kind = 'INNER' if 'INNER' in arguments or 'WHERE' in arguments else \
+        'RIGHT' if 'OUTER' in arguments and 'RIGHT' in arguments else \
+        'LEFT' if 'OUTER' in arguments and 'LEFT' in arguments else None
+    spilled = len(tables) <= 2 and all([_db.validate_table(x) for x in tables]) \
+        and not _mem.fits(sum([table_size(x) for x in tables]))
+    streamed = streamed or spilled and len(tables) == 1
+
+    missing = next((x for x in tables if not _db.validate_table(x)), None)
+    if missing is not None:
+        print(f'!Failed because {missing} does not exist')
+        return
 
     # Check the arguments to see what operations are being done on the table/tables
-    if 'JOIN' in arguments or len(tables) > 1:
+    # More than two tables are joined by a pipeline whose joined records are read one at a time
+    if len(tables) > 2 or len(tables) == 2 and spilled and kind is not None:
+        where = condition if 'WHERE' in arguments else 'True'
+        selected_table, records, offsets = join_tables(join_clauses(arguments), where)
+        condition = 'True'
+        if aggregate is not None and not grouped:
+            selected_table.records = list(records)
+        else:
+            streamed = True
+    elif 'JOIN' in arguments or len(tables) > 1:
         # If we are performing a join, then set up the tables and identifiers as a tuple to
         # pass as an argument to the join methods
-        table_tup1 = (table_names[0], retrieve_table(tables[0], False))
-        table_tup2 = (table_names[1], retrieve_table(tables[1], False))
+        table_tup1, table_tup2 = retrieve_joined(tables[:2], table_names[:2], kind, condition)
+        offsets = {table_names[0]: 0, table_names[1]: len(table_tup1[1].fields)}
         if 'INNER' in arguments or 'WHERE' in arguments:
             selected_table = inner_join(table_tup1, table_tup2, condition)
         elif 'OUTER' in arguments:
@@ -497,41 +1824,625 @@ def select_records(arguments):
         # If the condition was used for the join, set the condition to evaluate as true
         condition = 'True'
     # If there is only one table, select from that table
+    # Partitions that can not hold records satisfying the condition are not read
+    elif len(tables) == 1 and streamed and (aggregate is None or grouped):
+        selected_table, records = stream_table(tables[0], condition)
     elif len(tables) == 1:
-        selected_table = retrieve_table(tables[0], False)
+        selected_table = retrieve_table(tables[0], False, condition)
 
-    # In the case that we are just getting the count, max,
+    # In the case that we are just getting the count, sum, max,
     # min or average, get those instead of the table's record
-    if 'COUNT' in fields:
-        print(''.join(fields))
-        print(len(selected_table.records))
+    # Only the records that satisfy the condition are aggregated
+    if grouped:
+        select_grouped(selected_table, selected_table.records if records is None else records,
+                       fields, condition, group, order, offsets, limit, offset)
         return
-    if 'MAX' in fields:
-        print(''.join(fields))
-        print(find_max(selected_table, fields[1]))
-        return
-    if 'MIN' in fields:
-        print(''.join(fields))
-        print(find_min(selected_table, fields[1]))
-        return
-    if 'AVG' in fields:
-        print(''.join(fields))
-        print(find_avg(selected_table, fields[1]))
+    if aggregate is not None:
+        if condition != 'True':
+            selected_table = filter_table(selected_table, selected_table.fields, condition)
+        print_aggregate(fields, aggregate_table(selected_table, aggregate, fields[1]))
         return
 
     # If the wildcard is used, then print all fields
     if '*' in fields:
         fields = selected_table.fields
 
+    # Fields prefixed by a table identifier are found by the offsets of the tables, as a streamed selection does
+    if streamed or any(['.' in x for x in fields]):
+        select_streamed(selected_table, selected_table.records if records is None else records,
+                        fields, condition, order, offsets, limit, offset)
+        return
+
     # Filter the table to only show the fields we want
     selected_table = filter_table(selected_table, fields, condition)
 
-    # Print the new table's schema
-    print(selected_table.schema)
+    print_records(selected_table.schema, selected_table.records)
+
+
+# METHOD:       selected_tables()
+# DESCRIPTION:  Finds the table names and identifiers listed after the 'FROM' keyword
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      A list alternating between the name and the identifier of each table
+def selected_tables(arguments) -> list[str]:
+    return [x for step in join_clauses(arguments) for x in step[:2]]
+
+
+# METHOD:       join_clauses()
+# DESCRIPTION:  Finds the tables listed after the 'FROM' keyword along with how each is joined, such as
+#               FROM Sales S INNER JOIN Employee E ON S.eid = E.id LEFT OUTER JOIN Region R ON E.rid = R.id
+#               or FROM Sales S, Employee E, Region R
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      A list of the (name, identifier, kind, condition) of each table, where the kind is 'INNER',
+#               'LEFT' or 'RIGHT' and the condition is the formatted ON condition the table is joined by
+def join_clauses(arguments) -> list[tuple[str, str, str, str]]:
+    arguments = group_clause(order_clause(limit_clause(arguments)[0])[0])[0]
+    from_data = combine_arguments_between('FROM', 'WHERE', arguments)
+
+    # kind - the kind of join given for the next table listed
+    # The ON condition of a join lasts until the next join begins
+    steps = []
+    kind = 'INNER'
+    index = 0
+    while index < len(from_data):
+        word = from_data[index]
+        if word in ('LEFT', 'RIGHT'):
+            kind = word
+        elif word == ',':
+            kind = 'INNER'
+        elif word == 'ON':
+            end = next((i for i in range(index + 1, len(from_data)) if from_data[i] in JOIN_KEYWORDS + (',',)),
+                       len(from_data))
+            if len(steps) > 0:
+                steps[-1] = steps[-1][:3] + (format_condition(from_data[index + 1:end]) or 'True',)
+            index = end
+            continue
+        elif word not in _gl.KEYWORDS:
+            # A table without an identifier is referred to by its name
+            # The tables listed with commas are kept apart by them, so a table is never taken for an identifier
+            alias = from_data[index + 1] if index + 1 < len(from_data) \
+                and from_data[index + 1] not in _gl.KEYWORDS + [','] else word
+            steps.append((word, alias, kind, 'True'))
+            kind = 'INNER'
+            index += 2 if alias is not word else 1
+            continue
+        index += 1
+
+    return steps
+
+
+# METHOD:       limit_clause()
+# DESCRIPTION:  Separates the 'LIMIT' and 'OFFSET' clauses from the end of a statement's arguments
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      A tuple of the arguments before the clauses, the limit and the offset,
+#               where the limit and offset are None if they are not given
+def limit_clause(arguments):
+    if not isinstance(arguments, list):
+        return arguments, None, None
+
+    # end - the position of the first argument after the statement's other clauses
+    end = len(arguments)
+    limit = None
+    offset = None
+
+    # The clauses are read from the end of the statement, so the OFFSET may come before or after the LIMIT
+    for keyword in reversed([x for x in arguments if x in ('LIMIT', 'OFFSET')]):
+        index = arguments.index(keyword)
+        value = ' '.join(arguments[index + 1:end])
+        if keyword == 'LIMIT':
+            limit = value
+        else:
+            offset = value
+        end = index
+
+    return arguments[:end], limit, offset
+
+
+# METHOD:       order_clause()
+# DESCRIPTION:  Separates the 'ORDER BY' clause from the end of a statement's arguments
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      A tuple of the arguments before the clause and a list of tuples holding each
+#               field to sort by and whether it is sorted in descending order
+def order_clause(arguments):
+    if not isinstance(arguments, list) or 'ORDER' not in arguments:
+        return arguments, []
+
+    index = arguments.index('ORDER')
+    if arguments[index + 1:index + 2] != ['BY']:
+        return arguments, []
+
+    # The commas between the fields are removed when the statement is split,
+    # so the direction of a field is the keyword that follows it, if any
+    # An aggregate such as COUNT(*) is split into the function and its parentheses, which are joined again
+    order = []
+    for x in arguments[index + 2:]:
+        if x in ('ASC', 'DESC') and len(order) > 0:
+            order[-1] = (order[-1][0], x == 'DESC')
+        elif x.startswith('(') and len(order) > 0:
+            order[-1] = (order[-1][0] + x, order[-1][1])
+        else:
+            order.append((x, False))
+
+    return arguments[:index], order
+
+
+# METHOD:       group_clause()
+# DESCRIPTION:  Separates the 'GROUP BY' clause from the end of a statement's arguments
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      A tuple of the arguments before the clause and a list of the fields to group by
+def group_clause(arguments):
+    if not isinstance(arguments, list) or 'GROUP' not in arguments:
+        return arguments, []
+
+    index = arguments.index('GROUP')
+    if arguments[index + 1:index + 2] != ['BY']:
+        return arguments, []
+
+    return arguments[:index], arguments[index + 2:]
+
+
+# METHOD:       field_position()
+# DESCRIPTION:  Finds the position of a field within the records of a table
+#               A field prefixed by the identifier of a joined table is looked up among that table's fields
+# ARGUMENTS:    table - the table holding the fields of the records
+#               name - the name of the field, which may be prefixed by a table identifier
+#               offsets - the position of the first field of each table identifier, for joined tables
+# RETURNS:      The position of the field, or None if the table has no such field
+def field_position(table: Table, name: str, offsets: dict = None):
+    if name in table.fields:
+        return table.fields.index(name)
+
+    identifier, _, field = name.rpartition('.')
+    start = (offsets or {}).get(identifier, 0)
+
+    return table.fields.index(field, start) if field in table.fields[start:] else None
+
+
+# METHOD:       select_grouped()
+# DESCRIPTION:  Prints the groups of the records that satisfy a condition along with the aggregates
+#               selected for each group, using a hash aggregation that spills to the database directory
+#               when the groups do not fit in its memory limit. SELECT DISTINCT groups the records by
+#               every selected field.
+# ARGUMENTS:    table - the table holding the fields and schema of the records
+#               records - an iterable of the records to select from
+#               fields - the arguments between SELECT and FROM
+#               condition - the condition formatted as a string to use for evaluation
+#               group - the fields listed after 'GROUP BY'
+#               order - the fields to sort the groups by and whether each is sorted in descending order
+#               offsets - the position of the first field of each table identifier, for joined tables
+#               limit - the most groups to print, or None to print every group
+#               offset - the number of groups to skip before printing
+# RETURNS:      N/A
+def select_grouped(table: Table, records, fields: list[str], condition: str, group: list[str],
+                   order: list[tuple[str, bool]], offsets: dict, limit: int, offset: int):
+    distinct = 'DISTINCT' in fields
+    columns = _ag.parse_columns(' '.join([x for x in fields if x != 'DISTINCT']))
+    if columns is None:
+        return
+
+    # The wildcard selects every field of the records
+    if any([x.argument == '*' and not x.function for x in columns]):
+        columns = [_ag.Column('', x, name=x) for x in table.fields]
+
+    # positions - the position of the field of each column within the records, None for COUNT(*)
+    positions = []
+    for column in columns:
+        position = None if column.argument == '*' else field_position(table, column.argument, offsets)
+        if position is None and column.argument != '*':
+            print(f'!Failed because the field {column.argument} does not exist.')
+            return
+        positions.append(position)
+
+    # grouping - the position of each field the records are grouped by
+    # SELECT DISTINCT without GROUP BY groups the records by the selected fields
+    grouping = [field_position(table, x, offsets) for x in group]
+    if None in grouping:
+        print(f'!Failed because the field {group[grouping.index(None)]} does not exist.')
+        return
+    if distinct and len(group) < 1:
+        grouping = [x for x, column in zip(positions, columns) if not column.function]
+
+    if any([x not in grouping for x, column in zip(positions, columns) if not column.function]):
+        print('!Failed because each field selected with an aggregate must be listed in GROUP BY.')
+        return
 
-    # Print the new table's records
-    for record in format_records(selected_table.records):
-        print(record)
+    # aggregates - the (function, position, distinct) of each aggregate column
+    # output - the position of each column within the records returned by the aggregation
+    aggregates = [(x.function, position, x.distinct) for x, position in zip(columns, positions) if x.function]
+    output = []
+    index = len(grouping)
+    for column, position in zip(columns, positions):
+        if column.function:
+            output.append(index)
+            index += 1
+        else:
+            output.append(grouping.index(position))
+
+    if condition != 'True':
+        records = filter_records(table.fields, records, condition)
+
+    records = _ag.hash_aggregate(records, grouping, aggregates,
+                                 _fs.rpath(_gl.DATABASES_DIRECTORY, _ss.current().active_db),
+                                 len(group) < 1 and not distinct)
+
+    # The groups are selected from, sorted and limited as the records of a table of their own
+    # A field keeps its type in the schema, under its alias or its name without a table identifier
+    schema = table.schema.split('|')
+    grouped_table = Table(None)
+    grouped_table.fields = [x.name if x.function else x.name.rpartition('.')[2] for x in columns]
+    grouped_table.schema = '|'.join([name if column.function else ' '.join([name] + schema[position].split()[1:])
+                                     for name, column, position in zip(grouped_table.fields, columns, positions)])
+    # An aggregate without a value, such as the AVG of no records, is empty like any other missing value
+    records = (tuple([record[x] if record[x] is not None else '' for x in output]) for record in records)
+
+    select_streamed(grouped_table, records, grouped_table.fields, 'True', order, {}, limit, offset)
+
+
+# METHOD:       select_streamed()
+# DESCRIPTION:  Prints the fields of the records that satisfy a condition, sorted by the 'ORDER BY' fields
+#               and limited by the 'LIMIT' and 'OFFSET' clauses. Records that do not fit in the sort's
+#               memory limit are spilled to the database directory, and a limited selection stops
+#               reading its records once it has printed enough of them.
+# ARGUMENTS:    table - the table holding the fields and schema of the records
+#               records - an iterable of the records to select from
+#               fields - the fields to select
+#               condition - the condition formatted as a string to use for evaluation
+#               order - the fields to sort by and whether each is sorted in descending order
+#               offsets - the position of the first field of each table identifier, for joined tables
+#               limit - the most records to print, or None to print every record
+#               offset - the number of records to skip before printing
+# RETURNS:      N/A
+def select_streamed(table: Table, records, fields: list[str], condition: str, order: list[tuple[str, bool]],
+                    offsets: dict = None, limit: int = None, offset: int = 0):
+    # positions - the position of each field to sort by within the records
+    # A field prefixed by the identifier of a joined table is looked up among that table's fields
+    positions = [field_position(table, name, offsets) for name, _ in order]
+    if None in positions:
+        print(f'!Failed because the field {order[positions.index(None)][0]} does not exist.')
+        return
+
+    # selected - the position of each of the selected fields within the records
+    selected = list(range(len(table.fields))) if fields == table.fields \
+        else [field_position(table, x, offsets) for x in fields]
+    if None in selected:
+        print(f'!Failed because the field {fields[selected.index(None)]} does not exist.')
+        return
+    schema = table.schema.split('|')
+
+    if condition != 'True':
+        records = filter_records(table.fields, records, condition)
+
+    # end - the number of records that are read, which a sort only has to keep the first of
+    end = offset + limit if limit is not None else None
+
+    if len(order) > 0:
+        records = _so.sort_records(records, positions, [x[1] for x in order],
+                                   _fs.rpath(_gl.DATABASES_DIRECTORY, _ss.current().active_db), end)
+
+    if end is not None or offset > 0:
+        records = itertools.islice(records, offset, end)
+
+    # The selected fields are taken from each record as it leaves the sort
+    if selected != list(range(len(table.fields))):
+        records = (tuple([record[x] for x in selected]) for record in records)
+
+    print_records('|'.join([schema[x] for x in selected]), records)
+
+
+# METHOD:       resolve_subqueries()
+# DESCRIPTION:  Executes the subqueries of a condition, such as pid IN (SELECT pid FROM Supply) or
+#               NOT EXISTS (SELECT * FROM Supply S WHERE S.pid = P.pid), before any record is selected.
+#               The values found by each subquery are held in a hash set that each record is looked up in,
+#               so the records are semi-joined or anti-joined to the subquery instead of executing it per record.
+# ARGUMENTS:    condition_data - the arguments of the condition
+#               steps - the (name, identifier, kind, condition) of each table the condition is evaluated on
+# RETURNS:      The arguments of the condition with each subquery replaced by a lookup of its hash set,
+#               or None if a subquery could not be executed
+def resolve_subqueries(condition_data: list[str], steps: list[tuple[str, str, str, str]]):
+    # resolved - the arguments of the condition, where a subquery replaces the arguments it follows
+    resolved = []
+    for word in condition_data:
+        if not _ut.SUBQUERY.match(word):
+            resolved.append(word)
+            continue
+
+        kind = resolved.pop().upper() if len(resolved) > 0 and resolved[-1].upper() in ('IN', 'EXISTS') else None
+        negated = len(resolved) > 0 and resolved[-1].upper() == 'NOT'
+        if negated:
+            resolved.pop()
+        operand = resolved.pop() if kind == 'IN' and len(resolved) > 0 else None
+
+        if kind is None or kind == 'IN' and operand is None:
+            print('!Failed because a subquery has to follow IN, NOT IN, EXISTS or NOT EXISTS.')
+            return None
+
+        lookup = execute_subquery(word, kind, negated, operand, steps)
+        if lookup is None:
+            return None
+        resolved.append(lookup)
+
+    return resolved
+
+
+# METHOD:       format_subquery_condition()
+# DESCRIPTION:  Formats the arguments of a condition whose subqueries have been resolved, which may have
+#               become a single lookup or the result of an EXISTS
+# ARGUMENTS:    condition_data - the arguments of the condition
+# RETURNS:      A condition formatted as a string to be evaluated
+def format_subquery_condition(condition_data: list[str]) -> str:
+    return format_condition(condition_data) or ' '.join(condition_data) or 'True'
+
+
+# METHOD:       execute_subquery()
+# DESCRIPTION:  Executes a subquery once and builds the hash set of its values. A subquery that refers to
+#               the outer query is decorrelated: each equality between one of its fields and an expression of
+#               the outer query adds that field to the values of the hash set, and the expression to the
+#               values each record of the outer query looks up, which turns it into a hash semi-join or
+#               anti-join. An uncorrelated EXISTS only reads the subquery until its first record.
+# ARGUMENTS:    text - the subquery, including its parentheses
+#               kind - 'IN' or 'EXISTS'
+#               negated - whether the subquery follows NOT IN or NOT EXISTS
+#               operand - the expression before IN, or None for EXISTS
+#               steps - the (name, identifier, kind, condition) of each table of the outer query
+# RETURNS:      The expression the outer query evaluates for each record, or None if the subquery is invalid
+def execute_subquery(text: str, kind: str, negated: bool, operand: str, steps: list[tuple[str, str, str, str]]):
+    arguments = _ut.split_statement(text[1:-1])[1:]
+    fields = combine_arguments_between(None, 'FROM', arguments)
+    inner = join_clauses(arguments) if 'FROM' in arguments else []
+
+    if len(inner) < 1:
+        print('!Failed because a subquery has to select from a table.')
+        return None
+    missing = next((x[0] for x in inner + steps if not _db.validate_table(x[0])), None)
+    if missing is not None:
+        print(f'!Failed because {missing} does not exist')
+        return None
+    if kind == 'IN' and (len(fields) != 1 or fields[0] == '*'):
+        print('!Failed because a subquery after IN has to select a single field.')
+        return None
+
+    # Any subquery of the subquery's own condition is executed first
+    condition_data = combine_arguments_between('WHERE', None, arguments) if 'WHERE' in arguments else []
+    if any([_ut.SUBQUERY.match(x) for x in condition_data]):
+        condition_data = resolve_subqueries(condition_data, inner)
+        if condition_data is None:
+            return None
+
+    # headers - the metadata of each table of the subquery and the outer query
+    # inner_fields - the fields of the subquery's tables
+    # outer_names - the identifiers and fields of the outer query that the subquery does not hide
+    # A field of the outer query can only be referred to without its identifier when it selects from one table
+    headers = {}
+    for name, _, _, _ in inner + steps:
+        headers[name] = Table(None)
+        headers[name].parse_lines([table_meta(name)])
+    inner_aliases = [x[1] for x in inner]
+    inner_fields = [x for name, _, _, _ in inner for x in headers[name].fields]
+    outer_names = {x[1] for x in steps} - set(inner_aliases)
+    if len(steps) == 1:
+        outer_names |= set(headers[steps[0][0]].fields) - set(inner_fields) - set(inner_aliases)
+
+    # correlated - the field of the subquery and the expression of the outer query of each equality between them
+    # local - the parts of the condition that only refer to the subquery
+    correlated = []
+    local = []
+    for part, used in split_conjuncts(format_subquery_condition(condition_data), list(outer_names)):
+        if len(used) < 1:
+            local.append(part)
+            continue
+
+        tree = ast.parse(part, mode='eval').body
+        sides = [tree.left, tree.comparators[0]] if isinstance(tree, ast.Compare) and len(tree.ops) == 1 \
+            and isinstance(tree.ops[0], ast.Eq) else []
+        outer = [x for x in sides if any([isinstance(y, ast.Name) and y.id in outer_names for y in ast.walk(x)])]
+        if len(sides) < 1 or len(outer) != 1:
+            print('!Failed because a subquery can only refer to the outer query by equalities, such as S.pid = P.pid.')
+            return None
+        correlated.append((ast.unparse(sides[1] if outer[0] is sides[0] else sides[0]), ast.unparse(outer[0])))
+
+    # The subquery's records are read one at a time, and a single table is read without its identifier
+    where = ' and '.join([f'({x})' for x in local]) or 'True'
+    if len(inner) == 1:
+        header, records = stream_table(inner[0][0], unqualify(where, inner[0][1]))
+        records = filter_records(header.fields, records, unqualify(where, inner[0][1]))
+        offsets = {}
+    else:
+        header, records, offsets = join_tables(inner, where)
+
+    # positions - the positions of the fields of the subquery's records that are held in the hash set
+    # lookups - the expression of the outer query looked up for each of the positions
+    selected = [(fields[0], operand)] if kind == 'IN' else []
+    positions = [field_position(header, x, offsets) for x, _ in selected + correlated]
+    lookups = [unqualify(x, steps[0][1]) if len(steps) == 1 else x for _, x in selected + correlated]
+    if None in positions:
+        name = [x for x, _ in selected + correlated][positions.index(None)]
+        print(f'!Failed because {name} is not a field of the subquery.')
+        return None
+
+    # An uncorrelated EXISTS is true as soon as the subquery finds a record
+    if len(positions) < 1:
+        with _pf.operator('exists') as op:
+            found = next(iter(records), None) is not None
+            op.rows_out = int(found)
+        return str(found != negated)
+
+    key = itemgetter(*positions)
+    values = set()
+    count = 0
+
+    with _pf.operator(f'hash {"anti" if negated else "semi"} join build') as op:
+        for record in records:
+            count += 1
+            values.add(key(record))
+        op.rows_in = count
+        op.rows_out = len(values)
+
+    subqueries = _ss.current().subqueries
+    name = f'__subquery_{len(subqueries)}'
+    subqueries[name] = values
+    lookup = lookups[0] if len(lookups) == 1 else f'({", ".join(lookups)})'
+
+    return f'({lookup} {"not in" if negated else "in"} {name})'
+
+
+# METHOD:       unqualify()
+# DESCRIPTION:  Removes a table identifier from the fields of an expression, such as P.pid = 1 becoming pid = 1,
+#               so the expression can be evaluated on the records of a single table
+# ARGUMENTS:    expression - the expression formatted as a string to use for evaluation
+#               identifier - the table identifier
+# RETURNS:      The expression without the identifier
+def unqualify(expression: str, identifier: str) -> str:
+    tree = ast.parse(expression, mode='eval')
+
+    for node in ast.walk(tree):
+        for name, value in ast.iter_fields(node):
+            children = value if isinstance(value, list) else [value]
+            children = [ast.Name(x.attr) if isinstance(x, ast.Attribute) and isinstance(x.value, ast.Name)
+                        and x.value.id == identifier else x for x in children]
+            setattr(node, name, children if isinstance(value, list) else children[0])
+
+    return ast.unparse(tree)
+
+
+# METHOD:       subquery_tables()
+# DESCRIPTION:  Finds the tables read by the subqueries of a statement, including their own subqueries
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      A list of the names of the tables
+def subquery_tables(arguments) -> list[str]:
+    names = []
+
+    for word in arguments if isinstance(arguments, list) else []:
+        if _ut.SUBQUERY.match(word):
+            inner = _ut.split_statement(word[1:-1])[1:]
+            names.extend(selected_tables(inner)[::2] + subquery_tables(inner))
+
+    return names
+
+
+# METHOD:       select_cached()
+# DESCRIPTION:  Prints the cached output of a selection, or performs the selection and caches its output
+# ARGUMENTS:    arguments - the arguments passed down to select_records()
+# RETURNS:      N/A
+def select_cached(arguments):
+    if _ss.current().active_db is None:
+        perform_select(arguments)
+        return
+
+    # paths - the files of every table read by the selection, including every partition of a partitioned table
+    paths = []
+    for name in selected_tables(arguments)[::2] + subquery_tables(arguments):
+        path = _db.tbl_path(name)
+        scheme = _cat.scheme(path)
+        paths.append(path)
+        if scheme is not None:
+            paths.extend([_pt.partition_path(path, x) for x in scheme.names])
+
+    key = _ch.cache_key(' '.join(arguments) if isinstance(arguments, list) else arguments, paths)
+    result = _ch.lookup(key)
+
+    if result is not None:
+        with _pf.operator('cache hit') as op:
+            sys.stdout.write(result.output)
+            op.rows_out = result.rows
+        _pf.count_returned(result.rows)
+        return
+
+    # The output of the selection is captured so that it can be cached
+    # rows - the number of rows returned by the selection
+    buffer = io.StringIO()
+    rows = _pf.current().rows_returned if _pf.current() is not None else 0
+
+    try:
+        with _ss.redirect_output(buffer):
+            perform_select(arguments)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+
+    rows = (_pf.current().rows_returned if _pf.current() is not None else 0) - rows
+    _ch.store(key, buffer.getvalue(), rows)
+
+
+# METHOD:       select_columnar()
+# DESCRIPTION:  Selects fields or an aggregate from a single table using the columnar execution mode
+# ARGUMENTS:    table_name - the name of the table to select from
+#               fields - the fields to select from the table
+#               condition - the condition formatted as a string to use for evaluation
+#               aggregate - the aggregate function being selected, or None
+# RETURNS:      True if the selection was performed, False if it has to be performed on records instead
+def select_columnar(table_name: str, fields: list[str], condition: str, aggregate: str = None) -> bool:
+    path = _db.tbl_path(table_name)
+
+    if aggregate is not None:
+        result = _cl.aggregate(path, aggregate, fields[1], condition)
+        if result is None:
+            return False
+        print_aggregate(fields, result[1])
+        return True
+
+    selection = _cl.select(path, fields, condition)
+    if selection is None:
+        return False
+
+    print_records(*selection)
+    return True
+
+
+# METHOD:       print_aggregate()
+# DESCRIPTION:  Prints the result of an aggregate function
+# ARGUMENTS:    fields - the selected fields, such as ['COUNT', '(*)']
+#               result - the result of the aggregate function, or None if it has no value
+# RETURNS:      N/A
+def print_aggregate(fields: list[str], result):
+    # An aggregate of no records, such as the AVG of none, has no value and is printed empty
+    print(''.join(fields))
+    print(result if result is not None else '')
+    _pf.count_returned(1)
+
+
+# METHOD:       print_records()
+# DESCRIPTION:  Prints a schema followed by a list of records
+#               Records that are not in a list are formatted and printed as they are read
+# ARGUMENTS:    schema - the schema of the records
+#               records - the records to print
+# RETURNS:      N/A
+def print_records(schema: str, records: list[Record]):
+    if not isinstance(records, list):
+        print_stream(schema, records)
+        return
+
+    # Format the records into their string representations
+    lines = format_records(records)
+
+    with _pf.operator('output') as op:
+        # Print the schema
+        print(schema)
+
+        # Print the records
+        for record in lines:
+            print(record)
+
+        op.rows_in = op.rows_out = len(lines)
+
+    _pf.count_returned(len(lines))
+
+
+# METHOD:       print_stream()
+# DESCRIPTION:  Prints a schema followed by records that are formatted as they are read
+# ARGUMENTS:    schema - the schema of the records
+#               records - an iterable of the records to print
+# RETURNS:      N/A
+def print_stream(schema: str, records):
+    count = 0
+
+    with _pf.operator('output') as op:
+        print(schema)
+
+        for record in records:
+            print(format_record(record))
+            count += 1
+
+        op.rows_in = op.rows_out = count
+
+    _pf.count_returned(count)
 
 
 # METHOD:       update_records()
@@ -539,8 +2450,20 @@ def select_records(arguments):
 # ARGUMENTS:    arguments - the arguments passed down to the method
 # RETURNS:      N/A
 def update_records(arguments):
+    # The hash sets of the statement's subqueries are only kept until the statement is finished
+    try:
+        perform_update(arguments)
+    finally:
+        _ss.current().subqueries.clear()
+
+
+# METHOD:       perform_update()
+# DESCRIPTION:  Performs an update of the fields of the records that satisfy a condition
+# ARGUMENTS:    arguments - the arguments passed down to update_records()
+# RETURNS:      N/A
+def perform_update(arguments):
     # Prevents transactions if no transaction is ongoing
-    if not transaction_active:
+    if not _ss.current().transaction_active:
         print(f'Error: no transaction active!')
 
     # table_name - the name of the table to select from
@@ -557,54 +2480,114 @@ def update_records(arguments):
     if 'SET' not in set_str.upper():
         logging.info('ERROR: Invalid arguments in select_records')
         return
-
-    table = None
-
-    try:
-        # Instantiate a table object from the table file
-        table = retrieve_table(table_name)
-    except TableLockedError:
-        abort_transaction()
+    if _mv.is_view(_db.tbl_path(table_name)):
+        print(f'!Failed to update {table_name} because it is a materialized view.')
         return
 
     # Initially set the condition to evaluate as true
     condition = 'True'
 
-    if len(args) > 2:
+    # A condition in parentheses, such as WHERE (id > 1 or id < 0), is a single argument
+    if len(args) > 1:
         # where_str - the string the MAY contain 'WHERE'
         # cond_str - the condition following the 'WHERE' argument as a string
         # condition - the condition following the 'WHERE' argument
         # condition is by replacing single instance of '=' with '=='
         where_str, args = _ut.pop_argument(args)
-        cond_str = ''.join(args)
+        args = args if isinstance(args, list) else [args]
+        cond_str = ' '.join(args)
         condition = re.sub(r'(?<![=><!])\=(?!=)', '==', cond_str)
 
-    # mod_count - the amount of modifications made to the table
-    mod_count = 0
+        # Each subquery of the condition is executed once, before any record is read
+        if any([_ut.SUBQUERY.match(x) for x in args]):
+            args = resolve_subqueries(args, [(table_name, table_name, 'INNER', 'True')])
+            if args is None:
+                return
+            condition = format_subquery_condition(args)
+
+    workspaces = []
+
+    try:
+        # Retrieve the table as it has been changed by the transaction
+        # Each partition of a partitioned table that the condition does not rule out is updated on its own
+        workspaces = [retrieve_workspace(x, condition) for x in partition_tables(table_name, condition)]
+    except TableLockedError:
+        abort_transaction()
+        return
+
+    # code - the compiled condition
+    # assignment_code - the compiled assignment
+    # changes - the workspace, row number, values and new values of each record that meets the condition
+    # subqueries - the hash sets of the statement's subqueries, the global scope the condition is evaluated in
+    code = compile(condition, '<condition>', 'eval')
+    assignment_code = compile(assignment, '<assignment>', 'exec')
+    changes = []
+    subqueries = _ss.current().subqueries
 
     # Checks each record to see if the condition is met
-    # If it is, perform the assignment
-    for record in table.records:
-        if eval(condition, {}, record):
-            exec(assignment, {}, record)
-            mod_count += 1
+    # If it is, perform the assignment on a mutable copy of the record
+    with _pf.operator('update') as op:
+        for workspace in workspaces:
+            view = RecordView(workspace.table.fields)
+            for row_id, record in workspace.rows():
+                op.rows_in += 1
+                view._record = record
+                if eval(code, subqueries, view):
+                    view._record = list(record)
+                    exec(assignment_code, {}, view)
+                    changes.append((workspace, row_id, record, tuple(view._record)))
+        op.rows_out = len(changes)
+
+    # Records can not be updated in a way that would move them to another partition
+    scheme = _cat.scheme(_db.tbl_path(table_name))
+    if scheme is not None:
+        table_path = _db.tbl_path(table_name)
+        for workspace, _, _, record in changes:
+            partition = _pt.route(scheme, record[scheme.position])
+            if partition is None or _pt.partition_path(table_path, partition) != workspace.table.path:
+                print(f'!Failed to update {table_name} because a record would be moved to another partition.')
+                return
+
+    # The new values are remembered by row number so only the updated rows are written
+    for workspace, row_id, old, record in changes:
+        workspace.original.setdefault(row_id, old)
+        workspace.updated[row_id] = record
+
+    # mod_count - the amount of modifications made to the table
+    mod_count = len(changes)
 
     # If mod_count == 0, print 'No records modified'
     # If mod_count == 1, print '1 record modified'
     # If mod_count  > 1, print '# records modified
     print(f'{"No" if mod_count == 0 else mod_count} record{"s" if mod_count != 1 else ""} modified.')
-    # Write the table to the file
 
-    transaction.append(table)
+    # Outside of a transaction the changes are written to the file immediately
+    # The statement is not stopped once its changes are being written, so they are written whole
+    if not _ss.current().transaction_active:
+        with _cn.shield():
+            for workspace in workspaces:
+                apply_workspace(workspace)
 
 
-# METHOD:       update_records()
-# DESCRIPTION:  Updates fields from a record that satisfy a condition
+# METHOD:       delete_records()
+# DESCRIPTION:  Deletes the records that satisfy a condition
 # ARGUMENTS:    arguments - the arguments passed down to the method
 # RETURNS:      N/A
 def delete_records(arguments):
+    # The hash sets of the statement's subqueries are only kept until the statement is finished
+    try:
+        perform_delete(arguments)
+    finally:
+        _ss.current().subqueries.clear()
+
+
+# METHOD:       perform_delete()
+# DESCRIPTION:  Performs a deletion of the records that satisfy a condition
+# ARGUMENTS:    arguments - the arguments passed down to delete_records()
+# RETURNS:      N/A
+def perform_delete(arguments):
     # Prevents transactions if no transaction is ongoing
-    if not transaction_active:
+    if not _ss.current().transaction_active:
         print(f'Error: no transaction active!')
 
     # table_name - the name of the table to select from
@@ -619,46 +2602,653 @@ def delete_records(arguments):
     if 'FROM' not in from_str.upper():
         logging.info('ERROR: Invalid arguments in select_records')
         return
-
-    # Initially set table to none
-    table = None
-
-    try:
-        # Instantiate a table object from the table file
-        table = retrieve_table(table_name)
-    except TableLockedError:
-        abort_transaction()
+    if _mv.is_view(_db.tbl_path(table_name)):
+        print(f'!Failed to delete from {table_name} because it is a materialized view.')
         return
 
     # Initially set the condition to evaluate as true
     condition = 'True'
 
-    if len(args) > 2:
+    # A condition in parentheses, such as WHERE (id > 1 or id < 0), is a single argument
+    if len(args) > 1:
         # where_str - the string the MAY contain 'WHERE'
         # cond_str - the condition following the 'WHERE' argument as a string
         # condition - the condition following the 'WHERE' argument
         # condition is by replacing single instance of '=' with '=='
         where_str, args = _ut.pop_argument(args)
-        cond_str = ''.join(args)
+        args = args if isinstance(args, list) else [args]
+        cond_str = ' '.join(args)
         condition = re.sub(r'(?<![=><!])\=(?!=)', '==', cond_str)
 
+        # Each subquery of the condition is executed once, before any record is read
+        if any([_ut.SUBQUERY.match(x) for x in args]):
+            args = resolve_subqueries(args, [(table_name, table_name, 'INNER', 'True')])
+            if args is None:
+                return
+            condition = format_subquery_condition(args)
+
+    # Initially set the workspaces to an empty list
+    workspaces = []
+
+    try:
+        # Retrieve the table as it has been changed by the transaction
+        # Each partition of a partitioned table that the condition does not rule out is deleted from on its own
+        workspaces = [retrieve_workspace(x, condition) for x in partition_tables(table_name, condition)]
+    except TableLockedError:
+        abort_transaction()
+        return
+
     # mod_count - the amount of modifications made to the table
+    # code - the compiled condition
+    # subqueries - the hash sets of the statement's subqueries, the global scope the condition is evaluated in
     mod_count = 0
+    code = compile(condition, '<condition>', 'eval')
+    subqueries = _ss.current().subqueries
 
     # Checks each record to see if the condition is met
-    # If it is, perform the assignment
-    for record in table.records:
-        if eval(condition, {}, record):
-            table.records.remove(record)
-            mod_count += 1
+    # If it is, remember its row number so the workspace no longer reads it
+    with _pf.operator('delete') as op:
+        for workspace in workspaces:
+            # view - the view used to access the fields of each record by name
+            view = RecordView(workspace.table.fields)
+
+            for row_id, record in workspace.rows():
+                op.rows_in += 1
+                view._record = record
+                if eval(code, subqueries, view):
+                    workspace.deleted.add(row_id)
+                    workspace.updated.pop(row_id, None)
+                    workspace.original.setdefault(row_id, record)
+                    mod_count += 1
+        op.rows_out = mod_count
 
     # If mod_count == 0, print 'No records modified'
     # If mod_count == 1, print '1 record modified'
     # If mod_count  > 1, print '# records modified
     print(f'{"No" if mod_count == 0 else mod_count} record{"s" if mod_count != 1 else ""} deleted.')
 
-    # Write the table to the file
-    write_table(table)
+    # Outside of a transaction the deleted rows are marked in the file immediately
+    # The statement is not stopped once its changes are being written, so they are written whole
+    if not _ss.current().transaction_active:
+        with _cn.shield():
+            for workspace in workspaces:
+                apply_workspace(workspace)
+
+
+# METHOD:       vacuum_tables()
+# DESCRIPTION:  Compacts tables by rewriting them without their deleted rows
+# ARGUMENTS:    arguments - the name of the table to vacuum, or None to vacuum every table in the database
+# RETURNS:      N/A
+def vacuum_tables(arguments):
+    # table_names - the names of the tables to vacuum, a partitioned table is vacuumed one partition at a time
+    table_name, _ = _ut.pop_argument(arguments)
+    table_names = _db.list_tables() if table_name is None else partition_tables(table_name)
+
+    for name in table_names:
+        if not can_rewrite(name, 'vacuum'):
+            continue
+
+        # The slots of deleted rows are reclaimed along with the old slots of the rows updates relocated,
+        # so the count is not the number of rows deleted
+        with _pf.operator(f'vacuum {name}') as op:
+            reclaimed = vacuum_table(_db.tbl_path(name))
+            op.rows_out = reclaimed
+
+        print(f'Table {name} vacuumed, {reclaimed} slot{"s" if reclaimed != 1 else ""} reclaimed.')
+
+
+# METHOD:       compress_tables()
+# DESCRIPTION:  Compresses a table by encoding its records into a segment, one column at a time
+#               A partitioned table is compressed one partition at a time
+#               A table is only compressed when its segment is smaller than the text of its rows
+# ARGUMENTS:    arguments - the name of the table to compress
+# RETURNS:      N/A
+def compress_tables(arguments):
+    table_name, _ = _ut.pop_argument(arguments)
+
+    if table_name is None:
+        print('!Failed because no table was specified.')
+        return
+
+    for name in partition_tables(table_name):
+        if not can_rewrite(name, 'compress'):
+            continue
+
+        table = Table(_db.tbl_path(name))
+        segment = encode_table(table)
+
+        # A table whose segment is not smaller than its rows, such as a small table, keeps its rows as text
+        if segment.size >= segment.raw_bytes:
+            write_table(table)
+            print(f'Table {name} not compressed, {segment.raw_bytes} bytes would be {segment.size} bytes.')
+            continue
+
+        write_table(table, segment)
+
+        print(f'Table {name} compressed, {segment.raw_bytes} bytes to {segment.size} bytes.')
+
+
+# METHOD:       can_rewrite()
+# DESCRIPTION:  Checks that a table can be rewritten, printing the reason if it can not
+# ARGUMENTS:    name - the name of the table
+#               action - the name of the action rewriting the table, used in the error messages
+# RETURNS:      A bool representing whether the table can be rewritten
+def can_rewrite(name: str, action: str) -> bool:
+    path = _db.tbl_path(name)
+
+    if not _db.validate_table(name):
+        print(f'!Failed to {action} {name} because it does not exist.')
+        return False
+
+    # Tables locked by other transactions can not be rewritten, and the row numbers
+    # held by this transaction's workspace would no longer match the table file
+    if _sto.lock_owner(path) not in (None, _ss.current().transaction_key):
+        print(f'Error: Table {name} is locked!')
+        return False
+    if path in _ss.current().transaction:
+        print(f'!Failed to {action} {name} because it has uncommitted changes.')
+        return False
+
+    return True
+
+
+# endregion
+
+# region MATERIALIZED VIEWS
+
+# REGION:       MATERIALIZED VIEWS
+# DESCRIPTION:  Provides methods for creating, refreshing and maintaining materialized views.
+#               A view's records are held by a table of its own, which is kept up to date
+#               from the records added to and removed from the tables the view reads.
+
+# --------- METHODS --------- #
+
+
+# METHOD:       create_view()
+# DESCRIPTION:  Creates a materialized view and fills it with the result of its query
+# ARGUMENTS:    arguments - the arguments following CREATE MATERIALIZED, such as ['VIEW', 'v', 'AS', 'SELECT', ...]
+# RETURNS:      N/A
+def create_view(arguments):
+    if not isinstance(arguments, list) or len(arguments) < 4 or arguments[0].upper() != 'VIEW' \
+            or arguments[2].upper() != 'AS':
+        print('ERROR: Expected CREATE MATERIALIZED VIEW name AS SELECT ...')
+        return
+
+    # view_name - the name of the view and of the table holding its records
+    # view - the definition of the view, parsed from the query following AS
+    view_name = arguments[1]
+    path = _db.tbl_path(view_name)
+    view = _mv.parse_definition(' '.join(arguments[3:]))
+
+    if view is None:
+        return
+    if _db.validate_table(view_name):
+        print(f'!Failed to create materialized view {view_name} because it already exists.')
+        return
+    for name in view.tables:
+        if not _db.validate_table(name):
+            print(f'!Failed because {name} does not exist')
+            return
+
+    plan = _mv.plan_view(view, [table_meta(x) for x in view.tables])
+    if plan is None:
+        return
+
+    _fs.write_line(plan.schema, path, echo=False, append=False)
+    _mv.write_view(path, view, {}, {}, 0)
+    _cat.register(path, plan.schema, 'view')
+    count = refresh_view(path, view, plan)
+
+    print(f'Materialized view {view_name} created with {count} record{"s" if count != 1 else ""}.')
+
+    if not view.incremental:
+        print(f'Materialized view {view_name} is only brought up to date by REFRESH MATERIALIZED VIEW.')
+
+
+# METHOD:       refresh_views()
+# DESCRIPTION:  Rebuilds a materialized view from its query
+# ARGUMENTS:    arguments - the arguments following REFRESH, such as ['MATERIALIZED', 'VIEW', 'v']
+# RETURNS:      N/A
+def refresh_views(arguments):
+    if not isinstance(arguments, list) or len(arguments) != 3 or arguments[0].upper() != 'MATERIALIZED' \
+            or arguments[1].upper() != 'VIEW':
+        print('ERROR: Expected REFRESH MATERIALIZED VIEW name')
+        return
+
+    view_name = arguments[2]
+    path = _db.tbl_path(view_name)
+    definition = _mv.read_view(path)
+
+    if definition is None:
+        print(f'!Failed because {view_name} is not a materialized view.')
+        return
+
+    # The records of the view before it was rebuilt are passed on to the views that read from it
+    view = definition[0]
+    plan = _mv.plan_view(view, [table_meta(x) for x in view.tables])
+    if plan is None:
+        return
+
+    removed = Table(path).records
+    count = refresh_view(path, view, plan)
+
+    print(f'Materialized view {view_name} refreshed with {count} record{"s" if count != 1 else ""}.')
+
+    if len(_mv.dependents(path)) > 0:
+        maintain_views(path, removed, Table(path).records)
+
+
+# METHOD:       drop_view()
+# DESCRIPTION:  Drops a materialized view by deleting its table
+# ARGUMENTS:    arguments - the arguments following DROP MATERIALIZED, such as ['VIEW', 'v']
+# RETURNS:      N/A
+def drop_view(arguments):
+    if not isinstance(arguments, list) or len(arguments) != 2 or arguments[0].upper() != 'VIEW':
+        print('ERROR: Expected DROP MATERIALIZED VIEW name')
+        return
+
+    view_name = arguments[1]
+    path = _db.tbl_path(view_name)
+
+    if not _mv.is_view(path):
+        print(f'!Failed because {view_name} is not a materialized view.')
+        return
+
+    # Views that read from this view have to be dropped first
+    for dependent, _ in _mv.dependents(path):
+        print(f'!Failed to drop {view_name} because materialized view '
+              f'{os.path.splitext(os.path.basename(dependent))[0]} depends on it.')
+        return
+
+    _fs.delete_file(path)
+    _sto.delete_sidecars(path)
+    _ch.bump(path)
+    _cat.unregister([path])
+
+    print(f'Materialized view {view_name} dropped.')
+
+
+# METHOD:       refresh_view()
+# DESCRIPTION:  Computes the records of a view from every record of its tables and writes them to the view's table
+# ARGUMENTS:    path - the path of the view's table file
+#               view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+# RETURNS:      The number of records in the view
+def refresh_view(path: str, view: _mv.ViewDefinition, plan: _mv.ViewPlan) -> int:
+    with _pf.operator(f'refresh {os.path.splitext(os.path.basename(path))[0]}') as op:
+        tables = [retrieve_table(x, False) for x in view.tables]
+        records = view_records(view, plan, tables)
+
+        # state - the aggregates of each group of an aggregated view
+        state = {}
+        if view.aggregated:
+            _mv.accumulate(view, plan, state, records, 1)
+
+        table = Table(None)
+        table.path = path
+        table.schema = plan.schema
+        table.records = view_output(view, plan, records, state)
+
+        # The record of each group is written to the row of the group's position in the state
+        write_table(table)
+        _mv.write_view(path, view, state, {key: i for i, key in enumerate(state)}, len(table.records))
+
+        op.rows_in = sum([len(x.records) for x in tables])
+        op.rows_out = len(table.records)
+
+    return len(table.records)
+
+
+# METHOD:       maintain_views()
+# DESCRIPTION:  Maintains the materialized views that read from a table from the records added to and
+#               removed from the table. An updated record is removed with its old values and added with its new ones.
+# ARGUMENTS:    path - the path of the table file
+#               removed - the records removed from the table
+#               added - the records added to the table
+# RETURNS:      N/A
+def maintain_views(path: str, removed: list[Record], added: list[Record]):
+    table_name = os.path.splitext(os.path.basename(path))[0]
+
+    for view_path, view in _mv.dependents(path):
+        # Views that can not be maintained from the changes are left as they are until they are refreshed
+        if not view.incremental:
+            logging.info(f'Materialized view {view_path} is out of date until it is refreshed')
+            continue
+
+        with _pf.operator(f'maintain {os.path.splitext(os.path.basename(view_path))[0]}') as op:
+            plan = _mv.plan_view(view, [table_meta(x) for x in view.tables])
+            if plan is None:
+                continue
+
+            # side - the position of the changed table within the view's join
+            # tables - the records of the other table of a join, which the changed records are joined with
+            side = [x.lower() for x in view.tables].index(table_name)
+            tables = [retrieve_table(x, False) if i != side else None for i, x in enumerate(view.tables)]
+            old = view_records(view, plan, tables, side, removed)
+            new = view_records(view, plan, tables, side, added)
+
+            if view.aggregated:
+                changes = maintain_aggregates(view_path, view, plan, old, new)
+            else:
+                changes = maintain_records(view_path, view, plan, old, new)
+
+            op.rows_in = len(removed) + len(added)
+            op.rows_out = len(changes[0]) + len(changes[1])
+
+        # The changes to the view are passed on to the views that read from it
+        if len(_mv.dependents(view_path)) > 0 and len(changes[0]) + len(changes[1]) > 0:
+            maintain_views(view_path, *changes)
+
+
+# METHOD:       maintain_records()
+# DESCRIPTION:  Maintains a view that is not aggregated by removing the view's records of the removed records
+#               from its table and appending the view's records of the added records
+# ARGUMENTS:    path - the path of the view's table file
+#               view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               old - the joined records removed from the view's query
+#               new - the joined records added to the view's query
+# RETURNS:      A tuple of the records removed from and added to the view
+def maintain_records(path: str, view: _mv.ViewDefinition, plan: _mv.ViewPlan, old: list[tuple], new: list[tuple]):
+    removed = view_output(view, plan, old)
+    added = view_output(view, plan, new)
+
+    # Each removed record deletes one row of the view's table holding the same values
+    # The records of a view that is not aggregated are not indexed, so the rows are found by reading its table
+    if len(removed) > 0:
+        table = Table(path)
+        rows = {}
+        for record, row_id in zip(table.records, table.row_ids):
+            rows.setdefault(record, []).append(row_id)
+
+        deleted = []
+        for record in removed:
+            if len(rows.get(record, [])) < 1:
+                logging.warning(f'Materialized view {path} is missing a record, it is refreshed instead')
+                refresh_view(path, view, plan)
+                return table.records, Table(path).records
+            deleted.append(rows[record].pop())
+
+        _sto.delete_rows(path, deleted)
+        _ch.bump(path)
+
+        dead = len(_sto.read_tombstones(path))
+        if _sto.needs_vacuum(dead, dead + len(table.records) - len(deleted)):
+            vacuum_table(path)
+
+    for record in added:
+        append_line(path, format_record(record))
+
+    return removed, added
+
+
+# METHOD:       maintain_aggregates()
+# DESCRIPTION:  Maintains an aggregated view by updating the aggregates of the groups of the removed and
+#               added records, then overwriting the rows of the view's table holding the changed groups' records,
+#               deleting the rows of the groups without any records and appending the records of new groups
+# ARGUMENTS:    path - the path of the view's table file
+#               view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               old - the joined records removed from the view's query
+#               new - the joined records added to the view's query
+# RETURNS:      A tuple of the records removed from and added to the view
+def maintain_aggregates(path: str, view: _mv.ViewDefinition, plan: _mv.ViewPlan, old: list[tuple], new: list[tuple]):
+    _, state, rows, total = _mv.read_view(path)
+
+    # groups - the groups whose aggregates are changed, in the order their records were given
+    # before - the view's record of each changed group before the change
+    groups = dict.fromkeys([tuple([x[i] for i in plan.group]) for x in old + new])
+    before = {x: _mv.aggregate_record(view, plan, x, state[x]) for x in groups if x in state}
+
+    # Removing the minimum or maximum of a group leaves its new extreme unknown, so the view is refreshed
+    if not (_mv.accumulate(view, plan, state, old, -1) and _mv.accumulate(view, plan, state, new, 1)):
+        removed = Table(path).records
+        refresh_view(path, view, plan)
+        return removed, Table(path).records
+
+    after = {x: _mv.aggregate_record(view, plan, x, state[x]) for x in groups if x in state}
+    changes = [before[x] for x in before if after.get(x) != before[x]], \
+        [after[x] for x in after if before.get(x) != after[x]]
+
+    # The rows are numbered as they were when the view was last written unless its table has been
+    # rewritten since, such as by VACUUM, in which case the view is refreshed instead
+    first_row = _cmp.segment_rows(path)
+    if total != first_row + _sto.count_rows(path):
+        logging.info(f'Materialized view {path} was rewritten since it was maintained, it is refreshed instead')
+        refresh_view(path, view, plan)
+        return changes
+
+    # updated - the new record of each changed group that still has records, keyed by the row holding its record
+    # deleted - the rows holding the records of the groups without any records
+    # appended - the groups without a record in the view's table, in the order they were added to the state
+    updated = {rows[x]: after[x] for x in before if x in after and after[x] != before[x]}
+    deleted = [rows.pop(x) for x in before if x not in after]
+    appended = [x for x in state if x in after and x not in before]
+
+    _ch.bump(path)
+    size = os.path.getsize(path)
+
+    # Records that no longer fit in their rows are moved to the end of the table, after its last row
+    _, relocated = _sto.update_rows(path, {x: format_record(y) for x, y in updated.items()}, first_row)
+    _bf.update_rows(path, updated, len(relocated), size)
+    moved = {x: total + i for i, x in enumerate(relocated)}
+    rows = {key: moved.get(row, row) for key, row in rows.items()}
+
+    if len(appended) > 0:
+        append_lines(path, [format_record(after[x]) for x in appended])
+        rows.update({x: total + len(relocated) + i for i, x in enumerate(appended)})
+
+    if len(deleted) > 0:
+        _sto.delete_rows(path, deleted)
+
+    # Vacuuming the table moves each row back by the number of deleted rows before it
+    dead = sorted(_sto.read_tombstones(path))
+    if _sto.needs_vacuum(len(dead), first_row + _sto.count_rows(path)):
+        vacuum_table(path)
+        rows = {key: row - bisect.bisect(dead, row) for key, row in rows.items()}
+
+    _mv.write_view(path, view, state, rows, _cmp.segment_rows(path) + _sto.count_rows(path))
+
+    return changes
+
+
+# METHOD:       view_records()
+# DESCRIPTION:  Finds the joined records of a view's tables that satisfy the view's conditions, either from
+#               every record of the tables or only from records added to or removed from one of the tables
+# ARGUMENTS:    view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               tables - the Table of each of the view's tables, the changed table's may be None
+#               side - the position of the changed table, or None to join every record of the tables
+#               records - the records added to or removed from the changed table
+# RETURNS:      The joined records
+def view_records(view: _mv.ViewDefinition, plan: _mv.ViewPlan, tables: list[Table], side: int = None,
+                 records: list[Record] = None) -> list[tuple]:
+    if side is not None and len(records) < 1:
+        return []
+
+    if view.join == '':
+        return view_filter(view, plan, tables[0].records if side is None else records, view.where)
+
+    # Joins on an equality are computed by probing a hash table of the other table's records
+    if view.join == 'INNER' and plan.keys is not None:
+        side = side or 0
+        probe = tables[side].records if records is None else records
+        (_, probe_key), (_, build_key) = plan.keys[side], plan.keys[1 - side]
+
+        buckets = {}
+        for record in tables[1 - side].records:
+            buckets.setdefault(record[build_key], []).append(record)
+
+        joined = []
+        for record in probe:
+            for match in buckets.get(record[probe_key], []):
+                joined.append(record + match if side == 0 else match + record)
+
+        return view_filter(view, plan, joined, view.on)
+
+    # Every other join is computed from every record of the tables
+    table_tup1 = (view.aliases[0], tables[0])
+    table_tup2 = (view.aliases[1], tables[1])
+
+    match view.join:
+        case 'LEFT':
+            joined = left_outer_join(table_tup1, table_tup2, view.on)
+        case 'RIGHT':
+            joined = right_outer_join(table_tup1, table_tup2, view.on)
+        case _:
+            joined = inner_join(table_tup1, table_tup2, view.on)
+
+    return view_filter(view, plan, joined.records, view.where)
+
+
+# METHOD:       view_filter()
+# DESCRIPTION:  Filters joined records by a condition of a view
+#               The condition refers to the fields of a joined record's tables by the tables' identifiers
+# ARGUMENTS:    view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               records - the joined records to filter
+#               condition - the condition formatted as a python expression
+# RETURNS:      The joined records that satisfy the condition
+def view_filter(view: _mv.ViewDefinition, plan: _mv.ViewPlan, records: list[tuple], condition: str) -> list[tuple]:
+    if condition == 'True':
+        return records
+
+    code = compile(condition, '<condition>', 'eval')
+    views = [RecordView(x) for x in plan.fields]
+    scope = views[0] if len(views) == 1 else dict(zip(view.aliases, views))
+    width = plan.widths[0]
+    filtered = []
+
+    for record in records:
+        if len(views) == 1:
+            views[0]._record = record
+        else:
+            views[0]._record = record[:width]
+            views[1]._record = record[width:]
+        if eval(code, {}, scope):
+            filtered.append(record)
+
+    return filtered
+
+
+# METHOD:       view_output()
+# DESCRIPTION:  Creates the records of a view from its joined records or from the aggregates of its groups
+# ARGUMENTS:    view - the ViewDefinition of the view
+#               plan - the ViewPlan of the view
+#               records - the joined records, used when the view is not aggregated
+#               state - the aggregates of each group, used when the view is aggregated
+# RETURNS:      The records of the view
+def view_output(view: _mv.ViewDefinition, plan: _mv.ViewPlan, records: list[tuple], state: dict = None) -> list:
+    if view.aggregated:
+        return [_mv.aggregate_record(view, plan, key, entry) for key, entry in state.items()]
+
+    return [tuple([record[x] for x in plan.positions]) for record in records]
+
+
+# METHOD:       table_meta()
+# DESCRIPTION:  Finds the metadata of a table in the catalog, or reads it from the first line of its file
+# ARGUMENTS:    name - the name of the table
+# RETURNS:      The metadata string of the table
+def table_meta(name: str) -> str:
+    entry = _cat.lookup(name)
+    if entry is not None:
+        return entry.meta
+
+    with open(_db.tbl_path(name), 'r') as f:
+        return f.readline().strip()
+
+
+# endregion
+
+# region BLOOM FILTERS
+
+# REGION:       BLOOM FILTERS
+# DESCRIPTION:  Provides methods for creating and dropping the Bloom filters of tables' fields, which let
+#               scans for field = literal skip the blocks of rows that can not hold the literal
+
+# --------- METHODS --------- #
+
+
+# METHOD:       create_bloom_filter()
+# DESCRIPTION:  Builds Bloom filters of fields of a table, replacing any the table already has
+#               A partitioned table has filters for each of its partitions
+# ARGUMENTS:    arguments - the arguments following CREATE BLOOM, such as ['FILTER', 'ON', 'item', '(id, name)']
+# RETURNS:      N/A
+def create_bloom_filter(arguments):
+    if not isinstance(arguments, list) or len(arguments) != 4 or arguments[0].upper() != 'FILTER' \
+            or arguments[1].upper() != 'ON' or not arguments[3].startswith('('):
+        print('ERROR: Expected CREATE BLOOM FILTER ON table (field, ...)')
+        return
+
+    table_name = arguments[2]
+    columns = [x.strip() for x in arguments[3].strip('()').split(',') if x.strip()]
+
+    if not _db.validate_table(table_name):
+        print(f'!Failed because {table_name} does not exist')
+        return
+
+    fields, _ = _db.parse_table_meta(table_meta(table_name))
+    for name in columns:
+        if name not in fields:
+            print(f'!Failed because {table_name} has no field {name}.')
+            return
+    if len(columns) < 1 or len(set(columns)) != len(columns):
+        print('!Failed because the fields of a Bloom filter must be listed once each.')
+        return
+
+    # nbytes - the size of the filters of every partition
+    nbytes = 0
+    for name in partition_tables(table_name):
+        if not can_rewrite(name, 'create a Bloom filter on'):
+            return
+        with _pf.operator(f'bloom filter {name}') as op:
+            written = rebuild_filters(_db.tbl_path(name), columns)
+            op.bytes_written = written
+            nbytes += written
+
+    print(f'Bloom filter created on {table_name}({", ".join(columns)}), {nbytes} bytes.')
+
+
+# METHOD:       drop_bloom_filter()
+# DESCRIPTION:  Deletes the Bloom filters of a table and of its partitions
+# ARGUMENTS:    arguments - the arguments following DROP BLOOM, such as ['FILTER', 'ON', 'item']
+# RETURNS:      N/A
+def drop_bloom_filter(arguments):
+    if not isinstance(arguments, list) or len(arguments) != 3 or arguments[0].upper() != 'FILTER' \
+            or arguments[1].upper() != 'ON':
+        print('ERROR: Expected DROP BLOOM FILTER ON table')
+        return
+
+    table_name = arguments[2]
+    if not _db.validate_table(table_name):
+        print(f'!Failed because {table_name} does not exist')
+        return
+
+    if not any([_bf.delete(_db.tbl_path(x)) for x in partition_tables(table_name)]):
+        print(f'!Failed because {table_name} has no Bloom filter.')
+        return
+
+    print(f'Bloom filter on {table_name} dropped.')
+
+
+# METHOD:       rebuild_filters()
+# DESCRIPTION:  Builds the Bloom filters of a table file from every record it holds
+# ARGUMENTS:    path - the path of the table file
+#               columns - the names of the fields to filter, or None to rebuild the filters the table file has
+# RETURNS:      The number of bytes of the filters
+def rebuild_filters(path: str, columns: list[str] = None) -> int:
+    table = Table(path)
+
+    if columns is None:
+        columns = [x for x in _bf.read_header(path).columns if x in table.fields]
+    if len(columns) < 1:
+        _bf.delete(path)
+        return 0
+
+    # The rows of the table file are numbered after the rows of its segment, deleted rows included
+    rows = _cmp.segment_rows(path) + len(_sto.read_index(path))
+
+    return _bf.build(path, columns, table.fields, table.records, table.row_ids, rows)
 
 
 # endregion
@@ -676,37 +3266,43 @@ def delete_records(arguments):
 # ARGUMENTS:    name - the name of the table
 # RETURNS:      N/A
 def acquire_lock(name: str):
-    lines = None
+    path = _db.tbl_path(name)
 
-    with open(_db.tbl_path(name), 'r') as f:
-        lines = f.readlines()
-        f.close()
-
-    transaction_lock = lines[0]
-
-    if transaction_lock.startswith('&') and transaction_key not in transaction_lock:
+    # Within a transaction, the lock is held until the transaction ends
+    # Outside of a transaction, the statement only has to check that no transaction holds the lock
+    session = _ss.current()
+    if session.transaction_active:
+        if not _sto.try_lock(path, session.transaction_key):
+            raise TableLockedError
+    elif _sto.lock_owner(path) not in (None, session.transaction_key):
         raise TableLockedError
 
-    with open(_db.tbl_path(name), 'w') as f:
-        f.write(f'{transaction_key}\n')
-        f.writelines(lines)
+
+# METHOD:       release_locks()
+# DESCRIPTION:  Releases the locks of every table in the transaction
+# ARGUMENTS:    N/A
+# RETURNS:      N/A
+def release_locks():
+    session = _ss.current()
+    for path in session.transaction:
+        _sto.unlock(path, session.transaction_key)
 
 
 # METHOD:       begin_transaction()
-# DESCRIPTION:  Initializes globals to begin a transaction and creates a transaction key
+# DESCRIPTION:  Begins a transaction in the current session and creates a transaction key
+#               The key tells apart the sessions of every process, so each session locks tables for itself
 # ARGUMENTS:    N/A
 # RETURNS:      N/A
 def begin_transaction():
-    global transaction_active
-    global transaction_key
-    global transaction
+    session = _ss.current()
 
-    if transaction_active:
+    if session.transaction_active:
         print(f'ERROR: Transaction is currently active!')
 
-    transaction_active = True
-    transaction_key = f'&{os.getpid()}'
-    transaction = []
+    session.transaction_active = True
+    session.transaction_key = f'&{os.getpid()}.{session.id}'
+    session.transaction = {}
+    session.changes = []
 
     print('Transaction starts.')
 
@@ -716,35 +3312,42 @@ def begin_transaction():
 # ARGUMENTS:    N/A
 # RETURNS:      N/A
 def commit_transaction():
-    global transaction_active
-    global transaction_key
-    global transaction
+    session = _ss.current()
 
     # Checks to see if there is anything to commit
     # If there is, print a success message
     # Otherwise, don't print anything
-    if len(transaction) > 0:
+    if len(session.transaction) > 0:
         print('Transaction committed.')
-        for table in transaction:
-            write_table(table)
+        for workspace in session.transaction.values():
+            apply_workspace(workspace)
+            workspace.budget.release()
 
-    transaction_active = False
-    transaction_key = ''
-    transaction = []
+    # The changes are published once they are applied, so a replica never applies an aborted transaction
+    _rp.publish_transaction()
+    release_locks()
+
+    session.transaction_active = False
+    session.transaction_key = ''
+    session.transaction = {}
 
 
 # METHOD:       abort_transaction()
-# DESCRIPTION:  Aborts transaction and resets the globals
+# DESCRIPTION:  Aborts the transaction of the current session
 # ARGUMENTS:    N/A
 # RETURNS:      N/A
 def abort_transaction():
-    global transaction_active
-    global transaction_key
-    global transaction
+    session = _ss.current()
+
+    # The changes held by the transaction's workspaces are discarded
+    release_locks()
+    for workspace in session.transaction.values():
+        workspace.budget.release()
 
-    transaction_active = False
-    transaction_key = ''
-    transaction = []
+    session.transaction_active = False
+    session.transaction_key = ''
+    session.transaction = {}
+    session.changes = []
 
     print('Transaction abort.')
 
@@ -810,12 +3413,13 @@ def combine_arguments_between(arg1: str, arg2: str, arguments: list) -> list[str
 # RETURNS:      A condition formatted as a string to be evaluated
 def format_condition(conditions_data: list[str]) -> str:
     # If there are no conditions to evaluate, return an empty string
-    if conditions_data is not None and len(conditions_data) <= 1:
+    # A condition in parentheses is a single argument, which is evaluated as it is
+    if conditions_data is None or len(conditions_data) < 1:
         return ''
 
     # Join the condition_data arguments into a single string
     # Then, replace any singular '=' with '=='
-    cond_str = ''.join(conditions_data)
+    cond_str = ' '.join(conditions_data)
     condition = re.sub(r'(?<![=><!])\=(?!=)', '==', cond_str)
 
     return condition
@@ -1,6 +1,15 @@
 import re
 import _globals as _gl
 
+# Runtime Constants Variables
+# SUBQUERY - the beginning of a subquery within a statement, such as (SELECT pid FROM Supply)
+# LIST_ENDS - the keywords that end the list of tables after FROM
+# TOKEN - an argument of a statement outside of parentheses, such as a name, a quoted word, an operator or a comma
+#         A minus sign is an argument of its own, so that -1 is split into - and 1 rather than losing its sign
+SUBQUERY = re.compile(r'\(\s*SELECT\b', re.IGNORECASE)
+LIST_ENDS = ('WHERE', 'GROUP', 'ORDER', 'LIMIT', 'OFFSET')
+TOKEN = re.compile(r'\w*\.*\w+|\*|[<>=!]+|-|\'\w+\'|,')
+
 # region UTILITY
 
 # REGION:       UTILITY
@@ -51,4 +60,77 @@ def remove_arg(table, element):
     # Otherwise, return the last element of the list
     return new_args if len(new_args) > 1 else new_args[0]
 
+
+# METHOD:       split_statement()
+# DESCRIPTION:  Splits the text of a statement into a list of arguments. Each group of parentheses, such as
+#               (*) in COUNT(*), a condition or a subquery, is kept as a single argument up to the parenthesis
+#               that closes it, and the values of an INSERT are kept along with the VALUES keyword. Commas are
+#               only kept between the tables listed after FROM, where they tell a table without an identifier
+#               apart from the table after it.
+# ARGUMENTS:    statement - the text of the statement, without its semicolon
+# RETURNS:      The list of arguments, with any keywords in uppercase
+def split_statement(statement: str) -> list[str]:
+    arg_list = []
+    for part in split_groups(statement):
+        if not part.startswith('('):
+            arg_list.extend(TOKEN.findall(part))
+        elif len(arg_list) > 0 and arg_list[-1] in ('VALUES', 'values'):
+            arg_list[-1] += part
+        else:
+            arg_list.append(part)
+
+    arg_list = [x.upper() if x.upper() in _gl.KEYWORDS else x for x in arg_list]
+
+    # listing - whether the arguments are part of the list of tables after FROM
+    words = []
+    listing = False
+    for x in arg_list:
+        if x == 'FROM':
+            listing = True
+        elif x in LIST_ENDS:
+            listing = False
+        elif x == ',' and not listing:
+            continue
+        words.append(x)
+
+    return words
+
+
+# METHOD:       split_groups()
+# DESCRIPTION:  Splits the text of a statement into each group of parentheses and the text between them,
+#               such as SELECT grp, COUNT, (*), FROM P WHERE, (id > 1 or id < 0). A group ends at the
+#               parenthesis that closes it, and parentheses within quotes are not counted. An opening
+#               parenthesis that is never closed is left in the text around it.
+# ARGUMENTS:    text - the text of the statement
+# RETURNS:      A list of the groups and the text between them
+def split_groups(text: str) -> list[str]:
+    words = []
+    depth = 0
+    start = 0
+    quoted = False
+
+    for i, character in enumerate(text):
+        if character == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif character == '(':
+            if depth == 0:
+                words.append(text[start:i])
+                start = i
+            depth += 1
+        elif character == ')' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                words.append(text[start:i + 1])
+                start = i + 1
+
+    # The text after a parenthesis that is never closed is split again without it
+    if depth > 0:
+        return [x for x in words if x] + split_groups(text[start + 1:])
+
+    words.append(text[start:])
+
+    return [x for x in words if x]
+
 # endregion
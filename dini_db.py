@@ -56,6 +56,43 @@
 #       - Added methods for finding the count, max, min and average of a table
 #       - Adjusted the way arguments are split
 #       - Implemented COUNT, AVG, MAX and MIN in select_record()
+#
+#       OCTOBER 18, 2026
+#       - Added the profiler module
+#       - Added the --profile and --profile-dump arguments
+#       - Added EXPLAIN ANALYZE
+#       - Added the statistics module and SHOW STATEMENTS
+#       - Added the --slow-query-ms and --slow-query-log arguments
+#       - Added the columnar module and the --columnar argument
+#       - Added SUM and applied conditions to aggregates
+#       - Added the storage module for deletion bitmaps and lock files
+#       - Changed DELETE to mark deleted rows instead of rewriting the table
+#       - Added VACUUM and the --vacuum-threshold argument
+#       - Added row offset indexes and changed UPDATE to overwrite rows in place
+#       - Added the partition module for RANGE and HASH partitioned tables
+#       - Added partition pruning and ALTER TABLE ... DROP PARTITION
+#       - Added the compression module, COMPRESS TABLE and SHOW COMPRESSION
+#       - Added the cache module, the --result-cache-mb argument and SHOW CACHE
+#       - Added the matview module, CREATE/DROP/REFRESH MATERIALIZED VIEW and view maintenance
+#       - Added the sort module, ORDER BY and the --sort-memory-mb argument
+#       - Added LIMIT and OFFSET
+#       - Added the aggregate module, GROUP BY, SELECT DISTINCT and the --aggregate-memory-mb argument
+#       - Added joins of more than two tables
+#       - Added IN, NOT IN, EXISTS and NOT EXISTS subqueries
+#       - Changed scripts and piped input to be executed as their statements are read
+#       - Added the --insert-batch argument
+#       - Added the catalog module, which holds the metadata of every table of the database being used
+#       - Changed ALTER TABLE to keep the records of the table, and added DEFAULT and DROP COLUMN to it
+#       - Added the session module, which lets several threads execute statements at once
+#       - Added the stress module and the --stress-threads argument
+#       - Added the replication module, the --replica-of argument and SHOW REPLICATION
+#       - Added the backup module and BACKUP DATABASE
+#       - Added the pushdown module, which rules out rows before they are converted into records
+#       - Added the bloom module, CREATE/DROP BLOOM FILTER, SHOW BLOOM FILTERS and runtime join filters
+#       - Added the memory module, SET work_mem, SHOW MEMORY, --memory-limit and spilling joins and workspaces
+#       - Added the cancel module, SET statement_timeout and cancelling statements with Ctrl-C
+#       - Added the benchmark module and the --benchmark argument
+#       - Added RESTORE DATABASE
 
 
 import argparse
@@ -64,6 +101,19 @@ import _globals as _gl
 import _filesystem as _fs
 import _dbmanagement as _db
 import _input as _in
+import _profiler as _pf
+import _statistics as _st
+import _columnar as _cl
+import _storage as _sto
+import _cache as _ch
+import _sort as _so
+import _aggregate as _ag
+import _memory as _mem
+import _cancel as _cn
+import _session as _ss
+import _stress as _sx
+import _benchmark as _bm
+import _replication as _rp
 
 # region ARGPARSER ARGUMENTS
 
@@ -98,6 +148,104 @@ parser.add_argument(
     action="store_const", dest="loglevel", const=logging.INFO,
 )
 
+parser.add_argument(
+    '--profile',
+    help="Print the phase and operator timings of every statement",
+    action="store_true", dest="profile",
+    default=False,
+)
+
+parser.add_argument(
+    '--profile-dump',
+    help="Write a cProfile dump of every statement to the specified directory",
+    type=str, dest="profile_dump",
+    default=None,
+)
+
+parser.add_argument(
+    '--slow-query-ms',
+    help="Log every statement that takes longer than the specified milliseconds",
+    type=float, dest="slow_query_ms",
+    default=None,
+)
+
+parser.add_argument(
+    '--slow-query-log',
+    help="The file slow statements are logged to",
+    type=str, dest="slow_query_log",
+    default='slow_query.log',
+)
+
+parser.add_argument(
+    '--columnar',
+    help="Evaluate conditions and aggregates over NumPy column batches when possible",
+    action="store_true", dest="columnar",
+    default=False,
+)
+
+parser.add_argument(
+    '--vacuum-threshold',
+    help="Vacuum a table after a delete once this ratio of its rows are deleted",
+    type=float, dest="vacuum_threshold",
+    default=None,
+)
+
+parser.add_argument(
+    '--result-cache-mb',
+    help="Cache the output of SELECT statements in up to this many megabytes of memory",
+    type=float, dest="result_cache_mb",
+    default=None,
+)
+
+parser.add_argument(
+    '--sort-memory-mb',
+    help="Sort up to this many megabytes of records in memory before spilling sorted runs to disk",
+    type=float, dest="sort_memory_mb",
+    default=None,
+)
+
+parser.add_argument(
+    '--aggregate-memory-mb',
+    help="Group records in up to this many megabytes of memory before spilling groups to disk",
+    type=float, dest="aggregate_memory_mb",
+    default=None,
+)
+
+parser.add_argument(
+    '--memory-limit',
+    help="Reserve at most this many megabytes of memory for the operators of every session at once",
+    type=float, dest="memory_limit",
+    default=None,
+)
+
+parser.add_argument(
+    '--insert-batch',
+    help="Append the records of up to this many consecutive INSERT statements of a script together",
+    type=int, dest="insert_batch",
+    default=None,
+)
+
+parser.add_argument(
+    '--stress-threads',
+    help="Run the stress test with this many reader threads executing statements at once, then exit",
+    type=int, dest="stress_threads",
+    default=None,
+)
+
+parser.add_argument(
+    '--benchmark',
+    help="Measure the bytes each of this many rows uses as dict-based records and as tuples, then exit",
+    type=int, dest="benchmark",
+    default=None,
+)
+
+parser.add_argument(
+    '--replica-of',
+    help="Run as a read-only replica applying the changes published by the program in this working directory",
+    type=str, dest="replica_of",
+    default=None,
+)
+
 ARGS = parser.parse_args()
 
 logging.basicConfig(level=ARGS.loglevel)
@@ -132,13 +280,27 @@ def main():
 # ARGUMENTS:    N/A
 # RETURNS:      N/A
 def run():
+    # A replica that could not be started does not read statements
+    if ARGS.replica_of is not None and _rp.replica is None:
+        return
+
+    # The stress test is run instead of reading statements
+    if ARGS.stress_threads is not None:
+        _sx.run(ARGS.stress_threads)
+        return
+
+    # The memory benchmark is run instead of reading statements
+    if ARGS.benchmark is not None:
+        _bm.run(ARGS.benchmark)
+        return
+
     # If a file is specified from the program's arguments, read from that file
     # In the case that an '.EXIT' command is not read from the file, continue from terminal
     if ARGS.file is not None:
         if not _in.file_input(ARGS.file):
             return
 
-    # Takes in user input from the terminal
+    # Takes in user input from the terminal, or from a script piped to the program
     _in.terminal_input()
 
 
@@ -150,9 +312,21 @@ def init():
     logging.info('Performing initialization...')
 
     # Initialize global variables in modules that use globals
+    # The sessions are initialized first, since the other modules hold their state in the current session
+    _ss.ss_init()
     _gl.gl_init()
     _fs.fs_init()
     _db.db_init()
+    _pf.pf_init(ARGS.profile, ARGS.profile_dump)
+    _st.st_init(ARGS.slow_query_ms, ARGS.slow_query_log)
+    _cl.cl_init(ARGS.columnar)
+    _sto.sto_init(ARGS.vacuum_threshold)
+    _ch.ch_init(ARGS.result_cache_mb)
+    _so.so_init(ARGS.sort_memory_mb)
+    _ag.ag_init(ARGS.aggregate_memory_mb)
+    _mem.mem_init(ARGS.memory_limit)
+    _cn.cn_init()
+    _in.in_init(ARGS.insert_batch)
 
     # If the reset argument in the argparser is set, reset the default database
     # Raises an exception in the case of an invalid directory
@@ -162,12 +336,18 @@ def init():
     # Create the default database directory if it doesn't exist
     _db.initialize_databases_folder()
 
+    # Once the databases folder exists, open its change log or start applying the changes of the primary
+    _rp.rp_init(ARGS.replica_of)
+
 
 # METHOD:       end()
 # DESCRIPTION:  End the program at the end of main's execution
 # ARGUMENTS:    N/A
 # RETURNS:      N/A
 def end():
+    # A replica stops applying changes before the program ends
+    _rp.stop()
+
     print('All done.')
 
 